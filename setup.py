@@ -27,9 +27,11 @@ INSTALL_REQUIRES = [
     "click >= 7, < 8",
     "colorama >= 0.3.9, < 1",
     "distro >= 1.5.0, < 2",
+    "futures >= 3.3.0, < 4; python_version < '3'",
     "packaging >= 17.1, < 18",
     "pystache >= 0.5.4, < 1",
     "sawmill >= 0.2.1, < 1",
+    "scandir >= 1.10.0, < 2; python_version < '3.5'",
     "six >= 1.15.0, < 2",
     "toml >= 0.10.1, < 1",
     "ujson >= 2.0.3, < 4"
@@ -1,24 +1,43 @@
 # :coding: utf-8
 
+import math
 import os
 import shlex
+import uuid
 
+import six
+from six.moves import cPickle
+
+import wiz.cache
 import wiz.definition
 import wiz.environ
 import wiz.exception
 import wiz.filesystem
 import wiz.graph
+import wiz.history
 import wiz.logging
 import wiz.package
 import wiz.registry
+import wiz.sat
 import wiz.spawn
 import wiz.symbol
 import wiz.system
 import wiz.utility
 from ._version import __version__
 
+#: Number of batches of requests submitted per worker when contexts are
+#: resolved concurrently.
+_BATCHES_PER_WORKER = 4
+
+#: Definition mappings deserialized within worker processes, organised per
+#: unique token identifying the resolutions which require them.
+_WORKER_DEFINITION_MAPPINGS = {}
 
-def fetch_definition_mapping(paths, max_depth=None, system_mapping=None):
+
+def fetch_definition_mapping(
+    paths, max_depth=None, system_mapping=None, ignore_patterns=None,
+    workers=None, executor=None, lazy=False, cache=False, memory_cache=False
+):
     """Return mapping including all definitions available under *paths*.
 
     Mapping returned should be in the form of::
@@ -58,20 +77,91 @@ def fetch_definition_mapping(paths, max_depth=None, system_mapping=None):
         out non compatible definitions. Default is None, which means that the
         current system mapping will be :func:`queried <wiz.system.query>`.
 
+    :param ignore_patterns: List of :mod:`fnmatch` patterns matching names of
+        files and directories which should be skipped within registries (e.g.
+        [".git", "payload*"]). Default is None.
+
+    :param workers: Number of workers to load :class:`definitions
+        <wiz.definition.Definition>` concurrently. Default is None, which means
+        that definitions will be loaded sequentially.
+
+    :param executor: Instance of :class:`concurrent.futures.Executor` or type
+        of executor to create with *workers* (:data:`wiz.symbol.THREAD_EXECUTOR`
+        or :data:`wiz.symbol.PROCESS_EXECUTOR`). Default is None, which means
+        that a thread pool executor will be created if more than one worker is
+        required.
+
+    :param lazy: Indicate whether definitions should only be loaded for an
+        identifier when it is required, using the index of each registry.
+        Default is False.
+
+    :param cache: Indicate whether the definition mapping should be loaded
+        from a snapshot saved in :func:`cache directory <wiz.cache.get_path>`
+        when registries have not been modified since it was exported. The
+        snapshot is updated otherwise. This option is ignored when *lazy* is
+        True. Default is False.
+
+    :param memory_cache: Indicate whether the definition mapping should be
+        kept in memory and returned by subsequent calls with the same
+        registries and options, as long as registries have not been modified.
+        The same definition mapping instance is then returned to each caller.
+        Default is False.
+
     :return: Definition mapping.
 
+    .. seealso:: :class:`wiz.definition.LazyDefinitionMapping`
+
     """
     if system_mapping is None:
         system_mapping = wiz.system.query()
 
-    mapping = wiz.definition.fetch(
-        paths, system_mapping=system_mapping, max_depth=max_depth
+    use_cache = cache and not lazy
+    options = dict(
+        system_mapping=system_mapping, max_depth=max_depth,
+        ignore_patterns=ignore_patterns
     )
 
+    if memory_cache:
+        mapping = wiz.cache.load_from_memory(paths, lazy=lazy, **options)
+        if mapping is not None:
+            return mapping
+
+    mapping = wiz.cache.load_snapshot(paths, **options) if use_cache else None
+
+    if mapping is not None:
+        wiz.history.record_action(
+            wiz.symbol.DEFINITIONS_COLLECTION_ACTION,
+            registries=paths, max_depth=max_depth, definition_mapping=mapping
+        )
+
+    else:
+        mapping = wiz.definition.fetch(
+            paths, workers=workers, executor=executor, lazy=lazy, **options
+        )
+
+        if use_cache:
+            wiz.cache.export_snapshot(mapping, paths, **options)
+
     mapping["registries"] = paths
+
+    if memory_cache:
+        wiz.cache.save_to_memory(mapping, paths, lazy=lazy, **options)
+
     return mapping
 
 
+def invalidate_cache():
+    """Discard definition mappings kept in memory.
+
+    Subsequent calls to :func:`fetch_definition_mapping` with *memory_cache*
+    will fetch definitions from registries again.
+
+    .. seealso:: :func:`wiz.cache.clear_memory`
+
+    """
+    wiz.cache.clear_memory()
+
+
 def fetch_definition(request, definition_mapping):
     """Return :class:`~wiz.definition.Definition` instance from request.
 
@@ -157,14 +247,14 @@ def fetch_package_request_from_command(command_request, definition_mapping):
     _requirement = wiz.utility.get_requirement(
         definition_mapping[request_type][requirement.name]
     )
-    _requirement.specifier = requirement.specifier
-    _requirement.extras = requirement.extras
-    return str(_requirement)
+    return str(requirement.with_name(_requirement.name))
 
 
 def resolve_context(
     requests, definition_mapping=None, ignore_implicit=False,
-    environ_mapping=None
+    environ_mapping=None, strategy=wiz.symbol.GRAPH_STRATEGY, jobs=None,
+    executor=None, max_combinations=None, timeout=None, cancel_event=None,
+    initiate_environ=True
 ):
     """Return context mapping from *requests*.
 
@@ -201,7 +291,8 @@ def resolve_context(
     :param definition_mapping: Mapping regrouping all available definitions. It
         could be fetched with :func:`fetch_definition_mapping`. If no definition
         mapping is provided, a default one will be fetched from
-        :func:`default registries <wiz.registry.get_defaults>`.
+        :func:`default registries <wiz.registry.get_defaults>` and kept in
+        memory for subsequent calls.
 
     :param ignore_implicit: Indicates whether implicit packages should not be
         included in context. Default is False.
@@ -209,20 +300,463 @@ def resolve_context(
     :param environ_mapping: Mapping of environment variables which would be
         augmented by the resolved environment. Default is None.
 
+    :param strategy: Indicate which resolver should be used to compute the
+        packages (:data:`wiz.symbol.GRAPH_STRATEGY` or
+        :data:`wiz.symbol.SAT_STRATEGY`). Default is
+        :data:`wiz.symbol.GRAPH_STRATEGY`.
+
+    :param jobs: Number of variant combinations which can be computed
+        concurrently in worker processes by the graph resolver. Default is
+        None, which means that combinations are computed one at a time.
+
+    :param executor: Instance of :class:`concurrent.futures.Executor` used by
+        the graph resolver to compute variant combinations concurrently, so
+        that it can be reused by subsequent resolutions. Default is None,
+        which means that a process pool executor will be created for this
+        resolution if more than one job is required.
+
+    :param max_combinations: Maximum number of variant combinations to compute
+        by the graph resolver. Default is None, which means that the number of
+        combinations is not limited.
+
+    :param timeout: Number of seconds after which the resolver is
+        interrupted. Default is None, which means that the resolution is not
+        limited in time.
+
+    :param cancel_event: Instance of :class:`threading.Event` which interrupts
+        the resolver when set. Default is None.
+
+    :param initiate_environ: Indicate whether *environ_mapping* should be
+        added to the :func:`initial environment <wiz.environ.initiate>`.
+        Otherwise, *environ_mapping* is used as the initial environment.
+        Default is True.
+
     :return: Context mapping.
 
     :raise: :exc:`wiz.exception.GraphResolutionError` if the resolution graph
         cannot be resolved in time.
 
+    :raise: :exc:`wiz.exception.ResolutionInterrupted` if the resolver is
+        cancelled, or if its timeout or the maximum number of combinations of
+        the graph resolver is exceeded.
+
+    :raise: :exc:`ValueError` if the *strategy* is incorrect, or if *jobs*,
+        *executor* or *max_combinations* are used with the SAT resolver.
+
     """
-    # To prevent mutating input list.
-    _requests = requests[:]
+    _validate_strategy(
+        strategy, jobs=jobs, executor=executor,
+        max_combinations=max_combinations
+    )
 
     if definition_mapping is None:
         definition_mapping = wiz.fetch_definition_mapping(
-            wiz.registry.get_defaults()
+            wiz.registry.get_defaults(), memory_cache=True
+        )
+
+    options = {"timeout": timeout, "cancel_event": cancel_event}
+
+    if strategy == wiz.symbol.GRAPH_STRATEGY:
+        options["jobs"] = jobs
+        options["executor"] = executor
+        options["max_combinations"] = max_combinations
+
+    resolver = _create_resolver(definition_mapping, strategy, options)
+
+    return _extract_context(
+        resolver, requests, definition_mapping,
+        ignore_implicit=ignore_implicit, environ_mapping=environ_mapping,
+        initiate_environ=initiate_environ
+    )
+
+
+def resolve_contexts(
+    requests_list, definition_mapping=None, ignore_implicit=False,
+    environ_mapping=None, strategy=wiz.symbol.GRAPH_STRATEGY,
+    max_combinations=None, timeout=None, workers=None, executor=None
+):
+    """Yield context mappings from each list of requests in *requests_list*.
+
+    Contexts are resolved as with :func:`resolve_context`, but the same
+    resolver is used for several lists of requests so that packages extracted
+    from requirements are shared between resolutions.
+
+    Example::
+
+        >>> for requests, context in resolve_contexts([["foo"], ["bar"]]):
+        ...     if isinstance(context, wiz.exception.WizError):
+        ...         print("{}: {}".format(requests, context))
+
+    :param requests_list: List of request lists (e.g. [["foo"], ["bar>1"]]).
+
+    :param definition_mapping: Mapping regrouping all available definitions. It
+        could be fetched with :func:`fetch_definition_mapping`. If no definition
+        mapping is provided, a default one will be fetched from
+        :func:`default registries <wiz.registry.get_defaults>` and kept in
+        memory for subsequent calls.
+
+    :param ignore_implicit: Indicates whether implicit packages should not be
+        included in contexts. Default is False.
+
+    :param environ_mapping: Mapping of environment variables which would be
+        augmented by each resolved environment. Default is None.
+
+    :param strategy: Indicate which resolver should be used to compute the
+        packages (:data:`wiz.symbol.GRAPH_STRATEGY` or
+        :data:`wiz.symbol.SAT_STRATEGY`). Default is
+        :data:`wiz.symbol.GRAPH_STRATEGY`.
+
+    :param max_combinations: Maximum number of variant combinations to compute
+        by the graph resolver for each context. Default is None, which means
+        that the number of combinations is not limited.
+
+    :param timeout: Number of seconds after which the resolver is
+        interrupted for each context. Default is None, which means that
+        resolutions are not limited in time.
+
+    :param workers: Number of workers to resolve contexts concurrently.
+        Default is None, which means that contexts will be resolved
+        sequentially.
+
+    :param executor: Instance of :class:`concurrent.futures.Executor` or type
+        of executor to create with *workers* (:data:`wiz.symbol.THREAD_EXECUTOR`
+        or :data:`wiz.symbol.PROCESS_EXECUTOR`). Default is None, which means
+        that a process pool executor will be created if more than one worker is
+        required.
+
+    :return: Generator which yield tuples with each list of requests and the
+        corresponding context mapping, or the :exc:`wiz.exception.WizError`
+        instance raised if the context cannot be resolved.
+
+    :raise: :exc:`ValueError` if the *strategy* is incorrect, if
+        *max_combinations* is used with the SAT resolver, or if
+        *requests_list* does not only contain lists of requests.
+
+    .. note::
+
+        Arguments are validated when this function is called, before any
+        context is yielded.
+
+    .. note::
+
+        Contexts are always yielded in the order of *requests_list*, whether
+        they are resolved concurrently or not. When resolved concurrently,
+        lists of requests are divided into batches and each batch is resolved
+        by one worker.
+
+    """
+    _validate_strategy(strategy, max_combinations=max_combinations)
+
+    requests_list = list(requests_list)
+
+    for requests in requests_list:
+        if isinstance(requests, six.string_types):
+            raise ValueError(
+                "Requests must be given as a list for each context "
+                "[received: {!r}].".format(requests)
+            )
+
+    return _resolve_contexts(
+        requests_list, definition_mapping, ignore_implicit, environ_mapping,
+        strategy, max_combinations, timeout, workers, executor
+    )
+
+
+def _resolve_contexts(
+    requests_list, definition_mapping, ignore_implicit, environ_mapping,
+    strategy, max_combinations, timeout, workers, executor
+):
+    """Yield context mappings from each list of requests in *requests_list*.
+
+    This generator is returned by :func:`resolve_contexts` once arguments
+    have been validated.
+
+    :param requests_list: List of request lists.
+
+    :param definition_mapping: Mapping regrouping all available definitions,
+        or None if the default one should be fetched.
+
+    :param ignore_implicit: Indicates whether implicit packages should not be
+        included in contexts.
+
+    :param environ_mapping: Mapping of environment variables which would be
+        augmented by each resolved environment.
+
+    :param strategy: Resolution strategy.
+
+    :param max_combinations: Maximum number of variant combinations to compute
+        by the graph resolver for each context.
+
+    :param timeout: Number of seconds after which the resolver is interrupted
+        for each context.
+
+    :param workers: Number of workers to resolve contexts concurrently.
+
+    :param executor: Instance of :class:`concurrent.futures.Executor` or type
+        of executor to create with *workers*.
+
+    :return: Generator which yield tuples with each list of requests and the
+        corresponding context mapping, or the :exc:`wiz.exception.WizError`
+        instance raised if the context cannot be resolved.
+
+    """
+    if definition_mapping is None:
+        definition_mapping = wiz.fetch_definition_mapping(
+            wiz.registry.get_defaults(), memory_cache=True
         )
 
+    options = {"timeout": timeout}
+
+    if strategy == wiz.symbol.GRAPH_STRATEGY:
+        options["max_combinations"] = max_combinations
+
+    _executor = wiz.utility.create_executor(
+        workers, executor or wiz.symbol.PROCESS_EXECUTOR
+    )
+
+    if _executor is None:
+        for requests, context in _iter_contexts(
+            requests_list, definition_mapping, strategy, options,
+            ignore_implicit, environ_mapping
+        ):
+            yield requests, context
+
+        return
+
+    # Serialize definition mapping only once for all batches.
+    token = uuid.uuid4().hex
+    _definition_mapping = cPickle.dumps(
+        definition_mapping, cPickle.HIGHEST_PROTOCOL
+    )
+
+    size = max(1, int(math.ceil(
+        len(requests_list) / float((workers or 1) * _BATCHES_PER_WORKER)
+    )))
+
+    futures = [
+        _executor.submit(
+            _resolve_contexts_in_worker, token, _definition_mapping,
+            requests_list[index:index + size], strategy, options,
+            ignore_implicit, environ_mapping
+        )
+        for index in range(0, len(requests_list), size)
+    ]
+
+    try:
+        for future in futures:
+            for requests, context in future.result():
+                yield requests, context
+
+    finally:
+        # Prevent remaining batches from being resolved if generator is closed.
+        for future in futures:
+            future.cancel()
+
+        # Only shutdown executor created from number of workers.
+        if _executor is not executor:
+            _executor.shutdown()
+
+
+def _resolve_contexts_in_worker(
+    token, definition_mapping, requests_list, strategy, options,
+    ignore_implicit, environ_mapping
+):
+    """Return list of context mappings resolved from *requests_list*.
+
+    This function is used by :func:`resolve_contexts` to resolve contexts
+    concurrently.
+
+    :param token: Unique token identifying the resolutions which require the
+        definition mapping, so that it is only deserialized once per worker.
+
+    :param definition_mapping: Serialized mapping regrouping all available
+        definitions.
+
+    :param requests_list: List of request lists.
+
+    :param strategy: Resolution strategy.
+
+    :param options: Mapping of options to create the resolver.
+
+    :param ignore_implicit: Indicates whether implicit packages should not be
+        included in contexts.
+
+    :param environ_mapping: Mapping of environment variables which would be
+        augmented by each resolved environment.
+
+    :return: List of tuples with each list of requests and the corresponding
+        context mapping, or the :exc:`wiz.exception.WizError` instance raised
+        if the context cannot be resolved.
+
+    """
+    if token not in _WORKER_DEFINITION_MAPPINGS:
+        # Only keep definitions required by the latest resolutions.
+        _WORKER_DEFINITION_MAPPINGS.clear()
+        _WORKER_DEFINITION_MAPPINGS[token] = cPickle.loads(definition_mapping)
+
+    results = []
+
+    for requests, context in _iter_contexts(
+        requests_list, _WORKER_DEFINITION_MAPPINGS[token], strategy, options,
+        ignore_implicit, environ_mapping
+    ):
+        # Graphs recorded within conflicts cannot be serialized as they refer
+        # to the resolver.
+        if isinstance(context, wiz.exception.GraphResolutionError):
+            context.conflicts = [
+                {
+                    key: value for key, value in mapping.items()
+                    if key != "graph"
+                }
+                for mapping in context.conflicts
+            ]
+
+        results.append((requests, context))
+
+    return results
+
+
+def _iter_contexts(
+    requests_list, definition_mapping, strategy, options, ignore_implicit,
+    environ_mapping
+):
+    """Yield context mappings from *requests_list* with the same resolver.
+
+    :param requests_list: List of request lists.
+
+    :param definition_mapping: Mapping regrouping all available definitions.
+
+    :param strategy: Resolution strategy.
+
+    :param options: Mapping of options to create the resolver.
+
+    :param ignore_implicit: Indicates whether implicit packages should not be
+        included in contexts.
+
+    :param environ_mapping: Mapping of environment variables which would be
+        augmented by each resolved environment.
+
+    :return: Generator which yield tuples with each list of requests and the
+        corresponding context mapping, or the :exc:`wiz.exception.WizError`
+        instance raised if the context cannot be resolved.
+
+    """
+    resolver = _create_resolver(definition_mapping, strategy, options)
+
+    for requests in requests_list:
+        try:
+            context = _extract_context(
+                resolver, requests, definition_mapping,
+                ignore_implicit=ignore_implicit,
+                environ_mapping=environ_mapping
+            )
+
+        except wiz.exception.WizError as error:
+            yield requests, error
+
+        else:
+            yield requests, context
+
+
+def _create_resolver(definition_mapping, strategy, options):
+    """Return resolver corresponding to *strategy*.
+
+    :param definition_mapping: Mapping regrouping all available definitions.
+
+    :param strategy: Resolution strategy (:data:`wiz.symbol.GRAPH_STRATEGY`
+        or :data:`wiz.symbol.SAT_STRATEGY`).
+
+    :param options: Mapping of options to create the resolver.
+
+    :return: Instance of :class:`wiz.graph.Resolver` or
+        :class:`wiz.sat.Resolver`.
+
+    """
+    resolver_types = {
+        wiz.symbol.GRAPH_STRATEGY: wiz.graph.Resolver,
+        wiz.symbol.SAT_STRATEGY: wiz.sat.Resolver,
+    }
+
+    return resolver_types[strategy](
+        definition_mapping[wiz.symbol.PACKAGE_REQUEST_TYPE], **options
+    )
+
+
+def _validate_strategy(
+    strategy, jobs=None, executor=None, max_combinations=None
+):
+    """Ensure that resolution *strategy* is correct.
+
+    :param strategy: Resolution strategy.
+
+    :param jobs: Number of variant combinations computed concurrently, which
+        is only supported by the graph resolver. Default is None.
+
+    :param executor: Executor used to compute variant combinations
+        concurrently, which is only supported by the graph resolver. Default
+        is None.
+
+    :param max_combinations: Maximum number of variant combinations to
+        compute, which is only supported by the graph resolver. Default is
+        None.
+
+    :raise: :exc:`ValueError` if the *strategy* is incorrect, or if *jobs*,
+        *executor* or *max_combinations* are used with another strategy than
+        :data:`wiz.symbol.GRAPH_STRATEGY`.
+
+    """
+    if strategy not in (
+        wiz.symbol.GRAPH_STRATEGY, wiz.symbol.SAT_STRATEGY
+    ):
+        raise ValueError(
+            "'{}' is not a valid resolver strategy.".format(strategy)
+        )
+
+    if strategy == wiz.symbol.GRAPH_STRATEGY:
+        return
+
+    for name, value in [
+        ("jobs", jobs), ("executor", executor),
+        ("max_combinations", max_combinations)
+    ]:
+        if value is not None:
+            raise ValueError(
+                "'{}' is not supported by the '{}' resolver strategy.".format(
+                    name, strategy
+                )
+            )
+
+
+def _extract_context(
+    resolver, requests, definition_mapping, ignore_implicit=False,
+    environ_mapping=None, initiate_environ=True
+):
+    """Return context mapping from *requests* computed with *resolver*.
+
+    :param resolver: Instance of :class:`wiz.graph.Resolver` or
+        :class:`wiz.sat.Resolver`.
+
+    :param requests: List of strings indicating the package version requested
+        to build the context (e.g. ["package >= 1.0.0, < 2"])
+
+    :param definition_mapping: Mapping regrouping all available definitions.
+
+    :param ignore_implicit: Indicates whether implicit packages should not be
+        included in context. Default is False.
+
+    :param environ_mapping: Mapping of environment variables which would be
+        augmented by the resolved environment. Default is None.
+
+    :param initiate_environ: Indicate whether *environ_mapping* should be
+        added to the :func:`initial environment <wiz.environ.initiate>`.
+        Default is True.
+
+    :return: Context mapping.
+
+    """
+    # To prevent mutating input list.
+    _requests = requests[:]
+
     if not ignore_implicit:
         # Prepend implicit requests to explicit ones.
         _requests = (
@@ -232,12 +766,13 @@ def resolve_context(
     requirements = [wiz.utility.get_requirement(r) for r in _requests]
 
     registries = definition_mapping["registries"]
-    resolver = wiz.graph.Resolver(
-        definition_mapping[wiz.symbol.PACKAGE_REQUEST_TYPE]
-    )
     packages = resolver.compute_packages(requirements)
 
-    _environ_mapping = wiz.environ.initiate(environ_mapping)
+    if initiate_environ:
+        _environ_mapping = wiz.environ.initiate(environ_mapping)
+    else:
+        _environ_mapping = dict(environ_mapping or {})
+
     context = wiz.package.extract_context(
         packages, environ_mapping=_environ_mapping
     )
@@ -335,7 +870,9 @@ def discover_context():
     package_identifiers, registries = wiz.utility.decode(encoded_context)
 
     # Extract and return each unique package from definition requirements.
-    definition_mapping = wiz.fetch_definition_mapping(registries)
+    definition_mapping = wiz.fetch_definition_mapping(
+        registries, memory_cache=True
+    )
     packages = [
         wiz.fetch_package(identifier, definition_mapping)
         for identifier in package_identifiers
@@ -1,11 +1,15 @@
 # :coding: utf-8
 
+import re
+
 import packaging.requirements
 from packaging.requirements import (
     L, Combine, Word, ZeroOrMore, ALPHANUM, Optional, EXTRAS,
     URL_AND_MARKER, VERSION_AND_MARKER, stringStart, stringEnd
 )
+from packaging.markers import Marker
 from packaging.requirements import Requirement
+from packaging.specifiers import Specifier, LegacySpecifier, SpecifierSet
 
 import wiz.symbol
 
@@ -24,6 +28,94 @@ packaging.requirements.REQUIREMENT = (
 )
 
 
+#: Regular expression matching a name without namespace, equivalent to the
+#: identifier expression from :mod:`packaging.requirements`.
+_NAME_PATTERN = r"[A-Za-z0-9]+(?:[-_.]+[A-Za-z0-9]+)*"
+
+#: Regular expression matching requirements without URL nor environment
+#: markers, which can be parsed without the pyparsing grammar.
+_REQUIREMENT_PATTERN = re.compile(
+    r"""
+    ^[ \t\n\r]*
+    (?P<name>(?:(?:{name})?{separator})?{name})
+    [ \t\n\r]*
+    (?:
+        \[[ \t\n\r]*
+        (?P<extras>{name}(?:[ \t\n\r]*,[ \t\n\r]*{name})*)?
+        [ \t\n\r]*\]
+    )?
+    [ \t\n\r]*
+    (?:
+        \((?P<enclosed_specifier>[^();@\[\]]+)\)
+        |
+        (?P<specifier>[^();@\[\]]*)
+    )
+    [ \t\n\r]*$
+    """.format(
+        name=_NAME_PATTERN,
+        separator=re.escape(wiz.symbol.NAMESPACE_SEPARATOR)
+    ),
+    re.VERBOSE
+)
+
+
+def parse(content):
+    """Return requirement instance from *content*.
+
+    Requirements following the grammar used by Wiz (identifier with optional
+    namespace, variant and version specifiers) are parsed with a regular
+    expression, which is significantly faster than the pyparsing grammar used
+    by :class:`packaging.requirements.Requirement`. Other requirements (e.g.
+    with URL or environment markers) are parsed with the pyparsing grammar.
+
+    Example::
+
+        >>> parse("foo::bar[V1] >= 1, < 2")
+        <FrozenRequirement('foo::bar[V1] >=1, <2')>
+
+    :param content: String representing a requirement.
+
+    :return: Instance of :class:`FrozenRequirement`.
+
+    :raise: :exc:`packaging.requirements.InvalidRequirement` if the requirement
+        is incorrect.
+
+    """
+    match = _REQUIREMENT_PATTERN.match(content)
+    if match is None:
+        return FrozenRequirement(content)
+
+    specifiers = []
+
+    _content = match.group("enclosed_specifier")
+    if _content is None:
+        _content = match.group("specifier")
+
+    if _content.strip():
+        for _specifier in _content.split(","):
+            # Use pyparsing grammar to raise the same error if necessary.
+            if (
+                Specifier._regex.search(_specifier) is None and
+                LegacySpecifier._regex.search(_specifier) is None
+            ):
+                return FrozenRequirement(content)
+
+            specifiers.append(_specifier.strip())
+
+    # Parentheses must enclose at least one specifier.
+    elif match.group("enclosed_specifier") is not None:
+        return FrozenRequirement(content)
+
+    extras = match.group("extras")
+
+    return FrozenRequirement.create(
+        match.group("name"),
+        extras=[_extra.strip() for _extra in extras.split(",")]
+        if extras else [],
+        specifier=SpecifierSet(",".join(specifiers))
+    )
+
+
 def _display_requirement(_requirement):
     """Improve readability when displaying Requirement instance.
 
@@ -61,3 +153,170 @@ Requirement.__eq__ = lambda self, other: (
 )
 Requirement.__ne__ = lambda self, other: not (self == other)
 Requirement.__hash__ = lambda self: hash(str(self))
+
+
+class FrozenRequirement(Requirement):
+    """Immutable requirement.
+
+    The canonical string and hash of the requirement are computed once when
+    the instance is created, and attributes cannot be modified afterwards, so
+    that instances can be shared safely and used efficiently as mapping keys::
+
+        >>> requirement = FrozenRequirement("foo >= 1")
+        >>> requirement.with_name("test::foo")
+        <FrozenRequirement('test::foo >=1')>
+        >>> requirement.intersect(FrozenRequirement("foo < 2"))
+        <FrozenRequirement('foo >=1, <2')>
+
+    Instances are equal to :class:`packaging.requirements.Requirement`
+    instances with the same canonical string.
+
+    """
+
+    def __init__(self, requirement_string):
+        """Initialize requirement from *requirement_string*.
+
+        :param requirement_string: String representing a requirement.
+
+        :raise: :exc:`packaging.requirements.InvalidRequirement` if the
+            requirement is incorrect.
+
+        """
+        requirement = Requirement(requirement_string)
+        self._initialize(
+            requirement.name, requirement.extras, requirement.specifier,
+            requirement.url, requirement.marker
+        )
+
+    @classmethod
+    def create(cls, name, extras=None, specifier=None, url=None, marker=None):
+        """Return requirement from parsed elements.
+
+        :param name: Requirement name (e.g. "foo", "test::foo").
+
+        :param extras: List of extras (e.g. variant identifier). Default is
+            None.
+
+        :param specifier: Instance of
+            :class:`packaging.specifiers.SpecifierSet`. Default is None,
+            which means that all versions are accepted.
+
+        :param url: URL string. Default is None.
+
+        :param marker: Instance of :class:`packaging.markers.Marker`. Default
+            is None.
+
+        :return: Instance of :class:`FrozenRequirement`.
+
+        """
+        requirement = cls.__new__(cls)
+        requirement._initialize(name, extras, specifier, url, marker)
+        return requirement
+
+    def _initialize(self, name, extras, specifier, url, marker):
+        """Set attributes and compute canonical string and hash."""
+        _set = super(FrozenRequirement, self).__setattr__
+        _set("name", name)
+        _set("extras", frozenset(extras or []))
+        _set("specifier", specifier or SpecifierSet())
+        _set("url", url)
+        _set("marker", marker)
+        _set("_string", _display_requirement(self))
+        _set("_hash", hash(self._string))
+
+    def __setattr__(self, name, value):
+        """Prevent attribute modification."""
+        raise AttributeError("Requirement instance cannot be modified.")
+
+    def __delattr__(self, name):
+        """Prevent attribute deletion."""
+        raise AttributeError("Requirement instance cannot be modified.")
+
+    def __reduce__(self):
+        """Return elements required to pickle and copy requirement."""
+        return _restore, (
+            self.name, sorted(self.extras), str(self.specifier), self.url,
+            str(self.marker) if self.marker is not None else None
+        )
+
+    def __str__(self):
+        """Return canonical string."""
+        return self._string
+
+    def __repr__(self):
+        """Return representation of requirement."""
+        return "<FrozenRequirement({!r})>".format(self._string)
+
+    def __eq__(self, other):
+        """Indicate whether *other* has the same canonical string."""
+        if isinstance(other, FrozenRequirement):
+            return self._hash == other._hash and self._string == other._string
+        return isinstance(other, Requirement) and self._string == str(other)
+
+    def __ne__(self, other):
+        """Indicate whether *other* has a different canonical string."""
+        return not self == other
+
+    def __hash__(self):
+        """Return precomputed hash."""
+        return self._hash
+
+    def with_name(self, name):
+        """Return copy of requirement with another *name*.
+
+        :param name: New requirement name.
+
+        :return: Instance of :class:`FrozenRequirement`.
+
+        """
+        if name == self.name:
+            return self
+
+        return self.create(
+            name, extras=self.extras, specifier=self.specifier, url=self.url,
+            marker=self.marker
+        )
+
+    def intersect(self, other):
+        """Return copy of requirement also constrained by *other* specifier.
+
+        The name, extras, URL and marker of this requirement are kept.
+
+        :param other: Instance of :class:`packaging.requirements.Requirement`.
+
+        :return: Instance of :class:`FrozenRequirement`.
+
+        """
+        return self.create(
+            self.name, extras=self.extras,
+            specifier=self.specifier & other.specifier, url=self.url,
+            marker=self.marker
+        )
+
+
+def freeze(requirement):
+    """Return immutable copy of *requirement*.
+
+    :param requirement: Instance of
+        :class:`packaging.requirements.Requirement`.
+
+    :return: Instance of :class:`FrozenRequirement`, or *requirement* itself
+        if it is already immutable.
+
+    """
+    if isinstance(requirement, FrozenRequirement):
+        return requirement
+
+    return FrozenRequirement.create(
+        requirement.name, extras=requirement.extras,
+        specifier=requirement.specifier, url=requirement.url,
+        marker=requirement.marker
+    )
+
+
+def _restore(name, extras, specifier, url, marker):
+    """Return requirement from elements returned when pickling it."""
+    return FrozenRequirement.create(
+        name, extras=extras, specifier=SpecifierSet(specifier), url=url,
+        marker=Marker(marker) if marker is not None else None
+    )
@@ -0,0 +1,422 @@
+# :coding: utf-8
+
+import collections
+import hashlib
+import json
+import os
+import threading
+import time
+
+from packaging import _structures
+import six
+from six.moves import cPickle as pickle
+from six.moves import copyreg
+
+import wiz.exception
+import wiz.filesystem
+import wiz.logging
+import wiz.registry
+import wiz.symbol
+from ._version import __version__
+
+
+# Ensure that infinity singletons used to compare versions are restored as
+# the same objects when snapshots are loaded.
+copyreg.pickle(type(_structures.Infinity), lambda _: "Infinity")
+copyreg.pickle(type(_structures.NegativeInfinity), lambda _: "NegativeInfinity")
+
+#: Number of seconds during which a definition mapping kept in memory is
+#: returned without checking whether registries have been modified.
+MEMORY_CACHE_TTL = 10
+
+#: Maximum number of definition mappings kept in memory.
+MEMORY_CACHE_SIZE = 8
+
+#: Definition mappings kept in memory, from least to most recently used.
+_MEMORY_CACHE = collections.OrderedDict()
+
+#: Lock preventing concurrent modifications of definition mappings kept in
+#: memory.
+_MEMORY_CACHE_LOCK = threading.Lock()
+
+
+def get_path():
+    """Return path to the cache directory.
+
+    :return: :file:`~/.wiz/cache`
+
+    """
+    return os.path.join(os.path.expanduser("~"), ".wiz", "cache")
+
+
+def compute_key(
+    paths, system_mapping=None, max_depth=None, ignore_patterns=None
+):
+    """Return unique key identifying a definition mapping.
+
+    :param paths: List of registry paths used to fetch the definition mapping.
+
+    :param system_mapping: Mapping defining the system used to filter out non
+        compatible definitions. Default is None.
+
+    :param max_depth: Limited recursion value used to search for definitions.
+        Default is None.
+
+    :param ignore_patterns: List of patterns matching names of files and
+        directories skipped within registries. Default is None.
+
+    :return: Hexadecimal string.
+
+    """
+    content = json.dumps(
+        [
+            [os.path.abspath(path) for path in paths],
+            system_mapping, max_depth, sorted(ignore_patterns or [])
+        ],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def compute_fingerprint(paths):
+    """Return fingerprint of registries from *paths*.
+
+    The fingerprint records the modification time and size of each registry
+    index file and of each definition file recorded in these indexes, as well
+    as the modification time of each directory recorded. It can be validated
+    with :func:`is_fingerprint_valid` without reading any definition file or
+    index.
+
+    :param paths: List of registry paths.
+
+    :return: Fingerprint as a list, or None if a registry does not have a
+        valid index.
+
+    """
+    fingerprint = []
+
+    for path in paths:
+        path = path.strip()
+        if not path:
+            continue
+
+        path = os.path.abspath(path)
+        index_path = os.path.join(path, wiz.registry.INDEX_PATH)
+
+        try:
+            stat = os.stat(index_path)
+        except OSError:
+            return None
+
+        index = wiz.registry.load_index(path)
+
+        directories = index["directories"]
+        if len(directories) == 0:
+            return None
+
+        fingerprint.append([
+            index_path,
+            [wiz.filesystem.get_modification_time(stat), stat.st_size]
+        ])
+        fingerprint.extend(
+            [os.path.join(path, key), modification_time]
+            for key, modification_time in sorted(directories.items())
+        )
+
+        # Definition files modified in place do not modify their directory.
+        fingerprint.extend(
+            [os.path.join(path, key), entry["signature"]]
+            for key, entry in sorted(index["definitions"].items())
+        )
+
+    return fingerprint
+
+
+def is_fingerprint_valid(fingerprint):
+    """Indicate whether registries have not been modified since *fingerprint*.
+
+    :param fingerprint: Fingerprint as returned by :func:`compute_fingerprint`.
+
+    :return: Boolean value.
+
+    """
+    for path, signature in fingerprint:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+
+        modification_time = wiz.filesystem.get_modification_time(stat)
+
+        if isinstance(signature, list):
+            if signature != [modification_time, stat.st_size]:
+                return False
+
+        elif signature != modification_time:
+            return False
+
+    return True
+
+
+def load_snapshot(
+    paths, system_mapping=None, max_depth=None, ignore_patterns=None
+):
+    """Return definition mapping snapshot if available.
+
+    :param paths: List of registry paths used to fetch the definition mapping.
+
+    :param system_mapping: Mapping defining the system used to filter out non
+        compatible definitions. Default is None.
+
+    :param max_depth: Limited recursion value used to search for definitions.
+        Default is None.
+
+    :param ignore_patterns: List of patterns matching names of files and
+        directories skipped within registries. Default is None.
+
+    :return: Definition mapping, or None if no valid snapshot is available.
+
+    """
+    logger = wiz.logging.Logger(__name__ + ".load_snapshot")
+
+    key = compute_key(
+        paths, system_mapping=system_mapping, max_depth=max_depth,
+        ignore_patterns=ignore_patterns
+    )
+    path = os.path.join(get_path(), "{}.snapshot".format(key))
+
+    if not os.path.isfile(path):
+        return
+
+    try:
+        with open(path, "rb") as stream:
+            header = pickle.load(stream)
+
+            if (
+                header.get("version") != __version__ or
+                not is_fingerprint_valid(header.get("fingerprint", []))
+            ):
+                logger.debug("Ignore outdated snapshot {!r}".format(path))
+                return
+
+            mapping = pickle.load(stream)
+
+    except Exception:
+        logger.debug("Impossible to load snapshot from {!r}".format(path))
+        logger.debug_traceback()
+        return
+
+    logger.debug("Definition mapping loaded from {!r}".format(path))
+    return mapping
+
+
+def export_snapshot(
+    mapping, paths, system_mapping=None, max_depth=None, ignore_patterns=None
+):
+    """Export definition *mapping* snapshot.
+
+    Version, requirements, conditions and variants of each definition are
+    computed before being exported so that they are not parsed again when the
+    snapshot is loaded.
+
+    :param mapping: Definition mapping as returned by
+        :func:`wiz.definition.fetch`.
+
+    :param paths: List of registry paths used to fetch the definition mapping.
+
+    :param system_mapping: Mapping defining the system used to filter out non
+        compatible definitions. Default is None.
+
+    :param max_depth: Limited recursion value used to search for definitions.
+        Default is None.
+
+    :param ignore_patterns: List of patterns matching names of files and
+        directories skipped within registries. Default is None.
+
+    :return: Boolean value indicating whether the snapshot has been exported.
+
+    .. note::
+
+        No snapshot is exported if one of the registries does not have an index
+        as it would be impossible to detect when the snapshot is outdated.
+
+    """
+    logger = wiz.logging.Logger(__name__ + ".export_snapshot")
+
+    fingerprint = compute_fingerprint(paths)
+    if fingerprint is None:
+        logger.debug("Impossible to compute fingerprint for snapshot.")
+        return False
+
+    for identifier, definitions in six.iteritems(
+        mapping[wiz.symbol.PACKAGE_REQUEST_TYPE]
+    ):
+        if identifier == "__namespace__":
+            continue
+
+        for definition in definitions.values():
+            _prepare_definition(definition)
+
+    key = compute_key(
+        paths, system_mapping=system_mapping, max_depth=max_depth,
+        ignore_patterns=ignore_patterns
+    )
+    path = os.path.join(get_path(), "{}.snapshot".format(key))
+
+    header = {"version": __version__, "fingerprint": fingerprint}
+
+    try:
+        content = (
+            pickle.dumps(header, pickle.HIGHEST_PROTOCOL) +
+            pickle.dumps(mapping, pickle.HIGHEST_PROTOCOL)
+        )
+        wiz.filesystem.export_atomically(path, content, binary=True)
+
+    except (IOError, OSError, pickle.PicklingError):
+        logger.debug("Impossible to export snapshot to {!r}".format(path))
+        return False
+
+    logger.debug("Definition mapping snapshot exported to {!r}".format(path))
+    return True
+
+
+def _prepare_definition(definition):
+    """Compute values which are cached within *definition*.
+
+    Errors are ignored as they will be raised when the definition is used.
+
+    :param definition: Instance of :class:`wiz.definition.Definition`.
+
+    """
+    try:
+        _ = definition.version, definition.requirements, definition.conditions
+
+        for variant in definition.variants:
+            _ = variant.requirements
+
+    except wiz.exception.WizError:
+        pass
+
+
+def load_from_memory(
+    paths, system_mapping=None, max_depth=None, ignore_patterns=None,
+    lazy=False
+):
+    """Return definition mapping kept in memory if available.
+
+    The definition mapping is returned as is during :data:`MEMORY_CACHE_TTL`
+    seconds after it was saved or last validated. Registries are then checked
+    for modifications using the fingerprint recorded when the mapping was
+    saved.
+
+    :param paths: List of registry paths used to fetch the definition mapping.
+
+    :param system_mapping: Mapping defining the system used to filter out non
+        compatible definitions. Default is None.
+
+    :param max_depth: Limited recursion value used to search for definitions.
+        Default is None.
+
+    :param ignore_patterns: List of patterns matching names of files and
+        directories skipped within registries. Default is None.
+
+    :param lazy: Indicate whether the definition mapping loads definitions
+        lazily. Default is False.
+
+    :return: Definition mapping, or None if no valid definition mapping is
+        kept in memory.
+
+    .. warning::
+
+        The same definition mapping instance is returned to each caller and
+        should not be mutated.
+
+    """
+    logger = wiz.logging.Logger(__name__ + ".load_from_memory")
+
+    key = (
+        compute_key(
+            paths, system_mapping=system_mapping, max_depth=max_depth,
+            ignore_patterns=ignore_patterns
+        ),
+        lazy
+    )
+
+    with _MEMORY_CACHE_LOCK:
+        item = _MEMORY_CACHE.get(key)
+        if item is None:
+            return
+
+        now = time.time()
+
+        if now - item["time"] >= MEMORY_CACHE_TTL:
+            if (
+                item["fingerprint"] is None or
+                not is_fingerprint_valid(item["fingerprint"])
+            ):
+                logger.debug("Discard outdated definition mapping.")
+                del _MEMORY_CACHE[key]
+                return
+
+            item["time"] = now
+
+        # Record as most recently used.
+        del _MEMORY_CACHE[key]
+        _MEMORY_CACHE[key] = item
+
+        return item["mapping"]
+
+
+def save_to_memory(
+    mapping, paths, system_mapping=None, max_depth=None, ignore_patterns=None,
+    lazy=False
+):
+    """Keep definition *mapping* in memory.
+
+    The least recently used definition mapping is discarded when more than
+    :data:`MEMORY_CACHE_SIZE` mappings are kept in memory.
+
+    :param mapping: Definition mapping as returned by
+        :func:`wiz.fetch_definition_mapping`.
+
+    :param paths: List of registry paths used to fetch the definition mapping.
+
+    :param system_mapping: Mapping defining the system used to filter out non
+        compatible definitions. Default is None.
+
+    :param max_depth: Limited recursion value used to search for definitions.
+        Default is None.
+
+    :param ignore_patterns: List of patterns matching names of files and
+        directories skipped within registries. Default is None.
+
+    :param lazy: Indicate whether the definition mapping loads definitions
+        lazily. Default is False.
+
+    """
+    key = (
+        compute_key(
+            paths, system_mapping=system_mapping, max_depth=max_depth,
+            ignore_patterns=ignore_patterns
+        ),
+        lazy
+    )
+
+    item = {
+        "mapping": mapping,
+        "fingerprint": compute_fingerprint(paths),
+        "time": time.time()
+    }
+
+    with _MEMORY_CACHE_LOCK:
+        _MEMORY_CACHE.pop(key, None)
+        _MEMORY_CACHE[key] = item
+
+        while len(_MEMORY_CACHE) > MEMORY_CACHE_SIZE:
+            _MEMORY_CACHE.popitem(last=False)
+
+
+def clear_memory():
+    """Discard all definition mappings kept in memory."""
+    with _MEMORY_CACHE_LOCK:
+        _MEMORY_CACHE.clear()
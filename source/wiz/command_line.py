@@ -20,6 +20,7 @@ import wiz.filesystem
 import wiz.history
 import wiz.logging
 import wiz.registry
+import wiz.server
 import wiz.spawn
 import wiz.symbol
 import wiz.utility
@@ -132,6 +133,71 @@ class _MainGroup(click.Group):
     type=int,
     metavar="NUMBER",
 )
+@click.option(
+    "--registry-ignore",
+    help=(
+        "Skip files and directories matching pattern when searching for "
+        "definitions."
+    ),
+    default=_CONFIG.get("registry", {}).get("ignore_patterns", []),
+    multiple=True,
+    metavar="PATTERN",
+)
+@click.option(
+    "--registry-workers",
+    help="Number of workers to load definitions concurrently.",
+    default=_CONFIG.get("registry", {}).get("workers"),
+    type=int,
+    metavar="NUMBER",
+)
+@click.option(
+    "--registry-executor",
+    help="Type of executor to load definitions concurrently.",
+    type=click.Choice([
+        wiz.symbol.THREAD_EXECUTOR, wiz.symbol.PROCESS_EXECUTOR
+    ]),
+    default=_CONFIG.get("registry", {}).get(
+        "executor", wiz.symbol.THREAD_EXECUTOR
+    ),
+    show_default=True
+)
+@click.option(
+    "--lazy-registry",
+    help=(
+        "Only load definitions required to resolve the context, using the "
+        "index of each registry."
+    ),
+    is_flag=True,
+    default=_CONFIG.get("registry", {}).get("lazy", False),
+)
+@click.option(
+    "--cache-registry",
+    help=(
+        "Load definitions from a snapshot saved in the cache directory when "
+        "registries have not been modified."
+    ),
+    is_flag=True,
+    default=_CONFIG.get("registry", {}).get("cache", False),
+)
+@click.option(
+    "--use-server",
+    help=(
+        "Resolve contexts with the resolver server when available (started "
+        "with 'wiz serve')."
+    ),
+    is_flag=True,
+    default=_CONFIG.get("server", {}).get("enabled", False),
+)
+@click.option(
+    "--server-socket",
+    help="Set path to the resolver server socket.",
+    default=_CONFIG.get("server", {}).get(
+        "socket", wiz.server.get_socket_path()
+    ),
+    metavar="PATH",
+    type=click.Path(),
+    show_default=True
+)
 @click.option(
     "-r", "--registry",
     help="Set registry path for package definitions.",
@@ -157,6 +223,34 @@ class _MainGroup(click.Group):
     is_flag=True,
     default=_CONFIG.get("command", {}).get("ignore_implicit", False),
 )
+@click.option(
+    "--resolver",
+    help="Type of resolver to compute the packages of the context.",
+    type=click.Choice([
+        wiz.symbol.GRAPH_STRATEGY, wiz.symbol.SAT_STRATEGY
+    ]),
+    default=_CONFIG.get("resolver", {}).get(
+        "strategy", wiz.symbol.GRAPH_STRATEGY
+    ),
+    show_default=True
+)
+@click.option(
+    "--max-combinations",
+    help=(
+        "Maximum number of variant combinations to compute before "
+        "interrupting the resolution. Only used by the graph resolver."
+    ),
+    default=_CONFIG.get("resolver", {}).get("max_combinations"),
+    type=int,
+    metavar="NUMBER",
+)
+@click.option(
+    "--timeout",
+    help="Number of seconds after which the resolution is interrupted.",
+    default=_CONFIG.get("resolver", {}).get("timeout"),
+    type=float,
+    metavar="SECONDS",
+)
 @click.option(
     "--init",
     help=(
@@ -237,7 +331,17 @@ def main(click_context, **kwargs):
         "system_mapping": system_mapping,
         "registry_paths": registries,
         "registry_search_depth": kwargs["registry_depth"],
+        "registry_ignore_patterns": kwargs["registry_ignore"],
+        "registry_workers": kwargs["registry_workers"],
+        "registry_executor": kwargs["registry_executor"],
+        "registry_lazy": kwargs["lazy_registry"],
+        "registry_cache": kwargs["cache_registry"],
+        "use_server": kwargs["use_server"],
+        "server_socket": kwargs["server_socket"],
         "ignore_implicit_packages": kwargs["ignore_implicit"],
+        "resolver_strategy": kwargs["resolver"],
+        "resolver_max_combinations": kwargs["max_combinations"],
+        "resolver_timeout": kwargs["timeout"],
         "initial_environment": initial_environment,
         "recording_path": kwargs["record"],
     })
@@ -316,7 +420,10 @@ def wiz_list_package(click_context, **kwargs):
     for definition in wiz.definition.discover(
         click_context.obj["registry_paths"],
         system_mapping=system_mapping,
-        max_depth=click_context.obj["registry_search_depth"]
+        max_depth=click_context.obj["registry_search_depth"],
+        ignore_patterns=click_context.obj["registry_ignore_patterns"],
+        workers=click_context.obj["registry_workers"],
+        executor=click_context.obj["registry_executor"]
     ):
         _add_to_mapping(definition, package_mapping)
 
@@ -380,7 +487,10 @@ def wiz_list_command(click_context, **kwargs):
     for definition in wiz.definition.discover(
         click_context.obj["registry_paths"],
         system_mapping=system_mapping,
-        max_depth=click_context.obj["registry_search_depth"]
+        max_depth=click_context.obj["registry_search_depth"],
+        ignore_patterns=click_context.obj["registry_ignore_patterns"],
+        workers=click_context.obj["registry_workers"],
+        executor=click_context.obj["registry_executor"]
     ):
         _add_to_mapping(definition, package_mapping)
 
@@ -475,7 +585,10 @@ def wiz_search(click_context, **kwargs):
     for definition in wiz.definition.discover(
         click_context.obj["registry_paths"],
         system_mapping=system_mapping,
-        max_depth=click_context.obj["registry_search_depth"]
+        max_depth=click_context.obj["registry_search_depth"],
+        ignore_patterns=click_context.obj["registry_ignore_patterns"],
+        workers=click_context.obj["registry_workers"],
+        executor=click_context.obj["registry_executor"]
     ):
         values = [str(getattr(definition, keyword)) for keyword in keywords]
         values += definition.command.keys()
@@ -638,6 +751,16 @@ def wiz_view(click_context, **kwargs):
     is_flag=True,
     default=False
 )
+@click.option(
+    "-j", "--jobs",
+    help=(
+        "Number of variant combinations to compute concurrently in worker "
+        "processes. Only used by the graph resolver."
+    ),
+    default=_CONFIG.get("resolver", {}).get("jobs"),
+    type=int,
+    metavar="NUMBER",
+)
 @click.argument(
     "requests",
     nargs=-1,
@@ -648,18 +771,13 @@ def wiz_use(click_context, **kwargs):
     """Resolve and use context from command."""
     logger = wiz.logging.Logger(__name__ + ".wiz_use")
 
-    definition_mapping = _fetch_definition_mapping_from_context(click_context)
-    ignore_implicit = click_context.obj["ignore_implicit_packages"]
-    environ_mapping = click_context.obj["initial_environment"]
-
     # Fetch extra arguments from context.
     extra_arguments = _fetch_extra_arguments(click_context)
 
     try:
-        wiz_context = wiz.resolve_context(
-            list(kwargs["requests"]), definition_mapping,
-            ignore_implicit=ignore_implicit,
-            environ_mapping=environ_mapping,
+        wiz_context = _resolve_context_from_context(
+            click_context, requests=list(kwargs["requests"]),
+            jobs=kwargs["jobs"]
         )
 
         # Only view the resolved context without spawning a shell nor
@@ -730,23 +848,13 @@ def wiz_run(click_context, **kwargs):
     """Run application from resolved context."""
     logger = wiz.logging.Logger(__name__ + ".wiz_run")
 
-    definition_mapping = _fetch_definition_mapping_from_context(click_context)
-    ignore_implicit = click_context.obj["ignore_implicit_packages"]
-    environ_mapping = click_context.obj["initial_environment"]
-
     # Fetch extra arguments from context.
     extra_arguments = _fetch_extra_arguments(click_context)
 
     try:
         requirement = wiz.utility.get_requirement(kwargs["request"])
-        request = wiz.fetch_package_request_from_command(
-            kwargs["request"], definition_mapping
-        )
-
-        wiz_context = wiz.resolve_context(
-            [request], definition_mapping,
-            ignore_implicit=ignore_implicit,
-            environ_mapping=environ_mapping,
+        wiz_context = _resolve_context_from_context(
+            click_context, command_request=kwargs["request"]
         )
 
         # Only view the resolved context without spawning a shell nor
@@ -776,6 +884,69 @@ def wiz_run(click_context, **kwargs):
     _export_history_if_requested(click_context)
 
 
+@main.command(
+    "serve",
+    help=textwrap.dedent(
+        """
+        Start resolver server keeping definitions from registries in memory.
+
+        Contexts can then be resolved by the server when the "--use-server"
+        option is used.
+
+        Example:
+
+        \b
+        >>> wiz serve
+        >>> wiz --use-server use package1>=1 package2==2.3.0
+        >>> wiz --use-server run command
+
+        """
+    ),
+    short_help="Start resolver server.",
+    context_settings=CONTEXT_SETTINGS
+)
+@click.option(
+    "--refresh-interval",
+    help=(
+        "Minimum number of seconds between two checks of registry "
+        "modifications."
+    ),
+    type=float,
+    default=(
+        _CONFIG.get("command", {}).get("serve", {}).get(
+            "refresh_interval", wiz.server.DEFAULT_REFRESH_INTERVAL
+        )
+    ),
+    metavar="SECONDS",
+    show_default=True
+)
+@click.pass_context
+def wiz_serve(click_context, **kwargs):
+    """Start resolver server."""
+    logger = wiz.logging.Logger(__name__ + ".wiz_serve")
+
+    server = wiz.server.Server(
+        click_context.obj["registry_paths"],
+        socket_path=click_context.obj["server_socket"],
+        system_mapping=click_context.obj["system_mapping"],
+        max_depth=click_context.obj["registry_search_depth"],
+        ignore_patterns=click_context.obj["registry_ignore_patterns"],
+        workers=click_context.obj["registry_workers"],
+        executor=click_context.obj["registry_executor"],
+        refresh_interval=kwargs["refresh_interval"]
+    )
+
+    try:
+        server.serve_forever()
+
+    except wiz.exception.WizError as error:
+        logger.error(str(error))
+        logger.debug_traceback()
+
+    except KeyboardInterrupt:
+        logger.info("Server stopped.")
+
+
 @main.command(
     "freeze",
     help=textwrap.dedent(
@@ -823,12 +994,16 @@ def wiz_freeze(click_context, **kwargs):
     definition_mapping = _fetch_definition_mapping_from_context(click_context)
     ignore_implicit = click_context.obj["ignore_implicit_packages"]
     environ_mapping = click_context.obj["initial_environment"]
+    strategy = click_context.obj["resolver_strategy"]
 
     try:
         _context = wiz.resolve_context(
             list(kwargs["requests"]), definition_mapping,
             ignore_implicit=ignore_implicit,
             environ_mapping=environ_mapping,
+            strategy=strategy,
+            max_combinations=click_context.obj["resolver_max_combinations"],
+            timeout=click_context.obj["resolver_timeout"],
         )
         identifier = _query_identifier()
 
@@ -975,6 +1150,83 @@ def wiz_install(click_context, **kwargs):
     _export_history_if_requested(click_context)
 
 
+@main.group(
+    name="registry",
+    help=textwrap.dedent(
+        """
+        Manage registries.
+
+        Example:
+
+        \b
+        >>> wiz registry pack /path/to/registry
+
+        """
+    ),
+    short_help="Manage registries.",
+    context_settings=CONTEXT_SETTINGS
+)
+@click.pass_context
+def wiz_registry_group(click_context):
+    """Group command which manage registries."""
+    # Ensure that context fail if extra arguments were passed.
+    _fail_on_extra_arguments(click_context)
+
+
+@wiz_registry_group.command(
+    name="pack",
+    help=textwrap.dedent(
+        """
+        Compile all definitions from registries into a single pack file.
+
+        Definitions are then discovered from the pack file of each registry
+        instead of searching and loading each definition file, as long as the
+        registry is not modified. Installing definitions with "wiz install"
+        updates the pack.
+
+        Example:
+
+        \b
+        >>> wiz registry pack /path/to/registry
+        >>> wiz -rd 3 registry pack /path/to/registry1 /path/to/registry2
+
+        """
+    ),
+    short_help="Compile registries into pack files.",
+    context_settings=CONTEXT_SETTINGS
+)
+@click.argument(
+    "registries",
+    nargs=-1,
+    required=True,
+    type=click.Path(file_okay=False, exists=True)
+)
+@click.pass_context
+def wiz_registry_pack(click_context, **kwargs):
+    """Compile registries into pack files."""
+    logger = wiz.logging.Logger(__name__ + ".wiz_registry_pack")
+
+    for path in kwargs["registries"]:
+        try:
+            number = wiz.registry.pack(
+                path, max_depth=click_context.obj["registry_search_depth"],
+                ignore_patterns=click_context.obj["registry_ignore_patterns"]
+            )
+
+        except (IOError, OSError, wiz.exception.WizError) as error:
+            logger.error(
+                "Impossible to pack registry {!r}: {}".format(path, error)
+            )
+            logger.debug_traceback()
+            continue
+
+        logger.info(
+            "{number} definition(s) packed in registry {path!r}.".format(
+                number=number, path=path
+            )
+        )
+
+
 @main.command(
     "edit",
     help=textwrap.dedent(
@@ -1207,7 +1459,10 @@ def wiz_analyze(click_context, **kwargs):
     for definition in wiz.definition.discover(
         click_context.obj["registry_paths"],
         system_mapping=system_mapping,
-        max_depth=click_context.obj["registry_search_depth"]
+        max_depth=click_context.obj["registry_search_depth"],
+        ignore_patterns=click_context.obj["registry_ignore_patterns"],
+        workers=click_context.obj["registry_workers"],
+        executor=click_context.obj["registry_executor"]
     ):
         if latest_registry != definition.registry_path:
             info = "\nRegistry: {}\n".format(definition.registry_path)
@@ -1948,9 +2203,86 @@ def _fetch_definition_mapping_from_context(click_context):
     return wiz.fetch_definition_mapping(
         click_context.obj["registry_paths"],
         system_mapping=click_context.obj["system_mapping"],
-        max_depth=click_context.obj["registry_search_depth"]
+        max_depth=click_context.obj["registry_search_depth"],
+        ignore_patterns=click_context.obj["registry_ignore_patterns"],
+        workers=click_context.obj["registry_workers"],
+        executor=click_context.obj["registry_executor"],
+        lazy=click_context.obj["registry_lazy"],
+        cache=click_context.obj["registry_cache"]
+    )
+
+
+def _resolve_context_from_context(
+    click_context, requests=None, command_request=None, jobs=None
+):
+    """Return context mapping from elements stored in *click_context*.
+
+    The context is resolved from *requests*, or from the package providing
+    *command_request*. If requested, the resolver server is used and the
+    context is resolved within the current process when the server is
+    unavailable or when the resolution is recorded. Up to *jobs* variant
+    combinations can be computed concurrently.
+
+    """
+    logger = wiz.logging.Logger(__name__ + "._resolve_context_from_context")
+
+    registries = click_context.obj["registry_paths"]
+    options = dict(
+        ignore_implicit=click_context.obj["ignore_implicit_packages"],
+        environ_mapping=click_context.obj["initial_environment"],
+        strategy=click_context.obj["resolver_strategy"],
+        jobs=jobs,
+        max_combinations=click_context.obj["resolver_max_combinations"],
+        timeout=click_context.obj["resolver_timeout"],
     )
 
+    # Options which can be set in the configuration for the graph resolver
+    # are not supported by other resolvers.
+    if options["strategy"] != wiz.symbol.GRAPH_STRATEGY:
+        options["jobs"] = None
+        options["max_combinations"] = None
+
+    # History can only be recorded when resolving within current process.
+    if (
+        click_context.obj.get("use_server") and
+        click_context.obj.get("recording_path") is None
+    ):
+        server_options = dict(
+            system_mapping=click_context.obj["system_mapping"],
+            max_depth=click_context.obj["registry_search_depth"],
+            ignore_patterns=click_context.obj["registry_ignore_patterns"],
+            socket_path=click_context.obj["server_socket"],
+        )
+
+        try:
+            if command_request is not None:
+                requests = [
+                    wiz.server.fetch_package_request_from_command(
+                        command_request, registries, **server_options
+                    )
+                ]
+
+            server_options.update(options)
+            return wiz.server.resolve_context(
+                requests, registries, **server_options
+            )
+
+        except wiz.exception.ServerUnavailable as error:
+            logger.debug(
+                "{}\nResolve context without server.".format(error)
+            )
+
+    definition_mapping = _fetch_definition_mapping_from_context(click_context)
+
+    if command_request is not None:
+        requests = [
+            wiz.fetch_package_request_from_command(
+                command_request, definition_mapping
+            )
+        ]
+
+    return wiz.resolve_context(requests, definition_mapping, **options)
+
 
 def _export_history_if_requested(click_context):
     """Return definition mapping from elements stored in *click_context*."""
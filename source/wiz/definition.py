@@ -1,9 +1,11 @@
 # :coding: utf-8
 
 import os
+import bisect
 import copy
 import json
 import collections
+import functools
 
 import ujson
 
@@ -12,13 +14,17 @@ import wiz.filesystem
 import wiz.history
 import wiz.logging
 import wiz.package
+import wiz.registry
 import wiz.symbol
 import wiz.system
 import wiz.utility
 import wiz.validator
 
 
-def fetch(paths, system_mapping=None, max_depth=None):
+def fetch(
+    paths, system_mapping=None, max_depth=None, ignore_patterns=None,
+    workers=None, executor=None, lazy=False
+):
     """Return mapping from all definitions available under *paths*.
 
     A definition mapping should be in the form of::
@@ -61,11 +67,36 @@ def fetch(paths, system_mapping=None, max_depth=None):
         <Definition>`. Default is None, which means that all  sub-trees will be
         visited.
 
+    :param ignore_patterns: List of :mod:`fnmatch` patterns matching names of
+        files and directories which should be skipped within registries.
+        Default is None.
+
+    :param workers: Number of workers to load definition files concurrently.
+        Default is None, which means that definition files will be loaded
+        sequentially.
+
+    :param executor: Instance of :class:`concurrent.futures.Executor` or type
+        of executor to create with *workers*. Default is None, which means that
+        a thread pool executor will be created if more than one worker is
+        required.
+
+    :param lazy: Indicate whether the package mapping should be an instance of
+        :class:`LazyDefinitionMapping` which only loads definitions for an
+        identifier when it is required. Default is False.
+
     :return: Definition mapping.
 
+    .. seealso:: :func:`discover`
+
     """
+    if lazy:
+        return _fetch_lazily(
+            paths, system_mapping=system_mapping, max_depth=max_depth,
+            ignore_patterns=ignore_patterns, workers=workers, executor=executor
+        )
+
     mapping = {
-        wiz.symbol.PACKAGE_REQUEST_TYPE: {},
+        wiz.symbol.PACKAGE_REQUEST_TYPE: DefinitionMapping(),
         wiz.symbol.COMMAND_REQUEST_TYPE: {},
     }
 
@@ -74,7 +105,8 @@ def fetch(paths, system_mapping=None, max_depth=None):
     implicit_package_mapping = {}
 
     for definition in discover(
-        paths, system_mapping=system_mapping, max_depth=max_depth
+        paths, system_mapping=system_mapping, max_depth=max_depth,
+        ignore_patterns=ignore_patterns, workers=workers, executor=executor
     ):
         _add_to_mapping(definition, mapping[wiz.symbol.PACKAGE_REQUEST_TYPE])
 
@@ -102,6 +134,224 @@ def fetch(paths, system_mapping=None, max_depth=None):
     return mapping
 
 
+def _fetch_lazily(
+    paths, system_mapping=None, max_depth=None, ignore_patterns=None,
+    workers=None, executor=None
+):
+    """Return mapping from all definitions available under *paths* lazily.
+
+    The index of each registry is used to record the definitions available
+    without loading them when the directories of the registry have not been
+    modified since the index was last updated. Otherwise, the registry
+    definitions are :func:`discovered <discover>` and the index is updated.
+
+    .. note::
+
+        Commands and implicit packages are extracted from the indexed headers,
+        so a definition file modified in place is only taken into account once
+        the index is updated.
+
+    :param paths: List of registry paths to recursively fetch
+        :class:`definitions <Definition>` from.
+
+    :param system_mapping: Mapping defining the current system to filter
+        out non compatible definitions. Default is None.
+
+    :param max_depth: Limited recursion value to search for :class:`definitions
+        <Definition>`. Default is None.
+
+    :param ignore_patterns: List of patterns matching names of files and
+        directories which should be skipped within registries. Default is None.
+
+    :param workers: Number of workers to discover definition files concurrently
+        if necessary. Default is None.
+
+    :param executor: Instance of :class:`concurrent.futures.Executor` or type
+        of executor to create with *workers*. Default is None.
+
+    :return: Definition mapping.
+
+    """
+    logger = wiz.logging.Logger(__name__ + "._fetch_lazily")
+
+    package_mapping = LazyDefinitionMapping(system_mapping=system_mapping)
+
+    mapping = {
+        wiz.symbol.PACKAGE_REQUEST_TYPE: package_mapping,
+        wiz.symbol.COMMAND_REQUEST_TYPE: {},
+    }
+
+    # Record definitions which should be implicitly used.
+    implicit_identifiers = []
+
+    for path in paths:
+        path = path.strip()
+        if not path:
+            continue
+
+        path = os.path.abspath(path)
+
+        index = wiz.registry.load_index(path)
+
+        if _is_index_valid(path, index, max_depth, ignore_patterns):
+            logger.debug(
+                "Use index to fetch definitions from {!r}".format(path)
+            )
+            elements = _extract_index_elements(
+                path, index, system_mapping=system_mapping, max_depth=max_depth
+            )
+
+        else:
+            elements = (
+                (definition.path, path, definition)
+                for definition in discover(
+                    [path], system_mapping=system_mapping,
+                    max_depth=max_depth, ignore_patterns=ignore_patterns,
+                    workers=workers, executor=executor
+                )
+            )
+
+        for _path, registry_path, element in elements:
+            if isinstance(element, Definition):
+                header = element.header()
+            else:
+                header = element["header"]
+
+            qualified_identifier = package_mapping.add(
+                _path, registry_path, element
+            )
+
+            # Record commands from definition.
+            for command in header.get("command", {}).keys():
+                mapping[wiz.symbol.COMMAND_REQUEST_TYPE][command] = (
+                    qualified_identifier
+                )
+
+            # Record package identifiers which should be used implicitly.
+            if header.get("auto-use", False):
+                implicit_identifiers.append(qualified_identifier)
+
+    # Only load definitions which should be implicitly used.
+    implicit_package_mapping = {}
+
+    for identifier in set(implicit_identifiers):
+        for definition in package_mapping.get(identifier, {}).values():
+            if definition.auto_use:
+                _add_to_mapping(definition, implicit_package_mapping)
+
+    # Extract implicit package requests.
+    mapping[wiz.symbol.IMPLICIT_PACKAGE] = _extract_implicit_requests(
+        implicit_identifiers, implicit_package_mapping
+    )
+
+    wiz.history.record_action(
+        wiz.symbol.DEFINITIONS_COLLECTION_ACTION,
+        registries=paths, max_depth=max_depth, definition_mapping=mapping
+    )
+
+    return mapping
+
+
+def _is_index_valid(registry_path, index, max_depth=None, ignore_patterns=None):
+    """Indicate whether *index* can be used to fetch definitions.
+
+    The index is valid if it has been created with the same options and if no
+    directories have been modified since it was last updated, which means
+    that no definition files have been added or removed.
+
+    Definition files are not checked, as editing a file in place does not
+    modify its directory. Definitions modified since the index was last
+    updated are reloaded by :class:`LazyDefinitionMapping` when accessed.
+
+    :param registry_path: Path to the registry containing the index.
+
+    :param index: Index mapping as returned by :func:`wiz.registry.load_index`.
+
+    :param max_depth: Limited recursion value to search for definition files.
+        Default is None.
+
+    :param ignore_patterns: List of patterns matching names of files and
+        directories which should be skipped. Default is None.
+
+    :return: Boolean value.
+
+    """
+    options = wiz.registry.get_search_options(max_depth, ignore_patterns)
+    if index["options"] != options:
+        return False
+
+    if len(index["directories"]) == 0:
+        return False
+
+    try:
+        index_time = wiz.filesystem.get_modification_time(
+            os.stat(os.path.join(registry_path, wiz.registry.INDEX_PATH))
+        )
+    except OSError:
+        return False
+
+    for key, modification_time in index["directories"].items():
+        try:
+            stat = os.stat(os.path.join(registry_path, key))
+        except OSError:
+            return False
+
+        _modification_time = wiz.filesystem.get_modification_time(stat)
+        if (
+            _modification_time != modification_time or
+            _modification_time > index_time
+        ):
+            return False
+
+    return True
+
+
+def _extract_index_elements(
+    registry_path, index, system_mapping=None, max_depth=None
+):
+    """Yield elements to add to :class:`LazyDefinitionMapping` from *index*.
+
+    Definitions which are disabled or incompatible with *system_mapping*
+    according to their header are skipped.
+
+    :param registry_path: Path to the registry containing the index.
+
+    :param index: Index mapping as returned by :func:`wiz.registry.load_index`.
+
+    :param system_mapping: Mapping defining the current system to filter
+        out non compatible definitions. Default is None.
+
+    :param max_depth: Limited recursion value to search for definition files.
+        Default is None.
+
+    :return: Generator which yield tuples containing the definition path, the
+        registry path and the definition index entry.
+
+    """
+    def _sorting_key(key):
+        """Return key to sort paths in same order as :func:`discover`."""
+        elements = key.split(os.sep)
+        return [(1, name) for name in elements[:-1]] + [(0, elements[-1])]
+
+    for key in sorted(index["definitions"].keys(), key=_sorting_key):
+        if max_depth is not None and key.count(os.sep) > max_depth:
+            continue
+
+        entry = index["definitions"][key]
+        header = entry["header"]
+
+        # Only create definition when required to filter it out.
+        if (
+            header.get("disabled", False) or
+            (system_mapping is not None and "system" in header)
+        ):
+            definition = Definition(header, copy_data=False, header_only=True)
+            if not _is_enabled(definition, system_mapping):
+                continue
+
+        yield os.path.join(registry_path, key), registry_path, entry
+
+
 def _add_to_mapping(definition, mapping):
     """Mutate package *mapping* to add *definition*
 
@@ -131,8 +381,7 @@ def _add_to_mapping(definition, mapping):
     qualified_identifier = definition.qualified_identifier
     version = str(definition.version or wiz.symbol.UNSET_VALUE)
 
-    mapping.setdefault(qualified_identifier, {})
-    mapping[qualified_identifier].setdefault(version, {})
+    mapping.setdefault(qualified_identifier, VersionMapping())
     mapping[qualified_identifier][version] = definition
 
 
@@ -195,6 +444,131 @@ def query(requirement, definition_mapping, namespace_counter=None):
 
     :return: Instance of :class:`Definition`.
 
+    :raise: :exc:`wiz.exception.RequestNotFound` if the requirement can not
+        be resolved.
+
+    """
+    definitions, variant_identifier = _fetch_version_mapping(
+        requirement, definition_mapping, namespace_counter=namespace_counter
+    )
+
+    unset_version = str(wiz.symbol.UNSET_VALUE)
+
+    # Non-versioned definition is compatible with all specifiers.
+    if unset_version in definitions:
+        if (
+            variant_identifier is None or
+            definitions.has_variant(unset_version, variant_identifier)
+        ):
+            return definitions[unset_version]
+
+        raise wiz.exception.RequestNotFound(requirement)
+
+    # Only check versions within bounds, starting with the highest one.
+    keys, versions = definitions.index()
+    specifier = wiz.utility.compile_specifier(requirement.specifier)
+
+    start = 0
+    if specifier.minimum is not None:
+        start = bisect.bisect_left(keys, specifier.minimum)
+
+    end = len(keys)
+    if specifier.maximum is not None:
+        end = bisect.bisect_right(keys, specifier.maximum)
+
+    for version in reversed(versions[start:end]):
+        # Skip if the variant identifier required is not found in definition.
+        if variant_identifier and not definitions.has_variant(
+            version, variant_identifier
+        ):
+            continue
+
+        definition = definitions[version]
+        if specifier.contains(definition.version):
+            return definition
+
+    raise wiz.exception.RequestNotFound(requirement)
+
+
+def query_all(requirement, definition_mapping, namespace_counter=None):
+    """Return all definition versions matching *requirement*.
+
+    Contrary to :func:`query`, which only returns the best matching definition,
+    all definition versions compatible with the *requirement* are returned.
+
+    :param requirement: Instance of :class:`packaging.requirements.Requirement`.
+
+    :param definition_mapping: Mapping regrouping all available definitions
+        associated with their unique identifier.
+
+    :param namespace_counter: instance of :class:`collections.Counter`
+        which indicates occurrence of namespaces used as hints for package
+        identification. Default is None.
+
+    :return: List of :class:`Definition` instances sorted in descending order
+        of version.
+
+    :raise: :exc:`wiz.exception.RequestNotFound` if the requirement can not
+        be resolved.
+
+    """
+    definitions, variant_identifier = _fetch_version_mapping(
+        requirement, definition_mapping, namespace_counter=namespace_counter
+    )
+
+    unset_version = str(wiz.symbol.UNSET_VALUE)
+
+    if unset_version in definitions:
+        versions = [unset_version]
+
+    else:
+        # Only check versions within bounds.
+        keys, versions = definitions.index()
+        specifier = wiz.utility.compile_specifier(requirement.specifier)
+
+        start = 0
+        if specifier.minimum is not None:
+            start = bisect.bisect_left(keys, specifier.minimum)
+
+        end = len(keys)
+        if specifier.maximum is not None:
+            end = bisect.bisect_right(keys, specifier.maximum)
+
+        versions = [
+            version for version in reversed(versions[start:end])
+            if specifier.contains(definitions[version].version)
+        ]
+
+    # Skip definitions which do not contain the variant identifier required.
+    if variant_identifier is not None:
+        versions = [
+            version for version in versions
+            if definitions.has_variant(version, variant_identifier)
+        ]
+
+    if len(versions) == 0:
+        raise wiz.exception.RequestNotFound(requirement)
+
+    return [definitions[version] for version in versions]
+
+
+def _fetch_version_mapping(
+    requirement, definition_mapping, namespace_counter=None
+):
+    """Return definition mapping per version corresponding to *requirement*.
+
+    :param requirement: Instance of :class:`packaging.requirements.Requirement`.
+
+    :param definition_mapping: Mapping regrouping all available definitions
+        associated with their unique identifier.
+
+    :param namespace_counter: instance of :class:`collections.Counter`
+        which indicates occurrence of namespaces used as hints for package
+        identification. Default is None.
+
+    :return: Tuple with instance of :class:`VersionMapping` and variant
+        identifier required, or None.
+
     :raise: :exc:`wiz.exception.RequestNotFound` if the requirement can not
         be resolved.
 
@@ -221,47 +595,20 @@ def query(requirement, definition_mapping, namespace_counter=None):
     if identifier not in definition_mapping:
         raise wiz.exception.RequestNotFound(requirement)
 
-    definition = None
+    definitions = definition_mapping[identifier]
+    if not isinstance(definitions, VersionMapping):
+        definitions = VersionMapping(definitions)
 
-    # Extract all versions from definitions.
-    versions = [
-        _definition.version or wiz.symbol.UNSET_VALUE
-        for _definition in definition_mapping[identifier].values()
-    ]
+    unset_version = str(wiz.symbol.UNSET_VALUE)
 
-    if wiz.symbol.UNSET_VALUE in versions and len(versions) > 1:
+    if unset_version in definitions and len(definitions) > 1:
         raise wiz.exception.RequestNotFound(
             "Impossible to retrieve the best matching definition for "
             "'{}' as non-versioned and versioned definitions have "
             "been fetched.".format(identifier)
         )
 
-    # Sort the definition versions so that the highest one is first.
-    versions = sorted(versions, reverse=True)
-
-    # Get the best matching definition by sorting versions so that the highest
-    # one is first.
-    for version in sorted(versions, reverse=True):
-        _definition = definition_mapping[identifier][str(version)]
-
-        # Skip if the variant identifier required is not found in definition.
-        if variant_identifier and not any(
-            variant_identifier == variant.identifier
-            for variant in _definition.variants
-        ):
-            continue
-
-        if (
-            _definition.version is None
-            or _definition.version in requirement.specifier
-        ):
-            definition = _definition
-            break
-
-    if definition is None:
-        raise wiz.exception.RequestNotFound(requirement)
-
-    return definition
+    return definitions, variant_identifier
 
 
 def _guess_qualified_identifier(
@@ -409,7 +756,10 @@ def export(path, data, overwrite=False):
     return file_path
 
 
-def discover(paths, system_mapping=None, max_depth=None):
+def discover(
+    paths, system_mapping=None, max_depth=None, ignore_patterns=None,
+    workers=None, executor=None, update_index=False
+):
     """Discover and yield all definitions found under *paths*.
 
     :param paths: List of registry paths to recursively fetch
@@ -423,38 +773,121 @@ def discover(paths, system_mapping=None, max_depth=None):
         <Definition>`. Default is None, which means that all  sub-trees will be
         visited.
 
+    :param ignore_patterns: List of :mod:`fnmatch` patterns matching names of
+        files and directories which should be skipped within registries (e.g.
+        [".git", "payload*"]). Default is None.
+
+    :param workers: Number of workers to load definition files concurrently.
+        Default is None, which means that definition files will be loaded
+        sequentially.
+
+    :param executor: Instance of :class:`concurrent.futures.Executor` or type
+        of executor to create with *workers* (:data:`wiz.symbol.THREAD_EXECUTOR`
+        or :data:`wiz.symbol.PROCESS_EXECUTOR`). Default is None, which means
+        that a thread pool executor will be created if more than one worker is
+        required.
+
+    :param update_index: Indicate whether the index of each registry should be
+        created or updated once all its definitions have been discovered. The
+        registry pack is not used in this case. Default is False, which means
+        that the index is only updated if it is outdated and if the index
+        directory already exists and is writable.
+
     :return: Generator which yield all :class:`definitions <Definition>`.
 
+    .. note::
+
+        The :func:`pack <wiz.registry.pack>` of each registry is used instead
+        of searching the registry if none of its directories has been modified
+        since it was last updated.
+
+    .. note::
+
+        The :func:`index <wiz.registry.load_index>` of each registry is used
+        to only load definition files which have been modified since the index
+        was last updated. Other definitions are created from their
+        :meth:`header <Definition.header>` and their complete data is only
+        loaded when required.
+
+    .. note::
+
+        Definitions are always yielded in the order in which the definition
+        files are found, whether they are loaded concurrently or not.
+
     """
     logger = wiz.logging.Logger(__name__ + ".discover")
 
-    for path in paths:
+    _executor = wiz.utility.create_executor(workers, executor)
 
-        # Ignore empty paths that could resolve to current directory.
-        path = path.strip()
-        if not path:
-            logger.debug("Skipping empty path.")
-            continue
+    try:
+        for path in paths:
 
-        path = os.path.abspath(path)
-        logger.debug("Searching under {!r} for definition files.".format(path))
+            # Ignore empty paths that could resolve to current directory.
+            path = path.strip()
+            if not path:
+                logger.debug("Skipping empty path.")
+                continue
+
+            path = os.path.abspath(path)
+            # Use registry pack if available to prevent searching and loading
+            # each definition file.
+            pack = None
+
+            if not update_index:
+                pack = wiz.registry.load_pack(
+                    path, max_depth=max_depth, ignore_patterns=ignore_patterns
+                )
+
+            if pack is not None:
+                logger.debug(
+                    "Loading {} definition(s) from pack under {!r}.".format(
+                        len(pack), path
+                    )
+                )
+
+                for definition in _iter_from_pack(path, pack):
+                    if _is_enabled(definition, system_mapping):
+                        yield definition
 
-        initial_depth = path.rstrip(os.sep).count(os.sep)
-        for base, _, filenames in os.walk(path):
-            depth = base.count(os.sep)
-            if max_depth is not None and (depth - initial_depth) > max_depth:
                 continue
 
-            for filename in filenames:
-                _, extension = os.path.splitext(filename)
-                if extension != ".json":
-                    continue
+            logger.debug(
+                "Searching under {!r} for definition files.".format(path)
+            )
 
-                _path = os.path.join(base, filename)
+            index = wiz.registry.load_index(path)
+            index_directory = os.path.join(
+                path, os.path.dirname(wiz.registry.INDEX_PATH)
+            )
+
+            # Ensure that index directory exists before recording modification
+            # times of directories, as creating it would modify the registry.
+            if update_index:
+                try:
+                    wiz.filesystem.ensure_directory(index_directory)
+                except (IOError, OSError):
+                    pass
+
+            # Preserve index entries which cannot be reached with maximum depth
+            # to prevent discarding them when updating the index.
+            entries = {
+                key: entry for key, entry in index["definitions"].items()
+                if max_depth is not None and key.count(os.sep) > max_depth
+            }
+
+            statistics = {}
+            directories = {}
+
+            for _path, loader in _iter_loaders(
+                path, index["definitions"], max_depth=max_depth,
+                ignore_patterns=ignore_patterns, executor=_executor,
+                statistics=statistics, directories=directories
+            ):
+                key = os.path.relpath(_path, path)
 
                 # Load and validate the definition.
                 try:
-                    definition = load(_path, registry_path=path)
+                    definition, entries[key] = loader()
 
                 except (
                     IOError, ValueError, TypeError,
@@ -467,23 +900,218 @@ def discover(paths, system_mapping=None, max_depth=None):
                     logger.debug_traceback()
                     continue
 
-                # Skip definition if an incompatible system if set.
-                if (
-                    system_mapping is not None and
-                    not wiz.system.validate(definition, system_mapping)
-                ):
-                    continue
-
-                # Skip definition if "disabled" keyword is set to True.
-                if definition.disabled:
-                    _id = definition.qualified_version_identifier
-                    logger.warning("Definition '{}' is disabled".format(_id))
+                if not _is_enabled(definition, system_mapping):
                     continue
 
                 yield definition
 
+            logger.debug(
+                "Found {files} definition file(s) under {path!r} "
+                "[{directories} directories visited, {skipped_files} files "
+                "and {skipped_directories} directories skipped].".format(
+                    path=path, **statistics
+                )
+            )
+
+            # Update index if requested or if definitions have been modified,
+            # added or removed. Index directory is never created by a lookup.
+            _index = {
+                "options": wiz.registry.get_search_options(
+                    max_depth, ignore_patterns
+                ),
+                "directories": directories,
+                "definitions": entries
+            }
+
+            if (
+                (update_index or _index != index) and
+                os.access(index_directory, os.W_OK)
+            ):
+                wiz.registry.export_index(path, _index)
+
+    finally:
+        # Only shutdown executor created from number of workers.
+        if _executor is not None and _executor is not executor:
+            _executor.shutdown(wait=False)
+
+
+def _iter_from_pack(registry_path, pack):
+    """Yield definitions from *pack* data.
+
+    :param registry_path: Path to the registry containing the pack.
+
+    :param pack: Mapping of definition data per path relative to
+        *registry_path* as returned by :func:`wiz.registry.load_pack`.
+
+    :return: Generator which yield :class:`definitions <Definition>`.
+
+    """
+    logger = wiz.logging.Logger(__name__ + "._iter_from_pack")
+
+    for key, data in pack.items():
+        path = os.path.join(registry_path, key)
+
+        try:
+            definition = Definition(
+                data, path=path, registry_path=registry_path,
+                copy_data=False, lazy=True
+            )
+
+        except (ValueError, TypeError, wiz.exception.WizError):
+            logger.warning(
+                "Error occurred trying to load definition from {!r}"
+                .format(path),
+            )
+            logger.debug_traceback()
+            continue
+
+        yield definition
+
+
+def _is_enabled(definition, system_mapping=None):
+    """Indicate whether *definition* should be included in definition mapping.
+
+    :param definition: Instance of :class:`Definition`.
+
+    :param system_mapping: Mapping of the current system which will filter out
+        non compatible definitions. Default is None.
+
+    :return: Boolean value.
+
+    """
+    logger = wiz.logging.Logger(__name__ + "._is_enabled")
+
+    # Skip definition if an incompatible system if set.
+    if (
+        system_mapping is not None and
+        not wiz.system.validate(definition, system_mapping)
+    ):
+        return False
+
+    # Skip definition if "disabled" keyword is set to True.
+    if definition.disabled:
+        _id = definition.qualified_version_identifier
+        logger.warning("Definition '{}' is disabled".format(_id))
+        return False
+
+    return True
+
+
+def _iter_loaders(
+    registry_path, index, max_depth=None, ignore_patterns=None,
+    executor=None, statistics=None, directories=None
+):
+    """Yield definition paths with callable to load them from *registry_path*.
+
+    Each callable returns the definition and its index entry as returned by
+    :func:`_load_from_index`. When an *executor* is given, all definition files
+    found within *registry_path* are submitted at once and each callable waits
+    for its result, so that definitions can be processed in order.
+
+    :param registry_path: Path to the registry to recursively search for
+        definition files.
+
+    :param index: Definition entries recorded in index of *registry_path* as
+        returned by :func:`wiz.registry.load_index`.
+
+    :param max_depth: Limited recursion value to search for definition files.
+        Default is None, which means that all sub-trees will be visited.
+
+    :param ignore_patterns: List of patterns matching names of files and
+        directories which should be skipped. Default is None.
+
+    :param executor: Instance of :class:`concurrent.futures.Executor` to load
+        definition files with. Default is None, which means that definition
+        files will be loaded sequentially when each callable is called.
+
+    :param statistics: Mapping which will be mutated to record scan statistics
+        as returned by :func:`wiz.filesystem.scan`. Default is None.
+
+    :param directories: Mapping which will be mutated to record modification
+        times of directories visited as returned by
+        :func:`wiz.filesystem.scan`. Default is None.
+
+    :return: Generator which yield tuples containing the definition path and
+        the corresponding callable.
+
+    """
+    paths = []
+
+    # Always skip directory containing the registry index.
+    ignore_patterns = [os.path.dirname(wiz.registry.INDEX_PATH)] + list(
+        ignore_patterns or []
+    )
+
+    for file_entry in wiz.filesystem.scan(
+        registry_path, extension=".json", max_depth=max_depth,
+        ignore_patterns=ignore_patterns, statistics=statistics,
+        directories=directories
+    ):
+        path = file_entry.path
+        entry = index.get(os.path.relpath(path, registry_path))
+
+        if executor is None:
+            yield path, functools.partial(
+                _load_from_index, path, registry_path, entry,
+                stat=file_entry.stat()
+            )
+            continue
+
+        paths.append((path, entry))
+
+    futures = [
+        executor.submit(_load_from_index, path, registry_path, entry)
+        for path, entry in paths
+    ]
+
+    for (path, _), future in zip(paths, futures):
+        yield path, future.result
+
+
+def _load_from_index(path, registry_path, entry=None, stat=None):
+    """Return definition from *path* with corresponding index entry.
+
+    If the modification time and size of the file recorded in *entry* are
+    unchanged, the definition is created from the indexed header without
+    reading the file. Otherwise, the definition is loaded and a new index
+    entry is created.
+
+    :param path: :term:`JSON` file path which contains a definition.
+
+    :param registry_path: Path to the registry which contains the definition.
+
+    :param entry: Index entry recorded for *path* as returned by
+        :func:`wiz.registry.load_index`. Default is None.
+
+    :param stat: Result of :func:`os.stat` for *path* if already available.
+        Default is None, which means that *path* will be stat'ed.
+
+    :return: Tuple containing an instance of :class:`Definition` and the
+        corresponding index entry.
+
+    :raise: :exc:`wiz.exception.IncorrectDefinition` if the definition is
+        incorrect.
+
+    """
+    if stat is None:
+        stat = os.stat(path)
+
+    signature = [wiz.filesystem.get_modification_time(stat), stat.st_size]
 
-def load(path, mapping=None, registry_path=None):
+    if entry is not None and entry.get("signature") == signature:
+        definition = Definition(
+            entry["header"], path=path, registry_path=registry_path,
+            copy_data=False, header_only=True
+        )
+        return definition, entry
+
+    definition = load(path, registry_path=registry_path, lazy=True)
+    return definition, {
+        "signature": signature, "header": definition.header()
+    }
+
+
+def load(path, mapping=None, registry_path=None, lazy=False):
     """Load and return a definition from *path*.
 
     :param path: :term:`JSON` file path which contains a definition.
@@ -494,6 +1122,10 @@ def load(path, mapping=None, registry_path=None):
     :param registry_path: Path to the registry which contains the definition.
         Default is None.
 
+    :param lazy: Indicate whether only the :meth:`header <Definition.header>`
+        of the definition should be validated when loading it. Default is
+        False.
+
     :return: Instance of :class:`Definition`.
 
     :raise: :exc:`wiz.exception.IncorrectDefinition` if the definition is
@@ -511,7 +1143,8 @@ def load(path, mapping=None, registry_path=None):
             definition_data,
             path=path,
             registry_path=registry_path,
-            copy_data=False
+            copy_data=False,
+            lazy=lazy
         )
 
 
@@ -519,7 +1152,8 @@ class Definition(object):
     """Definition object."""
 
     def __init__(
-        self, data, path=None, registry_path=None, copy_data=True
+        self, data, path=None, registry_path=None, copy_data=True,
+        lazy=False, header_only=False
     ):
         """Initialize definition from input *data* mapping.
 
@@ -534,6 +1168,16 @@ class Definition(object):
         :param copy_data: Indicate whether input *data* will be copied to
             prevent mutating it. Default is True.
 
+        :param lazy: Indicate whether only the keywords included in the
+            :meth:`header` should be validated. If True, the complete data will
+            be validated when accessing keywords not included in the header.
+            Default is False.
+
+        :param header_only: Indicate whether *data* is a :meth:`header`
+            mapping which has already been validated. If True, the complete
+            data will be loaded from *path* and validated when accessing
+            keywords not included in the header. Default is False.
+
         :raise: :exc:`wiz.exception.IncorrectDefinition` if the *data* mapping
             is incorrect.
 
@@ -554,7 +1198,10 @@ class Definition(object):
         .. seealso:: :ref:`definition`
 
         """
-        wiz.validator.validate_definition(data)
+        if lazy:
+            wiz.validator.validate_definition_header(data)
+        elif not header_only:
+            wiz.validator.validate_definition(data)
 
         # Ensure that input data is not mutated if requested.
         if copy_data:
@@ -563,10 +1210,30 @@ class Definition(object):
         self._data = data
         self._path = path
         self._registry_path = registry_path
+        self._header_only = header_only
+        self._validated = not (lazy or header_only)
 
         # Store values that needs to be constructed.
         self._cache = {}
 
+    def _ensure_complete(self):
+        """Load and validate complete data if necessary.
+
+        :raise: :exc:`wiz.exception.IncorrectDefinition` if the complete
+            definition data is incorrect.
+
+        """
+        if self._validated:
+            return
+
+        if self._header_only:
+            with open(self._path, "r") as stream:
+                self._data = ujson.load(stream)
+                self._header_only = False
+
+        wiz.validator.validate_definition(self._data)
+        self._validated = True
+
     @property
     def path(self):
         """Return path to definition if available.
@@ -707,6 +1374,7 @@ class Definition(object):
         .. seealso:: :ref:`definition/install_root`
 
         """
+        self._ensure_complete()
         return self._data.get("install-root")
 
     @property
@@ -718,6 +1386,7 @@ class Definition(object):
         .. seealso:: :ref:`definition/install_location`
 
         """
+        self._ensure_complete()
         return self._data.get("install-location")
 
     @property
@@ -729,6 +1398,7 @@ class Definition(object):
         .. seealso:: :ref:`definition/environ`
 
         """
+        self._ensure_complete()
         return self._data.get("environ", {})
 
     @property
@@ -770,6 +1440,8 @@ class Definition(object):
         .. seealso:: :ref:`definition/requirements`
 
         """
+        self._ensure_complete()
+
         requirements = self._data.get("requirements")
 
         # Create cache value if necessary.
@@ -799,6 +1471,8 @@ class Definition(object):
         .. seealso:: :ref:`definition/conditions`
 
         """
+        self._ensure_complete()
+
         conditions = self._data.get("conditions")
 
         # Create cache value if necessary.
@@ -825,6 +1499,8 @@ class Definition(object):
         .. seealso:: :ref:`definition/variants`
 
         """
+        self._ensure_complete()
+
         variants = self._data.get("variants")
 
         # Create cache value if necessary.
@@ -1041,6 +1717,45 @@ class Definition(object):
             copy_data=False
         )
 
+    def header(self):
+        """Return header mapping.
+
+        The header only contains the keywords required to :func:`fetch` and
+        :func:`query` definitions. The :ref:`variants <definition/variants>`
+        are reduced to their identifiers. The complete data does not need to be
+        loaded or validated to return the header.
+
+        Example::
+
+            >>> definition.header()
+            {
+                "identifier": "foo",
+                "version": "0.1.0",
+                "command": {"app": "AppExe"},
+                "variants": [{"identifier": "V1"}, {"identifier": "V2"}]
+            }
+
+        :return: Header mapping.
+
+        """
+        keywords = [
+            "identifier", "version", "namespace", "description", "auto-use",
+            "disabled", "system", "command"
+        ]
+
+        header = {
+            keyword: copy.deepcopy(self._data[keyword])
+            for keyword in keywords if keyword in self._data
+        }
+
+        if len(self._data.get("variants", [])) > 0:
+            header["variants"] = [
+                {"identifier": variant["identifier"]}
+                for variant in self._data["variants"]
+            ]
+
+        return header
+
     def data(self, copy_data=True):
         """Return definition data used to created the definition instance.
 
@@ -1050,6 +1765,8 @@ class Definition(object):
         :return: Definition data mapping.
 
         """
+        self._ensure_complete()
+
         if not copy_data:
             return self._data
         return copy.deepcopy(self._data)
@@ -1289,3 +2006,296 @@ class Variant(object):
         if not copy_data:
             return self._data
         return copy.deepcopy(self._data)
+
+
+class VersionMapping(dict):
+    """Definition mapping per version for one identifier.
+
+    The mapping behaves like a dictionary, but records versions sorted in
+    ascending order and variant identifiers of each definition the first time
+    they are required, so that :func:`query` does not need to sort versions
+    and iterate over variants for each requirement::
+
+        >>> mapping = VersionMapping()
+        >>> mapping["0.1.0"] = Definition(
+        ...     {"identifier": "foo", "version": "0.1.0"}
+        ... )
+        >>> mapping["1.0.0"] = Definition(
+        ...     {"identifier": "foo", "version": "1.0.0"}
+        ... )
+        >>> mapping.index()
+        ([(0, (0, 1)), (0, (1,))], ["0.1.0", "1.0.0"])
+
+    Recorded data are discarded when the mapping is modified.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize mapping."""
+        super(VersionMapping, self).__init__(*args, **kwargs)
+        self._index = None
+        self._variants = {}
+
+    def __reduce__(self):
+        """Return recorded data to pickle mapping without cached data."""
+        return self.__class__, (dict(self),)
+
+    def __setitem__(self, version, definition):
+        """Set *definition* for *version* and discard recorded data."""
+        super(VersionMapping, self).__setitem__(version, definition)
+        self._reset()
+
+    def __delitem__(self, version):
+        """Remove definition for *version* and discard recorded data."""
+        super(VersionMapping, self).__delitem__(version)
+        self._reset()
+
+    def clear(self):
+        """Remove all definitions and discard recorded data."""
+        super(VersionMapping, self).clear()
+        self._reset()
+
+    def pop(self, *args):
+        """Remove definition and discard recorded data."""
+        result = super(VersionMapping, self).pop(*args)
+        self._reset()
+        return result
+
+    def popitem(self):
+        """Remove definition and discard recorded data."""
+        result = super(VersionMapping, self).popitem()
+        self._reset()
+        return result
+
+    def setdefault(self, version, definition=None):
+        """Return definition for *version*, setting *definition* if needed."""
+        if version not in self:
+            self[version] = definition
+        return self[version]
+
+    def update(self, *args, **kwargs):
+        """Update definitions and discard recorded data."""
+        super(VersionMapping, self).update(*args, **kwargs)
+        self._reset()
+
+    def _reset(self):
+        """Discard recorded data."""
+        self._index = None
+        self._variants = {}
+
+    def index(self):
+        """Return versions sorted in ascending order.
+
+        Non-versioned definitions are ignored.
+
+        :return: Tuple with the list of version keys as returned by
+            :func:`wiz.utility.compute_release_key` and the list of
+            corresponding version strings, both sorted in ascending order.
+
+        """
+        if self._index is None:
+            versions = sorted(
+                (
+                    definition.version for definition in self.values()
+                    if definition.version is not None
+                ),
+                key=wiz.utility.get_version_key
+            )
+            self._index = (
+                [
+                    wiz.utility.compute_release_key(version)
+                    for version in versions
+                ],
+                [str(version) for version in versions]
+            )
+
+        return self._index
+
+    def has_variant(self, version, variant_identifier):
+        """Indicate whether definition for *version* contains a variant.
+
+        :param version: Version string of the definition.
+
+        :param variant_identifier: Identifier of the variant.
+
+        :return: Boolean value.
+
+        """
+        if version not in self._variants:
+            self._variants[version] = frozenset(
+                variant.identifier for variant in self[version].variants
+            )
+
+        return variant_identifier in self._variants[version]
+
+
+class DefinitionMapping(dict):
+    """Package mapping returned by :func:`fetch`.
+
+    Unlike :class:`dict`, the mapping can be weakly referenced, so that data
+    recorded by resolutions using the mapping are discarded with it.
+
+    """
+
+
+class LazyDefinitionMapping(collections.Mapping):
+    """Package mapping which loads definitions on demand.
+
+    The mapping behaves like the package mapping returned by :func:`fetch`,
+    including the "__namespace__" key, but definitions for an identifier are
+    only created the first time this identifier is requested::
+
+        >>> mapping = LazyDefinitionMapping()
+        >>> mapping.add("/registry/foo.json", "/registry", entry)
+        "foo"
+        >>> mapping["foo"]
+        {
+            "0.1.0": <Definition(identifier="foo", version="0.1.0")>
+        }
+
+    Definitions recorded from an index entry are reloaded if the definition file
+    has been modified since the index was last updated.
+
+    """
+
+    def __init__(self, system_mapping=None):
+        """Initialize mapping.
+
+        :param system_mapping: Mapping defining the current system to filter
+            out definitions modified since the index was last updated which are
+            not compatible anymore. Default is None.
+
+        """
+        self._system_mapping = system_mapping
+
+        # Record elements to create definitions from per qualified identifier.
+        self._elements = collections.OrderedDict()
+
+        # Record namespaces per identifier.
+        self._namespaces = {}
+
+        # Record definitions already created per qualified identifier.
+        self._definitions = {}
+
+    def add(self, path, registry_path, element):
+        """Record definition *element* found in *path*.
+
+        :param path: Path to the definition :term:`JSON` file.
+
+        :param registry_path: Path to the registry containing the definition.
+
+        :param element: Instance of :class:`Definition` or index entry as
+            returned by :func:`wiz.registry.load_index`.
+
+        :return: Qualified identifier of the definition.
+
+        """
+        if isinstance(element, Definition):
+            header = element.header()
+        else:
+            header = element["header"]
+
+        identifier = header["identifier"]
+        namespace = header.get("namespace")
+
+        qualified_identifier = identifier
+        if namespace is not None:
+            self._namespaces.setdefault(identifier, set())
+            self._namespaces[identifier].add(namespace)
+
+            qualified_identifier = "{}{}{}".format(
+                namespace, wiz.symbol.NAMESPACE_SEPARATOR, identifier
+            )
+
+        self._elements.setdefault(qualified_identifier, [])
+        self._elements[qualified_identifier].append(
+            (path, registry_path, element)
+        )
+
+        # Reset definitions if necessary.
+        self._definitions.pop(qualified_identifier, None)
+
+        return qualified_identifier
+
+    def __getitem__(self, identifier):
+        """Return definition mapping per version for *identifier*."""
+        if identifier == "__namespace__" and len(self._namespaces) > 0:
+            return self._namespaces
+
+        if identifier not in self._elements:
+            raise KeyError(identifier)
+
+        if identifier not in self._definitions:
+            self._definitions[identifier] = self._load(identifier)
+
+        return self._definitions[identifier]
+
+    def __contains__(self, identifier):
+        """Indicate whether *identifier* is in mapping without loading it."""
+        if identifier == "__namespace__":
+            return len(self._namespaces) > 0
+
+        return identifier in self._elements
+
+    def __iter__(self):
+        """Iterate over all identifiers."""
+        if len(self._namespaces) > 0:
+            yield "__namespace__"
+
+        for identifier in self._elements.keys():
+            yield identifier
+
+    def __len__(self):
+        """Return number of identifiers."""
+        return len(self._elements) + int(len(self._namespaces) > 0)
+
+    def _load(self, identifier):
+        """Return definition mapping per version for *identifier*.
+
+        :param identifier: Qualified identifier of definitions to load.
+
+        :return: Instance of :class:`VersionMapping` in the form of::
+
+            {
+                "1.1.0": <Definition(identifier="foo", version="1.1.0")>,
+                "1.0.0": <Definition(identifier="foo", version="1.0.0")>,
+                ...
+            }
+
+        """
+        logger = wiz.logging.Logger(__name__ + ".LazyDefinitionMapping._load")
+
+        mapping = VersionMapping()
+
+        for path, registry_path, element in self._elements[identifier]:
+            definition = element
+
+            if not isinstance(element, Definition):
+                try:
+                    definition, _ = _load_from_index(
+                        path, registry_path, element
+                    )
+
+                except (
+                    IOError, OSError, ValueError, TypeError,
+                    wiz.exception.WizError
+                ):
+                    logger.warning(
+                        "Error occurred trying to load definition from {!r}"
+                        .format(path),
+                    )
+                    logger.debug_traceback()
+                    continue
+
+                # Skip definition modified since the index was last updated if
+                # it does not correspond to identifier anymore.
+                if (
+                    definition.qualified_identifier != identifier or
+                    not _is_enabled(definition, self._system_mapping)
+                ):
+                    continue
+
+            version = str(definition.version or wiz.symbol.UNSET_VALUE)
+            mapping[version] = definition
+
+        return mapping
@@ -129,6 +129,18 @@ class GraphResolutionError(WizError):
         self.conflicts = conflicts or []
 
 
+class ResolutionInterrupted(GraphResolutionError):
+    """Raise when the graph resolution is cancelled before completion."""
+
+    default_message = "The graph resolution has been interrupted."
+
+
+class ResolutionLimitExceeded(ResolutionInterrupted):
+    """Raise when the graph resolution exceeds its time or combination limit."""
+
+    default_message = "The graph resolution has exceeded its limit."
+
+
 class InvalidRequirement(WizError):
     """Raise when a requirement is incorrect."""
 
@@ -185,3 +197,15 @@ class InstallError(WizError):
     """Raise when the installation of a definition failed."""
 
     default_message = "The definition cannot be installed."
+
+
+class ServerUnavailable(WizError):
+    """Raise when the resolver server cannot be used."""
+
+    default_message = "The resolver server is unavailable."
+
+
+class ServerError(WizError):
+    """Raise when the resolver server received or returned invalid data."""
+
+    default_message = "The resolver server request failed."
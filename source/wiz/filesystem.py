@@ -2,15 +2,23 @@
 
 import os
 import errno
+import fnmatch
 import io
 import unicodedata
 import re
 import gzip
+import stat
 import pwd
 import getpass
+import tempfile
 
 import six
 
+try:
+    from os import scandir
+except ImportError:
+    from scandir import scandir
+
 import wiz.exception
 
 
@@ -61,6 +69,171 @@ def export(path, content, compressed=False, overwrite=False):
             outfile.write(six.text_type(content))
 
 
+def export_atomically(path, content, binary=False):
+    """Create file from *content* in *path* atomically.
+
+    The content is first written into a temporary file within the same
+    directory, which then replaces *path* so that concurrent processes never
+    read partial content. The file keeps the permissions of the file it
+    replaces, or the default permissions of new files otherwise.
+
+    :param path: Target path to save the file.
+
+    :param content: Content string to write in *path*.
+
+    :param binary: Indicate whether *content* is a binary string. Default is
+        False.
+
+    :raise: :exc:`OSError` or :exc:`IOError` if the file cannot be written.
+
+    """
+    directory = os.path.dirname(path)
+    ensure_directory(directory)
+
+    handle, temporary_path = tempfile.mkstemp(
+        dir=directory, prefix=".{}-".format(os.path.basename(path))
+    )
+
+    try:
+        with os.fdopen(handle, "wb" if binary else "w") as stream:
+            stream.write(content)
+
+        # Temporary files are only accessible by their owner.
+        os.chmod(temporary_path, _fetch_file_mode(path))
+        os.rename(temporary_path, path)
+
+    except (IOError, OSError):
+        os.remove(temporary_path)
+        raise
+
+
+def _fetch_file_mode(path):
+    """Return permission bits to set on file created in *path*.
+
+    :param path: Target path of the file.
+
+    :return: Permission bits of the existing file in *path*, or default
+        permission bits of new files according to the current umask.
+
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def scan(
+    path, extension=None, max_depth=None, ignore_patterns=None,
+    statistics=None, directories=None
+):
+    """Recursively yield file entries found under *path*.
+
+    Entries are yielded in alphabetical order, with files from each directory
+    being yielded before files from its sub-directories. Sub-directories deeper
+    than *max_depth* are never listed.
+
+    :param path: Directory path to scan.
+
+    :param extension: File extension which should be yielded (e.g. ".json").
+        Default is None, which means that all files will be yielded.
+
+    :param max_depth: Limited recursion value to scan sub-directories. Default
+        is None, which means that all sub-trees will be visited.
+
+    :param ignore_patterns: List of :mod:`fnmatch` patterns matching names of
+        files and directories which should be skipped (e.g. [".git", "*.bak"]).
+        Default is None.
+
+    :param statistics: Mapping which will be mutated to record the number of
+        "directories" visited, "files" yielded, "skipped_files" and
+        "skipped_directories". Default is None.
+
+    :param directories: Mapping which will be mutated to record the
+        modification time in nanoseconds of each directory visited, indexed by
+        directory path relative to *path*. The modification time is recorded
+        before listing the directory. Default is None.
+
+    :return: Generator which yield :class:`os.DirEntry` instances.
+
+    """
+    if statistics is None:
+        statistics = {}
+
+    for key in ["directories", "files", "skipped_files", "skipped_directories"]:
+        statistics.setdefault(key, 0)
+
+    def _is_ignored(name):
+        """Indicate whether *name* matches one of the ignore patterns."""
+        return any(
+            fnmatch.fnmatch(name, pattern) for pattern in ignore_patterns or []
+        )
+
+    def _scan(directory, depth):
+        """Yield file entries from *directory* at *depth*."""
+        statistics["directories"] += 1
+
+        try:
+            if directories is not None:
+                directories[os.path.relpath(directory, path)] = (
+                    get_modification_time(os.stat(directory))
+                )
+
+            entries = sorted(scandir(directory), key=lambda _e: _e.name)
+
+        except OSError:
+            return
+
+        _directories = []
+
+        for entry in entries:
+            if _is_ignored(entry.name):
+                if entry.is_dir():
+                    statistics["skipped_directories"] += 1
+                else:
+                    statistics["skipped_files"] += 1
+                continue
+
+            if entry.is_dir():
+                _directories.append(entry)
+
+            elif extension is not None and not entry.name.endswith(extension):
+                statistics["skipped_files"] += 1
+
+            else:
+                statistics["files"] += 1
+                yield entry
+
+        for entry in _directories:
+            # Do not follow symbolic links to directories to prevent infinite
+            # recursion, similarly to os.walk.
+            if entry.is_symlink():
+                continue
+
+            if max_depth is not None and depth >= max_depth:
+                statistics["skipped_directories"] += 1
+                continue
+
+            for _entry in _scan(entry.path, depth + 1):
+                yield _entry
+
+    for _entry in _scan(path, 0):
+        yield _entry
+
+
+def get_modification_time(stat):
+    """Return modification time in nanoseconds from *stat* result.
+
+    :param stat: Result of :func:`os.stat`.
+
+    :return: Modification time as an integer.
+
+    """
+    return getattr(stat, "st_mtime_ns", int(stat.st_mtime * 1e9))
+
+
 def is_accessible(folder_path):
     """Indicate whether the folder path is accessible.
 
@@ -2,17 +2,63 @@
 
 import collections
 import copy
+import functools
+import io
 import itertools
+import threading
+import time
 import uuid
+import weakref
 from heapq import heapify, heappush, heappop
 
+import concurrent.futures
 import six.moves
+from six.moves import cPickle
 
 import wiz.logging
 import wiz.package
 import wiz.exception
 import wiz.symbol
 import wiz.history
+import wiz.utility
+
+#: Maximum number of definition mappings kept within each worker process.
+WORKER_DEFINITION_MAPPINGS_SIZE = 4
+
+#: Maximum number of graphs divided into combinations kept within each worker
+#: process.
+WORKER_GRAPHS_SIZE = 16
+
+#: Definition mappings deserialized within worker processes with packages
+#: extracted from them, organised per unique token identifying the definition
+#: mapping from least to most recently used.
+_WORKER_DEFINITION_MAPPINGS = collections.OrderedDict()
+
+#: Graphs deserialized within worker processes, organised per graph identifier
+#: from least to most recently used.
+_WORKER_GRAPHS = collections.OrderedDict()
+
+#: Lock preventing concurrent modifications of elements kept within worker
+#: processes when combinations are computed with a thread pool executor.
+_WORKER_LOCK = threading.Lock()
+
+#: Tokens identifying definition mappings sent to worker processes, kept per
+#: identifier of the definition mapping with a weak reference to it.
+_DEFINITION_TOKENS = {}
+
+#: Lock preventing concurrent modifications of definition tokens.
+_DEFINITION_TOKENS_LOCK = threading.Lock()
+
+#: Number of seconds to wait for a combination computed concurrently before
+#: checking whether the resolution has been interrupted.
+_POLLING_INTERVAL = 0.1
+
+#: Closure caches kept in memory per identifier of the definition mapping,
+#: with a weak reference to this definition mapping.
+_CLOSURE_CACHES = {}
+
+#: Lock preventing concurrent modifications of closure caches kept in memory.
+_CLOSURE_CACHES_LOCK = threading.Lock()
 
 
 class Resolver(object):
@@ -66,14 +112,95 @@ class Resolver(object):
     found, other versions of the conflicting packages will be fetched to attempt
     to resolve the graph.
 
+    When a combination is rejected because it contains a node with errors or
+    conflicting nodes, the variants kept in this combination which lead to
+    these nodes are recorded as a nogood, so that any subsequent combination
+    keeping the same variants is skipped without being computed::
+
+        - 'foo[V1]' and 'bar[V1]' lead to incompatible requirements;
+        - The nogood {'foo[V1]', 'bar[V1]'} is recorded;
+        - All combinations keeping 'foo[V1]' and 'bar[V1]' are skipped.
+
+    When several *jobs* are requested, the next combinations are computed
+    concurrently by workers with the errors and conflicts recorded so far.
+    Results are then processed in the same order as combinations are
+    generated, and a result is computed again when errors or conflicts
+    recorded in the meantime could have changed it, so that the packages
+    returned are always the same as when combinations are computed one at a
+    time.
+
+    The resolution can be bounded by a maximum number of combinations to
+    compute and by a timeout, and it can be cancelled from another thread
+    with a :class:`threading.Event`. The number of combinations to compute is
+    estimated from variant groups so that the error raised when the resolution
+    is interrupted reports it with the conflicts recorded so far.
+
+    Dependencies of packages which cannot lead to conflicts, errors or
+    variant combinations are recorded with all their descendants, so that
+    the whole closure is added at once when the package is added to a graph.
+    Closures are kept in memory for all resolutions using the same definition
+    mapping.
+
+    The same resolver can compute packages from several lists of requirements,
+    in which case packages extracted from requirements are shared between
+    resolutions. Errors and conflicts are only recorded for the current
+    resolution, as they could be solved differently from other requirements.
+
     """
 
-    def __init__(self, definition_mapping):
+    def __init__(
+        self, definition_mapping, learn_nogoods=True, jobs=None, executor=None,
+        max_combinations=None, timeout=None, cancel_event=None,
+        closure_cache=True
+    ):
         """Initialize Resolver with *requirements*.
 
         :param definition_mapping: Mapping regrouping all available definitions
             associated with their unique identifier.
 
+        :param learn_nogoods: Indicate whether variant choices leading to
+            rejected combinations should be recorded to skip subsequent
+            combinations containing them. Default is True.
+
+        :param jobs: Number of graph combinations to compute concurrently.
+            Default is None, which means that combinations will be computed
+            sequentially.
+
+        :param executor: Instance of :class:`concurrent.futures.Executor` or
+            type of executor to create with *jobs*
+            (:data:`wiz.symbol.THREAD_EXECUTOR` or
+            :data:`wiz.symbol.PROCESS_EXECUTOR`). Default is None, which means
+            that a process pool executor will be created if more than one job
+            is required. An executor created from its type is shut down after
+            each resolution, so an instance should be given to reuse workers
+            between resolutions.
+
+        :param max_combinations: Maximum number of combinations to compute
+            before the resolution is interrupted. Default is None, which means
+            that the number of combinations is not limited.
+
+        :param timeout: Number of seconds after which the resolution is
+            interrupted. Default is None, which means that the resolution is
+            not limited in time.
+
+        :param cancel_event: Instance of :class:`threading.Event` which
+            interrupts the resolution when set. Default is None.
+
+        :param closure_cache: Indicate whether package closures should be
+            recorded and reused by subsequent resolutions using the same
+            definition mapping. Default is True.
+
+        .. note::
+
+            Actions are not recorded in the :mod:`history <wiz.history>`
+            while a combination is computed by a worker.
+
+        .. note::
+
+            Workers are not notified when *cancel_event* is set, so combinations
+            computed concurrently are completed before the resolution is
+            interrupted.
+
         """
         self._logger = wiz.logging.Logger(__name__ + ".Resolver")
 
@@ -83,10 +210,9 @@ class Resolver(object):
         # Set of node identifiers with variants which required graph division.
         self._variant_identifiers = set()
 
-        # Record mapping indicating the shortest possible distance of each node
-        # identifier from the root level of the graph with corresponding
-        # parent node identifier.
-        self._distance_mapping = None
+        # Record graph identifier and revision corresponding to the latest
+        # distance mapping fetched.
+        self._distance_revision = None
 
         # Iterator which yield the next graph to resolve with a list of
         # conflicting variant node identifiers to remove before instantiation.
@@ -96,6 +222,53 @@ class Resolver(object):
         # than one combination.
         self._node_errors = set()
 
+        # Number of combinations to compute concurrently and executor to use.
+        self._jobs = jobs
+        self._executor = executor
+
+        # Record tuples of node identifiers with errors and of conflicting node
+        # identifiers in the order in which they are recorded, so that it is
+        # possible to identify whether a combination computed concurrently
+        # could be affected by those recorded in the meantime.
+        self._learned = []
+
+        # Indicate whether nogoods should be recorded from rejected
+        # combinations.
+        self._learn_nogoods = learn_nogoods
+
+        # Record nogoods per identifier of the graph divided into variant
+        # combinations.
+        self._nogoods = {}
+
+        # Record nogoods and variant node identifiers kept for the combination
+        # currently computed, or None if the graph was not divided.
+        self._combination = None
+
+        # Record number of nogoods learned and number of combinations skipped.
+        self._statistics = {"learned_nogoods": 0, "pruned_combinations": 0}
+
+        # Record packages extracted from requirements to prevent querying
+        # definitions again for identical requirements.
+        self._package_cache = _PackageCache(definition_mapping)
+
+        # Record package closures shared with other resolutions if required.
+        self._closure_cache = None
+        if closure_cache:
+            self._closure_cache = _fetch_closure_cache(definition_mapping)
+
+        # Limits which interrupt the resolution when exceeded, and time at
+        # which the resolution times out.
+        self._max_combinations = max_combinations
+        self._timeout = timeout
+        self._cancel_event = cancel_event
+        self._deadline = None
+
+        # Record estimated number of combinations to compute, number of
+        # combinations which failed to be resolved and latest error raised.
+        self._estimated_combinations = 0
+        self._nb_failures = 0
+        self._latest_error = None
+
         # Record mapping of all conflicting identifiers found during the
         # graph resolution failed attempts.
         self._conflicts_mapping = {}
@@ -116,6 +289,70 @@ class Resolver(object):
         """Return mapping of all available definitions."""
         return self._definition_mapping
 
+    @property
+    def statistics(self):
+        """Return mapping with number of nogoods and skipped combinations.
+
+        The mapping is in the form of::
+
+            {
+                "learned_nogoods": 2,
+                "pruned_combinations": 5
+            }
+
+        """
+        return dict(self._statistics)
+
+    def fetch_packages(self, requirement, namespace_counter=None):
+        """Return packages extracted from *requirement*.
+
+        Packages extracted are recorded so that they are returned without
+        querying definitions again for identical requirements and namespace
+        occurrences. Returned :class:`~wiz.package.Package` instances are
+        shared and must not be modified.
+
+        :param requirement: Instance of
+            :class:`packaging.requirements.Requirement`.
+
+        :param namespace_counter: instance of :class:`collections.Counter`
+            which indicates occurrence of namespaces used as hints for package
+            identification. Default is None.
+
+        :return: List of :class:`~wiz.package.Package` instances.
+
+        :raise: :exc:`wiz.exception.RequestNotFound` if the requirement can not
+            be resolved.
+
+        .. seealso:: :func:`wiz.package.extract`
+
+        """
+        return self._package_cache.extract(
+            requirement, namespace_counter=namespace_counter
+        )
+
+    def fetch_closure(self, package):
+        """Return dependencies of *package* and of all its descendants.
+
+        Dependencies are only returned if they cannot lead to conflicts,
+        errors or variant combinations, so that the closure can be added to a
+        graph without updating it from each requirement. Returned
+        :class:`~wiz.package.Package` instances are shared and must not be
+        modified.
+
+        :param package: Instance of :class:`wiz.package.Package`.
+
+        :return: Mapping of each package identifier in the closure with a list
+            of dependency tuples containing the :class:`~wiz.package.Package`
+            instance required, the corresponding
+            :class:`packaging.requirements.Requirement` instance and the link
+            weight, or None if the closure cannot be used.
+
+        """
+        if self._closure_cache is None:
+            return None
+
+        return self._closure_cache.fetch(package, self._definition_mapping)
+
     def compute_packages(self, requirements):
         """Resolve requirements graphs and return list of packages.
 
@@ -125,7 +362,19 @@ class Resolver(object):
         :raise: :exc:`wiz.exception.GraphResolutionError` if the graph cannot be
             resolved in time.
 
+        :raise: :exc:`wiz.exception.ResolutionLimitExceeded` if the maximum
+            number of combinations or the timeout is exceeded.
+
+        :raise: :exc:`wiz.exception.ResolutionInterrupted` if the resolution
+            is cancelled.
+
         """
+        self._reset_state()
+
+        self._deadline = None
+        if self._timeout is not None:
+            self._deadline = time.time() + self._timeout
+
         graph = Graph(self)
 
         wiz.history.record_action(
@@ -138,53 +387,425 @@ class Resolver(object):
 
         self._initiate_iterator(graph)
 
-        # Store latest exception to raise if necessary.
-        latest_error = None
+        try:
+            if self._jobs is None or self._jobs <= 1:
+                return self._resolve_combinations()
+
+            executor = wiz.utility.create_executor(
+                self._jobs, self._executor or wiz.symbol.PROCESS_EXECUTOR
+            )
+
+            try:
+                return self._resolve_combinations_concurrently(executor)
+
+            finally:
+                # Only shutdown executor created from number of jobs.
+                if executor is not self._executor:
+                    executor.shutdown()
+
+        finally:
+            self._logger.debug(
+                "Packages extracted from cache: {}/{} ({:.1%})".format(
+                    self._package_cache.hits, self._package_cache.requests,
+                    self._package_cache.hit_rate
+                )
+            )
+
+            if self._closure_cache is not None:
+                self._logger.debug(
+                    "Closures fetched from cache: {}/{} ({:.1%})".format(
+                        self._closure_cache.hits,
+                        self._closure_cache.requests,
+                        self._closure_cache.hit_rate
+                    )
+                )
+
+    def _reset_state(self):
+        """Reset state recorded by previous resolution."""
+        self._variant_identifiers = set()
+        self._distance_revision = None
+        self._node_errors = set()
+        self._learned = []
+        self._nogoods = {}
+        self._combination = None
+        self._statistics = {"learned_nogoods": 0, "pruned_combinations": 0}
+
+        self._estimated_combinations = 0
+        self._nb_failures = 0
+        self._latest_error = None
+
+        self._conflicts_mapping = {}
+        self._conflicts = collections.deque()
+        self._conflicts_needs_sorting = True
+
+    def _resolve_combinations(self):
+        """Resolve combinations one at a time and return list of packages.
 
-        # Record the number of failed resolution attempts.
-        nb_failures = 0
+        :raise: :exc:`wiz.exception.GraphResolutionError` if no combinations
+            can be resolved.
 
+        """
         while True:
             graph, nodes_to_remove = self._fetch_next_combination()
             if graph is None:
-                latest_error.message = (
-                    "Failed to resolve graph at combination #{}:\n\n"
-                    "{}".format(nb_failures, latest_error.message)
-                )
-                raise latest_error
+                _raise_latest_error(self._latest_error, self._nb_failures)
 
             try:
-                # Compute new graph.
-                graph = self._compute_combination(graph, nodes_to_remove)
+                return self._resolve_combination(graph, nodes_to_remove)
 
-                # Raise error if a conflict in graph cannot be solved.
-                self._resolve_conflicts(graph)
+            except wiz.exception.ResolutionInterrupted:
+                raise
 
-                # Compute distance mapping if necessary.
-                distance_mapping, _ = self._fetch_distance_mapping(graph)
+            except wiz.exception.WizError as error:
+                self._record_failure(graph, error)
 
-                # Raise remaining error found in graph if necessary.
-                validate(graph, distance_mapping)
+    def _resolve_combinations_concurrently(self, executor):
+        """Resolve combinations concurrently and return list of packages.
 
-                # Extract packages ordered by descending order of distance.
-                return extract_ordered_packages(graph, distance_mapping)
+        Up to :attr:`jobs <_jobs>` combinations are computed concurrently
+        with *executor*, and results are processed in the same order as the
+        combinations are generated. Failures are recorded as if combinations
+        were computed one at a time, and the first combination resolved is
+        returned.
 
-            except wiz.exception.WizError as error:
-                wiz.history.record_action(
-                    wiz.symbol.GRAPH_RESOLUTION_FAILURE_ACTION,
-                    graph=graph, error=error
+        :param executor: Instance of :class:`concurrent.futures.Executor`.
+
+        :raise: :exc:`wiz.exception.GraphResolutionError` if no combinations
+            can be resolved.
+
+        """
+        # Definition mapping is only sent to workers which do not record it
+        # yet, and serialized once when first required.
+        token = _fetch_definition_token(self._definition_mapping)
+        definition_mapping = None
+
+        # Serialize each graph divided into combinations only once, as
+        # combinations generated from the same graph only differ by the nodes
+        # to remove.
+        graphs = {}
+
+        # Combinations submitted in the order in which they are generated.
+        pending = collections.deque()
+
+        while True:
+            while len(pending) < self._jobs:
+                graph, nodes_to_remove = self._fetch_combination(len(pending))
+                if graph is None:
+                    break
+
+                if graph.identifier not in graphs:
+                    graphs[graph.identifier] = _dump(graph, self)
+
+                task = _dump(
+                    (
+                        nodes_to_remove, self._learn_nogoods,
+                        self._combination[1] if self._combination else None,
+                        self._export_learned_state()
+                    ),
+                    self
+                )
+
+                submit = functools.partial(
+                    executor.submit, _resolve_combination_in_worker, token,
+                    graph.identifier, graphs[graph.identifier], task,
+                    deadline=self._deadline
+                )
+
+                pending.append((
+                    graph, nodes_to_remove, self._combination,
+                    len(self._learned), submit, submit()
+                ))
+
+            if len(pending) == 0:
+                _raise_latest_error(self._latest_error, self._nb_failures)
+
+            graph, nodes_to_remove, combination, index, submit, future = (
+                pending.popleft()
+            )
+
+            self._distance_revision = None
+            self._combination = combination
+
+            # Skip combination if a nogood has been recorded in the meantime.
+            if combination is not None and combination[0].match(
+                nodes_to_remove
+            ):
+                self._logger.debug(
+                    "Skip combination without following nodes as it "
+                    "contains a nogood: {!r}".format(nodes_to_remove)
+                )
+                self._statistics["pruned_combinations"] += 1
+                continue
+
+            result = self._wait_for(future)
+
+            # Submit combination again with definition mapping if the worker
+            # does not record it.
+            if result is None:
+                if definition_mapping is None:
+                    definition_mapping = cPickle.dumps(
+                        self._definition_mapping, cPickle.HIGHEST_PROTOCOL
+                    )
+
+                result = self._wait_for(
+                    submit(definition_mapping=definition_mapping)
+                )
+
+            result = _load(result, self)
+
+            # Compute combination again if errors or conflicts recorded in the
+            # meantime would have been checked.
+            if any(
+                all(identifier in result["checked"] for identifier in element)
+                for element in self._learned[index:]
+            ):
+                self._logger.debug(
+                    "Compute combination again without following nodes: "
+                    "{!r}".format(nodes_to_remove)
                 )
+                self._restore_pending_combinations(pending)
+
+                # To prevent mutating any copy of the instance.
+                graph = graph.copy()
+
+                try:
+                    return self._resolve_combination(graph, nodes_to_remove)
+
+                except wiz.exception.ResolutionInterrupted:
+                    raise
+
+                except wiz.exception.WizError as error:
+                    self._record_failure(graph, error)
+
+                continue
+
+            # Results of remaining pending combinations are ignored.
+            if result["packages"] is not None:
+                return result["packages"]
+
+            # Worker interrupted the combination as the timeout is exceeded.
+            if isinstance(
+                result["error"], wiz.exception.ResolutionInterrupted
+            ):
+                self._check_interruption()
+
+            for nogood in result["nogoods"]:
+                self._record_nogood(nogood)
+
+            # Combinations extracted from the graph must be computed before
+            # the pending combinations.
+            if result["extracted"]:
+                self._restore_pending_combinations(pending)
+                self._extract_combinations(result["graph"])
+
+            self._record_failure(result["graph"], result["error"])
+
+    def _wait_for(self, future):
+        """Return result of *future* once it is completed.
+
+        If a timeout or a cancellation event is set, the resolution is checked
+        for interruption while waiting for the result.
+
+        :param future: Instance of :class:`concurrent.futures.Future`.
+
+        :raise: :exc:`wiz.exception.ResolutionInterrupted` if the resolution
+            is interrupted.
+
+        """
+        if self._deadline is None and self._cancel_event is None:
+            return future.result()
+
+        while True:
+            self._check_interruption()
+
+            try:
+                return future.result(timeout=_POLLING_INTERVAL)
+
+            except concurrent.futures.TimeoutError:
+                continue
+
+    def _exhausted_combinations(self, pending=0):
+        """Indicate whether maximum number of combinations has been reached.
+
+        :param pending: Number of combinations being computed which are
+            counted as failed. Default is 0.
+
+        :return: Boolean value.
+
+        """
+        return (
+            self._max_combinations is not None
+            and self._nb_failures + pending >= self._max_combinations
+        )
+
+    def _check_interruption(self):
+        """Raise error if the resolution must be interrupted.
+
+        :raise: :exc:`wiz.exception.ResolutionInterrupted` if the cancellation
+            event is set.
+
+        :raise: :exc:`wiz.exception.ResolutionLimitExceeded` if the timeout or
+            the maximum number of combinations is exceeded.
+
+        """
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            self._raise_interruption(
+                wiz.exception.ResolutionInterrupted,
+                "The resolution has been cancelled"
+            )
+
+        if self._deadline is not None and time.time() > self._deadline:
+            self._raise_interruption(
+                wiz.exception.ResolutionLimitExceeded,
+                "The resolution has exceeded the timeout of {} "
+                "second(s)".format(self._timeout)
+            )
+
+        if self._exhausted_combinations():
+            self._raise_interruption(
+                wiz.exception.ResolutionLimitExceeded,
+                "The resolution has exceeded the maximum of {} "
+                "combination(s)".format(self._max_combinations)
+            )
+
+    def _raise_interruption(self, exception_type, reason):
+        """Raise interruption error with conflicts recorded so far.
+
+        :param exception_type: Type of
+            :exc:`wiz.exception.ResolutionInterrupted` to raise.
+
+        :param reason: Message indicating why the resolution is interrupted.
+
+        :raise: *exception_type*.
+
+        """
+        message = (
+            "{} after {} failed combination(s) out of {} estimated.".format(
+                reason, self._nb_failures, self._estimated_combinations
+            )
+        )
+
+        if self._latest_error is not None:
+            message += "\n\nLatest error:\n\n{}".format(
+                self._latest_error.message
+            )
+
+        # Each conflict mapping is recorded for several identifiers.
+        conflicts = []
+
+        for mapping in self._conflicts_mapping.values():
+            for conflict in mapping.values():
+                if not any(conflict is _conflict for _conflict in conflicts):
+                    conflicts.append(conflict)
+
+        raise exception_type(message, conflicts=conflicts)
+
+    def _restore_pending_combinations(self, pending):
+        """Add *pending* combinations back to the iterator.
+
+        Results of pending combinations are discarded, as they will be computed
+        again with errors and conflicts recorded in the meantime.
+
+        :param pending: Deque of pending combinations which will be emptied.
+
+        """
+        combinations = []
+
+        while len(pending) > 0:
+            graph, nodes_to_remove, _, _, _, _ = pending.popleft()
+            combinations.append((graph, nodes_to_remove))
+
+        self._iterator = itertools.chain(combinations, self._iterator)
+
+    def _export_learned_state(self):
+        """Return errors and conflicts required to compute combinations.
+
+        Conflict mappings are exported without the graphs they originate from
+        as only requirements and identifiers are required to raise an error.
+
+        :return: Tuple with set of node identifiers with errors, conflicts
+            mapping and set of node identifiers which required graph division.
+
+        """
+        conflicts_mapping = {
+            identifier: {
+                conflict: {
+                    key: value for key, value in mapping.items()
+                    if key != "graph"
+                }
+                for conflict, mapping in _mapping.items()
+            }
+            for identifier, _mapping in self._conflicts_mapping.items()
+        }
 
-                # Extract existing node errors in the graph.
-                self._node_errors.update(graph.error_identifiers())
+        return (
+            self._node_errors, conflicts_mapping, self._variant_identifiers
+        )
+
+    def _resolve_combination(self, graph, nodes_to_remove):
+        """Return list of packages resolved from combination.
+
+        :param graph: Instance of :class:`Graph`.
+
+        :param nodes_to_remove: List of node identifiers that should be
+            removed from the graph as part of this combination.
+
+        :raise: :exc:`wiz.exception.WizError` if the combination cannot be
+            resolved.
+
+        """
+        # Compute new graph.
+        graph = self._compute_combination(graph, nodes_to_remove)
+
+        return self._resolve_graph(graph)
+
+    def _resolve_graph(self, graph):
+        """Return list of packages resolved from combination *graph*.
+
+        :param graph: Instance of :class:`Graph`.
+
+        :raise: :exc:`wiz.exception.WizError` if the graph cannot be resolved.
+
+        """
+        # Raise error if a conflict in graph cannot be solved.
+        self._resolve_conflicts(graph)
+
+        # Compute distance mapping if necessary.
+        distance_mapping, _ = self._fetch_distance_mapping(graph)
+
+        # Raise remaining error found in graph if necessary.
+        validate(graph, distance_mapping)
+
+        # Extract packages ordered by descending order of distance.
+        return extract_ordered_packages(graph, distance_mapping)
+
+    def _record_failure(self, graph, error):
+        """Record errors and conflicts from combination which failed.
+
+        :param graph: Instance of :class:`Graph`.
 
-                # Extract conflicting identifiers and requirements if possible.
-                if isinstance(error, wiz.exception.GraphResolutionError):
-                    self._update_conflicts(error)
+        :param error: Instance of :exc:`wiz.exception.WizError`.
 
-                self._logger.debug("Failed to resolve graph: {}".format(error))
-                latest_error = error
-                nb_failures += 1
+        """
+        wiz.history.record_action(
+            wiz.symbol.GRAPH_RESOLUTION_FAILURE_ACTION,
+            graph=graph, error=error
+        )
+
+        # Extract existing node errors in the graph.
+        for identifier in sorted(graph.error_identifiers()):
+            if identifier not in self._node_errors:
+                self._node_errors.add(identifier)
+                self._learned.append((identifier,))
+
+        # Extract conflicting identifiers and requirements if possible.
+        if isinstance(error, wiz.exception.GraphResolutionError):
+            self._update_conflicts(error)
+
+        self._nb_failures += 1
+        self._latest_error = error
+
+        self._logger.debug("Failed to resolve graph: {}".format(error))
 
     def _update_conflicts(self, exception):
         """Extract and record conflicts from *exception* if possible.
@@ -203,6 +824,7 @@ class Resolver(object):
                 for conflict in conflicts:
                     self._conflicts_mapping.setdefault(identifier, {})
                     self._conflicts_mapping[identifier][conflict] = mapping
+                    self._learned.append((identifier, conflict))
 
     def _initiate_iterator(self, graph):
         """Initialize iterator with a *graph*.
@@ -212,12 +834,14 @@ class Resolver(object):
         """
         self._logger.debug("Initiate iterator from graph")
 
-        # Reset the iterator.
+        # Reset the iterator and nogoods recorded for previous graphs.
         self._iterator = iter([])
+        self._nogoods = {}
 
         # Initialize combinations or simply add graph to iterator.
         if not self._extract_combinations(graph):
             self._iterator = iter([(graph, [])])
+            self._estimated_combinations += 1
 
     def _extract_combinations(self, graph):
         """Extract possible combinations from variant conflicts in *graph*.
@@ -266,6 +890,23 @@ class Resolver(object):
             graph=graph, variant_groups=variant_groups
         )
 
+        # Estimate the number of combinations generated from variant groups.
+        estimate = 1
+        for group in variant_groups:
+            estimate *= len(group)
+
+        self._estimated_combinations += estimate
+        self._logger.debug(
+            "Estimated number of combinations: {} (total: {})".format(
+                estimate, self._estimated_combinations
+            )
+        )
+
+        if self._learn_nogoods:
+            self._nogoods[graph.identifier] = _Nogoods(
+                _id for _group in variant_groups for _id in _group
+            )
+
         self._iterator = itertools.chain(
             generate_variant_combinations(graph, variant_groups),
             self._iterator
@@ -275,46 +916,121 @@ class Resolver(object):
     def _fetch_distance_mapping(self, graph):
         """Return tuple with distance mapping and boolean update indicator.
 
-        If no distance mapping is available, a new one is generated from
-        *graph*. The boolean update indicator is True only if a new distance
-        mapping is generated.
+        The distance mapping is maintained by *graph*. The boolean update
+        indicator is True only if the graph has been modified since the
+        distance mapping was last fetched.
 
         :param graph: Instance of :class:`Graph`.
 
         :return: Tuple with distance mapping and boolean value.
 
         """
-        updated = False
+        revision = (graph.identifier, graph.revision)
 
-        if self._distance_mapping is None:
-            self._distance_mapping = compute_distance_mapping(graph)
-            updated = True
+        updated = revision != self._distance_revision
+        self._distance_revision = revision
 
-        return self._distance_mapping, updated
+        return graph.distance_mapping(), updated
 
     def _fetch_next_combination(self):
         """Return next graph and nodes to remove from the combination iterator.
 
+        :return: Copy of next :class:`Graph` instance and list of nodes to
+            remove from it. If the combination iterator is empty, the graph
+            will be returned as None and the node removal list will be empty.
+
+        :raise: :exc:`wiz.exception.ResolutionInterrupted` if the resolution
+            must be interrupted before computing the next combination.
+
+        """
+        graph, nodes_to_remove = self._fetch_combination()
+        if graph is None:
+            return None, []
+
+        # To prevent mutating any copy of the instance.
+        return graph.copy(), nodes_to_remove
+
+    def _fetch_combination(self, pending=0):
+        """Return next graph and nodes to remove which can be computed.
+
+        The resolution is checked for interruption before returning each
+        combination, so that the maximum number of combinations is enforced
+        the same way whether combinations are computed concurrently or not.
+
+        :param pending: Number of combinations being computed, which are
+            counted as failed. Default is 0.
+
+        :return: Next :class:`Graph` instance recorded in the iterator and
+            list of nodes to remove from it. If the combination iterator is
+            empty, or if the maximum number of combinations would be exceeded
+            should pending combinations fail, the graph will be returned as
+            None and the node removal list will be empty.
+
+        :raise: :exc:`wiz.exception.ResolutionInterrupted` if the resolution
+            must be interrupted before computing the next combination.
+
+        """
+        # Results of pending combinations are required to know whether
+        # another combination can be computed.
+        if pending > 0 and self._exhausted_combinations(pending):
+            return None, []
+
+        # The iterator can only be re-initialized from conflicts once all
+        # previous combinations have been processed.
+        graph, nodes_to_remove = self._next_combination(reset=pending == 0)
+        if graph is None:
+            return None, []
+
+        self._check_interruption()
+        return graph, nodes_to_remove
+
+    def _next_combination(self, reset=True):
+        """Return next graph and nodes to remove from the combination iterator.
+
+        The graph returned is the one recorded in the iterator, so it must be
+        copied before being mutated.
+
+        :param reset: Indicate whether the iterator should be re-initialized
+            from recorded requirement conflicts when it is empty. Default is
+            True.
+
         :return: Next :class:`Graph` instance and list of nodes to remove from
             it. If the combination iterator is empty, the graph will be returned
             as None and the node removal list will be empty.
 
         """
         # Reset the distance mapping for new graph.
-        self._distance_mapping = None
+        self._distance_revision = None
+        self._combination = None
 
         while True:
             try:
                 graph, nodes_to_remove = next(self._iterator)
 
-                # To prevent mutating any copy of the instance.
-                return copy.deepcopy(graph), nodes_to_remove
+                nogoods = self._nogoods.get(graph.identifier)
+                if nogoods is not None:
+                    if nogoods.match(nodes_to_remove):
+                        self._logger.debug(
+                            "Skip combination without following nodes as it "
+                            "contains a nogood: {!r}".format(nodes_to_remove)
+                        )
+                        self._statistics["pruned_combinations"] += 1
+                        continue
+
+                    self._combination = (
+                        nogoods, nogoods.identifiers.difference(nodes_to_remove)
+                    )
+
+                return graph, nodes_to_remove
 
             except StopIteration:
                 self._logger.debug(
                     "No more combination in"
                 )
 
+                if not reset:
+                    return None, []
+
                 # If iterator is empty, check the requirement conflicts to find
                 # out if a new graph could be computed with different versions.
                 if not self._reset_from_conflicts():
@@ -351,7 +1067,7 @@ class Resolver(object):
                 return False
 
             # To prevent mutating any copy of the instance.
-            _graph = copy.deepcopy(graph)
+            _graph = graph.copy()
 
             # Iterator can be initialized only if all identifiers can be
             # replaced with lower version.
@@ -397,15 +1113,14 @@ class Resolver(object):
             # Extract combined requirement to node and modify it to exclude
             # current package version.
             requirement = combined_requirements(graph, [node])
-            exclusion_requirement = wiz.utility.get_requirement(
-                "{} != {}".format(requirement.name, node.package.version)
+            requirement = requirement.intersect(
+                wiz.utility.get_requirement(
+                    "{} != {}".format(requirement.name, node.package.version)
+                )
             )
-            requirement.specifier &= exclusion_requirement.specifier
 
             try:
-                packages = wiz.package.extract(
-                    requirement, self._definition_mapping
-                )
+                packages = self.fetch_packages(requirement)
             except wiz.exception.RequestNotFound:
                 self._logger.debug(
                     "Impossible to fetch another version for conflicting "
@@ -481,6 +1196,17 @@ class Resolver(object):
                 relink_parents(graph, node)
 
             except wiz.exception.GraphResolutionError:
+                # Variants kept for this definition are incompatible with
+                # requirements from parents of removed variants.
+                definition_id = node.definition.qualified_identifier
+                identifiers = set(graph.variant_identifiers(definition_id))
+
+                for _node in removed_nodes:
+                    if _node.definition.qualified_identifier == definition_id:
+                        identifiers.update(_node.parent_identifiers)
+
+                self._record_nogood(identifiers)
+
                 # Raise more palatable error message to indicate that graph
                 # combination could not be computed.
                 _raise_variant_conflicts(graph, node, removed_nodes)
@@ -510,6 +1236,9 @@ class Resolver(object):
         identifiers = self._node_errors.intersection(all_identifiers)
 
         if len(self._node_errors.intersection(all_identifiers)) > 0:
+            for identifier in identifiers:
+                self._record_nogood_from_graph(graph, [identifier])
+
             _raise_node_errors(graph, identifiers)
 
     def _check_conflicts_in_combination(self, graph):
@@ -531,6 +1260,9 @@ class Resolver(object):
             identifiers = conflicts.intersection(all_identifiers)
 
             if len(identifiers) > 0:
+                for _id in identifiers:
+                    self._record_nogood_from_graph(graph, [identifier, _id])
+
                 conflict_mappings = (
                     (
                         self._conflicts_mapping[identifier][_id],
@@ -544,6 +1276,51 @@ class Resolver(object):
                     record_conflicts=False
                 )
 
+    def _record_nogood_from_graph(self, graph, identifiers):
+        """Record variants leading to node *identifiers* in *graph* as nogood.
+
+        Node *identifiers* will be in the graph of any combination keeping all
+        variants from which they can be reached, unless a node leading to them
+        has conditions which could be fulfilled differently. In this case, the
+        nogood is not recorded.
+
+        :param graph: Instance of :class:`Graph`.
+
+        :param identifiers: List of node identifiers which lead the current
+            combination to be rejected.
+
+        """
+        if self._combination is None:
+            return
+
+        ancestors = extract_ancestors(graph, identifiers)
+
+        for identifier in ancestors:
+            node = graph.node(identifier)
+            if node is not None and len(node.package.conditions) > 0:
+                return
+
+        self._record_nogood(ancestors)
+
+    def _record_nogood(self, identifiers):
+        """Record variants kept within node *identifiers* as nogood.
+
+        :param identifiers: Set of node identifiers which lead the current
+            combination to be rejected.
+
+        """
+        if self._combination is None:
+            return
+
+        nogoods, kept_identifiers = self._combination
+        nogood = kept_identifiers.intersection(identifiers)
+
+        if nogoods.add(nogood):
+            self._logger.debug(
+                "Record nogood: {!r}".format(sorted(nogood))
+            )
+            self._statistics["learned_nogoods"] += 1
+
     def _resolve_conflicts(self, graph):
         """Attempt to resolve all conflicts in *graph*.
 
@@ -572,21 +1349,29 @@ class Resolver(object):
             graph=graph, conflicting=conflicts
         )
 
+        queue = _ConflictQueue(conflicts)
+
         while True:
+            self._check_interruption()
+
             # If no nodes are left in the queue, exit the loop. The graph
             # is officially resolved. Hooray!
-            if not conflicts:
+            if queue.empty():
                 return
 
             # Sort conflicting nodes by distances.
             distance_mapping, updated = self._fetch_distance_mapping(graph)
 
-            if updated or self._conflicts_needs_sorting:
-                conflicts = updated_by_distance(conflicts, distance_mapping)
+            if updated or self._conflicts_needs_sorting or not queue.sorted:
+                queue.sort(distance_mapping)
+
+                # Unreachable nodes are discarded from the queue.
+                if queue.empty():
+                    return
 
             # Pick up the furthest conflicting node identifier so that nearest
             # node have priorities.
-            identifier = conflicts.pop()
+            identifier = queue.pop()
             node = graph.node(identifier)
 
             # If node has already been removed from graph, ignore.
@@ -606,7 +1391,7 @@ class Resolver(object):
 
             # Query packages from combined requirement.
             packages = self._extract_packages(
-                requirement, graph, [node] + conflicting_nodes, conflicts
+                requirement, graph, [node] + conflicting_nodes, queue
             )
             if packages is None:
                 continue
@@ -620,10 +1405,6 @@ class Resolver(object):
                 self._logger.debug("Remove '{}'".format(node.identifier))
                 graph.remove_node(node.identifier)
 
-                # The graph changed in a way that can affect the distances of
-                # other nodes, so the distance mapping cached is discarded.
-                self._distance_mapping = None
-
                 # Update the graph if necessary
                 updated = self._add_packages_to_graph(
                     graph, packages, requirement, conflicting_nodes
@@ -639,9 +1420,7 @@ class Resolver(object):
 
                 # Update conflict list if necessary.
                 if updated:
-                    conflicts = list(
-                        set(conflicts + graph.conflicting_identifiers())
-                    )
+                    queue.update(graph.conflicting_identifiers())
 
                     # If the updated graph contains conflicting variants, the
                     # relevant combination must be extracted, therefore the
@@ -671,16 +1450,14 @@ class Resolver(object):
 
         :param nodes: List of :class:`Node` instances.
 
-        :param conflicting_identifiers: List of node identifiers conflicting
-            in *graph*.
+        :param conflicting_identifiers: Collection of node identifiers
+            conflicting in *graph*.
 
         :return: List of :class:`~wiz.package.Package` instances, or None.
 
         """
         try:
-            packages = wiz.package.extract(
-                requirement, self._definition_mapping
-            )
+            packages = self.fetch_packages(requirement)
         except wiz.exception.RequestNotFound:
             conflict_mappings = extract_conflicting_requirements(graph, nodes)
             parents = set(
@@ -771,10 +1548,9 @@ class Resolver(object):
             if not updated:
                 return
 
-            # Remove all unreachable nodes if the graph has been updated. Reset
-            # the distance mapping if nodes have been removed.
-            if trim_unreachable_from_graph(graph, distance_mapping):
-                self._distance_mapping = None
+            # Remove all unreachable nodes if the graph has been updated. The
+            # distance mapping is updated by the graph if nodes are removed.
+            trim_unreachable_from_graph(graph, distance_mapping)
 
             # Fetch updated distance mapping or return now.
             distance_mapping, updated = self._fetch_distance_mapping(graph)
@@ -782,9 +1558,192 @@ class Resolver(object):
                 return
 
             # Search and trim invalid nodes from graph if conditions are no
-            # longer fulfilled. If so reset the distance mapping.
+            # longer fulfilled.
             while trim_invalid_from_graph(graph, distance_mapping):
-                self._distance_mapping = None
+                pass
+
+
+def _resolve_combination_in_worker(
+    token, graph_identifier, graph, task, definition_mapping=None,
+    deadline=None
+):
+    """Resolve combination from serialized *task* and return serialized result.
+
+    This function is used by :class:`Resolver` to compute combinations
+    concurrently.
+
+    :param token: Unique token identifying the definition mapping, so that it
+        is only sent and deserialized once per worker.
+
+    :param graph_identifier: Identifier of the :class:`Graph` instance
+        divided into combinations, so that it is only deserialized once per
+        worker.
+
+    :param graph: Serialized :class:`Graph` instance divided into
+        combinations.
+
+    :param task: Serialized tuple with the list of node identifiers to remove
+        from the graph, a boolean value indicating whether nogoods should be
+        recorded, the set of variant node identifiers kept in the combination
+        if applicable, and the errors and conflicts recorded so far.
+
+    :param definition_mapping: Serialized mapping regrouping all available
+        definitions associated with their unique identifier. Default is None,
+        which means that the worker should already record the definition
+        mapping corresponding to *token*.
+
+    :param deadline: Time at which the combination should be interrupted.
+        Default is None.
+
+    :return: Serialized mapping in the form of::
+
+            {
+                "packages": None,
+                "error": GraphResolutionError(),
+                "graph": Graph(),
+                "checked": {"root", "A==0.1.0", "B[V1]==0.1.0"},
+                "nogoods": [{"B[V1]==0.1.0"}],
+                "extracted": False
+            }
+
+        None is returned if *definition_mapping* is not given and the worker
+        does not record the definition mapping corresponding to *token*.
+
+    """
+    with _WORKER_LOCK:
+        item = _WORKER_DEFINITION_MAPPINGS.pop(token, None)
+
+    if item is None:
+        if definition_mapping is None:
+            return None
+
+        _definition_mapping = cPickle.loads(definition_mapping)
+        item = (_definition_mapping, _PackageCache(_definition_mapping))
+
+    with _WORKER_LOCK:
+        # Record as most recently used.
+        _WORKER_DEFINITION_MAPPINGS[token] = item
+
+        while len(_WORKER_DEFINITION_MAPPINGS) > (
+            WORKER_DEFINITION_MAPPINGS_SIZE
+        ):
+            _WORKER_DEFINITION_MAPPINGS.popitem(last=False)
+
+    _definition_mapping, package_cache = item
+
+    resolver = Resolver(_definition_mapping)
+    resolver._package_cache = package_cache
+    resolver._deadline = deadline
+
+    with _WORKER_LOCK:
+        _graph = _WORKER_GRAPHS.pop(graph_identifier, None)
+
+    if _graph is None:
+        _graph = _load(graph, resolver)
+
+    with _WORKER_LOCK:
+        # Record as most recently used.
+        _WORKER_GRAPHS[graph_identifier] = _graph
+
+        while len(_WORKER_GRAPHS) > WORKER_GRAPHS_SIZE:
+            _WORKER_GRAPHS.popitem(last=False)
+
+    # To prevent mutating the graph shared by subsequent combinations.
+    graph = _graph.copy(resolver=resolver)
+
+    (
+        nodes_to_remove, resolver._learn_nogoods, kept_identifiers, state
+    ) = _load(task, resolver)
+
+    (
+        resolver._node_errors, resolver._conflicts_mapping,
+        resolver._variant_identifiers
+    ) = state
+
+    nogoods = []
+    if kept_identifiers is not None:
+        resolver._combination = (_RecordedNogoods(nogoods), kept_identifiers)
+
+    # Record whether the graph is divided into new combinations.
+    iterator = resolver._iterator
+
+    result = {
+        "packages": None, "error": None, "graph": graph, "checked": None,
+        "nogoods": nogoods, "extracted": False
+    }
+
+    try:
+        graph = resolver._compute_combination(graph, nodes_to_remove)
+        result["checked"] = set([graph.ROOT] + graph.identifiers())
+        result["packages"] = resolver._resolve_graph(graph)
+
+    except wiz.exception.WizError as error:
+        if result["checked"] is None:
+            result["checked"] = set([graph.ROOT] + graph.identifiers())
+
+        result["error"] = error
+        result["extracted"] = resolver._iterator is not iterator
+
+    return _dump(result, resolver)
+
+
+def _dump(element, resolver):
+    """Return serialized *element* referencing *resolver*.
+
+    Instances of :class:`Graph` are associated with a resolver which is not
+    serialized, so that it can be replaced with another resolver when the
+    element is deserialized with :func:`_load`.
+
+    :param element: Content to serialize.
+
+    :param resolver: Instance of :class:`Resolver`.
+
+    :return: Serialized element.
+
+    """
+    stream = io.BytesIO()
+
+    pickler = cPickle.Pickler(stream, cPickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = (
+        lambda _element: "resolver" if _element is resolver else None
+    )
+    pickler.dump(element)
+
+    return stream.getvalue()
+
+
+def _load(element, resolver):
+    """Return deserialized *element* referencing *resolver*.
+
+    :param element: Content serialized with :func:`_dump`.
+
+    :param resolver: Instance of :class:`Resolver` to associate with
+        deserialized instances of :class:`Graph`.
+
+    :return: Deserialized element.
+
+    """
+    unpickler = cPickle.Unpickler(io.BytesIO(element))
+    unpickler.persistent_load = lambda _: resolver
+
+    return unpickler.load()
+
+
+def _raise_latest_error(error, nb_failures):
+    """Raise latest *error* after *nb_failures* failed combinations.
+
+    :param error: Instance of :exc:`wiz.exception.WizError`.
+
+    :param nb_failures: Number of combinations which failed to be resolved.
+
+    :raise: *error*.
+
+    """
+    error.message = (
+        "Failed to resolve graph at combination #{}:\n\n"
+        "{}".format(nb_failures, error.message)
+    )
+    raise error
 
 
 def _raise_node_errors(graph, identifiers):
@@ -1179,18 +2138,53 @@ def extract_conflicting_nodes(graph, node):
     :return: List of conflicting :class:`Node`.
 
     """
-    nodes = (graph.node(_id) for _id in graph.conflicting_identifiers())
+    identifiers = graph.definition_identifiers(
+        node.definition.qualified_identifier
+    )
 
-    # Extract definition identifier
-    definition_identifier = node.definition.qualified_identifier
+    # Nodes are conflicting only if several nodes are found for definition.
+    if len(identifiers) < 2:
+        return []
 
     return [
-        _node for _node in nodes
-        if _node.definition.qualified_identifier == definition_identifier
-        and _node.identifier != node.identifier
+        graph.node(identifier) for identifier in identifiers
+        if identifier != node.identifier
     ]
 
 
+def extract_ancestors(graph, identifiers):
+    """Return node *identifiers* from *graph* with all their ancestors.
+
+    :param graph: Instance of :class:`Graph`.
+
+    :param identifiers: List of node identifiers.
+
+    :return: Set of node identifiers, including the :attr:`root <Graph.ROOT>`
+        level of the *graph* if it can be reached.
+
+    """
+    ancestors = set(identifiers)
+    queue = collections.deque(ancestors)
+
+    while len(queue) > 0:
+        node = graph.node(queue.popleft())
+        if node is None:
+            continue
+
+        for parent_identifier in node.parent_identifiers:
+            if parent_identifier in ancestors:
+                continue
+
+            if (
+                parent_identifier == graph.ROOT
+                or graph.exists(parent_identifier)
+            ):
+                ancestors.add(parent_identifier)
+                queue.append(parent_identifier)
+
+    return ancestors
+
+
 def combined_requirements(graph, nodes):
     """Return combined requirements from *nodes* in *graph*.
 
@@ -1198,6 +2192,8 @@ def combined_requirements(graph, nodes):
 
     :param nodes: List of :class:`Node` instances.
 
+    :return: Instance of :class:`wiz.utility.FrozenRequirement`.
+
     :raise: :exc:`wiz.exception.GraphResolutionError` if requirements cannot
         be combined.
 
@@ -1208,12 +2204,12 @@ def combined_requirements(graph, nodes):
         _requirements = (
             graph.link_requirement(node.identifier, _identifier)
             for _identifier in node.parent_identifiers
-            if _identifier is graph.ROOT or graph.exists(_identifier)
+            if _identifier == graph.ROOT or graph.exists(_identifier)
         )
 
         for _requirement in _requirements:
             if requirement is None:
-                requirement = copy.copy(_requirement)
+                requirement = wiz.utility.freeze_requirement(_requirement)
 
             elif requirement.name != _requirement.name:
                 raise wiz.exception.GraphResolutionError(
@@ -1224,39 +2220,45 @@ def combined_requirements(graph, nodes):
                 )
 
             else:
-                requirement.specifier &= _requirement.specifier
+                requirement = requirement.intersect(_requirement)
 
     return requirement
 
 
 def sanitize_requirement(requirement, namespace):
-    """Mutate package *requirement* according to the package *namespace*.
+    """Return package *requirement* according to the package *namespace*.
 
     This is necessary so that the requirement name is always qualified to
     prevent error when :func:`combining requirements <combined_requirements>`
     during the conflict resolution process.
 
     If the requirement "foo > 1" was used to fetch the package "namespace::foo",
-    the requirement will be mutated to "namespace::foo > 1"
+    the requirement "namespace::foo > 1" will be returned.
 
     On the other had, if the requirement "::bar==0.1.0" was used to fetch the
-    package "bar" which doesn't have a namespace, the requirement will be
-    mutated to "bar==0.1.0"
+    package "bar" which doesn't have a namespace, the requirement "bar==0.1.0"
+    will be returned.
+
+    The incoming *requirement* is never mutated as requirement instances are
+    shared between definitions.
 
     :param requirement: Instance of :class:`packaging.requirements.Requirement`.
 
     :param namespace: String indicating the package namespace, or None.
 
-    :return: Updated instance of :class:`packaging.requirements.Requirement`.
+    :return: Instance of :class:`wiz.utility.FrozenRequirement`.
 
     """
     separator = wiz.symbol.NAMESPACE_SEPARATOR
+    requirement = wiz.utility.freeze_requirement(requirement)
 
     if namespace is not None and separator not in requirement.name:
-        requirement.name = namespace + separator + requirement.name
+        return requirement.with_name(namespace + separator + requirement.name)
 
     elif namespace is None and separator in requirement.name:
-        requirement.name = requirement.name.rsplit(separator, 1)[-1]
+        return requirement.with_name(requirement.name.rsplit(separator, 1)[-1])
+
+    return requirement
 
 
 def extract_conflicting_requirements(graph, nodes):
@@ -1404,7 +2406,7 @@ def relink_parents(graph, node_removed, requirement=None):
             )
 
         for _node in _nodes:
-            _node.add_parent(parent_identifier)
+            graph.add_parent(_node.identifier, parent_identifier)
 
             graph.create_link(
                 _node.identifier,
@@ -1530,6 +2532,10 @@ class Graph(object):
         # Set of node identifiers organised per definition identifier.
         self._identifiers_per_definition = {}
 
+        # List of node identifiers organised per definition identifier with
+        # and without namespace, in the order of creation of the nodes.
+        self._identifiers_per_name = {}
+
         # List of stored nodes with related conditions.
         self._conditioned_nodes = []
 
@@ -1545,29 +2551,138 @@ class Graph(object):
         # List of exception raised per node identifier.
         self._error_mapping = {}
 
-    def __deepcopy__(self, memo):
-        """Ensure that only necessary element are copied in the new graph."""
-        result = Graph(self._resolver)
-        result._node_mapping = copy.deepcopy(self._node_mapping)
-        result._link_mapping = copy.deepcopy(self._link_mapping)
-        result._identifiers_per_definition = (
-            copy.deepcopy(self._identifiers_per_definition)
-        )
-        result._conditioned_nodes = copy.deepcopy(self._conditioned_nodes)
-        result._variants_per_definition = (
-            copy.deepcopy(self._variants_per_definition)
-        )
-        result._namespace_count = copy.deepcopy(self._namespace_count)
-        result._error_mapping = copy.deepcopy(self._error_mapping)
+        # Set of definition identifiers with several nodes in the graph.
+        self._conflicting_definitions = set()
+
+        # Set of existing node identifiers with exceptions.
+        self._error_identifiers = set()
+
+        # Set of parent identifiers linked to each node identifier.
+        self._incoming_mapping = {}
+
+        # Mapping indicating the shortest possible distance of each node
+        # identifier from the root level of the graph with corresponding
+        # parent node identifier. It is computed when first required and then
+        # updated when nodes are added or removed and when links are created.
+        self._distance_mapping = None
 
+        # Set of node identifiers organised per parent identifier in the
+        # distance mapping.
+        self._distance_children = {}
+
+        # Number incremented each time nodes or links are modified.
+        self._revision = 0
+
+        # Set of keys whose values are shared with copies of the graph,
+        # organised per mapping attribute name.
+        self._shared_keys = {}
+
+    #: Name of mapping attributes whose values are shared between copies of
+    #: the graph until they are modified.
+    _COPY_ON_WRITE_MAPPINGS = (
+        "_node_mapping", "_link_mapping", "_identifiers_per_definition",
+        "_identifiers_per_name", "_variants_per_definition", "_error_mapping",
+        "_incoming_mapping", "_distance_children"
+    )
+
+    def __deepcopy__(self, memo):
+        """Return copy of the graph sharing unchanged elements."""
+        result = self.copy()
         memo[id(self)] = result
         return result
 
+    def __getstate__(self):
+        """Return state of the graph to serialize."""
+        state = dict(self.__dict__)
+        del state["_logger"]
+        return state
+
+    def __setstate__(self, state):
+        """Restore graph from serialized *state*."""
+        self.__dict__.update(state)
+        self._logger = wiz.logging.Logger(__name__ + ".Graph")
+
+    def copy(self, resolver=None):
+        """Return copy of the graph sharing unchanged elements.
+
+        Nodes, links and other elements recorded in the graph are shared with
+        the copy and are only copied when they are modified by either of the
+        graphs, so that creating a copy of the graph for each combination does
+        not copy the entire structure.
+
+        :param resolver: Instance of :class:`Resolver` to associate with the
+            copy. Default is None, which means that the resolver of the graph
+            is kept.
+
+        :return: Instance of :class:`Graph`.
+
+        """
+        if resolver is None:
+            resolver = self._resolver
+
+        result = Graph(resolver)
+
+        for name in self._COPY_ON_WRITE_MAPPINGS:
+            mapping = getattr(self, name)
+            setattr(result, name, dict(mapping))
+
+            # Values are now shared so both graphs must copy them before
+            # modifying them.
+            self._shared_keys[name] = set(mapping.keys())
+            result._shared_keys[name] = set(mapping.keys())
+
+        result._conditioned_nodes = list(self._conditioned_nodes)
+        result._namespace_count = collections.Counter(self._namespace_count)
+        result._conflicting_definitions = set(self._conflicting_definitions)
+        result._error_identifiers = set(self._error_identifiers)
+
+        # Distance mapping values are replaced and never modified.
+        if self._distance_mapping is not None:
+            result._distance_mapping = dict(self._distance_mapping)
+
+        return result
+
+    def _writable(self, name, key, default_factory=None):
+        """Return value from mapping which can be modified.
+
+        If the value is shared with a copy of the graph, it is copied first.
+
+        :param name: Name of the mapping attribute.
+
+        :param key: Key of the value within the mapping.
+
+        :param default_factory: Callable returning the value to set in the
+            mapping if *key* is not recorded yet. Default is None, which means
+            that *key* must be recorded.
+
+        :return: Value recorded for *key* in the mapping.
+
+        :raise: :exc:`KeyError` if *key* is not recorded and no
+            *default_factory* is given.
+
+        """
+        mapping = getattr(self, name)
+        shared = self._shared_keys.get(name)
+
+        if key not in mapping and default_factory is not None:
+            mapping[key] = default_factory()
+
+        elif shared and key in shared:
+            mapping[key] = copy.copy(mapping[key])
+            shared.discard(key)
+
+        return mapping[key]
+
     @property
     def identifier(self):
         """Return unique graph identifier."""
         return self._identifier
 
+    @property
+    def revision(self):
+        """Return number incremented each time nodes or links are modified."""
+        return self._revision
+
     def identifiers(self):
         """Return all node identifiers in the graph."""
         return list(self._node_mapping.keys())
@@ -1636,19 +2751,13 @@ class Graph(object):
 
         :return: List of matching node identifiers.
 
-        .. warning::
-
-            Node identifiers which have been removed from the graph will also be
-            returned.
-
         """
         identifiers = []
 
-        for node in self.nodes():
-            # Ignore if node identifier doesn't match requirement name.
-            qualified_name = node.definition.qualified_identifier
-            name = qualified_name.split(wiz.symbol.NAMESPACE_SEPARATOR, 1)[-1]
-            if requirement.name not in [qualified_name, name]:
+        # Only nodes which match requirement name are checked.
+        for identifier in self._identifiers_per_name.get(requirement.name, []):
+            node = self._node_mapping.get(identifier)
+            if node is None:
                 continue
 
             # Ignore if node variant doesn't match requirement extras.
@@ -1663,142 +2772,392 @@ class Graph(object):
                 identifiers.append(node.package.identifier)
 
             # Node is matching if requirement contains package version.
-            elif requirement.specifier.contains(node.package.version):
+            elif wiz.utility.compile_specifier(requirement.specifier).contains(
+                node.package.version
+            ):
                 identifiers.append(node.package.identifier)
 
         return identifiers
 
-    def variant_groups(self):
-        """Return variant groups in graphs.
+    def distance_mapping(self):
+        """Return distance mapping for each node of the graph.
 
-        A variant group list should contain at least more than one node
-        identifier which belongs at least to two different variant names.
+        The mapping is :func:`computed <compute_distance_mapping>` when first
+        required, and then updated when nodes are added or removed and when
+        links are created, so that only distances of affected nodes are
+        computed again.
 
-        The variant group list contains unique identifiers and is sorted
-        following three criteria:
+        :return: Distance mapping in the form of::
 
-        1. By number of occurrences of each node identifier in the graph in
-           descending order
-        2. By the package version in descending order
-        3. By the original variant order within the definition.
+            {
+                "root": {"distance": 0, "parent": "root"},
+                "A==0.1.0": {"distance": 1, "parent": "root"},
+                "B==2.0.0": {"distance": 3, "parent": "A==0.1.0"},
+                "C==1.0.0": {"distance": None, "parent": None},
+                ...
+            }
 
-        :return: Mapping in the form of
-            ::
+        .. note::
 
-                [
-                    ["foo[V2]==0.1.0", "foo[V1]==0.1.0"],
-                    ["bar[V2]==2.2.0", "bar[V2]==2.1.5", "bar[V1]==2.1.0"]
-                ]
+            The mapping returned is a copy which is not updated when the graph
+            is modified.
 
         """
-        groups = []
+        if self._distance_mapping is None:
+            self._distance_mapping = compute_distance_mapping(self)
+            self._distance_children = {}
 
-        for definition_identifier in self._variants_per_definition.keys():
-            nodes = [
-                self._node_mapping.get(identifier) for identifier
-                in self._variants_per_definition[definition_identifier]
-                if self._node_mapping.get(identifier)
-            ]
+            for identifier, mapping in self._distance_mapping.items():
+                if mapping["parent"] is None or identifier == self.ROOT:
+                    continue
 
-            variant_identifiers = set([
-                node.package.variant_identifier for node in nodes
-            ])
-            if len(variant_identifiers) <= 1:
-                continue
+                self._distance_children.setdefault(mapping["parent"], set())
+                self._distance_children[mapping["parent"]].add(identifier)
 
-            count = collections.Counter([node.identifier for node in nodes])
-            nodes = sorted(
-                set(nodes),
-                key=lambda n: (
-                    count[n.identifier], n.package.version, -nodes.index(n)
-                ),
-                reverse=True
-            )
-            groups.append([node.identifier for node in nodes])
+        return dict(self._distance_mapping)
 
-        return groups
+    def _distance_key(self, identifier, parent_identifier):
+        """Return key to compare paths from *parent_identifier*.
 
-    def variant_identifiers(self, definition_identifier):
-        """Return variant identifiers corresponding to definition identifier.
+        The key contains the distance of node *identifier* through
+        *parent_identifier*, the distance of *parent_identifier* and
+        *parent_identifier*, so that ties are solved as with
+        :func:`compute_distance_mapping`, where parents are visited in
+        ascending order of distance and identifier.
 
-        :param definition_identifier: Qualified identifier of definition.
+        :param identifier: Unique identifier of the targeted node.
 
-        :return: List of :class:`Node` instances.
+        :param parent_identifier: Unique identifier of parent node.
+
+        :return: Tuple with distance, parent distance and parent identifier,
+            or None if *parent_identifier* is unreachable.
 
         """
-        return self._variants_per_definition.get(definition_identifier, [])
+        mapping = self._distance_mapping.get(parent_identifier)
+        if mapping is None or mapping["distance"] is None:
+            return
 
-    def outcoming(self, identifier):
-        """Return outcoming node identifiers for node *identifier*.
+        distance = mapping["distance"]
+        weight = self.link_weight(identifier, parent_identifier)
+        return distance + weight, distance, parent_identifier
+
+    def _current_distance_key(self, identifier):
+        """Return key of current path to node *identifier*.
 
         :param identifier: Unique identifier of the targeted node.
 
-        :return: List of dependent node identifiers.
+        :return: Tuple with distance, parent distance and parent identifier,
+            or None if node *identifier* is unreachable.
 
         """
-        return [
-            _identifier for _identifier
-            in self._link_mapping.get(identifier, {}).keys()
-            if self.exists(_identifier)
-        ]
+        mapping = self._distance_mapping[identifier]
+        if mapping["distance"] is None:
+            return
 
-    def link_weight(self, identifier, parent_identifier):
-        """Return weight from link between parent and node identifier.
+        parent = mapping["parent"]
+        return (
+            mapping["distance"], self._distance_mapping[parent]["distance"],
+            parent
+        )
+
+    def _set_distance(self, identifier, distance, parent_identifier):
+        """Record *distance* and *parent_identifier* for node *identifier*.
 
         :param identifier: Unique identifier of the targeted node.
 
-        :param parent_identifier: Unique identifier of parent node.
+        :param distance: Distance from the root level of the graph, or None.
 
-        :return: Integer value.
+        :param parent_identifier: Unique identifier of parent node, or None.
 
         """
-        return self._link_mapping[parent_identifier][identifier]["weight"]
+        mapping = self._distance_mapping.get(identifier, {})
+        _parent_identifier = mapping.get("parent")
 
-    def link_requirement(self, identifier, parent_identifier):
-        """Return requirement from link between parent and node identifier.
+        if _parent_identifier not in (None, parent_identifier):
+            self._writable(
+                "_distance_children", _parent_identifier, set
+            ).discard(identifier)
 
-        :param identifier: Unique identifier of the targeted node.
+        if parent_identifier is not None:
+            self._writable(
+                "_distance_children", parent_identifier, set
+            ).add(identifier)
 
-        :param parent_identifier: Unique identifier of parent node.
+        self._distance_mapping[identifier] = {
+            "distance": distance, "parent": parent_identifier
+        }
 
-        :return: Instance of :class:`packaging.requirements.Requirement`.
+    def _propagate_distances(self, identifiers, restricted=None):
+        """Update distances reachable from node *identifiers*.
 
-        """
-        return self._link_mapping[parent_identifier][identifier]["requirement"]
+        This is using `Dijkstra's shortest path algorithm
+        <https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm>`_ from nodes
+        whose distance has just been reduced or computed.
 
-    def conflicting_identifiers(self):
-        """Return conflicting nodes identifiers.
+        :param identifiers: List of node identifiers with updated distance.
 
-        A conflict appears when several nodes are found for a single
-        definition identifier.
+        :param restricted: Set of node identifiers which can be updated.
+            Default is None, which means that all nodes can be updated.
 
-        :return: List of node identifiers.
+        """
+        queue = _DistanceQueue({
+            identifier: self._distance_mapping[identifier]["distance"]
+            for identifier in identifiers
+        })
+
+        while not queue.empty():
+            identifier = queue.pop_smallest()
+
+            for child_identifier in self.outcoming(identifier):
+                if (
+                    restricted is not None and
+                    child_identifier not in restricted
+                ):
+                    continue
+
+                key = self._distance_key(child_identifier, identifier)
+                current_key = self._current_distance_key(child_identifier)
+
+                if current_key is None or key < current_key:
+                    self._set_distance(child_identifier, key[0], identifier)
+                    queue[child_identifier] = key[0]
+
+    def _update_distances_from_link(self, identifier, parent_identifier):
+        """Update distance mapping after creating a link.
+
+        :param identifier: Unique identifier of the targeted node.
+
+        :param parent_identifier: Unique identifier of parent node.
+
+        """
+        if self._distance_mapping is None or not self.exists(identifier):
+            return
+
+        key = self._distance_key(identifier, parent_identifier)
+        if key is None:
+            return
+
+        current_key = self._current_distance_key(identifier)
+        if current_key is None or key < current_key:
+            self._set_distance(identifier, key[0], parent_identifier)
+            self._propagate_distances([identifier])
+
+    def _update_distances_from_node(self, identifier):
+        """Update distance mapping after adding node *identifier*.
+
+        :param identifier: Unique identifier of the targeted node.
+
+        """
+        if self._distance_mapping is None:
+            return
+
+        self._set_distance(identifier, None, None)
+
+        keys = [
+            self._distance_key(identifier, parent_identifier)
+            for parent_identifier in self._incoming_mapping.get(identifier, [])
+        ]
+        keys = [key for key in keys if key is not None]
+
+        if len(keys) > 0:
+            key = min(keys)
+            self._set_distance(identifier, key[0], key[2])
+            self._propagate_distances([identifier])
+
+    def _update_distances_from_removal(self, identifier):
+        """Update distance mapping after removing node *identifier*.
+
+        Only distances of nodes which were reached through the node removed
+        are computed again.
+
+        :param identifier: Unique identifier of the node removed.
 
         """
-        conflicting = []
+        if self._distance_mapping is None:
+            return
+
+        mapping = self._distance_mapping.pop(identifier, None)
+        if mapping is None:
+            return
+
+        if mapping["parent"] is not None:
+            self._writable(
+                "_distance_children", mapping["parent"], set
+            ).discard(identifier)
+
+        # Identify all nodes reached through the node removed.
+        affected = set()
+        identifiers = list(self._distance_children.pop(identifier, []))
+
+        while len(identifiers) > 0:
+            _identifier = identifiers.pop()
+            if _identifier in affected:
+                continue
+
+            affected.add(_identifier)
+            identifiers.extend(self._distance_children.pop(_identifier, []))
 
-        for identifiers in self._identifiers_per_definition.values():
-            _identifiers = [
-                identifier for identifier in identifiers
-                if self.exists(identifier)
+        for _identifier in affected:
+            self._distance_mapping[_identifier] = {
+                "distance": None, "parent": None
+            }
+
+        # Compute distances from unaffected parents before updating other
+        # distances within affected nodes.
+        identifiers = []
+
+        for _identifier in affected:
+            keys = [
+                self._distance_key(_identifier, parent_identifier)
+                for parent_identifier
+                in self._incoming_mapping.get(_identifier, [])
+                if parent_identifier not in affected
             ]
+            keys = [key for key in keys if key is not None]
 
-            if len(_identifiers) > 1:
-                conflicting += _identifiers
+            if len(keys) > 0:
+                key = min(keys)
+                self._set_distance(_identifier, key[0], key[2])
+                identifiers.append(_identifier)
 
-        return conflicting
+        self._propagate_distances(identifiers, restricted=affected)
 
-    def error_identifiers(self):
-        """Return list of existing node identifiers which encapsulate an error.
+    def variant_groups(self):
+        """Return variant groups in graphs.
+
+        A variant group list should contain at least more than one node
+        identifier which belongs at least to two different variant names.
+
+        The variant group list contains unique identifiers and is sorted
+        following three criteria:
+
+        1. By number of occurrences of each node identifier in the graph in
+           descending order
+        2. By the package version in descending order
+        3. By the original variant order within the definition.
+
+        :return: Mapping in the form of
+            ::
+
+                [
+                    ["foo[V2]==0.1.0", "foo[V1]==0.1.0"],
+                    ["bar[V2]==2.2.0", "bar[V2]==2.1.5", "bar[V1]==2.1.0"]
+                ]
+
+        """
+        groups = []
+
+        for definition_identifier in self._variants_per_definition.keys():
+            nodes = [
+                self._node_mapping.get(identifier) for identifier
+                in self._variants_per_definition[definition_identifier]
+                if self._node_mapping.get(identifier)
+            ]
+
+            variant_identifiers = set([
+                node.package.variant_identifier for node in nodes
+            ])
+            if len(variant_identifiers) <= 1:
+                continue
+
+            count = collections.Counter([node.identifier for node in nodes])
+            nodes = sorted(
+                set(nodes),
+                key=lambda n: (
+                    count[n.identifier],
+                    wiz.utility.get_version_key(n.package.version),
+                    -nodes.index(n)
+                ),
+                reverse=True
+            )
+            groups.append([node.identifier for node in nodes])
+
+        return groups
+
+    def definition_identifiers(self, definition_identifier):
+        """Return node identifiers corresponding to definition identifier.
+
+        :param definition_identifier: Qualified identifier of definition.
 
         :return: List of node identifiers.
 
+        """
+        return list(
+            self._identifiers_per_definition.get(definition_identifier, [])
+        )
+
+    def variant_identifiers(self, definition_identifier):
+        """Return variant identifiers corresponding to definition identifier.
+
+        :param definition_identifier: Qualified identifier of definition.
+
+        :return: List of :class:`Node` instances.
+
+        """
+        return self._variants_per_definition.get(definition_identifier, [])
+
+    def outcoming(self, identifier):
+        """Return outcoming node identifiers for node *identifier*.
+
+        :param identifier: Unique identifier of the targeted node.
+
+        :return: List of dependent node identifiers.
+
         """
         return [
-            identifier for identifier in self._error_mapping.keys()
-            if identifier == self.ROOT or self.exists(identifier)
+            _identifier for _identifier
+            in self._link_mapping.get(identifier, {}).keys()
+            if self.exists(_identifier)
         ]
 
+    def link_weight(self, identifier, parent_identifier):
+        """Return weight from link between parent and node identifier.
+
+        :param identifier: Unique identifier of the targeted node.
+
+        :param parent_identifier: Unique identifier of parent node.
+
+        :return: Integer value.
+
+        """
+        return self._link_mapping[parent_identifier][identifier]["weight"]
+
+    def link_requirement(self, identifier, parent_identifier):
+        """Return requirement from link between parent and node identifier.
+
+        :param identifier: Unique identifier of the targeted node.
+
+        :param parent_identifier: Unique identifier of parent node.
+
+        :return: Instance of :class:`packaging.requirements.Requirement`.
+
+        """
+        return self._link_mapping[parent_identifier][identifier]["requirement"]
+
+    def conflicting_identifiers(self):
+        """Return conflicting nodes identifiers.
+
+        A conflict appears when several nodes are found for a single
+        definition identifier.
+
+        :return: List of node identifiers.
+
+        """
+        return [
+            identifier for definition_identifier
+            in self._conflicting_definitions
+            for identifier
+            in self._identifiers_per_definition[definition_identifier]
+        ]
+
+    def error_identifiers(self):
+        """Return list of existing node identifiers which encapsulate an error.
+
+        :return: List of node identifiers.
+
+        """
+        return list(self._error_identifiers)
+
     def errors(self, identifier):
         """Return list of exceptions raised for node *identifier*.
 
@@ -1913,7 +3272,8 @@ class Graph(object):
                     "requirement": stored_node.requirement,
                     "package": stored_node.package,
                     "parent_identifier": stored_node.parent_identifier,
-                    "weight": stored_node.weight
+                    "weight": stored_node.weight,
+                    "conditions_processed": True
                 })
 
             self._update_from_queue(queue)
@@ -1939,9 +3299,8 @@ class Graph(object):
 
             try:
                 packages = (
-                    wiz.package.extract(
-                        condition, self._resolver.definition_mapping
-                    ) for condition in stored_node.package.conditions
+                    self._resolver.fetch_packages(condition)
+                    for condition in stored_node.package.conditions
                 )
 
                 # Require all package identifiers to be in the node mapping.
@@ -1988,7 +3347,10 @@ class Graph(object):
                     data.get("package"), data.get("requirement"),
                     data.get("parent_identifier"),
                     queue,
-                    weight=data.get("weight")
+                    weight=data.get("weight"),
+                    conditions_processed=data.get(
+                        "conditions_processed", False
+                    )
                 )
 
     def _update_from_requirement(
@@ -2013,27 +3375,32 @@ class Graph(object):
 
         # Get packages from requirement.
         try:
-            packages = wiz.package.extract(
-                requirement, self._resolver.definition_mapping,
-                namespace_counter=self._namespace_count
+            packages = self._resolver.fetch_packages(
+                requirement, namespace_counter=self._namespace_count
             )
 
         except wiz.exception.WizError as error:
-            self._error_mapping.setdefault(parent_identifier, [])
-            self._error_mapping[parent_identifier].append(error)
+            self._writable("_error_mapping", parent_identifier, list).append(
+                error
+            )
+
+            if parent_identifier == self.ROOT or self.exists(parent_identifier):
+                self._error_identifiers.add(parent_identifier)
+
             return
 
         # Create a node for each package if necessary.
         for package in packages:
-            sanitize_requirement(requirement, package.namespace)
+            _requirement = sanitize_requirement(requirement, package.namespace)
 
             self._update_from_package(
-                package, requirement, parent_identifier, queue,
+                package, _requirement, parent_identifier, queue,
                 weight=weight
             )
 
     def _update_from_package(
-        self, package, requirement, parent_identifier, queue, weight=1
+        self, package, requirement, parent_identifier, queue, weight=1,
+        conditions_processed=False
     ):
         """Update graph from *package*.
 
@@ -2051,6 +3418,14 @@ class Graph(object):
             link from the node to its parent. The lesser this number, the higher
             is the importance of the link. Default is 1.
 
+        :param conditions_processed: Indicate whether *package* conditions
+            have been fulfilled. Default is False.
+
+        .. note::
+
+            Packages are shared between graphs, so whether conditions have been
+            processed is not recorded on the *package* itself.
+
         """
         identifier = package.identifier
 
@@ -2058,12 +3433,7 @@ class Graph(object):
 
             try:
                 # Do not add node to the graph if conditions are unprocessed.
-                if (
-                    len(package.conditions) > 0
-                    and not package.conditions_processed
-                ):
-                    package.conditions_processed = True
-
+                if len(package.conditions) > 0 and not conditions_processed:
                     self._conditioned_nodes.append(
                         StoredNode(
                             requirement, package,
@@ -2075,13 +3445,19 @@ class Graph(object):
 
                 self._create_node_from_package(package)
 
-                # Update queue with dependent requirement.
-                for index, _requirement in enumerate(package.requirements):
-                    queue.put({
-                        "requirement": _requirement,
-                        "parent_identifier": identifier,
-                        "weight": index + 1
-                    })
+                # Add all descendants at once if possible.
+                closure = self._resolver.fetch_closure(package)
+                if closure is not None:
+                    self._update_from_closure(identifier, closure)
+
+                # Otherwise, update queue with dependent requirement.
+                else:
+                    for index, _requirement in enumerate(package.requirements):
+                        queue.put({
+                            "requirement": _requirement,
+                            "parent_identifier": identifier,
+                            "weight": index + 1
+                        })
 
             except wiz.exception.InvalidRequirement as error:
                 raise wiz.exception.IncorrectDefinition(
@@ -2093,10 +3469,8 @@ class Graph(object):
             # Update variant mapping if necessary
             self._update_variant_mapping(identifier)
 
-        node = self._node_mapping[identifier]
-
         if parent_identifier is not None:
-            node.add_parent(parent_identifier)
+            node = self.add_parent(identifier, parent_identifier)
 
             # Create links with requirement and weight.
             self.create_link(
@@ -2106,6 +3480,43 @@ class Graph(object):
                 weight=weight
             )
 
+    def _update_from_closure(self, identifier, closure):
+        """Update graph from *closure* of existing node *identifier*.
+
+        Descendants are added in the same way as when the graph is updated from
+        each requirement, so that descendants which already exist in the graph
+        are linked without adding their own dependencies again.
+
+        :param identifier: Unique identifier of the node.
+
+        :param closure: Mapping of each package identifier with a list of
+            dependency tuples as returned by :meth:`Resolver.fetch_closure`.
+
+        """
+        self._logger.debug(
+            "Update from closure of '{}' [{} package(s)]".format(
+                identifier, len(closure)
+            )
+        )
+
+        queue = collections.deque([identifier])
+
+        while len(queue) > 0:
+            parent_identifier = queue.popleft()
+
+            for package, requirement, weight in closure[parent_identifier]:
+                _identifier = package.identifier
+
+                if not self.exists(_identifier):
+                    self._create_node_from_package(package)
+                    queue.append(_identifier)
+
+                node = self.add_parent(_identifier, parent_identifier)
+                self.create_link(
+                    node.identifier, parent_identifier, requirement,
+                    weight=weight
+                )
+
     def _create_node_from_package(self, package):
         """Create node in graph from *package*.
 
@@ -2116,19 +3527,56 @@ class Graph(object):
 
         self._logger.debug("Adding package: {}".format(identifier))
         self._node_mapping[identifier] = Node(package)
+        self._revision += 1
 
         # Record node identifiers per package to identify conflicts.
         _definition_id = package.definition.qualified_identifier
-        self._identifiers_per_definition.setdefault(_definition_id, set())
-        self._identifiers_per_definition[_definition_id].add(identifier)
+        self._writable(
+            "_identifiers_per_definition", _definition_id, set
+        ).add(identifier)
+        self._update_conflicting_definition(_definition_id)
+
+        if identifier in self._error_mapping:
+            self._error_identifiers.add(identifier)
+
+        # Record node identifiers per name with and without namespace to find
+        # nodes matching a requirement.
+        name = _definition_id.split(wiz.symbol.NAMESPACE_SEPARATOR, 1)[-1]
+
+        for name in set([_definition_id, name]):
+            identifiers = self._writable("_identifiers_per_name", name, list)
+
+            # Keep the same order as the node mapping if node is created again.
+            if identifier in identifiers:
+                identifiers.remove(identifier)
+
+            identifiers.append(identifier)
 
         # Record variant per unique key identifier if necessary.
         self._update_variant_mapping(identifier)
 
+        # Update distance mapping if necessary.
+        self._update_distances_from_node(identifier)
+
         wiz.history.record_action(
             wiz.symbol.GRAPH_NODE_CREATION_ACTION, graph=self, node=identifier
         )
 
+    def _update_conflicting_definition(self, definition_identifier):
+        """Record whether several nodes exist for *definition_identifier*.
+
+        :param definition_identifier: Qualified identifier of definition.
+
+        """
+        identifiers = self._identifiers_per_definition.get(
+            definition_identifier, []
+        )
+
+        if len(identifiers) > 1:
+            self._conflicting_definitions.add(definition_identifier)
+        else:
+            self._conflicting_definitions.discard(definition_identifier)
+
     def _update_variant_mapping(self, identifier):
         """Update variant mapping according to node *identifier*.
 
@@ -2142,8 +3590,9 @@ class Graph(object):
         # This is not a set because the number of occurrences of each identifier
         # is used to determine its priority within the variant group.
         _definition_id = node.definition.qualified_identifier
-        self._variants_per_definition.setdefault(_definition_id, [])
-        self._variants_per_definition[_definition_id].append(identifier)
+        self._writable(
+            "_variants_per_definition", _definition_id, list
+        ).append(identifier)
 
     def _update_namespace_count(self, requirements):
         """Record namespace occurrences from *requirements*.
@@ -2189,12 +3638,10 @@ class Graph(object):
             can raise, but never decrease.
 
         """
-        self._link_mapping.setdefault(parent_identifier, {})
+        links = self._link_mapping.get(parent_identifier, {})
 
-        if identifier in self._link_mapping[parent_identifier].keys():
-            _weight = (
-                self._link_mapping[parent_identifier][identifier]["weight"]
-            )
+        if identifier in links.keys():
+            _weight = links[identifier]["weight"]
 
             # Skip if a link is already set between these two nodes with
             # a lower weight:
@@ -2211,7 +3658,16 @@ class Graph(object):
         )
 
         link = {"requirement": requirement, "weight": weight}
-        self._link_mapping[parent_identifier][identifier] = link
+        self._writable("_link_mapping", parent_identifier, dict)[identifier] = (
+            link
+        )
+        self._writable("_incoming_mapping", identifier, set).add(
+            parent_identifier
+        )
+        self._revision += 1
+
+        # Update distance mapping if necessary.
+        self._update_distances_from_link(identifier, parent_identifier)
 
         # Record link creation to history if necessary.
         wiz.history.record_action(
@@ -2223,6 +3679,20 @@ class Graph(object):
             requirement=requirement
         )
 
+    def add_parent(self, identifier, parent_identifier):
+        """Add *parent_identifier* as parent to node *identifier*.
+
+        :param identifier: Unique identifier of the targeted node.
+
+        :param parent_identifier: Unique identifier of the parent node.
+
+        :return: Instance of :class:`Node` updated.
+
+        """
+        node = self._writable("_node_mapping", identifier)
+        node.add_parent(parent_identifier)
+        return node
+
     def remove_node(self, identifier):
         """Remove node from the graph.
 
@@ -2234,7 +3704,19 @@ class Graph(object):
             performance.
 
         """
-        del self._node_mapping[identifier]
+        node = self._node_mapping.pop(identifier)
+        self._revision += 1
+
+        # Update conflicts and errors.
+        _definition_id = node.definition.qualified_identifier
+        self._writable(
+            "_identifiers_per_definition", _definition_id, set
+        ).discard(identifier)
+        self._update_conflicting_definition(_definition_id)
+        self._error_identifiers.discard(identifier)
+
+        # Update distance mapping if necessary.
+        self._update_distances_from_removal(identifier)
 
         wiz.history.record_action(
             wiz.symbol.GRAPH_NODE_REMOVAL_ACTION,
@@ -2286,6 +3768,12 @@ class Node(object):
         """Return set of parent identifiers."""
         return self._parent_identifiers
 
+    def __copy__(self):
+        """Return copy of the node with the same package."""
+        result = Node(self._package)
+        result._parent_identifiers = set(self._parent_identifiers)
+        return result
+
     def add_parent(self, identifier):
         """Add *identifier* as parent to the node."""
         self._parent_identifiers.add(identifier)
@@ -2450,3 +3938,584 @@ class _DistanceQueue(dict):
 
         del self[identifier]
         return identifier
+
+
+class _ConflictQueue(object):
+    """Queue of conflicting node identifiers sorted by distance.
+
+    Node identifiers are popped in descending order of distance from the
+    :attr:`root of the graph <Graph.ROOT>`, so that conflicts nearest to the
+    root have priority, and in ascending order of identifier for identical
+    distances, as with :func:`updated_by_distance`.
+
+    Identifiers are kept in a heap so that popping an identifier does not
+    require to sort the queue again.
+
+    """
+
+    def __init__(self, identifiers=None):
+        """Initialize queue with node *identifiers*.
+
+        :param identifiers: List of node identifiers. Default is None.
+
+        """
+        self._identifiers = set(identifiers or [])
+        self._heap = []
+        self._sorted = False
+
+    def __contains__(self, identifier):
+        """Indicate whether *identifier* is in the queue."""
+        return identifier in self._identifiers
+
+    def __iter__(self):
+        """Iterate over node identifiers in the queue."""
+        return iter(self._identifiers)
+
+    def __len__(self):
+        """Return number of node identifiers in the queue."""
+        return len(self._identifiers)
+
+    @property
+    def sorted(self):
+        """Indicate whether all identifiers have been sorted by distance."""
+        return self._sorted
+
+    def empty(self):
+        """Indicate whether the queue is empty."""
+        return len(self._identifiers) == 0
+
+    def update(self, identifiers):
+        """Add node *identifiers* to the queue.
+
+        The queue must be :meth:`sorted <sort>` again before popping
+        identifiers.
+
+        :param identifiers: List of node identifiers.
+
+        """
+        self._identifiers.update(identifiers)
+        self._sorted = False
+
+    def sort(self, distance_mapping):
+        """Sort identifiers according to *distance_mapping*.
+
+        Unreachable node identifiers are removed from the queue.
+
+        :param distance_mapping: Mapping indicating the shortest possible
+            distance of each node identifier from the :attr:`root <Graph.ROOT>`
+            level of the graph with its corresponding parent node identifier.
+
+        """
+        self._heap = []
+
+        for identifier in self._identifiers:
+            distance = distance_mapping.get(identifier, {}).get("distance")
+            if distance is not None:
+                self._heap.append((-distance, identifier))
+
+        heapify(self._heap)
+
+        self._identifiers = set(identifier for _, identifier in self._heap)
+        self._sorted = True
+
+    def pop(self):
+        """Return furthest node identifier and remove it from the queue.
+
+        :raise: :exc:`IndexError` if the queue is empty.
+
+        """
+        _, identifier = heappop(self._heap)
+        self._identifiers.discard(identifier)
+        return identifier
+
+
+class _Nogoods(object):
+    """Nogoods recorded for combinations of one graph division.
+
+    A nogood is a set of variant node identifiers which cannot be kept together
+    in a combination. Only minimal nogoods are recorded::
+
+        >>> nogoods = _Nogoods(["A[V1]", "A[V2]", "B[V1]", "B[V2]"])
+        >>> nogoods.add({"A[V1]", "B[V1]"})
+        True
+        >>> nogoods.add({"A[V1]", "B[V1]", "C[V1]"})
+        False
+        >>> nogoods.match(["A[V2]", "B[V2]"])
+        True
+
+    """
+
+    def __init__(self, identifiers):
+        """Initialize nogoods with variant node *identifiers*.
+
+        :param identifiers: All variant node identifiers of the graph division.
+
+        """
+        self.identifiers = frozenset(identifiers)
+        self._nogoods = []
+
+    def __iter__(self):
+        """Iterate over nogoods."""
+        return iter(self._nogoods)
+
+    def __len__(self):
+        """Return number of nogoods."""
+        return len(self._nogoods)
+
+    def add(self, identifiers):
+        """Record *identifiers* as nogood unless a smaller one is recorded.
+
+        Recorded nogoods which contain *identifiers* are discarded.
+
+        :param identifiers: Set of variant node identifiers.
+
+        :return: Boolean value indicating whether the nogood has been recorded.
+
+        """
+        nogood = frozenset(identifiers)
+
+        if any(_nogood.issubset(nogood) for _nogood in self._nogoods):
+            return False
+
+        self._nogoods = [
+            _nogood for _nogood in self._nogoods
+            if not nogood.issubset(_nogood)
+        ]
+        self._nogoods.append(nogood)
+        return True
+
+    def match(self, nodes_to_remove):
+        """Indicate whether a combination contains a nogood.
+
+        :param nodes_to_remove: List of node identifiers removed from the graph
+            as part of the combination.
+
+        :return: Boolean value.
+
+        """
+        removed = set(nodes_to_remove)
+        return any(_nogood.isdisjoint(removed) for _nogood in self._nogoods)
+
+
+class _RecordedNogoods(object):
+    """Nogoods recorded in order while a combination is computed by a worker.
+
+    Contrary to :class:`_Nogoods`, all nogoods are recorded in a list so that
+    they can be recorded again in the same order by the :class:`Resolver`
+    which requested the combination.
+
+    """
+
+    def __init__(self, nogoods):
+        """Initialize with list of *nogoods* to update.
+
+        :param nogoods: List which will record nogoods.
+
+        """
+        self._nogoods = nogoods
+
+    def add(self, nogood):
+        """Record *nogood* and return True.
+
+        :param nogood: Set of variant node identifiers.
+
+        """
+        self._nogoods.append(frozenset(nogood))
+        return True
+
+
+class _PackageCache(object):
+    """Packages extracted from requirements during a resolution.
+
+    Packages are recorded per requirement and per occurrence of namespaces
+    which could qualify the requirement name, as other namespace occurrences
+    do not change which definition is selected::
+
+        >>> cache = _PackageCache(definition_mapping)
+        >>> cache.extract(Requirement("foo"))
+        [Package("foo==0.1.0")]
+        >>> cache.extract(Requirement("foo"))
+        [Package("foo==0.1.0")]
+        >>> cache.hits, cache.requests
+        (1, 2)
+
+    """
+
+    def __init__(self, definition_mapping):
+        """Initialize cache.
+
+        :param definition_mapping: Mapping regrouping all available definitions
+            associated with their unique identifier.
+
+        """
+        self._definition_mapping = definition_mapping
+        self._packages = {}
+
+        # Record number of package lists requested and returned from cache.
+        self.hits = 0
+        self.requests = 0
+
+    @property
+    def hit_rate(self):
+        """Return ratio of packages lists returned from cache."""
+        if self.requests == 0:
+            return 0.0
+
+        return float(self.hits) / self.requests
+
+    def extract(self, requirement, namespace_counter=None):
+        """Return packages extracted from *requirement*.
+
+        :param requirement: Instance of
+            :class:`packaging.requirements.Requirement`.
+
+        :param namespace_counter: instance of :class:`collections.Counter`
+            which indicates occurrence of namespaces used as hints for package
+            identification. Default is None.
+
+        :return: List of :class:`~wiz.package.Package` instances.
+
+        :raise: :exc:`wiz.exception.RequestNotFound` if the requirement can not
+            be resolved.
+
+        """
+        self.requests += 1
+
+        key = (requirement, self._namespace_occurrences(
+            requirement, namespace_counter
+        ))
+
+        packages = self._packages.get(key)
+
+        if packages is None:
+            packages = tuple(
+                wiz.package.extract(
+                    requirement, self._definition_mapping,
+                    namespace_counter=namespace_counter
+                )
+            )
+            self._packages[key] = packages
+
+        else:
+            self.hits += 1
+
+        return list(packages)
+
+    def qualifiable(self, requirement):
+        """Indicate whether *requirement* name can be qualified by a namespace.
+
+        Packages extracted from such requirement could depend on namespace
+        occurrences.
+
+        :param requirement: Instance of
+            :class:`packaging.requirements.Requirement`.
+
+        :return: Boolean value.
+
+        """
+        return self._namespace_occurrences(requirement, None) is not None
+
+    def _namespace_occurrences(self, requirement, namespace_counter):
+        """Return occurrences of namespaces which could qualify *requirement*.
+
+        :param requirement: Instance of
+            :class:`packaging.requirements.Requirement`.
+
+        :param namespace_counter: instance of :class:`collections.Counter`
+            or None.
+
+        :return: Tuple of namespace occurrences, or None if the requirement
+            name cannot be qualified with a namespace.
+
+        """
+        if wiz.symbol.NAMESPACE_SEPARATOR in requirement.name:
+            return None
+
+        namespaces = self._definition_mapping.get("__namespace__", {}).get(
+            requirement.name
+        )
+
+        if not namespaces:
+            return None
+
+        return tuple(
+            namespace_counter[namespace] if namespace_counter else 0
+            for namespace in sorted(namespaces)
+        )
+
+
+class _ClosureCache(object):
+    """Package closures recorded for all resolutions using a definition mapping.
+
+    A closure contains the dependencies of a package and of all its
+    descendants. It is only recorded if each dependency is extracted as a
+    single package without variant nor condition, if requirement names
+    cannot be qualified with a namespace and if no definition is required
+    with several versions, so that the closure is the same for any graph::
+
+        >>> cache = _ClosureCache()
+        >>> cache.fetch(Package("foo==0.1.0"), definition_mapping)
+        {
+            "foo==0.1.0": [(Package("bar==1.0.0"), Requirement("bar"), 1)],
+            "bar==1.0.0": []
+        }
+
+    """
+
+    def __init__(self):
+        """Initialize cache."""
+        self._dependencies = {}
+        self._closures = {}
+        self._lock = threading.Lock()
+
+        # Record number of closures requested and returned from cache.
+        self.hits = 0
+        self.requests = 0
+
+    @property
+    def hit_rate(self):
+        """Return ratio of closures returned from cache."""
+        if self.requests == 0:
+            return 0.0
+
+        return float(self.hits) / self.requests
+
+    def fetch(self, package, definition_mapping):
+        """Return closure of *package*.
+
+        :param package: Instance of :class:`wiz.package.Package`.
+
+        :param definition_mapping: Mapping regrouping all available definitions
+            associated with their unique identifier, which is not kept so that
+            the cache can be discarded with it.
+
+        :return: Mapping of each package identifier in the closure with a list
+            of dependency tuples, or None if the closure cannot be recorded.
+
+        """
+        with self._lock:
+            self.requests += 1
+
+            closure = self._closures.get(package.identifier)
+
+            if closure is None:
+                package_cache = _PackageCache(definition_mapping)
+                closure = self._extract_closure(package, package_cache)
+                self._closures[package.identifier] = closure
+
+            else:
+                self.hits += 1
+
+        return closure or None
+
+    def _extract_closure(self, package, package_cache):
+        """Return closure of *package*.
+
+        :param package: Instance of :class:`wiz.package.Package`.
+
+        :param package_cache: Instance of :class:`_PackageCache` used to
+            extract dependencies.
+
+        :return: Mapping of each package identifier in the closure with a list
+            of dependency tuples, or False if the closure cannot be recorded.
+
+        """
+        closure = {}
+
+        # Record package identifier per definition to detect conflicts.
+        identifiers = {
+            package.definition.qualified_identifier: package.identifier
+        }
+
+        queue = collections.deque([package])
+
+        while len(queue) > 0:
+            _package = queue.popleft()
+
+            dependencies = self._extract_dependencies(_package, package_cache)
+            if dependencies is None:
+                return False
+
+            closure[_package.identifier] = dependencies
+
+            for dependency, _, _ in dependencies:
+                identifier = dependency.identifier
+                definition = dependency.definition
+
+                if identifiers.get(definition.qualified_identifier) is not None:
+                    # Several versions of the same definition are required.
+                    if identifiers[definition.qualified_identifier] != (
+                        identifier
+                    ):
+                        return False
+
+                    continue
+
+                # Closure of a descendant is included in this closure.
+                if self._closures.get(identifier) is False:
+                    return False
+
+                if (
+                    dependency.variant_identifier is not None
+                    or len(dependency.conditions) > 0
+                ):
+                    return False
+
+                identifiers[definition.qualified_identifier] = identifier
+                queue.append(dependency)
+
+        return closure
+
+    def _extract_dependencies(self, package, package_cache):
+        """Return dependency tuples extracted from *package* requirements.
+
+        :param package: Instance of :class:`wiz.package.Package`.
+
+        :param package_cache: Instance of :class:`_PackageCache` used to
+            extract packages from requirements.
+
+        :return: List of tuples containing the :class:`~wiz.package.Package`
+            instance extracted from each requirement, the requirement
+            sanitized for this package and the link weight, or None if a
+            requirement cannot be extracted as a single package.
+
+        """
+        if package.identifier in self._dependencies:
+            return self._dependencies[package.identifier]
+
+        dependencies = []
+
+        try:
+            for index, requirement in enumerate(package.requirements):
+                # Packages extracted could depend on the graph namespaces.
+                if package_cache.qualifiable(requirement):
+                    dependencies = None
+                    break
+
+                packages = package_cache.extract(requirement)
+                if len(packages) != 1:
+                    dependencies = None
+                    break
+
+                dependencies.append((
+                    packages[0],
+                    sanitize_requirement(requirement, packages[0].namespace),
+                    index + 1
+                ))
+
+        except wiz.exception.WizError:
+            dependencies = None
+
+        self._dependencies[package.identifier] = dependencies
+        return dependencies
+
+
+def _fetch_closure_cache(definition_mapping):
+    """Return closure cache shared by resolutions using *definition_mapping*.
+
+    Definition mappings kept in memory are replaced when registries are
+    modified, so closures recorded for previous definitions are never used.
+    The closure cache is discarded with *definition_mapping*, and it is not
+    shared if *definition_mapping* cannot be weakly referenced (e.g. a
+    :class:`dict` instance instead of a
+    :class:`wiz.definition.DefinitionMapping` instance).
+
+    :param definition_mapping: Mapping regrouping all available definitions
+        associated with their unique identifier.
+
+    :return: Instance of :class:`_ClosureCache`.
+
+    .. warning::
+
+        Closures would be incorrect if *definition_mapping* is mutated once
+        they have been recorded.
+
+    """
+    key = id(definition_mapping)
+
+    with _CLOSURE_CACHES_LOCK:
+        reference, cache = _CLOSURE_CACHES.get(key, (None, None))
+
+        # Identifier could be re-used by another mapping.
+        if reference is not None and reference() is definition_mapping:
+            return cache
+
+        cache = _ClosureCache()
+
+        try:
+            reference = weakref.ref(
+                definition_mapping,
+                functools.partial(_discard_closure_cache, key)
+            )
+
+        except TypeError:
+            return cache
+
+        _CLOSURE_CACHES[key] = (reference, cache)
+        return cache
+
+
+def _fetch_definition_token(definition_mapping):
+    """Return token identifying *definition_mapping* within workers.
+
+    The same token is returned for all resolutions using *definition_mapping*,
+    so that it is only sent once to each worker process. The token is
+    discarded with *definition_mapping*, and a new token is returned for each
+    call if *definition_mapping* cannot be weakly referenced.
+
+    :param definition_mapping: Mapping regrouping all available definitions
+        associated with their unique identifier.
+
+    :return: Hexadecimal string.
+
+    """
+    key = id(definition_mapping)
+
+    with _DEFINITION_TOKENS_LOCK:
+        reference, token = _DEFINITION_TOKENS.get(key, (None, None))
+
+        # Identifier could be re-used by another mapping.
+        if reference is not None and reference() is definition_mapping:
+            return token
+
+        token = uuid.uuid4().hex
+
+        try:
+            reference = weakref.ref(
+                definition_mapping,
+                functools.partial(_discard_definition_token, key)
+            )
+
+        except TypeError:
+            return token
+
+        _DEFINITION_TOKENS[key] = (reference, token)
+        return token
+
+
+def _discard_definition_token(key, reference):
+    """Discard definition token once its definition mapping is deleted.
+
+    :param key: Identifier of the definition mapping deleted.
+
+    :param reference: Weak reference to the definition mapping deleted.
+
+    """
+    # Lock is not used as the mapping could be deleted while it is acquired.
+    item = _DEFINITION_TOKENS.get(key)
+    if item is not None and item[0] is reference:
+        _DEFINITION_TOKENS.pop(key, None)
+
+
+def _discard_closure_cache(key, reference):
+    """Discard closure cache once its definition mapping is deleted.
+
+    :param key: Identifier of the definition mapping deleted.
+
+    :param reference: Weak reference to the definition mapping deleted.
+
+    """
+    # Lock is not used as the mapping could be deleted while it is acquired.
+    item = _CLOSURE_CACHES.get(key)
+    if item is not None and item[0] is reference:
+        _CLOSURE_CACHES.pop(key, None)
@@ -131,7 +131,7 @@ def record_action(identifier, **kwargs):
 
 def _json_default(_object):
     """Override :func:`JSONEncoder.default` to serialize all objects."""
-    from wiz.definition import Definition
+    from wiz.definition import Definition, LazyDefinitionMapping
     from wiz.package import Package
     from wiz.graph import Graph
 
@@ -141,6 +141,9 @@ def _json_default(_object):
         data["registry_path"] = _object.registry_path
         return data
 
+    if isinstance(_object, LazyDefinitionMapping):
+        return dict(_object.items())
+
     if isinstance(_object, (Graph, Package)):
         return _object.data()
 
@@ -1,14 +1,34 @@
 # :coding: utf-8
 
+import collections
+import gzip
+import io
 import os
+import zlib
+
+import ujson
 
 import wiz.config
+import wiz.definition
 import wiz.exception
 import wiz.filesystem
 import wiz.logging
 import wiz.utility
 
 
+#: Path to the index file relative to each registry.
+INDEX_PATH = os.path.join(".wiz", "index")
+
+#: Version of the index format. Indexes with a different version are ignored.
+INDEX_VERSION = 1
+
+#: Path to the pack file relative to each registry.
+PACK_PATH = os.path.join(".wiz", "pack")
+
+#: Version of the pack format. Packs with a different version are ignored.
+PACK_VERSION = 2
+
+
 def get_local():
     """Return the local registry if available.
 
@@ -107,9 +127,15 @@ def discover(path):
             yield registry_path
 
 
-def install_to_path(definitions, registry_path, overwrite=False):
+def install_to_path(
+    definitions, registry_path, overwrite=False, rebuild_pack=False
+):
     """Install a list of definitions to a registry on the file system.
 
+    If the registry contains a :func:`pack <pack>`, installed definitions are
+    appended to it. The registry :func:`index <load_index>` is updated once
+    definitions are installed.
+
     :param definitions: List of :class:`wiz.definition.Definition` instances.
 
     :param registry_path: Targeted registry path to install to
@@ -117,6 +143,12 @@ def install_to_path(definitions, registry_path, overwrite=False):
     :param overwrite: Indicate whether existing definitions in the target
         registry should be overwritten. Default is False.
 
+    :param rebuild_pack: Indicate whether the registry pack should be rebuilt
+        from all definitions in the registry instead of appending installed
+        definitions to it. The pack is rebuilt with the options it was created
+        with, or created with default options if it does not exist. Default is
+        False.
+
     :raise: :exc:`wiz.exception.DefinitionsExist` if definitions already exist
         in the target registry and overwrite is False.
 
@@ -177,6 +209,10 @@ def install_to_path(definitions, registry_path, overwrite=False):
             for definition in existing_definition_map.values()
         ])
 
+    # Record paths of definitions exported and removed to update pack.
+    exported_paths = []
+    removed_paths = []
+
     # Release definitions
     for definition in _definitions:
         path = registry_path
@@ -189,8 +225,19 @@ def install_to_path(definitions, registry_path, overwrite=False):
             )
             path = os.path.dirname(existing_definition_path)
             os.remove(existing_definition_path)
+            removed_paths.append(existing_definition_path)
+
+        exported_paths.append(
+            wiz.export_definition(path, definition, overwrite=True)
+        )
 
-        wiz.export_definition(path, definition, overwrite=True)
+    if rebuild_pack:
+        _rebuild_pack(registry_path)
+    else:
+        append_to_pack(
+            registry_path, paths=exported_paths, removed_paths=removed_paths
+        )
+        _update_index(registry_path)
 
     logger.info(
         "Successfully installed {number} definition(s) to "
@@ -199,3 +246,565 @@ def install_to_path(definitions, registry_path, overwrite=False):
             registry=registry_path
         )
     )
+
+
+def load_index(registry_path):
+    """Return index recorded for *registry_path*.
+
+    The mapping returned should be in the form of::
+
+        {
+            "options": {
+                "max_depth": None,
+                "ignore_patterns": [".git"]
+            },
+            "directories": {
+                ".": 1600000000000000000,
+                "foo": 1600000000000000000,
+                ...
+            },
+            "definitions": {
+                "foo/foo-0.1.0.json": {
+                    "signature": [1600000000000000000, 1024],
+                    "header": {
+                        "identifier": "foo",
+                        "version": "0.1.0",
+                        ...
+                    }
+                },
+                ...
+            }
+        }
+
+    Each definition entry is identified by the definition path relative to the
+    registry and records the modification time and size of the file when the
+    header was extracted. The modification time of each directory visited is
+    recorded with the options used to search the registry so that new or
+    removed definition files can be detected without listing directories.
+
+    :param registry_path: Path to the registry containing the index.
+
+    :return: Index mapping, which is empty if the index cannot be read.
+
+    .. seealso:: :meth:`wiz.definition.Definition.header`
+
+    """
+    logger = wiz.logging.Logger(__name__ + ".load_index")
+
+    index = {"options": {}, "directories": {}, "definitions": {}}
+
+    path = os.path.join(registry_path, INDEX_PATH)
+    if not os.path.isfile(path):
+        return index
+
+    try:
+        with open(path, "r") as stream:
+            data = ujson.load(stream)
+
+    except (IOError, OSError, ValueError):
+        logger.debug("Impossible to read index from {!r}".format(path))
+        return index
+
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        logger.debug("Ignore incompatible index from {!r}".format(path))
+        return index
+
+    for key in index.keys():
+        index[key] = data.get(key, {})
+
+    return index
+
+
+def export_index(registry_path, index):
+    """Export *index* mapping for *registry_path*.
+
+    The index is :func:`exported atomically <wiz.filesystem.export_atomically>`
+    so that concurrent processes never read partial content.
+
+    :param registry_path: Path to the registry containing the index.
+
+    :param index: Index mapping as returned by :func:`load_index`.
+
+    :return: Boolean value indicating whether the index has been exported.
+
+    .. note::
+
+        No error is raised if the index cannot be written (e.g. read-only
+        registry) as the index is only used to speed up the discovery of
+        definitions.
+
+    """
+    logger = wiz.logging.Logger(__name__ + ".export_index")
+
+    path = os.path.join(registry_path, INDEX_PATH)
+
+    data = {"version": INDEX_VERSION}
+    data.update(index)
+
+    try:
+        wiz.filesystem.export_atomically(path, ujson.dumps(data))
+
+    except (IOError, OSError):
+        logger.debug("Impossible to export index to {!r}".format(path))
+        return False
+
+    logger.debug("Index exported to {!r}".format(path))
+    return True
+
+
+def get_search_options(max_depth=None, ignore_patterns=None):
+    """Return options used to search definition files within a registry.
+
+    These options are recorded in the registry :func:`index <load_index>` and
+    :func:`pack <pack>` to ensure that they are only used with the same
+    options.
+
+    :param max_depth: Limited recursion value to search for definition files.
+        Default is None.
+
+    :param ignore_patterns: List of patterns matching names of files and
+        directories which should be skipped. Default is None.
+
+    :return: Options mapping.
+
+    """
+    return {
+        "max_depth": max_depth,
+        "ignore_patterns": sorted(ignore_patterns or [])
+    }
+
+
+def pack(registry_path, max_depth=None, ignore_patterns=None):
+    """Compile all definitions from *registry_path* into a single pack file.
+
+    The pack is a :mod:`gzip` file containing one :term:`JSON` record per line.
+    The first record indicates the version of the format and the options used
+    to search the registry, followed by a record listing the modification time
+    of each directory visited and a record for each definition file found with
+    the modification time and size of the file::
+
+        {"type": "header", "version": 2, "options": {...}}
+        {"type": "directories", "directories": {".": 1600000000000000000}}
+        {
+            "type": "definition",
+            "path": "foo/foo-0.1.0.json",
+            "signature": [1600000000000000000, 1024],
+            "data": {...}
+        }
+        ...
+
+    New records can be appended to the pack as additional :mod:`gzip` members
+    with :func:`append_to_pack`. Definition records override previous records
+    with the same path, and "removal" records discard them.
+
+    The registry :func:`index <load_index>` is also exported with the same
+    options, so that definitions can be fetched lazily from the registry.
+
+    :param registry_path: Path to the registry to pack.
+
+    :param max_depth: Limited recursion value to search for definition files.
+        Default is None, which means that all sub-trees will be visited.
+
+    :param ignore_patterns: List of :mod:`fnmatch` patterns matching names of
+        files and directories which should be skipped. Default is None.
+
+    :return: Number of definitions packed.
+
+    :raise: :exc:`wiz.exception.WizError` if *registry_path* is not a valid
+        directory.
+
+    :raise: :exc:`OSError` or :exc:`IOError` if the pack cannot be written.
+
+    .. seealso:: :func:`load_pack`
+
+    """
+    logger = wiz.logging.Logger(__name__ + ".pack")
+
+    if not os.path.isdir(registry_path):
+        raise wiz.exception.WizError(
+            "{path!r} is not a valid registry directory.",
+            details={"path": registry_path}
+        )
+
+    registry_path = os.path.abspath(registry_path)
+
+    # Ensure that pack directory exists before recording modification times of
+    # directories, as creating it would modify the registry.
+    wiz.filesystem.ensure_directory(
+        os.path.join(registry_path, os.path.dirname(PACK_PATH))
+    )
+
+    directories = {}
+    records = []
+    entries = {}
+
+    for entry in wiz.filesystem.scan(
+        registry_path, extension=".json", max_depth=max_depth,
+        ignore_patterns=[os.path.dirname(PACK_PATH)] + list(
+            ignore_patterns or []
+        ),
+        directories=directories
+    ):
+        try:
+            definition = wiz.definition.load(
+                entry.path, registry_path=registry_path
+            )
+
+        except (IOError, ValueError, TypeError, wiz.exception.WizError):
+            logger.warning(
+                "Error occurred trying to load definition from {!r}"
+                .format(entry.path),
+            )
+            logger.debug_traceback()
+            continue
+
+        key = os.path.relpath(entry.path, registry_path)
+        signature = _fetch_signature(entry.path)
+
+        records.append({
+            "type": "definition",
+            "path": key,
+            "signature": signature,
+            "data": definition.data(copy_data=False)
+        })
+
+        entries[key] = {"signature": signature, "header": definition.header()}
+
+    records = [
+        {
+            "type": "header",
+            "version": PACK_VERSION,
+            "options": get_search_options(max_depth, ignore_patterns)
+        },
+        {"type": "directories", "directories": directories},
+    ] + records
+
+    path = os.path.join(registry_path, PACK_PATH)
+    wiz.filesystem.export_atomically(
+        path, _compress_records(records), binary=True
+    )
+
+    export_index(registry_path, {
+        "options": get_search_options(max_depth, ignore_patterns),
+        "directories": directories,
+        "definitions": entries
+    })
+
+    logger.debug(
+        "{} definition(s) packed in {!r}".format(len(records) - 2, path)
+    )
+    return len(records) - 2
+
+
+def append_to_pack(registry_path, paths=None, removed_paths=None):
+    """Append definitions from *paths* to pack from *registry_path*.
+
+    The modification time of each directory containing *paths* or
+    *removed_paths* is recorded so that the pack remains valid.
+
+    :param registry_path: Path to the registry containing the pack.
+
+    :param paths: List of definition paths added or modified within
+        *registry_path*. Default is None.
+
+    :param removed_paths: List of definition paths removed from
+        *registry_path*. Default is None.
+
+    :return: Boolean value indicating whether the pack has been updated.
+
+    .. note::
+
+        Nothing is done if the registry does not contain a pack. The pack is
+        removed if it cannot be updated, as it would otherwise contain outdated
+        definitions.
+
+    """
+    logger = wiz.logging.Logger(__name__ + ".append_to_pack")
+
+    registry_path = os.path.abspath(registry_path)
+    path = os.path.join(registry_path, PACK_PATH)
+
+    if not os.path.isfile(path):
+        return False
+
+    records = []
+    directories = {}
+
+    def _record_directory(_path):
+        """Record modification time of directory containing *_path*."""
+        directory = os.path.dirname(_path)
+        key = os.path.relpath(directory, registry_path)
+        directories[key] = wiz.filesystem.get_modification_time(
+            os.stat(directory)
+        )
+
+    try:
+        for _path in removed_paths or []:
+            records.append({
+                "type": "removal",
+                "path": os.path.relpath(_path, registry_path),
+            })
+            _record_directory(_path)
+
+        for _path in paths or []:
+            definition = wiz.definition.load(
+                _path, registry_path=registry_path
+            )
+            records.append({
+                "type": "definition",
+                "path": os.path.relpath(_path, registry_path),
+                "signature": _fetch_signature(_path),
+                "data": definition.data(copy_data=False)
+            })
+            _record_directory(_path)
+
+        records.append({"type": "directories", "directories": directories})
+
+        with open(path, "ab") as stream:
+            stream.write(_compress_records(records))
+
+    except (IOError, OSError, ValueError, TypeError, wiz.exception.WizError):
+        logger.warning(
+            "Impossible to update pack {!r}, it will be removed.".format(path)
+        )
+        logger.debug_traceback()
+
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+        return False
+
+    logger.debug("Pack {!r} updated.".format(path))
+    return True
+
+
+def load_pack(
+    registry_path, max_depth=None, ignore_patterns=None, check_files=False
+):
+    """Return definition data recorded in pack from *registry_path*.
+
+    The pack is only used if it has been created with the same options and if
+    none of the directories recorded has been modified since the pack was
+    last updated, so that definitions can be discovered without listing
+    directories nor opening each definition file.
+
+    The mapping returned should be in the form of::
+
+        {
+            "foo/foo-0.1.0.json": {
+                "identifier": "foo",
+                "version": "0.1.0",
+                ...
+            },
+            ...
+        }
+
+    :param registry_path: Path to the registry containing the pack.
+
+    :param max_depth: Limited recursion value used to search for definition
+        files. Default is None.
+
+    :param ignore_patterns: List of patterns matching names of files and
+        directories which should be skipped. Default is None.
+
+    :param check_files: Indicate whether the modification time and size of
+        each definition file recorded should also be checked, as editing a
+        file in place does not modify its directory. Default is False.
+
+    :return: :class:`collections.OrderedDict` instance mapping definition paths
+        relative to *registry_path* with their data, in the order in which they
+        were found, or None if the pack is not available or outdated.
+
+    .. seealso:: :func:`pack`
+
+    """
+    logger = wiz.logging.Logger(__name__ + ".load_pack")
+
+    path = os.path.join(registry_path, PACK_PATH)
+
+    try:
+        pack_time = wiz.filesystem.get_modification_time(os.stat(path))
+    except OSError:
+        return
+
+    content = _read_pack(path)
+    if content is None:
+        return
+
+    options, directories, signatures, definitions = content
+
+    if options != get_search_options(max_depth, ignore_patterns):
+        logger.debug("Ignore pack created with other options.")
+        return
+
+    for key, modification_time in directories.items():
+        try:
+            stat = os.stat(os.path.join(registry_path, key))
+        except OSError:
+            return
+
+        _modification_time = wiz.filesystem.get_modification_time(stat)
+        if (
+            _modification_time != modification_time or
+            _modification_time > pack_time
+        ):
+            logger.debug("Ignore outdated pack {!r}".format(path))
+            return
+
+    if not check_files:
+        return definitions
+
+    # Definition files modified in place do not modify their directory.
+    for key in definitions.keys():
+        try:
+            signature = _fetch_signature(os.path.join(registry_path, key))
+        except OSError:
+            return
+
+        if signature != signatures.get(key):
+            logger.debug("Ignore outdated pack {!r}".format(path))
+            return
+
+    return definitions
+
+
+def _rebuild_pack(registry_path):
+    """Rebuild pack from *registry_path* with options it was created with.
+
+    :param registry_path: Path to the registry containing the pack.
+
+    """
+    options = _fetch_search_options(registry_path)
+
+    pack(
+        registry_path, max_depth=options.get("max_depth"),
+        ignore_patterns=options.get("ignore_patterns")
+    )
+
+
+def _update_index(registry_path):
+    """Update index from *registry_path* with options it was created with.
+
+    :param registry_path: Path to the registry containing the index.
+
+    """
+    options = _fetch_search_options(registry_path)
+
+    for _ in wiz.definition.discover(
+        [registry_path], max_depth=options.get("max_depth"),
+        ignore_patterns=options.get("ignore_patterns"), update_index=True
+    ):
+        pass
+
+
+def _fetch_search_options(registry_path):
+    """Return search options recorded for *registry_path*.
+
+    The options are fetched from the pack if available, or from the index
+    otherwise.
+
+    :param registry_path: Path to the registry.
+
+    :return: Options mapping as returned by :func:`get_search_options`, which
+        is empty if neither the pack nor the index can be read.
+
+    """
+    path = os.path.join(registry_path, PACK_PATH)
+    if os.path.isfile(path):
+        content = _read_pack(path)
+        if content is not None:
+            return content[0] or {}
+
+    return load_index(registry_path)["options"]
+
+
+def _read_pack(path):
+    """Return content of pack from *path*.
+
+    :param path: Path to the pack file.
+
+    :return: Tuple containing the search options, the modification time of
+        each directory, the signature and the definition data per path, or
+        None if the pack cannot be read.
+
+    """
+    logger = wiz.logging.Logger(__name__ + "._read_pack")
+
+    header = None
+    directories = {}
+    signatures = {}
+    definitions = collections.OrderedDict()
+
+    try:
+        with gzip.open(path, "rb") as stream:
+            for line in stream:
+                record = ujson.loads(line)
+                _type = record.get("type")
+
+                if header is None:
+                    header = record
+                    if (
+                        _type != "header" or
+                        record.get("version") != PACK_VERSION
+                    ):
+                        logger.debug(
+                            "Ignore incompatible pack {!r}".format(path)
+                        )
+                        return
+
+                elif _type == "directories":
+                    directories.update(record["directories"])
+
+                elif _type == "definition":
+                    signatures[record["path"]] = record["signature"]
+                    definitions[record["path"]] = record["data"]
+
+                elif _type == "removal":
+                    signatures.pop(record["path"], None)
+                    definitions.pop(record["path"], None)
+
+    except (
+        IOError, OSError, EOFError, ValueError, KeyError, AttributeError,
+        zlib.error
+    ):
+        logger.debug("Impossible to read pack from {!r}".format(path))
+        logger.debug_traceback()
+        return
+
+    if header is None:
+        return
+
+    return header.get("options"), directories, signatures, definitions
+
+
+def _fetch_signature(path):
+    """Return modification time and size of file from *path*.
+
+    :param path: Path to the file.
+
+    :return: List containing the modification time and the size of the file.
+
+    :raise: :exc:`OSError` if the file cannot be accessed.
+
+    """
+    stat = os.stat(path)
+    return [wiz.filesystem.get_modification_time(stat), stat.st_size]
+
+
+def _compress_records(records):
+    """Return *records* as :mod:`gzip` compressed :term:`JSON` lines.
+
+    :param records: List of records mappings.
+
+    :return: Compressed binary string.
+
+    """
+    stream = io.BytesIO()
+
+    with gzip.GzipFile(fileobj=stream, mode="wb") as _stream:
+        for record in records:
+            _stream.write((ujson.dumps(record) + "\n").encode("utf-8"))
+
+    return stream.getvalue()
@@ -0,0 +1,1148 @@
+# :coding: utf-8
+
+import collections
+import heapq
+import time
+
+import wiz.definition
+import wiz.exception
+import wiz.graph
+import wiz.logging
+import wiz.package
+import wiz.symbol
+import wiz.utility
+
+
+class Resolver(object):
+    """Boolean satisfiability resolver class.
+
+    Compute a ordered list of packages from an initial list of
+    :class:`packaging.requirements.Requirement` instances, like
+    :class:`wiz.graph.Resolver`::
+
+        >>> from wiz.utility import Requirement
+        >>> resolver = Resolver()
+        >>> resolver.compute_packages(Requirement("foo"), Requirement("bar"))
+
+        [Package("foo"), Package("bar"), Package("bim"), Package("baz")]
+
+    All definition versions and variants which could be used to fulfill the
+    requirements are collected first, and each corresponding package is
+    represented by a boolean variable. The following constraints are then
+    solved with a :class:`Solver` instance:
+
+    * At least one package must be selected for each initial requirement and
+      for each requirement of a selected package;
+    * Only one package can be selected per definition;
+    * A package can only be selected if it is required by another selected
+      package and if its conditions are fulfilled;
+    * A package required by a selected package must be selected if its
+      conditions are fulfilled.
+
+    The solver attempts to fulfill requirements from the nearest definitions
+    first, and selects the package fulfilling the highest number of
+    requirements with the highest version, following the same priorities as
+    the graph resolution::
+
+        - 'foo==0.5.0' is required by 'foo<1';
+        - 'foo==1.0.0' is required by 'foo';
+        - The version '0.5.0' is selected as it fulfills both requirements.
+
+    When the selected packages lead to incompatible requirements, the solver
+    learns which previous selections led to the conflict and selects other
+    versions or variants for these packages, without going through all
+    combinations.
+
+    Packages are then ordered with a :class:`wiz.graph.Resolver` instance for
+    which only selected packages are available.
+
+    """
+
+    def __init__(self, definition_mapping, timeout=None, cancel_event=None):
+        """Initialize Resolver with *definition_mapping*.
+
+        :param definition_mapping: Mapping regrouping all available definitions
+            associated with their unique identifier.
+
+        :param timeout: Number of seconds after which the resolution is
+            interrupted. Default is None, which means that the resolution is
+            not limited in time.
+
+        :param cancel_event: Instance of :class:`threading.Event` which
+            interrupts the resolution when set. Default is None.
+
+        """
+        self._logger = wiz.logging.Logger(__name__ + ".Resolver")
+
+        # All available definitions.
+        self._definition_mapping = definition_mapping
+
+        # Limits which interrupt the resolution when exceeded, and time at
+        # which the resolution times out.
+        self._timeout = timeout
+        self._cancel_event = cancel_event
+        self._deadline = None
+
+        # Record number of variables, clauses, decisions and conflicts from
+        # latest resolution.
+        self._statistics = {}
+
+    @property
+    def definition_mapping(self):
+        """Return mapping of all available definitions."""
+        return self._definition_mapping
+
+    @property
+    def statistics(self):
+        """Return mapping with information about the latest resolution.
+
+        The mapping is in the form of::
+
+            {
+                "variables": 42,
+                "clauses": 256,
+                "decisions": 12,
+                "conflicts": 3
+            }
+
+        """
+        return dict(self._statistics)
+
+    def compute_packages(self, requirements):
+        """Resolve requirements and return list of packages.
+
+        :param requirements: List of :class:`packaging.requirements.Requirement`
+            instances.
+
+        :raise: :exc:`wiz.exception.GraphResolutionError` if the requirements
+            cannot be resolved.
+
+        :raise: :exc:`wiz.exception.ResolutionLimitExceeded` if the timeout is
+            exceeded.
+
+        :raise: :exc:`wiz.exception.ResolutionInterrupted` if the resolution
+            is cancelled.
+
+        """
+        self._deadline = None
+        if self._timeout is not None:
+            self._deadline = time.time() + self._timeout
+
+        problem = _Problem(self._definition_mapping)
+        problem.update_from_requirements(requirements)
+
+        self._logger.debug(
+            "Solve {} variables with {} clauses".format(
+                problem.solver.variables, len(problem.solver.clauses)
+            )
+        )
+
+        try:
+            packages = problem.solve(interrupt=self._check_interruption)
+
+        finally:
+            self._statistics = {
+                "variables": problem.solver.variables,
+                "clauses": len(problem.solver.clauses),
+                "decisions": problem.solver.statistics["decisions"],
+                "conflicts": problem.solver.statistics["conflicts"],
+            }
+
+        if packages is None:
+            problem.raise_error()
+
+        self._logger.debug(
+            "Selected packages: {}".format(
+                ", ".join(package.identifier for package in packages)
+            )
+        )
+
+        # Order selected packages with the same rules as the graph resolver.
+        resolver = wiz.graph.Resolver(
+            SelectionMapping(
+                self._definition_mapping, packages,
+                ignored_packages=problem.fetch_ignored_packages()
+            ),
+            timeout=self._remaining_time(), cancel_event=self._cancel_event
+        )
+        return resolver.compute_packages(requirements)
+
+    def _remaining_time(self):
+        """Return number of seconds before the resolution times out.
+
+        :return: Number of seconds, or None if the resolution is not limited
+            in time.
+
+        """
+        if self._deadline is None:
+            return None
+
+        return max(0.0, self._deadline - time.time())
+
+    def _check_interruption(self, solver):
+        """Raise error if the resolution must be interrupted.
+
+        :param solver: Instance of :class:`Solver`.
+
+        :raise: :exc:`wiz.exception.ResolutionInterrupted` if the cancellation
+            event is set.
+
+        :raise: :exc:`wiz.exception.ResolutionLimitExceeded` if the timeout is
+            exceeded.
+
+        """
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            raise wiz.exception.ResolutionInterrupted(
+                "The resolution has been cancelled after {} conflict(s)."
+                .format(solver.statistics["conflicts"])
+            )
+
+        if self._deadline is not None and time.time() > self._deadline:
+            raise wiz.exception.ResolutionLimitExceeded(
+                "The resolution has exceeded the timeout of {} second(s) "
+                "after {} conflict(s).".format(
+                    self._timeout, solver.statistics["conflicts"]
+                )
+            )
+
+
+class SelectionMapping(collections.Mapping):
+    """Definition mapping only providing selected packages.
+
+    Definitions of selected packages only contain the version and variant
+    selected, whereas definitions of other identifiers are unchanged so that
+    namespaces are guessed the same way as with the original mapping. Other
+    versions of selected packages can be kept when their conditions are not
+    fulfilled, so that requirements ignored by the graph resolution are also
+    ignored when packages are ordered::
+
+        >>> mapping = SelectionMapping(definition_mapping, [package])
+        >>> mapping["foo"]
+        {'0.1.0': <Definition(identifier="foo", version="0.1.0")>}
+
+    """
+
+    def __init__(self, definition_mapping, packages, ignored_packages=None):
+        """Initialize mapping from *definition_mapping* and *packages*.
+
+        :param definition_mapping: Mapping regrouping all available definitions
+            associated with their unique identifier.
+
+        :param packages: List of selected :class:`wiz.package.Package`
+            instances.
+
+        :param ignored_packages: List of :class:`wiz.package.Package`
+            instances which are not selected as their conditions are not
+            fulfilled. Default is None.
+
+        """
+        self._definition_mapping = definition_mapping
+        self._selection = {}
+
+        for package in packages:
+            definition = package.definition
+            version = str(definition.version or wiz.symbol.UNSET_VALUE)
+
+            if package.variant is not None:
+                definition = definition.set(
+                    "variants", [package.variant.data()]
+                )
+
+            self._selection[definition.qualified_identifier] = (
+                wiz.definition.VersionMapping({version: definition})
+            )
+
+        for package in ignored_packages or []:
+            definition = package.definition
+            version = str(definition.version or wiz.symbol.UNSET_VALUE)
+
+            mapping = self._selection.get(definition.qualified_identifier)
+            if mapping is not None and version not in mapping:
+                mapping[version] = definition
+
+    def __getitem__(self, identifier):
+        """Return definitions available for *identifier*."""
+        if identifier in self._selection:
+            return self._selection[identifier]
+        return self._definition_mapping[identifier]
+
+    def __contains__(self, identifier):
+        """Indicate whether *identifier* is in mapping."""
+        return (
+            identifier in self._selection or
+            identifier in self._definition_mapping
+        )
+
+    def __iter__(self):
+        """Iterate over identifiers."""
+        return iter(self._definition_mapping)
+
+    def __len__(self):
+        """Return number of identifiers."""
+        return len(self._definition_mapping)
+
+
+class Solver(object):
+    """Conflict-driven clause learning solver.
+
+    Variables are represented by positive integers, and literals by positive
+    or negative integers depending on whether the variable is true or false::
+
+        >>> solver = Solver()
+        >>> a, b = solver.new_variable(), solver.new_variable()
+        >>> solver.add_clause([a, b])
+        >>> solver.add_clause([-a])
+        >>> solver.solve()
+        {1: False, 2: True}
+
+    Assigned values are propagated with two watched literals per clause. When
+    a clause cannot be fulfilled, a new clause is learned from the first
+    unique implication point of the conflict and the solver backjumps to the
+    latest decision involved.
+
+    """
+
+    def __init__(self):
+        """Initialize solver."""
+        self._number_of_variables = 0
+
+        # List of clauses, including learned clauses.
+        self._clauses = []
+
+        # List of clause indices per watched literal.
+        self._watches = collections.defaultdict(list)
+
+        # List of literals which must be true before any decisions.
+        self._units = []
+
+        # Indicate whether an empty clause has been added.
+        self._unsatisfiable = False
+
+        # Value, decision level and reason clause index per assigned variable.
+        self._values = {}
+        self._levels = {}
+        self._reasons = {}
+
+        # Assigned literals in order of assignment, with index of the first
+        # literal of each decision level.
+        self._trail = []
+        self._trail_limits = []
+
+        # Index of the next literal to propagate in the trail.
+        self._propagation_index = 0
+
+        self._statistics = {"decisions": 0, "conflicts": 0}
+
+    @property
+    def variables(self):
+        """Return number of variables."""
+        return self._number_of_variables
+
+    @property
+    def clauses(self):
+        """Return list of clauses, including learned clauses."""
+        return self._clauses
+
+    @property
+    def statistics(self):
+        """Return mapping with number of decisions and conflicts."""
+        return dict(self._statistics)
+
+    def new_variable(self):
+        """Return new variable."""
+        self._number_of_variables += 1
+        return self._number_of_variables
+
+    def value(self, literal):
+        """Return value of *literal*.
+
+        :param literal: Positive or negative variable.
+
+        :return: Boolean value, or None if the variable is not assigned.
+
+        """
+        value = self._values.get(abs(literal))
+        if value is None:
+            return None
+        return value if literal > 0 else not value
+
+    def add_clause(self, literals):
+        """Add clause requiring at least one of *literals* to be true.
+
+        :param literals: List of positive or negative variables.
+
+        """
+        clause = []
+
+        for literal in literals:
+            # Clause is always fulfilled if it contains opposite literals.
+            if -literal in clause:
+                return
+
+            if literal not in clause:
+                clause.append(literal)
+
+        if len(clause) == 0:
+            self._unsatisfiable = True
+
+        elif len(clause) == 1:
+            self._units.append(clause[0])
+
+        else:
+            self._add_watched_clause(clause)
+
+    def _add_watched_clause(self, clause):
+        """Record *clause* watching its two first literals.
+
+        :param clause: List of at least two literals.
+
+        :return: Index of the clause.
+
+        """
+        index = len(self._clauses)
+        self._clauses.append(clause)
+        self._watches[clause[0]].append(index)
+        self._watches[clause[1]].append(index)
+        return index
+
+    def solve(self, decide=None, interrupt=None):
+        """Return mapping with value of each variable fulfilling all clauses.
+
+        :param decide: Function returning the next literal to assign from the
+            solver instance, or None to assign the first unassigned variable
+            to False. Default is None.
+
+        :param interrupt: Function called with the solver instance before each
+            decision, which can raise an exception to interrupt the solver.
+            Default is None.
+
+        :return: Mapping with boolean value per variable, or None if clauses
+            cannot be fulfilled.
+
+        """
+        if self._unsatisfiable:
+            return None
+
+        for literal in self._units:
+            value = self.value(literal)
+            if value is False:
+                return None
+
+            elif value is None:
+                self._assign(literal, None)
+
+        while True:
+            conflict = self._propagate()
+
+            if conflict is not None:
+                self._statistics["conflicts"] += 1
+
+                if len(self._trail_limits) == 0:
+                    return None
+
+                learned, level = self._analyze(conflict)
+                self._backtrack(level)
+
+                if len(learned) == 1:
+                    self._assign(learned[0], None)
+                else:
+                    self._assign(learned[0], self._add_watched_clause(learned))
+
+                continue
+
+            if interrupt is not None:
+                interrupt(self)
+
+            literal = decide(self) if decide is not None else None
+
+            if literal is None:
+                literal = self._default_decision()
+
+                # All variables are assigned.
+                if literal is None:
+                    return dict(self._values)
+
+            self._statistics["decisions"] += 1
+            self._trail_limits.append(len(self._trail))
+            self._assign(literal, None)
+
+    def _default_decision(self):
+        """Return first unassigned variable as a false literal, or None."""
+        for variable in range(1, self._number_of_variables + 1):
+            if variable not in self._values:
+                return -variable
+
+    def _assign(self, literal, reason):
+        """Assign *literal* to be true at current decision level.
+
+        :param literal: Positive or negative variable.
+
+        :param reason: Index of clause which implied the literal, or None if
+            the literal is a decision.
+
+        """
+        variable = abs(literal)
+        self._values[variable] = literal > 0
+        self._levels[variable] = len(self._trail_limits)
+        self._reasons[variable] = reason
+        self._trail.append(literal)
+
+    def _propagate(self):
+        """Propagate assigned literals to clauses.
+
+        :return: Index of a clause which cannot be fulfilled, or None.
+
+        """
+        while self._propagation_index < len(self._trail):
+            literal = -self._trail[self._propagation_index]
+            self._propagation_index += 1
+
+            indices = self._watches[literal]
+            self._watches[literal] = []
+
+            for position, index in enumerate(indices):
+                clause = self._clauses[index]
+
+                # Ensure that the false literal is the second watched literal.
+                if clause[0] == literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+
+                if self.value(clause[0]) is True:
+                    self._watches[literal].append(index)
+                    continue
+
+                # Watch another literal which is not false if possible.
+                for _position in range(2, len(clause)):
+                    if self.value(clause[_position]) is not False:
+                        clause[1], clause[_position] = (
+                            clause[_position], clause[1]
+                        )
+                        self._watches[clause[1]].append(index)
+                        break
+
+                else:
+                    self._watches[literal].append(index)
+
+                    if self.value(clause[0]) is False:
+                        self._watches[literal].extend(indices[position + 1:])
+                        return index
+
+                    self._assign(clause[0], index)
+
+        return None
+
+    def _analyze(self, conflict):
+        """Return clause learned from *conflict* with level to backjump to.
+
+        :param conflict: Index of the clause which cannot be fulfilled.
+
+        :return: Tuple with list of literals, starting with the literal which
+            will be implied after backjumping, and decision level.
+
+        """
+        level = len(self._trail_limits)
+        learned = []
+        visited = set()
+        count = 0
+
+        literal = None
+        clause = self._clauses[conflict]
+        position = len(self._trail) - 1
+
+        while True:
+            for _literal in clause:
+                variable = abs(_literal)
+                if (
+                    _literal == literal or variable in visited or
+                    self._levels[variable] == 0
+                ):
+                    continue
+
+                visited.add(variable)
+
+                if self._levels[variable] == level:
+                    count += 1
+                else:
+                    learned.append(_literal)
+
+            # Resolve with the reason of the latest literal assigned at the
+            # current level until only one of them remains.
+            while abs(self._trail[position]) not in visited:
+                position -= 1
+
+            literal = self._trail[position]
+            position -= 1
+            count -= 1
+
+            if count == 0:
+                break
+
+            clause = self._clauses[self._reasons[abs(literal)]]
+
+        backjump_level = 0
+
+        if len(learned) > 0:
+            # Watch the literal assigned at the highest level after the
+            # asserting literal.
+            index = max(
+                range(len(learned)),
+                key=lambda _index: self._levels[abs(learned[_index])]
+            )
+            learned[0], learned[index] = learned[index], learned[0]
+            backjump_level = self._levels[abs(learned[0])]
+
+        return [-literal] + learned, backjump_level
+
+    def _backtrack(self, level):
+        """Unassign all literals assigned after decision *level*."""
+        if len(self._trail_limits) <= level:
+            return
+
+        limit = self._trail_limits[level]
+
+        for literal in self._trail[limit:]:
+            variable = abs(literal)
+            del self._values[variable]
+            del self._levels[variable]
+            del self._reasons[variable]
+
+        del self._trail[limit:]
+        del self._trail_limits[level:]
+        self._propagation_index = limit
+
+
+class _Problem(object):
+    """Boolean representation of a package resolution."""
+
+    def __init__(self, definition_mapping):
+        """Initialize problem from *definition_mapping*.
+
+        :param definition_mapping: Mapping regrouping all available definitions
+            associated with their unique identifier.
+
+        """
+        self._logger = wiz.logging.Logger(__name__ + "._Problem")
+        self._definition_mapping = definition_mapping
+        self._namespace_count = collections.Counter()
+
+        self.solver = Solver()
+
+        # Package and rank per variable, the rank being the position of the
+        # package in the first list of candidates it has been found in.
+        self._packages = {}
+        self._ranks = {}
+
+        # Variable per package identifier.
+        self._variables = {}
+
+        # Variables organised per definition identifier, in the order of
+        # discovery.
+        self._variables_per_definition = collections.OrderedDict()
+
+        # Candidate variables per requirement, or exception raised.
+        self._candidates = {}
+
+        # Variable per condition requirement.
+        self._conditions = {}
+
+        # Condition variables required by each package variable.
+        self._package_conditions = {}
+
+        # List of requirement entries in the order of discovery.
+        self._entries = []
+
+        # Entry indices organised per definition identifier.
+        self._entries_per_definition = {}
+
+        # Errors raised from initial requirements.
+        self._errors = []
+
+        # Definition identifiers ordered so that packages requiring a
+        # definition are processed first when possible.
+        self._order = {}
+
+        # Values assigned to each variable by the latest solution.
+        self._values = None
+
+    def update_from_requirements(self, requirements):
+        """Collect candidate packages and add constraints from *requirements*.
+
+        Requirements of each candidate package are traversed with a
+        `Breadth-first search
+        <https://en.wikipedia.org/wiki/Breadth-first_search>`_ algorithm.
+
+        :param requirements: List of class:`packaging.requirements.Requirement`
+            instances ordered from the most important to the least important.
+
+        """
+        # Record namespaces from all requirement names.
+        mapping = self._definition_mapping.get("__namespace__", {})
+
+        for requirement in requirements:
+            self._namespace_count.update(mapping.get(requirement.name, []))
+
+        queue = collections.deque(
+            (requirement, None) for requirement in requirements
+        )
+
+        while len(queue) > 0:
+            requirement, parent = queue.popleft()
+            self._update_from_requirement(requirement, parent, queue)
+
+        self._add_requirement_clauses()
+        self._add_reachability_clauses()
+        self._add_definition_clauses()
+        self._order = self._compute_definition_order()
+
+    def _update_from_requirement(self, requirement, parent, queue):
+        """Add constraints from *requirement* of *parent*.
+
+        :param requirement: Instance of
+            :class:`packaging.requirements.Requirement`.
+
+        :param parent: Variable of the package requiring *requirement*, or
+            None if *requirement* is an initial requirement.
+
+        :param queue: Instance of :class:`collections.deque` that will be
+            updated with requirements of new candidate packages.
+
+        """
+        candidates = self._fetch_candidates(
+            requirement, queue, namespace_counter=self._namespace_count
+        )
+
+        if isinstance(candidates, wiz.exception.WizError):
+            if parent is None:
+                self._errors.append(candidates)
+                self.solver.add_clause([])
+            else:
+                self.solver.add_clause([-parent])
+            return
+
+        # Requirement is ignored when conditions of the best candidate are not
+        # fulfilled, as with the graph resolution.
+        conditions = self._package_conditions.get(candidates[0], [])
+
+        index = len(self._entries)
+        self._entries.append({
+            "parent": parent,
+            "conditions": conditions,
+            "candidates": candidates
+        })
+
+        definition = self._packages[candidates[0]].definition
+        identifier = definition.qualified_identifier
+        self._entries_per_definition.setdefault(identifier, []).append(index)
+
+    def _fetch_candidates(self, requirement, queue, namespace_counter=None):
+        """Return variables of packages which can fulfill *requirement*.
+
+        :param requirement: Instance of
+            :class:`packaging.requirements.Requirement`.
+
+        :param queue: Instance of :class:`collections.deque` that will be
+            updated with requirements of new candidate packages.
+
+        :param namespace_counter: instance of :class:`collections.Counter`
+            which indicates occurrence of namespaces used as hints for package
+            identification. Default is None.
+
+        :return: List of variables ordered by descending version and variant
+            order, or exception raised if *requirement* cannot be resolved.
+
+        """
+        key = (str(requirement), namespace_counter is not None)
+        if key in self._candidates:
+            return self._candidates[key]
+
+        try:
+            definitions = wiz.definition.query_all(
+                requirement, self._definition_mapping,
+                namespace_counter=namespace_counter
+            )
+
+        except wiz.exception.WizError as error:
+            self._candidates[key] = error
+            return error
+
+        candidates = []
+
+        for definition in definitions:
+            if len(requirement.extras) > 0:
+                variants = [next(iter(requirement.extras))]
+            elif len(definition.variants) == 0:
+                variants = [None]
+            else:
+                variants = [
+                    variant.identifier for variant in definition.variants
+                ]
+
+            for variant in variants:
+                package = wiz.package.create(
+                    definition, variant_identifier=variant
+                )
+                variable = self._fetch_variable(package, queue)
+                self._ranks.setdefault(variable, len(candidates))
+                candidates.append(variable)
+
+        self._candidates[key] = candidates
+        return candidates
+
+    def _fetch_variable(self, package, queue):
+        """Return variable representing *package*.
+
+        If the variable does not exist, it is created and requirements of the
+        package are added to the *queue*.
+
+        :param package: Instance of :class:`wiz.package.Package`.
+
+        :param queue: Instance of :class:`collections.deque` that will be
+            updated with requirements of *package*.
+
+        :return: Variable.
+
+        """
+        variable = self._variables.get(package.identifier)
+        if variable is not None:
+            return variable
+
+        variable = self.solver.new_variable()
+        self._variables[package.identifier] = variable
+        self._packages[variable] = package
+
+        identifier = package.definition.qualified_identifier
+        self._variables_per_definition.setdefault(identifier, []).append(
+            variable
+        )
+
+        try:
+            requirements = package.requirements
+            conditions = [
+                self._fetch_condition(condition, queue)
+                for condition in package.conditions
+            ]
+
+        except wiz.exception.InvalidRequirement as error:
+            self._logger.debug(
+                "Package '{}' is incorrect [{}]".format(
+                    package.identifier, error
+                )
+            )
+            self.solver.add_clause([-variable])
+            return variable
+
+        # Package cannot be selected if conditions are not fulfilled.
+        for condition in conditions:
+            self.solver.add_clause([-variable, condition])
+
+        self._package_conditions[variable] = conditions
+
+        for requirement in requirements:
+            queue.append((requirement, variable))
+
+        return variable
+
+    def _fetch_condition(self, requirement, queue):
+        """Return variable indicating whether *requirement* is fulfilled.
+
+        :param requirement: Instance of
+            :class:`packaging.requirements.Requirement`.
+
+        :param queue: Instance of :class:`collections.deque` that will be
+            updated with requirements of new candidate packages.
+
+        :return: Variable.
+
+        """
+        key = str(requirement)
+        if key in self._conditions:
+            return self._conditions[key]
+
+        variable = self.solver.new_variable()
+        self._conditions[key] = variable
+
+        candidates = self._fetch_candidates(requirement, queue)
+        if isinstance(candidates, wiz.exception.WizError):
+            candidates = []
+
+        # Condition is fulfilled if and only if one candidate is selected.
+        self.solver.add_clause([-variable] + candidates)
+
+        for candidate in candidates:
+            self.solver.add_clause([-candidate, variable])
+
+        return variable
+
+    def _add_requirement_clauses(self):
+        """Add clauses ensuring that requirements are fulfilled.
+
+        Each candidate can only be selected if its own conditions are
+        fulfilled. When the best candidate of a requirement has conditions,
+        other candidates can only fulfill the requirement if they have the
+        same conditions or if they are also required elsewhere, as the graph
+        resolution only selects another version of a conditioned package to
+        resolve conflicts.
+
+        """
+        # Count distinct requirements which can be fulfilled by each package,
+        # as entries of the same requirement share the same candidate list.
+        counter = collections.Counter()
+
+        candidates_lists = {
+            id(entry["candidates"]): entry["candidates"]
+            for entry in self._entries
+        }
+
+        for candidates in candidates_lists.values():
+            counter.update(candidates)
+
+        for entry in self._entries:
+            conditions = entry["conditions"]
+
+            if len(conditions) > 0:
+                entry["candidates"] = [
+                    variable for variable in entry["candidates"]
+                    if counter[variable] > 1
+                    or self._package_conditions.get(variable) == conditions
+                ]
+
+            literals = [-variable for variable in conditions]
+            literals += entry["candidates"]
+
+            if entry["parent"] is not None:
+                literals.append(-entry["parent"])
+
+            self.solver.add_clause(literals)
+
+    def _add_reachability_clauses(self):
+        """Add clauses preventing packages not required from being selected."""
+        parents = {}
+
+        for entry in self._entries:
+            for variable in entry["candidates"]:
+                parents.setdefault(variable, set()).add(entry["parent"])
+
+        for variable in self._packages:
+            _parents = parents.get(variable, set())
+            if None in _parents:
+                continue
+
+            self.solver.add_clause([-variable] + sorted(_parents))
+
+    def _add_definition_clauses(self):
+        """Add clauses allowing only one package per definition."""
+        for variables in self._variables_per_definition.values():
+            for index, variable in enumerate(variables):
+                for _variable in variables[index + 1:]:
+                    self.solver.add_clause([-variable, -_variable])
+
+    def _compute_definition_order(self):
+        """Return position of each definition identifier in decision order.
+
+        Definitions are sorted so that packages requiring a definition are
+        processed before it. When definitions depend on each other, the
+        definition discovered first is processed first.
+
+        :return: Mapping with position per definition identifier.
+
+        """
+        identifiers = list(self._variables_per_definition.keys())
+        discovery = {
+            identifier: index for index, identifier in enumerate(identifiers)
+        }
+
+        children = {}
+        degrees = collections.Counter()
+
+        for entry in self._entries:
+            if entry["parent"] is None:
+                continue
+
+            parent = self._packages[entry["parent"]]
+            parent_identifier = parent.definition.qualified_identifier
+            identifier = (
+                self._packages[entry["candidates"][0]]
+                .definition.qualified_identifier
+            )
+
+            if identifier == parent_identifier:
+                continue
+
+            _children = children.setdefault(parent_identifier, set())
+            if identifier not in _children:
+                _children.add(identifier)
+                degrees[identifier] += 1
+
+        queue = [
+            (discovery[identifier], identifier) for identifier in identifiers
+            if degrees[identifier] == 0
+        ]
+        heapq.heapify(queue)
+
+        order = {}
+
+        while len(order) < len(identifiers):
+            # Break dependency cycles with the definition discovered first.
+            if len(queue) == 0:
+                identifier = next(
+                    _identifier for _identifier in identifiers
+                    if _identifier not in order
+                )
+                queue.append((discovery[identifier], identifier))
+
+            _, identifier = heapq.heappop(queue)
+            if identifier in order:
+                continue
+
+            order[identifier] = len(order)
+
+            for child in sorted(children.get(identifier, [])):
+                degrees[child] -= 1
+                if degrees[child] == 0:
+                    heapq.heappush(queue, (discovery[child], child))
+
+        return order
+
+    def _decide(self, solver):
+        """Return next literal to assign.
+
+        The requirement which must be fulfilled with the definition processed
+        first is selected, and the package fulfilling the highest number of
+        requirements for this definition is selected with the highest version.
+
+        :param solver: Instance of :class:`Solver`.
+
+        :return: Positive variable, or None if all requirements are fulfilled.
+
+        """
+        identifier = None
+
+        for entry in self._entries:
+            if not self._is_active(entry, solver):
+                continue
+
+            if any(
+                solver.value(variable) is True
+                for variable in entry["candidates"]
+            ):
+                continue
+
+            _identifier = (
+                self._packages[entry["candidates"][0]]
+                .definition.qualified_identifier
+            )
+            if identifier is None or self._order[_identifier] < (
+                self._order[identifier]
+            ):
+                identifier = _identifier
+
+        if identifier is None:
+            return None
+
+        # Count active requirements which can be fulfilled by each package.
+        count = collections.Counter()
+
+        for index in self._entries_per_definition[identifier]:
+            entry = self._entries[index]
+            if self._is_active(entry, solver):
+                count.update(entry["candidates"])
+
+        candidates = [
+            variable for variable in count
+            if solver.value(variable) is None
+        ]
+
+        return max(
+            candidates,
+            key=lambda _variable: (
+                count[_variable],
+                wiz.utility.get_version_key(
+                    self._packages[_variable].definition.version
+                ),
+                -self._ranks[_variable]
+            )
+        )
+
+    def _is_active(self, entry, solver):
+        """Indicate whether requirement *entry* must be fulfilled.
+
+        :param entry: Requirement entry.
+
+        :param solver: Instance of :class:`Solver`.
+
+        :return: Boolean value.
+
+        """
+        if (
+            entry["parent"] is not None and
+            solver.value(entry["parent"]) is not True
+        ):
+            return False
+
+        return all(
+            solver.value(variable) is True for variable in entry["conditions"]
+        )
+
+    def solve(self, interrupt=None):
+        """Return selected packages.
+
+        :param interrupt: Function called with the solver instance before each
+            decision, which can raise an exception to interrupt the
+            resolution. Default is None.
+
+        :return: List of :class:`wiz.package.Package` instances, or None if
+            requirements cannot be fulfilled.
+
+        """
+        values = self.solver.solve(decide=self._decide, interrupt=interrupt)
+        self._values = values
+
+        if values is None:
+            return None
+
+        return [
+            package for variable, package in sorted(self._packages.items())
+            if values.get(variable)
+        ]
+
+    def fetch_ignored_packages(self):
+        """Return packages ignored as their conditions are not fulfilled.
+
+        Conditions are checked against the latest solution.
+
+        :return: List of :class:`wiz.package.Package` instances.
+
+        """
+        if self._values is None:
+            return []
+
+        return [
+            package for variable, package in sorted(self._packages.items())
+            if any(
+                not self._values.get(condition)
+                for condition in self._package_conditions.get(variable, [])
+            )
+        ]
+
+    def raise_error(self):
+        """Raise exception when requirements cannot be fulfilled.
+
+        :raise: :exc:`wiz.exception.GraphResolutionError`.
+
+        """
+        if len(self._errors) > 0:
+            raise wiz.exception.GraphResolutionError(
+                "The dependency graph could not be resolved due to the "
+                "following error(s):\n"
+                "{}\n".format(
+                    "\n".join([
+                        "  * {}: {}".format(wiz.graph.Graph.ROOT, error)
+                        for error in self._errors
+                    ])
+                )
+            )
+
+        raise wiz.exception.GraphResolutionError(
+            "The dependency graph could not be resolved as no combination of "
+            "package versions and variants fulfills all requirements."
+        )
@@ -0,0 +1,752 @@
+# :coding: utf-8
+
+import os
+import socket
+import threading
+import time
+
+import concurrent.futures
+import six
+from six.moves import socketserver
+import ujson
+
+import wiz
+import wiz.cache
+import wiz.definition
+import wiz.environ
+import wiz.exception
+import wiz.filesystem
+import wiz.logging
+import wiz.package
+import wiz.symbol
+import wiz.system
+
+#: Default number of seconds between two checks of registry modifications.
+DEFAULT_REFRESH_INTERVAL = 5
+
+
+def get_socket_path():
+    """Return default path to the server socket.
+
+    :return: :file:`~/.wiz/server.sock`
+
+    """
+    return os.path.join(os.path.expanduser("~"), ".wiz", "server.sock")
+
+
+class Server(object):
+    """Resolver server keeping a definition mapping in memory.
+
+    Clients are connected via a UNIX socket and send requests encoded as
+    :term:`JSON` on a single line. Each request should be in the form of::
+
+        {
+            "action": "resolve_context",
+            "arguments": {
+                "requests": ["foo >= 1", "bar"],
+                "registries": ["/path/to/registry"],
+                "registry_key": "13a0a2d7a5d3c87d0e54b2c1f3d8b3fc9f3ab5e1",
+                "ignore_implicit": False,
+                "environ_mapping": {"KEY": "VALUE"},
+                "strategy": "graph",
+                "jobs": None
+            }
+        }
+
+    The server returns a response on a single line in the form of::
+
+        {"status": "success", "result": {...}}
+
+    Or, if the request failed::
+
+        {"status": "error", "error": {"type": "RequestNotFound", ...}}
+
+    The registry key is computed by the client with
+    :func:`wiz.cache.compute_key` from the registries, the system mapping and
+    the registry options used to fetch definitions. The request is rejected
+    with :exc:`wiz.exception.ServerUnavailable` if it does not correspond to
+    the key of the server, so that the client can resolve the context itself.
+    The server keeps a complete definition mapping in memory, so options
+    which only change how definitions are loaded (e.g. "lazy" or "cache") do
+    not need to be checked.
+
+    The environment mapping is expected to be :func:`initiated
+    <wiz.environ.initiate>` by the client, so that the variables passed
+    through are fetched from the client environment.
+
+    When variant combinations are computed concurrently, the same process
+    pool executor is used for all requests until the server is shut down.
+
+    Each client connection is handled within its own thread.
+
+    """
+
+    def __init__(
+        self, paths, socket_path=None, system_mapping=None, max_depth=None,
+        ignore_patterns=None, workers=None, executor=None,
+        refresh_interval=DEFAULT_REFRESH_INTERVAL
+    ):
+        """Initialize server.
+
+        :param paths: List of registry paths to fetch definitions from.
+
+        :param socket_path: Path to the UNIX socket to listen to. Default is
+            None, which means that :func:`get_socket_path` will be used.
+
+        :param system_mapping: Mapping defining the current system to filter
+            out non compatible definitions. Default is None, which means that
+            the current system mapping will be :func:`queried
+            <wiz.system.query>`.
+
+        :param max_depth: Limited recursion value to search for definitions.
+            Default is None, which means that all sub-trees will be visited.
+
+        :param ignore_patterns: List of :mod:`fnmatch` patterns matching names
+            of files and directories which should be skipped within registries.
+            Default is None.
+
+        :param workers: Number of workers to load definitions concurrently.
+            Default is None.
+
+        :param executor: Type of executor to create with *workers*. Default is
+            None.
+
+        :param refresh_interval: Minimum number of seconds between two checks
+            of registry modifications. Default is
+            :data:`DEFAULT_REFRESH_INTERVAL`.
+
+        """
+        self._paths = list(paths)
+        self._socket_path = socket_path or get_socket_path()
+        self._options = dict(
+            system_mapping=system_mapping, max_depth=max_depth,
+            ignore_patterns=ignore_patterns, workers=workers,
+            executor=executor
+        )
+        self._refresh_interval = refresh_interval
+        self._registry_key = _compute_registry_key(
+            self._paths, system_mapping, max_depth, ignore_patterns
+        )
+
+        self._definition_mapping = None
+        self._fingerprint = None
+        self._last_check = None
+        self._refresh_lock = threading.Lock()
+        self._server = None
+
+        self._resolver_executor = None
+        self._resolver_executor_lock = threading.Lock()
+
+    @property
+    def socket_path(self):
+        """Return path to the UNIX socket.
+
+        :return: String.
+
+        """
+        return self._socket_path
+
+    @property
+    def registry_key(self):
+        """Return key identifying registries and options used by the server.
+
+        :return: Hexadecimal string as returned by
+            :func:`wiz.cache.compute_key`.
+
+        """
+        return self._registry_key
+
+    @property
+    def definition_mapping(self):
+        """Return definition mapping currently used.
+
+        :return: Definition mapping as returned by
+            :func:`wiz.fetch_definition_mapping`.
+
+        """
+        if self._definition_mapping is None:
+            self.refresh()
+
+        return self._definition_mapping
+
+    def refresh(self, force=False):
+        """Fetch definition mapping again if registries have been modified.
+
+        Registries are only checked if the refresh interval has passed since
+        the last check. Only definition files modified since registry indexes
+        were last updated are loaded again.
+
+        The definition mapping used by ongoing requests is not modified. If
+        the definition mapping is already being refreshed by another thread,
+        the current one is kept.
+
+        :param force: Indicate whether the definition mapping should be
+            fetched again without checking registries. Default is False.
+
+        :return: Boolean value indicating whether the definition mapping has
+            been refreshed.
+
+        """
+        logger = wiz.logging.Logger(__name__ + ".refresh")
+
+        force = force or self._definition_mapping is None
+
+        if not self._refresh_lock.acquire(force):
+            return False
+
+        try:
+            now = time.time()
+
+            if not force:
+                if now - self._last_check < self._refresh_interval:
+                    return False
+
+                self._last_check = now
+
+                if (
+                    self._fingerprint is not None and
+                    wiz.cache.is_fingerprint_valid(self._fingerprint)
+                ):
+                    return False
+
+            self._definition_mapping = wiz.fetch_definition_mapping(
+                self._paths, **self._options
+            )
+            self._fingerprint = wiz.cache.compute_fingerprint(self._paths)
+            self._last_check = now
+
+            logger.debug("Definition mapping refreshed.")
+            return True
+
+        finally:
+            self._refresh_lock.release()
+
+    def handle(self, request):
+        """Return response mapping for *request*.
+
+        :param request: Request mapping.
+
+        :return: Response mapping.
+
+        """
+        logger = wiz.logging.Logger(__name__ + ".handle")
+
+        actions = {
+            "resolve_context": self._resolve_context,
+            "fetch_package_request_from_command": (
+                self._fetch_package_request_from_command
+            ),
+        }
+
+        try:
+            if (
+                not isinstance(request, dict) or
+                request.get("action") not in actions
+            ):
+                raise wiz.exception.ServerError(
+                    "The request is incorrect: {request!r}",
+                    details={"request": request}
+                )
+
+            self.refresh()
+
+            action = actions[request["action"]]
+            result = action(**request.get("arguments", {}))
+
+        except wiz.exception.WizError as error:
+            return {
+                "status": "error",
+                "error": {
+                    "type": error.__class__.__name__,
+                    "message": str(error)
+                }
+            }
+
+        except Exception as error:
+            logger.error("Unexpected error: {}".format(error))
+            logger.debug_traceback()
+
+            return {
+                "status": "error",
+                "error": {"type": "ServerError", "message": str(error)}
+            }
+
+        return {"status": "success", "result": result}
+
+    def serve_forever(self):
+        """Fetch definition mapping and handle requests until shutdown."""
+        logger = wiz.logging.Logger(__name__ + ".serve_forever")
+
+        if self._definition_mapping is None:
+            self.refresh()
+
+        _prepare_socket_path(self._socket_path)
+
+        self._server = _ThreadingServer(self._socket_path, _RequestHandler)
+        self._server.handler = self
+
+        logger.info("Listening to {}".format(self._socket_path))
+
+        try:
+            self._server.serve_forever()
+
+        finally:
+            self._server.server_close()
+
+            if os.path.exists(self._socket_path):
+                os.remove(self._socket_path)
+
+            with self._resolver_executor_lock:
+                if self._resolver_executor is not None:
+                    self._resolver_executor.shutdown()
+                    self._resolver_executor = None
+
+    def shutdown(self):
+        """Stop handling requests."""
+        if self._server is not None:
+            self._server.shutdown()
+
+    def _check_registries(self, registries, registry_key):
+        """Ensure that *registries* correspond to server registries.
+
+        :param registries: List of registry paths used by the client.
+
+        :param registry_key: Key computed by the client from *registries* and
+            the options used to fetch definitions.
+
+        :raise: :exc:`wiz.exception.ServerUnavailable` if *registries* or
+            *registry_key* are different.
+
+        """
+        if list(registries) != self._paths:
+            raise wiz.exception.ServerUnavailable(
+                "The resolver server is using other registries."
+            )
+
+        if registry_key != self._registry_key:
+            raise wiz.exception.ServerUnavailable(
+                "The resolver server is using other registry options."
+            )
+
+    def _resolve_context(
+        self, requests, registries, registry_key, ignore_implicit=False,
+        environ_mapping=None, strategy=wiz.symbol.GRAPH_STRATEGY, jobs=None,
+        max_combinations=None, timeout=None
+    ):
+        """Return encoded context mapping from *requests*.
+
+        *environ_mapping* is used as the initial environment, as it has
+        already been initiated by the client.
+
+        .. seealso:: :func:`wiz.resolve_context`
+
+        """
+        self._check_registries(registries, registry_key)
+
+        executor = None
+        if strategy == wiz.symbol.GRAPH_STRATEGY:
+            executor = self._fetch_resolver_executor(jobs)
+
+        context = wiz.resolve_context(
+            requests, self.definition_mapping,
+            ignore_implicit=ignore_implicit,
+            environ_mapping=environ_mapping,
+            strategy=strategy, jobs=jobs, executor=executor,
+            max_combinations=max_combinations,
+            timeout=timeout, initiate_environ=False
+        )
+        return encode_context(context)
+
+    def _fetch_resolver_executor(self, jobs):
+        """Return executor to compute variant combinations concurrently.
+
+        The process pool executor is created when first required and reused
+        by subsequent requests.
+
+        :param jobs: Number of variant combinations to compute concurrently.
+
+        :return: Instance of :class:`concurrent.futures.ProcessPoolExecutor`,
+            or None if combinations are computed one at a time.
+
+        """
+        if jobs is None or jobs <= 1:
+            return None
+
+        with self._resolver_executor_lock:
+            if self._resolver_executor is None:
+                self._resolver_executor = (
+                    concurrent.futures.ProcessPoolExecutor()
+                )
+
+            return self._resolver_executor
+
+    def _fetch_package_request_from_command(
+        self, command_request, registries, registry_key
+    ):
+        """Return package request corresponding to *command_request*.
+
+        .. seealso:: :func:`wiz.fetch_package_request_from_command`
+
+        """
+        self._check_registries(registries, registry_key)
+
+        return wiz.fetch_package_request_from_command(
+            command_request, self.definition_mapping
+        )
+
+
+class _ThreadingServer(socketserver.ThreadingUnixStreamServer):
+    """UNIX socket server handling each connection within a thread."""
+
+    daemon_threads = True
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handler decoding requests sent by a client connection."""
+
+    def handle(self):
+        """Answer each request line until the client closes the connection."""
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+
+            try:
+                request = ujson.loads(line.decode("utf-8"))
+            except ValueError:
+                request = None
+
+            response = self.server.handler.handle(request)
+            self.wfile.write(_encode_line(response))
+            self.wfile.flush()
+
+
+def request(action, socket_path=None, **arguments):
+    """Send request to the resolver server and return the result.
+
+    :param action: Name of the action to execute (e.g. "resolve_context").
+
+    :param socket_path: Path to the server UNIX socket. Default is None, which
+        means that :func:`get_socket_path` will be used.
+
+    :param arguments: Keyword arguments for the action.
+
+    :return: Result returned by the server.
+
+    :raise: :exc:`wiz.exception.ServerUnavailable` if the server cannot be
+        reached or cannot handle the request.
+
+    :raise: :exc:`wiz.exception.WizError` or a sub-class if the request
+        failed.
+
+    """
+    path = socket_path or get_socket_path()
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    try:
+        try:
+            connection.connect(path)
+        except socket.error as error:
+            raise wiz.exception.ServerUnavailable(
+                "The resolver server cannot be reached at {path!r}: {error}",
+                details={"path": path, "error": error}
+            )
+
+        connection.sendall(
+            _encode_line({"action": action, "arguments": arguments})
+        )
+
+        chunks = []
+        while True:
+            chunk = connection.recv(65536)
+            chunks.append(chunk)
+
+            if not chunk or chunk.endswith(b"\n"):
+                break
+
+    except socket.error as error:
+        raise wiz.exception.ServerUnavailable(
+            "The resolver server connection failed: {error}",
+            details={"error": error}
+        )
+
+    finally:
+        connection.close()
+
+    try:
+        response = ujson.loads(b"".join(chunks).decode("utf-8"))
+        status = response["status"]
+    except (ValueError, KeyError, TypeError):
+        raise wiz.exception.ServerError(
+            "The resolver server returned an incorrect response."
+        )
+
+    if status == "error":
+        raise _create_error(response.get("error", {}))
+
+    return response.get("result")
+
+
+def resolve_context(
+    requests, registries, system_mapping=None, max_depth=None,
+    ignore_patterns=None, ignore_implicit=False, environ_mapping=None,
+    strategy=wiz.symbol.GRAPH_STRATEGY, jobs=None, max_combinations=None,
+    timeout=None, socket_path=None
+):
+    """Return context mapping from *requests* resolved by the server.
+
+    The initial environment is :func:`initiated <wiz.environ.initiate>` from
+    *environ_mapping* before sending the request, so that the variables passed
+    through are fetched from the current environment.
+
+    :param requests: List of strings indicating the package version requested
+        to build the context (e.g. ["package >= 1.0.0, < 2"])
+
+    :param registries: List of registry paths which must be used by the server.
+
+    :param system_mapping: Mapping defining the system which must be used by
+        the server to filter out non compatible definitions. Default is None,
+        which means that the current system mapping will be :func:`queried
+        <wiz.system.query>`.
+
+    :param max_depth: Limited recursion value which must be used by the
+        server to search for definitions. Default is None.
+
+    :param ignore_patterns: List of :mod:`fnmatch` patterns which must be used
+        by the server to skip files and directories within registries. Default
+        is None.
+
+    :param ignore_implicit: Indicates whether implicit packages should not be
+        included in context. Default is False.
+
+    :param environ_mapping: Mapping of environment variables which would be
+        augmented by the resolved environment. Default is None.
+
+    :param strategy: Indicate which resolver should be used by the server to
+        compute the packages. Default is :data:`wiz.symbol.GRAPH_STRATEGY`.
+
+    :param jobs: Number of variant combinations which can be computed
+        concurrently by the server. Default is None.
+
+    :param max_combinations: Maximum number of variant combinations to compute
+        by the server. Default is None.
+
+    :param timeout: Number of seconds after which the server interrupts the
+        resolution. Default is None.
+
+    :param socket_path: Path to the server UNIX socket. Default is None, which
+        means that :func:`get_socket_path` will be used.
+
+    :return: Context mapping as returned by :func:`wiz.resolve_context`.
+
+    :raise: :exc:`wiz.exception.ServerUnavailable` if the server cannot be
+        reached or is using other registries or registry options.
+
+    """
+    result = request(
+        "resolve_context", socket_path=socket_path,
+        requests=list(requests), registries=list(registries),
+        registry_key=_compute_registry_key(
+            registries, system_mapping, max_depth, ignore_patterns
+        ),
+        ignore_implicit=ignore_implicit,
+        environ_mapping=wiz.environ.initiate(environ_mapping),
+        strategy=strategy, jobs=jobs, max_combinations=max_combinations,
+        timeout=timeout
+    )
+    return decode_context(result)
+
+
+def fetch_package_request_from_command(
+    command_request, registries, system_mapping=None, max_depth=None,
+    ignore_patterns=None, socket_path=None
+):
+    """Return package request corresponding to command fetched by the server.
+
+    :param command_request: String indicating which command should be used
+        (e.g. "command", "command >= 1.0.0, < 2", etc.).
+
+    :param registries: List of registry paths which must be used by the server.
+
+    :param system_mapping: Mapping defining the system which must be used by
+        the server to filter out non compatible definitions. Default is None,
+        which means that the current system mapping will be :func:`queried
+        <wiz.system.query>`.
+
+    :param max_depth: Limited recursion value which must be used by the
+        server to search for definitions. Default is None.
+
+    :param ignore_patterns: List of :mod:`fnmatch` patterns which must be used
+        by the server to skip files and directories within registries. Default
+        is None.
+
+    :param socket_path: Path to the server UNIX socket. Default is None, which
+        means that :func:`get_socket_path` will be used.
+
+    :return: String indicating the package request.
+
+    :raise: :exc:`wiz.exception.ServerUnavailable` if the server cannot be
+        reached or is using other registries or registry options.
+
+    """
+    return request(
+        "fetch_package_request_from_command", socket_path=socket_path,
+        command_request=command_request, registries=list(registries),
+        registry_key=_compute_registry_key(
+            registries, system_mapping, max_depth, ignore_patterns
+        )
+    )
+
+
+def encode_context(context):
+    """Return serializable mapping from *context*.
+
+    Packages are replaced by the data and path of their definition and their
+    variant identifier. Binary environment values (e.g. "WIZ_CONTEXT") are
+    decoded and their keys are recorded to be encoded again by
+    :func:`decode_context`.
+
+    :param context: Context mapping as returned by :func:`wiz.resolve_context`.
+
+    :return: Context mapping.
+
+    """
+    _context = dict(context)
+    _context["environ"] = {}
+    _context["binary_environ"] = []
+
+    for key, value in context.get("environ", {}).items():
+        if isinstance(value, six.binary_type) and six.PY3:
+            value = value.decode("utf-8")
+            _context["binary_environ"].append(key)
+
+        _context["environ"][key] = value
+
+    _context["packages"] = [
+        {
+            "definition": _package.definition.data(),
+            "path": _package.definition.path,
+            "registry_path": _package.definition.registry_path,
+            "variant": _package.variant_identifier,
+        }
+        for _package in context.get("packages", [])
+    ]
+    return _context
+
+
+def decode_context(context):
+    """Return context mapping from serialized *context*.
+
+    :param context: Context mapping as returned by :func:`encode_context`.
+
+    :return: Context mapping as returned by :func:`wiz.resolve_context`.
+
+    """
+    _context = dict(context)
+    _context["environ"] = dict(context.get("environ", {}))
+
+    for key in _context.pop("binary_environ", []):
+        _context["environ"][key] = _context["environ"][key].encode("utf-8")
+
+    _context["packages"] = [
+        wiz.package.create(
+            wiz.definition.Definition(
+                item["definition"], path=item["path"],
+                registry_path=item["registry_path"], copy_data=False
+            ),
+            variant_identifier=item["variant"]
+        )
+        for item in context.get("packages", [])
+    ]
+    return _context
+
+
+def _compute_registry_key(
+    registries, system_mapping=None, max_depth=None, ignore_patterns=None
+):
+    """Return key identifying *registries* and registry options.
+
+    If *system_mapping* is None, the current system mapping is
+    :func:`queried <wiz.system.query>`.
+
+    :return: Hexadecimal string as returned by :func:`wiz.cache.compute_key`.
+
+    """
+    if system_mapping is None:
+        system_mapping = wiz.system.query()
+
+    return wiz.cache.compute_key(
+        registries, system_mapping=system_mapping, max_depth=max_depth,
+        ignore_patterns=ignore_patterns
+    )
+
+
+def _prepare_socket_path(path):
+    """Ensure that a UNIX socket can be bound to *path*.
+
+    A socket file left by a server which is not running anymore is removed.
+
+    :raise: :exc:`wiz.exception.ServerError` if a server is already listening
+        to *path*.
+
+    """
+    wiz.filesystem.ensure_directory(os.path.dirname(path))
+
+    if not os.path.exists(path):
+        return
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    try:
+        connection.connect(path)
+
+    except socket.error:
+        os.remove(path)
+
+    else:
+        raise wiz.exception.ServerError(
+            "A resolver server is already listening to {path!r}",
+            details={"path": path}
+        )
+
+    finally:
+        connection.close()
+
+
+def _encode_line(data):
+    """Return *data* encoded as a :term:`JSON` line."""
+    line = ujson.dumps(data) + "\n"
+
+    if isinstance(line, six.text_type):
+        line = line.encode("utf-8")
+
+    return line
+
+
+def _create_error(mapping):
+    """Return exception from error *mapping* returned by the server.
+
+    The exception type is fetched from :mod:`wiz.exception` when possible.
+
+    :param mapping: Mapping in the form of {"type": "", "message": ""}.
+
+    :return: Instance of :exc:`wiz.exception.WizError` or a sub-class.
+
+    """
+    error_type = getattr(wiz.exception, mapping.get("type") or "", None)
+
+    if not (
+        isinstance(error_type, type) and
+        issubclass(error_type, wiz.exception.WizError)
+    ):
+        error_type = wiz.exception.WizError
+
+    # Initialize exception with the message as formatted by the server, as
+    # specific exceptions can require different arguments.
+    error = error_type.__new__(error_type)
+    wiz.exception.WizError.__init__(
+        error, message="{message}",
+        details={"message": mapping.get("message", "")}
+    )
+    return error
@@ -26,6 +26,18 @@ COMMAND_REQUEST_TYPE = "command"
 #: Identifier for packages which should be use implicitly in context.
 IMPLICIT_PACKAGE = "implicit-packages"
 
+#: Executor type using a pool of threads.
+THREAD_EXECUTOR = "thread"
+
+#: Executor type using a pool of processes.
+PROCESS_EXECUTOR = "process"
+
+#: Resolution strategy using a graph divided into variant combinations.
+GRAPH_STRATEGY = "graph"
+
+#: Resolution strategy using a boolean satisfiability solver.
+SAT_STRATEGY = "sat"
+
 #: History action for system identification.
 SYSTEM_IDENTIFICATION_ACTION = "IDENTIFY_SYSTEM"
 
@@ -2,9 +2,11 @@
 
 import base64
 import collections
+import concurrent.futures
 import hashlib
 import pipes
 import re
+import threading
 import zlib
 
 import colorama
@@ -14,37 +16,121 @@ import ujson
 
 import wiz.exception
 import wiz.symbol
-from ._requirement import Requirement
+from ._requirement import (
+    Requirement, FrozenRequirement, parse as parse_requirement,
+    freeze as freeze_requirement
+)
 
 # Arbitrary number which indicates a very high version number
 _INFINITY_VERSION = 9999
 
+#: Maximum number of requirements and versions kept by each interning cache.
+INTERN_CACHE_SIZE = 10000
 
-def get_requirement(content):
+
+class InternCache(object):
+    """Bounded cache sharing parsed objects between identical strings.
+
+    Objects are created with *factory* the first time a string (or any other
+    hashable element) is requested,
+    and the least recently used objects are discarded once the cache contains
+    more than :data:`INTERN_CACHE_SIZE` objects::
+
+        >>> cache = InternCache(Version)
+        >>> cache.get("0.1.0") is cache.get("0.1.0")
+        True
+        >>> cache.statistics()
+        {"hits": 1, "misses": 1, "size": 1}
+
+    .. warning::
+
+        Objects returned are shared by all callers and must not be mutated.
+
+    """
+
+    def __init__(self, factory):
+        """Initialize cache.
+
+        :param factory: Callable which creates the object from a string or
+            any other hashable element.
+
+        """
+        self._factory = factory
+        self._objects = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, content):
+        """Return object created from *content*.
+
+        :param content: String or hashable element to create the object from.
+
+        :return: Object created by the factory.
+
+        :raise: Any error raised by the factory. Errors are not cached.
+
+        """
+        with self._lock:
+            _object = self._objects.pop(content, None)
+
+            if _object is not None:
+                self._hits += 1
+                self._objects[content] = _object
+                return _object
+
+            self._misses += 1
+
+        _object = self._factory(content)
+
+        with self._lock:
+            self._objects[content] = _object
+
+            while len(self._objects) > INTERN_CACHE_SIZE:
+                self._objects.popitem(last=False)
+
+        return _object
+
+    def statistics(self):
+        """Return mapping with number of hits, misses and objects recorded."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._objects)
+            }
+
+    def clear(self):
+        """Discard all objects and reset counters."""
+        with self._lock:
+            self._objects.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+def _create_requirement(content):
     """Return the corresponding requirement instance from *content*.
 
-    :param content: String representing a requirement, with or without
-        version specifier or variant (e.g. "maya", "nuke >= 10, < 11",
-        "ldpk-nuke[10.0]").
+    :param content: String representing a requirement.
 
-    :return: Instance of :class:`packaging.requirements.Requirement`.
+    :return: Instance of :class:`FrozenRequirement`.
 
     :raise: :exc:`wiz.exception.InvalidRequirement` if the requirement is
         incorrect.
 
     """
     try:
-        return Requirement(content)
+        return parse_requirement(content)
     except InvalidRequirement:
         raise wiz.exception.InvalidRequirement(
             "The requirement '{}' is incorrect".format(content)
         )
 
 
-def get_version(content):
+def _create_version(content):
     """Return the corresponding version instance from *content*.
 
-    :param content: String representing a version (e.g. "2018", "0.1.0").
+    :param content: String representing a version.
 
     :return: Instance of :class:`packaging.version.Version`.
 
@@ -59,6 +145,312 @@ def get_version(content):
         )
 
 
+#: Cache sharing requirement instances between identical strings.
+_REQUIREMENT_CACHE = InternCache(_create_requirement)
+
+#: Cache sharing version instances between identical strings.
+_VERSION_CACHE = InternCache(_create_version)
+
+
+def get_requirement(content):
+    """Return the corresponding requirement instance from *content*.
+
+    The same immutable instance is returned for identical strings.
+
+    :param content: String representing a requirement, with or without
+        version specifier or variant (e.g. "maya", "nuke >= 10, < 11",
+        "ldpk-nuke[10.0]").
+
+    :return: Instance of :class:`FrozenRequirement`.
+
+    :raise: :exc:`wiz.exception.InvalidRequirement` if the requirement is
+        incorrect.
+
+    """
+    return _REQUIREMENT_CACHE.get(content)
+
+
+def get_version(content):
+    """Return the corresponding version instance from *content*.
+
+    The same instance is returned for identical strings, so it must not be
+    mutated.
+
+    :param content: String representing a version (e.g. "2018", "0.1.0").
+
+    :return: Instance of :class:`packaging.version.Version`.
+
+    :raise: :exc:`wiz.exception.InvalidVersion` if the version is incorrect.
+
+    """
+    return _VERSION_CACHE.get(content)
+
+
+def get_version_key(version):
+    """Return precomputed comparison key of *version*.
+
+    Sorting versions with this key compares tuples directly instead of calling
+    comparison methods of :class:`packaging.version.Version` instances.
+
+    :param version: Instance of :class:`packaging.version.Version`, or None.
+
+    :return: Tuple which can be compared with other version keys. An empty
+        tuple is returned if *version* is None.
+
+    """
+    if version is None:
+        return ()
+    return version._key
+
+
+def get_intern_statistics():
+    """Return statistics of caches sharing requirements and versions.
+
+    :return: Mapping in the form of::
+
+        {
+            "requirement": {"hits": 520, "misses": 48, "size": 48},
+            "version": {"hits": 310, "misses": 35, "size": 35},
+            "specifier": {"hits": 412, "misses": 40, "size": 40}
+        }
+
+    """
+    return {
+        "requirement": _REQUIREMENT_CACHE.statistics(),
+        "version": _VERSION_CACHE.statistics(),
+        "specifier": _SPECIFIER_CACHE.statistics(),
+    }
+
+
+def clear_intern_cache():
+    """Discard requirements, versions and compiled specifiers shared."""
+    _REQUIREMENT_CACHE.clear()
+    _VERSION_CACHE.clear()
+    _SPECIFIER_CACHE.clear()
+
+
+def compute_release_key(version):
+    """Return sort key from *version* release.
+
+    Trailing zeros are ignored so that equal releases get the same key (e.g.
+    "1.0" and "1.0.0"). Keys preserve the order of versions, but pre-release,
+    post-release and local version segments are not taken into account.
+
+    :param version: Instance of :class:`packaging.version.Version`.
+
+    :return: Tuple with version epoch and release tuple.
+
+    """
+    release = version.release
+
+    while len(release) > 1 and release[-1] == 0:
+        release = release[:-1]
+
+    return version.epoch, release
+
+
+class CompiledSpecifier(object):
+    """Version specifier compiled once to be checked efficiently.
+
+    The specifier is compiled into release bounds and excluded versions, so
+    that most incompatible versions are rejected with tuple comparisons.
+    Other versions are checked with the specifier and the result is
+    recorded::
+
+        >>> specifier = CompiledSpecifier(SpecifierSet(">=2, <3, !=2.5"))
+        >>> specifier.minimum, specifier.maximum
+        ((0, (2,)), (0, (3,)))
+        >>> specifier.contains(Version("2.5"))
+        False
+
+    Bounds are inclusive and do not take pre-release, post-release or local
+    version segments into account, so they can be used to filter a sorted
+    list of keys computed by :func:`compute_release_key`.
+
+    Instances should be created with :func:`compile_specifier` so that they
+    are shared between identical specifiers.
+
+    """
+
+    __slots__ = (
+        "_specifier", "_minimum", "_maximum", "_excluded", "_ranges",
+        "_results"
+    )
+
+    def __init__(self, specifier):
+        """Initialize compiled specifier.
+
+        Bounds and excluded versions are compiled the first time they are
+        required.
+
+        :param specifier: Instance of
+            :class:`packaging.specifiers.SpecifierSet`.
+
+        """
+        self._specifier = specifier
+        self._minimum = None
+        self._maximum = None
+        self._excluded = None
+        self._ranges = None
+        self._results = {}
+
+    def _compile(self):
+        """Compile bounds and excluded versions if necessary."""
+        if self._excluded is not None:
+            return
+
+        excluded = set()
+
+        for _specifier in self._specifier:
+            self._compile_element(
+                _specifier.operator, _specifier.version, excluded
+            )
+
+        self._excluded = frozenset(excluded)
+
+    def _compile_element(self, operator, content, excluded):
+        """Update bounds and *excluded* versions from specifier element.
+
+        :param operator: Specifier operator (e.g. ">=").
+
+        :param content: Specifier version string (e.g. "2.1", "2.*").
+
+        :param excluded: Set of excluded versions to update.
+
+        """
+        is_prefix = content.endswith(".*")
+        if is_prefix:
+            content = content[:-2]
+
+        try:
+            version = get_version(content)
+        except wiz.exception.InvalidVersion:
+            return
+
+        minimum, maximum = None, None
+
+        if operator in (">=", ">"):
+            minimum = compute_release_key(version)
+
+        elif operator in ("<=", "<"):
+            maximum = compute_release_key(version)
+
+        elif operator == "==" and is_prefix:
+            minimum = compute_release_key(version)
+            maximum = (version.epoch, version.release + (float("inf"),))
+
+        elif operator == "==":
+            minimum = maximum = compute_release_key(version)
+
+        elif operator == "~=":
+            minimum = compute_release_key(version)
+            maximum = (version.epoch, version.release[:-1] + (float("inf"),))
+
+        elif operator == "!=" and not is_prefix:
+            excluded.add(version)
+
+        if minimum is not None and (
+            self._minimum is None or minimum > self._minimum
+        ):
+            self._minimum = minimum
+
+        if maximum is not None and (
+            self._maximum is None or maximum < self._maximum
+        ):
+            self._maximum = maximum
+
+    @property
+    def specifier(self):
+        """Return :class:`packaging.specifiers.SpecifierSet` instance."""
+        return self._specifier
+
+    @property
+    def minimum(self):
+        """Return minimum release key, or None if not bounded."""
+        self._compile()
+        return self._minimum
+
+    @property
+    def maximum(self):
+        """Return maximum release key, or None if not bounded."""
+        self._compile()
+        return self._maximum
+
+    @property
+    def excluded(self):
+        """Return set of :class:`packaging.version.Version` excluded."""
+        self._compile()
+        return self._excluded
+
+    def contains(self, version):
+        """Indicate whether *version* is compatible with specifier.
+
+        :param version: Instance of :class:`packaging.version.Version`.
+
+        :return: Boolean value.
+
+        """
+        # Versions with different representations can be equal (e.g. "1.0"
+        # and "1.0.0"), so results are recorded per parsed representation as
+        # arbitrary equality compares version strings.
+        representation = version._version
+        result = self._results.get(representation)
+
+        if result is None:
+            self._compile()
+            key = compute_release_key(version)
+
+            result = not (
+                (self._minimum is not None and key < self._minimum) or
+                (self._maximum is not None and key > self._maximum) or
+                version in self._excluded
+            ) and self._specifier.contains(version)
+
+            if len(self._results) < INTERN_CACHE_SIZE:
+                self._results[representation] = result
+
+        return result
+
+    def ranges(self, requirement):
+        """Return version ranges as returned by :func:`extract_version_ranges`.
+
+        Ranges are only extracted once.
+
+        :param requirement: Instance of
+            :class:`packaging.requirements.Requirement` containing the
+            specifier. It is only used to raise errors.
+
+        :return: List of version tuples.
+
+        :raise: :exc:`wiz.exception.InvalidVersion` if the version extracted
+            from the specifier is incorrect.
+
+        :raise: :exc:`wiz.exception.InvalidRequirement` if the specifier
+            operator is not accepted or if the requirement does not allow any
+            versions to be reached.
+
+        """
+        if self._ranges is None:
+            self._ranges = tuple(extract_version_ranges(requirement))
+
+        return list(self._ranges)
+
+
+#: Cache sharing compiled specifiers between identical specifiers.
+_SPECIFIER_CACHE = InternCache(CompiledSpecifier)
+
+
+def compile_specifier(specifier):
+    """Return compiled specifier shared between identical specifiers.
+
+    :param specifier: Instance of :class:`packaging.specifiers.SpecifierSet`.
+
+    :return: Instance of :class:`CompiledSpecifier`.
+
+    """
+    return _SPECIFIER_CACHE.get(specifier)
+
+
 def is_overlapping(requirement1, requirement2):
     """Indicate whether requirements are overlapping.
 
@@ -91,8 +483,8 @@ def is_overlapping(requirement1, requirement2):
             "['{}' and '{}'].".format(requirement1.name, requirement2.name)
         )
 
-    r1 = extract_version_ranges(requirement1)
-    r2 = extract_version_ranges(requirement2)
+    r1 = compile_specifier(requirement1.specifier).ranges(requirement1)
+    r2 = compile_specifier(requirement2.specifier).ranges(requirement2)
     return (
         (r2[-1][1] is None or r1[0][0] is None or r2[-1][1] >= r1[0][0]) and
         (r1[-1][1] is None or r2[0][0] is None or r1[-1][1] >= r2[0][0])
@@ -418,6 +810,41 @@ def _decrement_version(version):
     return version[:index] + (version[index] - 1, _INFINITY_VERSION)
 
 
+def create_executor(workers=None, executor=None):
+    """Return executor to run tasks concurrently with *workers*.
+
+    :param workers: Number of workers to use. Default is None, which means that
+        tasks should be executed sequentially unless an executor instance is
+        given.
+
+    :param executor: Instance of :class:`concurrent.futures.Executor` or type
+        of executor to create (:data:`wiz.symbol.THREAD_EXECUTOR` or
+        :data:`wiz.symbol.PROCESS_EXECUTOR`). Default is None, which means that
+        a thread pool executor will be created.
+
+    :return: Instance of :class:`concurrent.futures.Executor`, or None if
+        tasks should be executed sequentially.
+
+    :raise: :exc:`ValueError` if the executor type is incorrect.
+
+    """
+    if isinstance(executor, concurrent.futures.Executor):
+        return executor
+
+    if executor not in (
+        None, wiz.symbol.THREAD_EXECUTOR, wiz.symbol.PROCESS_EXECUTOR
+    ):
+        raise ValueError("Executor type is incorrect: {!r}".format(executor))
+
+    if workers is None or workers <= 1:
+        return None
+
+    if executor == wiz.symbol.PROCESS_EXECUTOR:
+        return concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+
+    return concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+
 def encode(element):
     """Return serialized and encoded *element*.
 
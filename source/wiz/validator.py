@@ -34,20 +34,55 @@ def validate_definition(data):
         validate_type(data, dict)
         validate_keywords(data, keywords)
 
+    except ValueError as error:
+        raise wiz.exception.IncorrectDefinition(str(error))
+
+    validate_definition_header(data)
+
+    try:
+        validate_install_root_keyword(data)
+        validate_install_location_keyword(data)
+        validate_environ_keyword(data)
+        validate_requirements_keyword(data)
+        validate_conditions_keyword(data)
+        validate_variants_keyword(data)
+
+    except ValueError as error:
+        raise wiz.exception.IncorrectDefinition(str(error))
+
+
+def validate_definition_header(data):
+    """Validate keywords required to fetch a definition from *data* mapping.
+
+    Only the keywords required to :func:`fetch <wiz.definition.fetch>` and
+    :func:`query <wiz.definition.query>` definitions are validated, along with
+    the variant identifiers. Other keywords should be validated with
+    :func:`validate_definition` before being used.
+
+    :param data: Mapping to validate.
+
+    :raise: :exc:`wiz.exception.IncorrectDefinition` if the *data* mapping
+        is incorrect.
+
+    """
+    try:
+        validate_type(data, dict)
+
         validate_identifier_keyword(data)
         validate_version_keyword(data)
         validate_namespace_keyword(data)
         validate_description_keyword(data)
         validate_auto_use_keyword(data)
         validate_disabled_keyword(data)
-        validate_install_root_keyword(data)
-        validate_install_location_keyword(data)
         validate_system_keyword(data)
         validate_command_keyword(data)
-        validate_environ_keyword(data)
-        validate_requirements_keyword(data)
-        validate_conditions_keyword(data)
-        validate_variants_keyword(data)
+
+        variants = data.get("variants")
+        validate_type(variants, list, label="'variants'")
+
+        for index, variant in enumerate(variants or []):
+            validate_type(variant, dict, label="'variants/{}'".format(index))
+            validate_identifier_keyword(variant, variant_index=index)
 
     except ValueError as error:
         raise wiz.exception.IncorrectDefinition(str(error))
@@ -0,0 +1,41 @@
+# :coding: utf-8
+
+"""
+Requirements are parsed for each definition requirement, condition and
+implicit request, so parsing a requirement should take a few microseconds.
+
+"""
+
+import pytest
+
+import wiz.utility
+from wiz.utility import Requirement
+
+
+#: Requirements representative of the ones found in registries.
+REQUIREMENTS = [
+    "foo",
+    "foo[V1]",
+    "foo >= 0.1.0, < 1",
+    "foo::bar[V2] >= 2.3, < 3, != 2.5.*",
+    "::baz ~= 1.2",
+    "el >= 7, < 8",
+]
+
+
+def _parse(function):
+    """Parse all requirements with *function*."""
+    for content in REQUIREMENTS:
+        function(content)
+
+
+@pytest.mark.benchmark(group="requirement")
+def test_parse_with_grammar(benchmark):
+    """Parse requirements with pyparsing grammar."""
+    benchmark(_parse, Requirement)
+
+
+@pytest.mark.benchmark(group="requirement")
+def test_parse(benchmark):
+    """Parse requirements with default parser."""
+    benchmark(_parse, wiz.utility.get_requirement)
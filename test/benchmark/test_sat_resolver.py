@@ -0,0 +1,92 @@
+# :coding: utf-8
+
+import os
+
+import pytest
+
+import wiz.config
+import wiz.definition
+import wiz.sat
+from wiz.utility import Requirement
+
+
+@pytest.fixture(autouse=True)
+def reset_configuration(mocker):
+    """Ensure that no personal configuration is fetched during tests."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+
+    # Reset configuration.
+    wiz.config.fetch(refresh=True)
+
+
+@pytest.mark.parametrize("plugins, variants", [
+    (4, 4),
+    (8, 4),
+    (8, 8),
+], ids=[
+    "4-plugins-4-variants",
+    "8-plugins-4-variants",
+    "8-plugins-8-variants",
+])
+def test_plugins_with_variants(benchmark, plugins, variants):
+    """Resolve plugins for which only the last variant is compatible.
+
+    Root
+     |
+     |--(A): A==0.1.0
+     |   |
+     |   `--(L==1): L==1
+     |
+     |--(P0): P0[V{n}]==0.1.0 | ... | P0[V1]==0.1.0
+     |   |
+     |   `--(L=={n}) ... (L==1)
+     |
+     ...
+
+    Expected: L==1, A==0.1.0, P0[V1]==0.1.0, ...
+
+    """
+    definition_mapping = {
+        "A": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.1.0",
+                "requirements": ["L==1"]
+            })
+        },
+        "L": {
+            str(index): wiz.definition.Definition({
+                "identifier": "L",
+                "version": str(index)
+            })
+            for index in range(1, variants + 1)
+        }
+    }
+
+    for plugin in range(plugins):
+        identifier = "P{}".format(plugin)
+        definition_mapping[identifier] = {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": identifier,
+                "version": "0.1.0",
+                "variants": [
+                    {
+                        "identifier": "V{}".format(index),
+                        "requirements": ["L=={}".format(index)]
+                    }
+                    for index in range(variants, 0, -1)
+                ]
+            })
+        }
+
+    requirements = [Requirement("A")] + [
+        Requirement("P{}".format(plugin)) for plugin in range(plugins)
+    ]
+
+    def _resolve():
+        """Resolve context."""
+        resolver = wiz.sat.Resolver(definition_mapping)
+        return resolver.compute_packages(requirements)
+
+    packages = benchmark(_resolve)
+    assert len(packages) == plugins + 2
@@ -6,7 +6,9 @@ import pytest
 
 import wiz.config
 import wiz.definition
+import wiz.exception
 import wiz.graph
+import wiz.sat
 from wiz.utility import Requirement
 
 #: Indicate whether spied call should be tested.
@@ -22,6 +24,53 @@ def reset_configuration(mocker):
     wiz.config.fetch(refresh=True)
 
 
+@pytest.fixture(autouse=True)
+def compare_with_sat_resolver(mocker):
+    """Ensure that the SAT resolver returns the same packages for each test.
+
+    Requirements resolved during the test with :class:`wiz.graph.Resolver`
+    are recorded, and resolved again with both resolvers once all spied calls
+    have been checked.
+
+    """
+    calls = []
+    compute_packages = wiz.graph.Resolver.compute_packages
+
+    def _compute_packages(self, requirements):
+        calls.append((self.definition_mapping, requirements))
+        return compute_packages(self, requirements)
+
+    mocker.patch.object(
+        wiz.graph.Resolver, "compute_packages", _compute_packages
+    )
+
+    yield
+
+    mocker.stopall()
+
+    for definition_mapping, requirements in calls:
+        try:
+            packages = wiz.graph.Resolver(definition_mapping).compute_packages(
+                requirements
+            )
+
+        except wiz.exception.GraphResolutionError:
+            with pytest.raises(wiz.exception.GraphResolutionError):
+                wiz.sat.Resolver(definition_mapping).compute_packages(
+                    requirements
+                )
+
+        else:
+            resolver = wiz.sat.Resolver(definition_mapping)
+            assert (
+                [package.identifier for package in packages] ==
+                [
+                    package.identifier for package
+                    in resolver.compute_packages(requirements)
+                ]
+            )
+
+
 @pytest.fixture()
 def spied_fetch_next_combination(mocker):
     """Return spy mocker on 'wiz.graph.Resolver._fetch_next_combination'."""
@@ -260,11 +309,11 @@ def test_scenario_1(
         assert spied_fetch_distance_mapping.call_count == 6
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 1
-        assert spied_compute_distance_mapping.call_count == 3
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 0
         assert spied_trim_unreachable_from_graph.call_count == 1
         assert spied_trim_invalid_from_graph.call_count == 1
-        assert spied_updated_by_distance.call_count == 1
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 2
         assert spied_combined_requirements.call_count == 1
         assert spied_extract_conflicting_requirements.call_count == 0
@@ -413,7 +462,7 @@ def test_scenario_2(
         assert spied_generate_variant_combinations.call_count == 0
         assert spied_trim_unreachable_from_graph.call_count == 0
         assert spied_trim_invalid_from_graph.call_count == 0
-        assert spied_updated_by_distance.call_count == 1
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 1
         assert spied_combined_requirements.call_count == 3
         assert spied_extract_conflicting_requirements.call_count == 1
@@ -495,11 +544,11 @@ def test_scenario_3(
         assert spied_fetch_distance_mapping.call_count == 10
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 1
-        assert spied_compute_distance_mapping.call_count == 3
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 0
         assert spied_trim_unreachable_from_graph.call_count == 1
         assert spied_trim_invalid_from_graph.call_count == 1
-        assert spied_updated_by_distance.call_count == 3
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 4
         assert spied_combined_requirements.call_count == 3
         assert spied_extract_conflicting_requirements.call_count == 0
@@ -611,7 +660,7 @@ def test_scenario_4(
         assert spied_fetch_distance_mapping.call_count == 5
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 1
-        assert spied_compute_distance_mapping.call_count == 3
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 1
         assert spied_trim_unreachable_from_graph.call_count == 1
         assert spied_trim_invalid_from_graph.call_count == 1
@@ -832,11 +881,11 @@ def test_scenario_6(
         assert spied_fetch_distance_mapping.call_count == 13
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 3
-        assert spied_compute_distance_mapping.call_count == 7
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 1
         assert spied_trim_unreachable_from_graph.call_count == 3
         assert spied_trim_invalid_from_graph.call_count == 3
-        assert spied_updated_by_distance.call_count == 2
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 2
         assert spied_combined_requirements.call_count == 2
         assert spied_extract_conflicting_requirements.call_count == 2
@@ -933,11 +982,11 @@ def test_scenario_7(
         assert spied_fetch_distance_mapping.call_count == 12
         assert spied_extract_combinations.call_count == 2
         assert spied_resolve_conflicts.call_count == 1
-        assert spied_compute_distance_mapping.call_count == 4
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 0
         assert spied_trim_unreachable_from_graph.call_count == 3
         assert spied_trim_invalid_from_graph.call_count == 0
-        assert spied_updated_by_distance.call_count == 3
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 4
         assert spied_combined_requirements.call_count == 4
         assert spied_extract_conflicting_requirements.call_count == 0
@@ -1038,11 +1087,11 @@ def test_scenario_8(
         assert spied_fetch_distance_mapping.call_count == 9
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 1
-        assert spied_compute_distance_mapping.call_count == 3
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 0
         assert spied_trim_unreachable_from_graph.call_count == 1
         assert spied_trim_invalid_from_graph.call_count == 1
-        assert spied_updated_by_distance.call_count == 4
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 4
         assert spied_combined_requirements.call_count == 4
         assert spied_extract_conflicting_requirements.call_count == 2
@@ -1136,11 +1185,11 @@ def test_scenario_9(
         assert spied_fetch_distance_mapping.call_count == 8
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 1
-        assert spied_compute_distance_mapping.call_count == 3
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 0
         assert spied_trim_unreachable_from_graph.call_count == 1
         assert spied_trim_invalid_from_graph.call_count == 1
-        assert spied_updated_by_distance.call_count == 2
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 4
         assert spied_combined_requirements.call_count == 2
         assert spied_extract_conflicting_requirements.call_count == 1
@@ -1241,11 +1290,11 @@ def test_scenario_10(
         assert spied_fetch_distance_mapping.call_count == 10
         assert spied_extract_combinations.call_count == 2
         assert spied_resolve_conflicts.call_count == 2
-        assert spied_compute_distance_mapping.call_count == 4
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 1
         assert spied_trim_unreachable_from_graph.call_count == 2
         assert spied_trim_invalid_from_graph.call_count == 0
-        assert spied_updated_by_distance.call_count == 3
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 3
         assert spied_combined_requirements.call_count == 3
         assert spied_extract_conflicting_requirements.call_count == 0
@@ -1358,7 +1407,7 @@ def test_scenario_11(
         assert spied_fetch_distance_mapping.call_count == 5
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 1
-        assert spied_compute_distance_mapping.call_count == 3
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 1
         assert spied_trim_unreachable_from_graph.call_count == 1
         assert spied_trim_invalid_from_graph.call_count == 1
@@ -1502,11 +1551,11 @@ def test_scenario_12(
         assert spied_fetch_distance_mapping.call_count == 10
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 1
-        assert spied_compute_distance_mapping.call_count == 4
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 1
         assert spied_trim_unreachable_from_graph.call_count == 2
         assert spied_trim_invalid_from_graph.call_count == 1
-        assert spied_updated_by_distance.call_count == 2
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 2
         assert spied_combined_requirements.call_count == 2
         assert spied_extract_conflicting_requirements.call_count == 0
@@ -1636,11 +1685,11 @@ def test_scenario_13(
         assert spied_fetch_distance_mapping.call_count == 10
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 1
-        assert spied_compute_distance_mapping.call_count == 4
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 1
         assert spied_trim_unreachable_from_graph.call_count == 2
         assert spied_trim_invalid_from_graph.call_count == 1
-        assert spied_updated_by_distance.call_count == 2
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 2
         assert spied_combined_requirements.call_count == 2
         assert spied_extract_conflicting_requirements.call_count == 0
@@ -1762,7 +1811,7 @@ def test_scenario_14(
         assert spied_fetch_distance_mapping.call_count == 4
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 1
-        assert spied_compute_distance_mapping.call_count == 2
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 1
         assert spied_trim_unreachable_from_graph.call_count == 1
         assert spied_trim_invalid_from_graph.call_count == 0
@@ -1884,22 +1933,27 @@ def test_scenario_15(
     assert packages[1].identifier == "B[V4]"
     assert packages[2].identifier == "A[V2]"
 
+    # Combinations with 'A[V3]' are skipped once a nogood has been recorded.
+    assert resolver.statistics == {
+        "learned_nogoods": 1, "pruned_combinations": 6
+    }
+
     # Check spied functions / methods
     if _CHECK_SPIED_CALL:
-        assert spied_fetch_next_combination.call_count == 9
-        assert spied_compute_combination.call_count == 9
-        assert spied_fetch_distance_mapping.call_count == 21
+        assert spied_fetch_next_combination.call_count == 3
+        assert spied_compute_combination.call_count == 3
+        assert spied_fetch_distance_mapping.call_count == 9
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 2
-        assert spied_compute_distance_mapping.call_count == 10
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 1
-        assert spied_trim_unreachable_from_graph.call_count == 9
+        assert spied_trim_unreachable_from_graph.call_count == 3
         assert spied_trim_invalid_from_graph.call_count == 0
         assert spied_updated_by_distance.call_count == 1
         assert spied_extract_conflicting_nodes.call_count == 0
         assert spied_combined_requirements.call_count == 0
         assert spied_extract_conflicting_requirements.call_count == 0
-        assert spied_relink_parents.call_count == 54
+        assert spied_relink_parents.call_count == 18
         assert spied_extract_ordered_packages.call_count == 1
 
 
@@ -2028,20 +2082,20 @@ def test_scenario_16(
 
     # Check spied functions / methods
     if _CHECK_SPIED_CALL:
-        assert spied_fetch_next_combination.call_count == 9
-        assert spied_compute_combination.call_count == 9
-        assert spied_fetch_distance_mapping.call_count == 22
+        assert spied_fetch_next_combination.call_count == 3
+        assert spied_compute_combination.call_count == 3
+        assert spied_fetch_distance_mapping.call_count == 10
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 2
-        assert spied_compute_distance_mapping.call_count == 11
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 1
-        assert spied_trim_unreachable_from_graph.call_count == 9
+        assert spied_trim_unreachable_from_graph.call_count == 3
         assert spied_trim_invalid_from_graph.call_count == 1
-        assert spied_updated_by_distance.call_count == 1
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 1
         assert spied_combined_requirements.call_count == 1
         assert spied_extract_conflicting_requirements.call_count == 1
-        assert spied_relink_parents.call_count == 54
+        assert spied_relink_parents.call_count == 18
         assert spied_extract_ordered_packages.call_count == 1
 
 
@@ -2600,11 +2654,11 @@ def test_scenario_21(
         assert spied_fetch_distance_mapping.call_count == 8
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 1
-        assert spied_compute_distance_mapping.call_count == 5
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 0
         assert spied_trim_unreachable_from_graph.call_count == 2
         assert spied_trim_invalid_from_graph.call_count == 3
-        assert spied_updated_by_distance.call_count == 1
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 2
         assert spied_combined_requirements.call_count == 1
         assert spied_extract_conflicting_requirements.call_count == 0
@@ -3120,11 +3174,11 @@ def test_scenario_27(
         assert spied_fetch_distance_mapping.call_count == 6
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 1
-        assert spied_compute_distance_mapping.call_count == 2
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 0
         assert spied_trim_unreachable_from_graph.call_count == 1
         assert spied_trim_invalid_from_graph.call_count == 0
-        assert spied_updated_by_distance.call_count == 2
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 2
         assert spied_combined_requirements.call_count == 2
         assert spied_extract_conflicting_requirements.call_count == 0
@@ -3327,11 +3381,11 @@ def test_scenario_29(
         assert spied_fetch_distance_mapping.call_count == 10
         assert spied_extract_combinations.call_count == 2
         assert spied_resolve_conflicts.call_count == 2
-        assert spied_compute_distance_mapping.call_count == 5
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 2
         assert spied_trim_unreachable_from_graph.call_count == 3
         assert spied_trim_invalid_from_graph.call_count == 0
-        assert spied_updated_by_distance.call_count == 1
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 1
         assert spied_combined_requirements.call_count == 1
         assert spied_extract_conflicting_requirements.call_count == 0
@@ -3512,7 +3566,7 @@ def test_scenario_31(
         assert spied_fetch_distance_mapping.call_count == 6
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 1
-        assert spied_compute_distance_mapping.call_count == 3
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 1
         assert spied_trim_unreachable_from_graph.call_count == 2
         assert spied_trim_invalid_from_graph.call_count == 0
@@ -3623,11 +3677,11 @@ def test_scenario_32(
         assert spied_fetch_distance_mapping.call_count == 6
         assert spied_extract_combinations.call_count == 1
         assert spied_resolve_conflicts.call_count == 1
-        assert spied_compute_distance_mapping.call_count == 3
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 1
         assert spied_trim_unreachable_from_graph.call_count == 2
         assert spied_trim_invalid_from_graph.call_count == 0
-        assert spied_updated_by_distance.call_count == 1
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 1
         assert spied_combined_requirements.call_count == 2
         assert spied_extract_conflicting_requirements.call_count == 1
@@ -3787,11 +3841,11 @@ def test_scenario_33(
         assert spied_fetch_distance_mapping.call_count == 4
         assert spied_extract_combinations.call_count == 2
         assert spied_resolve_conflicts.call_count == 2
-        assert spied_compute_distance_mapping.call_count == 2
+        assert spied_compute_distance_mapping.call_count == 1
         assert spied_generate_variant_combinations.call_count == 0
         assert spied_trim_unreachable_from_graph.call_count == 0
         assert spied_trim_invalid_from_graph.call_count == 0
-        assert spied_updated_by_distance.call_count == 2
+        assert spied_updated_by_distance.call_count == 0
         assert spied_extract_conflicting_nodes.call_count == 2
         assert spied_combined_requirements.call_count == 4
         assert spied_extract_conflicting_requirements.call_count == 1
@@ -4034,3 +4088,83 @@ def test_scenario_35(
         assert spied_extract_conflicting_requirements.call_count == 0
         assert spied_relink_parents.call_count == 3
         assert spied_extract_ordered_packages.call_count == 0
+
+
+def test_scenario_36(
+    spied_fetch_next_combination,
+    spied_compute_combination,
+    spied_fetch_distance_mapping,
+    spied_extract_combinations,
+    spied_resolve_conflicts,
+    spied_compute_distance_mapping,
+    spied_generate_variant_combinations,
+    spied_trim_unreachable_from_graph,
+    spied_trim_invalid_from_graph,
+    spied_updated_by_distance,
+    spied_extract_conflicting_nodes,
+    spied_combined_requirements,
+    spied_extract_conflicting_requirements,
+    spied_relink_parents,
+    spied_extract_ordered_packages
+):
+    """Compute packages for the following graph.
+
+    The best version of a package has conditions which are fulfilled, but a
+    version without conditions is required to resolve the conflict.
+
+    Root
+     |
+     |--(A): A==2.2.0 (Condition: C)
+     |
+     `--(C): C==3.1.0
+         |
+         `--(A<1): A==0.0.0
+
+    Expected: C==3.1.0, A==0.0.0
+
+    """
+    definition_mapping = {
+        "A": {
+            "2.2.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "2.2.0",
+                "conditions": ["C"]
+            }),
+            "0.0.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.0.0"
+            })
+        },
+        "C": {
+            "3.1.0": wiz.definition.Definition({
+                "identifier": "C",
+                "version": "3.1.0",
+                "requirements": ["A<1"]
+            })
+        }
+    }
+
+    resolver = wiz.graph.Resolver(definition_mapping)
+    packages = resolver.compute_packages([Requirement("A"), Requirement("C")])
+
+    assert len(packages) == 2
+    assert packages[0].identifier == "C==3.1.0"
+    assert packages[1].identifier == "A==0.0.0"
+
+    # Check spied functions / methods
+    if _CHECK_SPIED_CALL:
+        assert spied_fetch_next_combination.call_count == 1
+        assert spied_compute_combination.call_count == 1
+        assert spied_fetch_distance_mapping.call_count == 6
+        assert spied_extract_combinations.call_count == 1
+        assert spied_resolve_conflicts.call_count == 1
+        assert spied_compute_distance_mapping.call_count == 1
+        assert spied_generate_variant_combinations.call_count == 0
+        assert spied_trim_unreachable_from_graph.call_count == 1
+        assert spied_trim_invalid_from_graph.call_count == 0
+        assert spied_updated_by_distance.call_count == 0
+        assert spied_extract_conflicting_nodes.call_count == 2
+        assert spied_combined_requirements.call_count == 2
+        assert spied_extract_conflicting_requirements.call_count == 0
+        assert spied_relink_parents.call_count == 1
+        assert spied_extract_ordered_packages.call_count == 1
@@ -0,0 +1,274 @@
+# :coding: utf-8
+
+import json
+import os
+import time
+
+import pytest
+
+import wiz.cache
+import wiz.definition
+import wiz.registry
+
+
+@pytest.fixture(autouse=True)
+def reset_memory():
+    """Ensure that no definition mapping is kept in memory between tests."""
+    wiz.cache.clear_memory()
+    yield
+    wiz.cache.clear_memory()
+
+
+@pytest.fixture()
+def mocked_time(mocker):
+    """Return mocked 'time.time' function used by cache module."""
+    mocked_module = mocker.patch.object(wiz.cache, "time")
+    mocked_module.time.return_value = 1000
+    return mocked_module.time
+
+
+@pytest.fixture()
+def cache_path(mocker, temporary_directory):
+    """Return mocked cache directory path."""
+    path = os.path.join(temporary_directory, "cache")
+    mocker.patch.object(wiz.cache, "get_path", return_value=path)
+    return path
+
+
+@pytest.fixture()
+def registry(temporary_directory):
+    """Return registry path with a few definitions."""
+    path = os.path.join(temporary_directory, "registry")
+
+    for identifier, data in [
+        ("foo", {"version": "0.1.0", "requirements": ["bar >= 1"]}),
+        ("bar", {"version": "1.0.0", "command": {"app": "App"}}),
+        ("baz", {"variants": [{"identifier": "V1", "requirements": ["foo"]}]}),
+    ]:
+        data["identifier"] = identifier
+        _export(os.path.join(path, identifier, "definition.json"), data)
+
+    os.makedirs(os.path.join(path, os.path.dirname(wiz.registry.INDEX_PATH)))
+
+    return path
+
+
+def _export(path, data):
+    """Export definition *data* to *path*."""
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+
+    with open(path, "w") as stream:
+        stream.write(json.dumps(data))
+
+
+def _fetch(paths):
+    """Return definition mapping from *paths*."""
+    return wiz.definition.fetch(paths, system_mapping={})
+
+
+def test_compute_key():
+    """Compute snapshot key from fetching options."""
+    key = wiz.cache.compute_key(["/registry1", "/registry2"])
+    assert key == wiz.cache.compute_key(["/registry1", "/registry2"])
+    assert key != wiz.cache.compute_key(["/registry2", "/registry1"])
+    assert key != wiz.cache.compute_key(
+        ["/registry1", "/registry2"], max_depth=2
+    )
+    assert key != wiz.cache.compute_key(
+        ["/registry1", "/registry2"], system_mapping={"os": "el7"}
+    )
+    assert wiz.cache.compute_key(
+        ["/registry"], ignore_patterns=["a", "b"]
+    ) == wiz.cache.compute_key(["/registry"], ignore_patterns=["b", "a"])
+
+
+@pytest.mark.usefixtures("cache_path")
+def test_export_and_load_snapshot(registry):
+    """Export and load definition mapping snapshot."""
+    mapping = _fetch([registry])
+
+    assert wiz.cache.export_snapshot(mapping, [registry]) is True
+    snapshot = wiz.cache.load_snapshot([registry])
+
+    assert sorted(snapshot["package"].keys()) == ["bar", "baz", "foo"]
+    assert snapshot["command"] == {"app": "bar"}
+
+    definition = snapshot["package"]["foo"]["0.1.0"]
+    assert definition.path == mapping["package"]["foo"]["0.1.0"].path
+    assert str(definition.version) == "0.1.0"
+    assert [str(r) for r in definition.requirements] == ["bar >=1"]
+
+    variant = snapshot["package"]["baz"]["-"].variants[0]
+    assert [str(r) for r in variant.requirements] == ["foo"]
+    assert (
+        snapshot["package"]["bar"]["1.0.0"].version
+        > snapshot["package"]["foo"]["0.1.0"].version
+    )
+
+
+@pytest.mark.usefixtures("cache_path")
+def test_load_snapshot_missing(registry):
+    """Fail to load missing snapshot."""
+    _fetch([registry])
+    assert wiz.cache.load_snapshot([registry]) is None
+    assert wiz.cache.load_snapshot([registry], max_depth=1) is None
+
+
+@pytest.mark.usefixtures("cache_path")
+def test_load_snapshot_outdated(registry):
+    """Ignore snapshot when registry has been modified."""
+    wiz.cache.export_snapshot(_fetch([registry]), [registry])
+
+    # Ensure that modification time differs on low resolution filesystems.
+    time.sleep(0.01)
+    _export(
+        os.path.join(registry, "qux", "definition.json"),
+        {"identifier": "qux"}
+    )
+    assert wiz.cache.load_snapshot([registry]) is None
+
+    # Snapshot is valid again once the index has been updated.
+    mapping = _fetch([registry])
+    wiz.cache.export_snapshot(mapping, [registry])
+
+    snapshot = wiz.cache.load_snapshot([registry])
+    assert sorted(snapshot["package"].keys()) == ["bar", "baz", "foo", "qux"]
+
+
+@pytest.mark.usefixtures("cache_path")
+def test_load_snapshot_outdated_file(registry):
+    """Ignore snapshot when definition has been modified in place."""
+    wiz.cache.export_snapshot(_fetch([registry]), [registry])
+
+    time.sleep(0.01)
+    _export(
+        os.path.join(registry, "bar", "definition.json"),
+        {"identifier": "bar", "version": "2.0.0"}
+    )
+    assert wiz.cache.load_snapshot([registry]) is None
+
+    mapping = _fetch([registry])
+    wiz.cache.export_snapshot(mapping, [registry])
+
+    snapshot = wiz.cache.load_snapshot([registry])
+    assert sorted(snapshot["package"]["bar"].keys()) == ["2.0.0"]
+    assert snapshot["command"] == {}
+
+
+def test_load_snapshot_incompatible_version(mocker, cache_path, registry):
+    """Ignore snapshot exported with another version of Wiz."""
+    wiz.cache.export_snapshot(_fetch([registry]), [registry])
+
+    mocker.patch.object(wiz.cache, "__version__", "__OTHER_VERSION__")
+    assert wiz.cache.load_snapshot([registry]) is None
+
+
+def test_load_snapshot_corrupted(cache_path, registry):
+    """Ignore corrupted snapshot."""
+    wiz.cache.export_snapshot(_fetch([registry]), [registry])
+
+    path = os.path.join(cache_path, os.listdir(cache_path)[0])
+    with open(path, "wb") as stream:
+        stream.write(b"incorrect")
+
+    assert wiz.cache.load_snapshot([registry]) is None
+
+
+def test_export_snapshot_without_index(cache_path, registry):
+    """Fail to export snapshot when registry does not have an index."""
+    mapping = _fetch([registry])
+    os.remove(os.path.join(registry, wiz.registry.INDEX_PATH))
+
+    assert wiz.cache.export_snapshot(mapping, [registry]) is False
+    assert not os.path.exists(cache_path)
+
+
+def test_load_from_memory(mocked_time, registry):
+    """Load definition mapping kept in memory."""
+    mapping = _fetch([registry])
+    wiz.cache.save_to_memory(mapping, [registry], max_depth=2)
+
+    assert wiz.cache.load_from_memory([registry], max_depth=2) is mapping
+    assert wiz.cache.load_from_memory([registry]) is None
+    assert wiz.cache.load_from_memory(
+        [registry], max_depth=2, lazy=True
+    ) is None
+
+    # Registry is checked once time to live has expired.
+    mocked_time.return_value = 1000 + wiz.cache.MEMORY_CACHE_TTL
+    assert wiz.cache.load_from_memory([registry], max_depth=2) is mapping
+
+
+def test_load_from_memory_outdated(mocked_time, registry):
+    """Discard definition mapping when registry has been modified."""
+    mapping = _fetch([registry])
+    wiz.cache.save_to_memory(mapping, [registry])
+
+    # Ensure that modification time differs on low resolution filesystems.
+    time.sleep(0.01)
+    _export(
+        os.path.join(registry, "qux", "definition.json"),
+        {"identifier": "qux"}
+    )
+
+    # Registry is not checked before time to live has expired.
+    assert wiz.cache.load_from_memory([registry]) is mapping
+
+    mocked_time.return_value = 1000 + wiz.cache.MEMORY_CACHE_TTL
+    assert wiz.cache.load_from_memory([registry]) is None
+
+
+def test_load_from_memory_outdated_file(mocked_time, registry):
+    """Discard definition mapping when definition is modified in place."""
+    mapping = _fetch([registry])
+    wiz.cache.save_to_memory(mapping, [registry])
+
+    # Ensure that modification time differs on low resolution filesystems.
+    time.sleep(0.01)
+    _export(
+        os.path.join(registry, "bar", "definition.json"),
+        {"identifier": "bar", "version": "2.0.0"}
+    )
+
+    mocked_time.return_value = 1000 + wiz.cache.MEMORY_CACHE_TTL
+    assert wiz.cache.load_from_memory([registry]) is None
+
+
+def test_load_from_memory_without_index(mocked_time, registry):
+    """Discard definition mapping when registry cannot be checked."""
+    mapping = _fetch([registry])
+    os.remove(os.path.join(registry, wiz.registry.INDEX_PATH))
+    wiz.cache.save_to_memory(mapping, [registry])
+
+    assert wiz.cache.load_from_memory([registry]) is mapping
+
+    mocked_time.return_value = 1000 + wiz.cache.MEMORY_CACHE_TTL
+    assert wiz.cache.load_from_memory([registry]) is None
+
+
+def test_save_to_memory_least_recently_used(mocker, mocked_time, registry):
+    """Discard least recently used definition mapping."""
+    mocker.patch.object(wiz.cache, "MEMORY_CACHE_SIZE", 2)
+    _fetch([registry])
+
+    wiz.cache.save_to_memory("__MAPPING1__", [registry], max_depth=1)
+    wiz.cache.save_to_memory("__MAPPING2__", [registry], max_depth=2)
+
+    # Mark first mapping as recently used.
+    wiz.cache.load_from_memory([registry], max_depth=1)
+
+    wiz.cache.save_to_memory("__MAPPING3__", [registry], max_depth=3)
+
+    assert wiz.cache.load_from_memory([registry], max_depth=1) == "__MAPPING1__"
+    assert wiz.cache.load_from_memory([registry], max_depth=2) is None
+    assert wiz.cache.load_from_memory([registry], max_depth=3) == "__MAPPING3__"
+
+
+def test_clear_memory(registry):
+    """Discard all definition mappings kept in memory."""
+    mapping = _fetch([registry])
+    wiz.cache.save_to_memory(mapping, [registry])
+
+    wiz.cache.clear_memory()
+    assert wiz.cache.load_from_memory([registry]) is None
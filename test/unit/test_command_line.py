@@ -17,6 +17,7 @@ import wiz.filesystem
 import wiz.history
 import wiz.package
 import wiz.registry
+import wiz.server
 import wiz.spawn
 import wiz.symbol
 import wiz.utility
@@ -89,6 +90,21 @@ def mocked_fetch_package_request_from_command(mocker):
     return mocker.patch.object(wiz, "fetch_package_request_from_command")
 
 
+@pytest.fixture()
+def mocked_server_resolve_context(mocker):
+    """Return mocked 'wiz.server.resolve_context' function."""
+    return mocker.patch.object(wiz.server, "resolve_context")
+
+
+@pytest.fixture()
+def mocked_server_fetch_package_request_from_command(mocker):
+    """Return mocked 'wiz.server.fetch_package_request_from_command' function.
+    """
+    return mocker.patch.object(
+        wiz.server, "fetch_package_request_from_command"
+    )
+
+
 @pytest.fixture()
 def mocked_export_definition(mocker):
     """Return mocked 'wiz.export_definition' function."""
@@ -539,7 +555,41 @@ def test_fetch_registry(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping="__SYSTEM__",
-        max_depth=depth
+        max_depth=depth,
+        ignore_patterns=(), workers=None, executor="thread"
+    )
+
+
+@pytest.mark.parametrize("options, workers, executor", [
+    ([], None, "thread"),
+    (["--registry-workers", "4"], 4, "thread"),
+    (
+        ["--registry-workers", "4", "--registry-executor", "process"],
+        4, "process"
+    ),
+], ids=[
+    "no-options",
+    "with-workers",
+    "with-process-executor",
+])
+def test_fetch_registry_with_workers(
+    mocked_system_query, mocked_registry_fetch, mocked_definition_discover,
+    options, workers, executor
+):
+    """Discover definitions concurrently with options."""
+    mocked_system_query.return_value = "__SYSTEM__"
+    mocked_registry_fetch.return_value = ["/registry1", "/registry2"]
+
+    runner = CliRunner()
+    result = runner.invoke(wiz.command_line.main, options + ["list", "package"])
+    assert result.exit_code == 0
+    assert not result.exception
+
+    mocked_definition_discover.assert_called_once_with(
+        ["/registry1", "/registry2"],
+        system_mapping="__SYSTEM__",
+        max_depth=None,
+        ignore_patterns=(), workers=workers, executor=executor
     )
 
 
@@ -608,7 +658,8 @@ def test_list_packages_empty(
     )
 
     mocked_definition_discover.assert_called_once_with(
-        [], system_mapping="__SYSTEM__", max_depth=None
+        [], system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread"
     )
 
 
@@ -647,7 +698,8 @@ def test_list_packages(
 
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping=None, max_depth=None
+        system_mapping=None, max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread"
     )
 
 
@@ -688,7 +740,8 @@ def test_list_packages_with_versions(
 
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping=None, max_depth=None
+        system_mapping=None, max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread"
     )
 
 
@@ -775,7 +828,8 @@ def test_list_commands_empty(
     )
 
     mocked_definition_discover.assert_called_once_with(
-        [], system_mapping="__SYSTEM__", max_depth=None
+        [], system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread"
     )
 
 
@@ -813,7 +867,8 @@ def test_list_commands(
 
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping=None, max_depth=None
+        system_mapping=None, max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread"
     )
 
 
@@ -852,7 +907,8 @@ def test_list_commands_with_versions(
 
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping=None, max_depth=None
+        system_mapping=None, max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread"
     )
 
 
@@ -936,7 +992,8 @@ def test_search_empty(
     logger.warning.assert_called_once_with("No results found.\n")
 
     mocked_definition_discover.assert_called_once_with(
-        [], system_mapping="__SYSTEM__", max_depth=None
+        [], system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread"
     )
 
 
@@ -985,7 +1042,8 @@ def test_search(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping="__SYSTEM__",
-        max_depth=None
+        max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread"
     )
 
 
@@ -1038,7 +1096,8 @@ def test_search_filtered_command(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping=None,
-        max_depth=None
+        max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread"
     )
 
 
@@ -1083,7 +1142,8 @@ def test_search_with_versions(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping=None,
-        max_depth=None
+        max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread"
     )
 
 
@@ -1119,7 +1179,8 @@ def test_search_packages(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping="__SYSTEM__",
-        max_depth=None
+        max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread"
     )
 
 
@@ -1157,7 +1218,8 @@ def test_search_packages_with_versions(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping="__SYSTEM__",
-        max_depth=None
+        max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread"
     )
 
 
@@ -1193,7 +1255,8 @@ def test_search_commands(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping="__SYSTEM__",
-        max_depth=None
+        max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread"
     )
 
 
@@ -1231,7 +1294,8 @@ def test_search_commands_with_versions(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping="__SYSTEM__",
-        max_depth=None
+        max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread"
     )
 
 
@@ -1314,7 +1378,9 @@ def test_view_not_found(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
 
@@ -1355,7 +1421,9 @@ def test_view_definition(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
 
@@ -1405,7 +1473,9 @@ def test_view_definition_json(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
 
@@ -1431,7 +1501,9 @@ def test_view_definition_from_command(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
 
@@ -1516,11 +1588,15 @@ def test_use_spawn_shell(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        strategy="graph", jobs=None,
+        max_combinations=None, timeout=None,
     )
 
     mocked_spawn_shell.assert_called_once_with({
@@ -1581,11 +1657,15 @@ def test_use_spawn_shell_view(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        strategy="graph", jobs=None,
+        max_combinations=None, timeout=None,
     )
 
     mocked_spawn_shell.assert_not_called()
@@ -1641,11 +1721,15 @@ def test_use_spawn_shell_view_empty(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        strategy="graph", jobs=None,
+        max_combinations=None, timeout=None,
     )
 
     mocked_spawn_shell.assert_not_called()
@@ -1678,11 +1762,15 @@ def test_use_execute_command(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        strategy="graph", jobs=None,
+        max_combinations=None, timeout=None,
     )
 
     mocked_resolve_command.assert_called_once_with(
@@ -1726,13 +1814,17 @@ def test_use_with_resolution_error(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo", "bim==0.1.*"], "__MAPPING__",
         ignore_implicit=False,
         environ_mapping={},
+        strategy="graph", jobs=None,
+        max_combinations=None, timeout=None,
     )
 
     mocked_spawn_shell.assert_not_called()
@@ -1793,6 +1885,8 @@ def test_use_initial_environment(
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False,
         environ_mapping={"PATH": "/path", "PYTHONPATH": "/other-path"},
+        strategy="graph", jobs=None,
+        max_combinations=None, timeout=None,
     )
 
     mocked_spawn_execute.assert_called_once_with(
@@ -1800,6 +1894,209 @@ def test_use_initial_environment(
     )
 
 
+def test_use_with_sat_resolver(
+    mocked_system_query, mocked_registry_fetch, mocked_fetch_definition_mapping,
+    mocked_resolve_context, mocked_spawn_shell, wiz_context
+):
+    """Resolve a context with the SAT resolver."""
+    mocked_system_query.return_value = "__SYSTEM__"
+    mocked_registry_fetch.return_value = ["/registry1", "/registry2"]
+    mocked_fetch_definition_mapping.return_value = "__MAPPING__"
+    mocked_resolve_context.return_value = wiz_context
+
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main,
+        [
+            "--resolver", "sat", "--max-combinations", "10",
+            "--timeout", "2.5", "use", "-j", "4", "foo"
+        ]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    # Options only supported by the graph resolver are ignored.
+    mocked_resolve_context.assert_called_once_with(
+        ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        strategy="sat", jobs=None,
+        max_combinations=None, timeout=2.5,
+    )
+
+    mocked_spawn_shell.assert_called_once_with(
+        wiz_context["environ"], wiz_context["command"]
+    )
+
+
+def test_use_with_jobs(
+    mocked_system_query, mocked_registry_fetch, mocked_fetch_definition_mapping,
+    mocked_resolve_context, mocked_spawn_shell, wiz_context
+):
+    """Resolve a context with concurrent variant combinations."""
+    mocked_system_query.return_value = "__SYSTEM__"
+    mocked_registry_fetch.return_value = ["/registry1", "/registry2"]
+    mocked_fetch_definition_mapping.return_value = "__MAPPING__"
+    mocked_resolve_context.return_value = wiz_context
+
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main, ["use", "--jobs", "4", "foo"]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    mocked_resolve_context.assert_called_once_with(
+        ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        strategy="graph", jobs=4,
+        max_combinations=None, timeout=None,
+    )
+
+    mocked_spawn_shell.assert_called_once_with(
+        wiz_context["environ"], wiz_context["command"]
+    )
+
+
+def test_use_with_limits(
+    mocked_system_query, mocked_registry_fetch, mocked_fetch_definition_mapping,
+    mocked_resolve_context, mocked_spawn_shell, wiz_context
+):
+    """Resolve a context with maximum number of combinations and timeout."""
+    mocked_system_query.return_value = "__SYSTEM__"
+    mocked_registry_fetch.return_value = ["/registry1", "/registry2"]
+    mocked_fetch_definition_mapping.return_value = "__MAPPING__"
+    mocked_resolve_context.return_value = wiz_context
+
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main, [
+            "--max-combinations", "10", "--timeout", "2.5", "use", "foo"
+        ]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    mocked_resolve_context.assert_called_once_with(
+        ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        strategy="graph", jobs=None,
+        max_combinations=10, timeout=2.5,
+    )
+
+    mocked_spawn_shell.assert_called_once_with(
+        wiz_context["environ"], wiz_context["command"]
+    )
+
+
+def test_use_with_server(
+    mocked_system_query, mocked_registry_fetch, mocked_fetch_definition_mapping,
+    mocked_resolve_context, mocked_server_resolve_context, mocked_spawn_shell,
+    wiz_context, logger
+):
+    """Use a context resolved by the server."""
+    mocked_system_query.return_value = "__SYSTEM__"
+    mocked_registry_fetch.return_value = ["/registry1", "/registry2"]
+    mocked_server_resolve_context.return_value = wiz_context
+
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main,
+        [
+            "--use-server", "--server-socket", "/socket",
+            "--registry-depth", "2", "--registry-ignore", ".git",
+            "use", "foo"
+        ]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    mocked_server_resolve_context.assert_called_once_with(
+        ["foo"], ["/registry1", "/registry2"], system_mapping="__SYSTEM__",
+        max_depth=2, ignore_patterns=(".git",), socket_path="/socket",
+        ignore_implicit=False, environ_mapping={},
+        strategy="graph", jobs=None, max_combinations=None, timeout=None
+    )
+    mocked_fetch_definition_mapping.assert_not_called()
+    mocked_resolve_context.assert_not_called()
+
+    mocked_spawn_shell.assert_called_once_with(
+        wiz_context["environ"], wiz_context["command"]
+    )
+    logger.error.assert_not_called()
+
+
+def test_use_with_server_unavailable(
+    mocked_system_query, mocked_registry_fetch, mocked_fetch_definition_mapping,
+    mocked_resolve_context, mocked_server_resolve_context, mocked_spawn_shell,
+    wiz_context, logger
+):
+    """Use a context resolved in process when server is unavailable."""
+    mocked_system_query.return_value = "__SYSTEM__"
+    mocked_registry_fetch.return_value = ["/registry1", "/registry2"]
+    mocked_fetch_definition_mapping.return_value = "__MAPPING__"
+    mocked_resolve_context.return_value = wiz_context
+    mocked_server_resolve_context.side_effect = (
+        wiz.exception.ServerUnavailable()
+    )
+
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main, ["--use-server", "use", "foo"]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    mocked_server_resolve_context.assert_called_once_with(
+        ["foo"], ["/registry1", "/registry2"], system_mapping="__SYSTEM__",
+        max_depth=None, ignore_patterns=(),
+        socket_path=wiz.server.get_socket_path(),
+        ignore_implicit=False, environ_mapping={},
+        strategy="graph", jobs=None, max_combinations=None, timeout=None
+    )
+    mocked_resolve_context.assert_called_once_with(
+        ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        strategy="graph", jobs=None,
+        max_combinations=None, timeout=None,
+    )
+
+    mocked_spawn_shell.assert_called_once_with(
+        wiz_context["environ"], wiz_context["command"]
+    )
+    logger.error.assert_not_called()
+
+
+@pytest.mark.usefixtures("mocked_history_start_recording")
+@pytest.mark.usefixtures("mocked_history_get")
+@pytest.mark.usefixtures("mocked_filesystem_export")
+def test_use_with_server_recorded(
+    mocked_system_query, mocked_registry_fetch, mocked_fetch_definition_mapping,
+    mocked_resolve_context, mocked_server_resolve_context, mocked_spawn_shell,
+    wiz_context, logger
+):
+    """Use a context resolved in process when resolution is recorded."""
+    mocked_system_query.return_value = "__SYSTEM__"
+    mocked_registry_fetch.return_value = ["/registry1", "/registry2"]
+    mocked_fetch_definition_mapping.return_value = "__MAPPING__"
+    mocked_resolve_context.return_value = wiz_context
+
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main,
+        ["--use-server", "--record", tempfile.gettempdir(), "use", "foo"]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    mocked_server_resolve_context.assert_not_called()
+    mocked_resolve_context.assert_called_once_with(
+        ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        strategy="graph", jobs=None,
+        max_combinations=None, timeout=None,
+    )
+
+    mocked_spawn_shell.assert_called_once_with(
+        wiz_context["environ"], wiz_context["command"]
+    )
+    logger.error.assert_not_called()
+
+
 @pytest.mark.parametrize("options, recorded", [
     ([], False),
     (["--record", tempfile.gettempdir()], True)
@@ -1866,7 +2163,9 @@ def test_run(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
     mocked_fetch_package_request_from_command.assert_called_once_with(
@@ -1876,7 +2175,8 @@ def test_run(
     mocked_resolve_context.assert_called_once_with(
         ["__PACKAGE__"], "__MAPPING__",
         ignore_implicit=False,
-        environ_mapping={}
+        environ_mapping={},
+        strategy="graph", jobs=None, max_combinations=None, timeout=None
     )
 
     mocked_resolve_command.assert_called_once_with(
@@ -1946,7 +2246,9 @@ def test_run_view(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
     mocked_fetch_package_request_from_command.assert_called_once_with(
@@ -1956,7 +2258,8 @@ def test_run_view(
     mocked_resolve_context.assert_called_once_with(
         ["__PACKAGE__"], "__MAPPING__",
         ignore_implicit=False,
-        environ_mapping={}
+        environ_mapping={},
+        strategy="graph", jobs=None, max_combinations=None, timeout=None
     )
 
     mocked_resolve_command.assert_not_called()
@@ -2014,7 +2317,9 @@ def test_run_view_empty(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
     mocked_fetch_package_request_from_command.assert_called_once_with(
@@ -2024,7 +2329,8 @@ def test_run_view_empty(
     mocked_resolve_context.assert_called_once_with(
         ["__PACKAGE__"], "__MAPPING__",
         ignore_implicit=False,
-        environ_mapping={}
+        environ_mapping={},
+        strategy="graph", jobs=None, max_combinations=None, timeout=None
     )
 
     mocked_resolve_command.assert_not_called()
@@ -2055,13 +2361,16 @@ def test_run_with_resolution_error(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["__PACKAGE__"], "__MAPPING__",
         ignore_implicit=False,
-        environ_mapping={}
+        environ_mapping={},
+        strategy="graph", jobs=None, max_combinations=None, timeout=None
     )
 
     mocked_fetch_package_request_from_command.assert_called_once_with(
@@ -2104,6 +2413,8 @@ def test_run_initial_environment(
     mocked_resolve_context.assert_called_once_with(
         ["__PACKAGE__"], "__MAPPING__", ignore_implicit=False,
         environ_mapping={"PATH": "/path", "PYTHONPATH": "/other-path"},
+        strategy="graph", jobs=None,
+        max_combinations=None, timeout=None,
     )
 
     mocked_spawn_execute.assert_called_once_with(
@@ -2111,6 +2422,105 @@ def test_run_initial_environment(
     )
 
 
+def test_run_with_server(
+    mocked_system_query, mocked_registry_fetch, mocked_fetch_definition_mapping,
+    mocked_server_fetch_package_request_from_command,
+    mocked_server_resolve_context, mocked_resolve_command,
+    mocked_spawn_execute, wiz_context, logger
+):
+    """Execute a command within a context resolved by the server."""
+    mocked_system_query.return_value = "__SYSTEM__"
+    mocked_registry_fetch.return_value = ["/registry1", "/registry2"]
+    mocked_server_fetch_package_request_from_command.return_value = (
+        "__PACKAGE__"
+    )
+    mocked_server_resolve_context.return_value = wiz_context
+    mocked_resolve_command.return_value = "__RESOLVED_COMMAND__"
+
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main,
+        ["--use-server", "--server-socket", "/socket", "run", "fooExe"]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    mocked_server_fetch_package_request_from_command.assert_called_once_with(
+        "fooExe", ["/registry1", "/registry2"], system_mapping="__SYSTEM__",
+        max_depth=None, ignore_patterns=(), socket_path="/socket"
+    )
+    mocked_server_resolve_context.assert_called_once_with(
+        ["__PACKAGE__"], ["/registry1", "/registry2"],
+        system_mapping="__SYSTEM__", max_depth=None, ignore_patterns=(),
+        socket_path="/socket",
+        ignore_implicit=False, environ_mapping={},
+        strategy="graph", jobs=None, max_combinations=None, timeout=None
+    )
+    mocked_fetch_definition_mapping.assert_not_called()
+
+    mocked_spawn_execute.assert_called_once_with(
+        "__RESOLVED_COMMAND__", wiz_context["environ"]
+    )
+    logger.error.assert_not_called()
+
+
+def test_serve(mocker, mocked_system_query, mocked_registry_fetch):
+    """Start resolver server."""
+    mocked_server = mocker.patch.object(wiz.server, "Server")
+    mocked_system_query.return_value = "__SYSTEM__"
+    mocked_registry_fetch.return_value = ["/registry1", "/registry2"]
+
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main,
+        [
+            "--server-socket", "/socket", "--registry-workers", "4",
+            "serve", "--refresh-interval", "10"
+        ]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    mocked_server.assert_called_once_with(
+        ["/registry1", "/registry2"], socket_path="/socket",
+        system_mapping="__SYSTEM__", max_depth=None, ignore_patterns=(),
+        workers=4, executor="thread", refresh_interval=10
+    )
+    mocked_server.return_value.serve_forever.assert_called_once()
+
+
+def test_registry_pack(mocker, logger, temporary_directory):
+    """Compile registries into pack files."""
+    mocked_pack = mocker.patch.object(
+        wiz.registry, "pack", side_effect=[
+            3, wiz.exception.WizError("Oops")
+        ]
+    )
+
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main,
+        [
+            "-rd", "2", "--registry-ignore", ".git", "registry", "pack",
+            temporary_directory, temporary_directory
+        ]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    assert mocked_pack.call_count == 2
+    mocked_pack.assert_called_with(
+        temporary_directory, max_depth=2, ignore_patterns=(".git",)
+    )
+
+    logger.info.assert_called_once_with(
+        "3 definition(s) packed in registry {!r}.".format(temporary_directory)
+    )
+    logger.error.assert_called_once_with(
+        "Impossible to pack registry {!r}: Oops".format(temporary_directory)
+    )
+
+
 @pytest.mark.parametrize("options, recorded", [
     ([], False),
     (["--record", tempfile.gettempdir()], True)
@@ -2191,11 +2601,14 @@ def test_freeze(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        strategy="graph", max_combinations=None, timeout=None,
     )
 
     mocked_export_definition.assert_called_once_with(
@@ -2250,11 +2663,14 @@ def test_freeze_empty(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        strategy="graph", max_combinations=None, timeout=None,
     )
 
     mocked_export_definition.assert_called_once_with(
@@ -2311,11 +2727,14 @@ def test_freeze_as_script(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        strategy="graph", max_combinations=None, timeout=None,
     )
 
     mocked_export_script.assert_called_once_with(
@@ -2368,11 +2787,14 @@ def test_freeze_as_script_without_commands(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        strategy="graph", max_combinations=None, timeout=None,
     )
 
     mocked_export_script.assert_called_once_with(
@@ -2411,11 +2833,14 @@ def test_freeze_with_resolution_error(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        ignore_patterns=(), workers=None, executor="thread",
+        lazy=False, cache=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        strategy="graph", max_combinations=None, timeout=None,
     )
 
     mocked_click_prompt.assert_not_called()
@@ -2478,6 +2903,7 @@ def test_freeze_initial_environment(
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False,
         environ_mapping={"PATH": "/path", "PYTHONPATH": "/other-path"},
+        strategy="graph", max_combinations=None, timeout=None,
     )
 
 
@@ -1,7 +1,10 @@
 # :coding: utf-8
 
+import concurrent.futures
 import copy
+import json
 import os
+import pickle
 import types
 from collections import OrderedDict, Counter
 
@@ -10,6 +13,7 @@ import pytest
 import wiz.definition
 import wiz.exception
 import wiz.filesystem
+import wiz.registry
 import wiz.system
 from wiz.utility import Requirement, Version
 
@@ -88,6 +92,7 @@ def registries(temporary_directory):
     """Return mocked registry paths."""
     mapping = {
         "registry1": {
+            ".wiz": {},
             "__files__": ["defA.json"],
             "level1": {
                 "__files__": ["defB.jee-son"],
@@ -100,6 +105,7 @@ def registries(temporary_directory):
             }
         },
         "registry2": {
+            ".wiz": {},
             "__files__": ["defG.yml", "defH.json", "defI.json"],
         }
     }
@@ -186,11 +192,15 @@ def mocked_registry_install(mocker):
 @pytest.mark.parametrize("options", [
     {},
     {"max_depth": 4},
-    {"system_mapping": "__SYSTEM__"}
+    {"system_mapping": "__SYSTEM__"},
+    {"ignore_patterns": [".git"]},
+    {"workers": 4, "executor": "process"}
 ], ids=[
     "without-option",
     "with-max-depth",
-    "with-system"
+    "with-system",
+    "with-ignore-patterns",
+    "with-workers"
 ])
 def test_fetch(mocked_discover, definitions, options):
     """Fetch all definition within *paths*."""
@@ -202,7 +212,10 @@ def test_fetch(mocked_discover, definitions, options):
     mocked_discover.assert_called_once_with(
         ["/path/to/registry-1", "/path/to/registry-2"],
         max_depth=options.get("max_depth"),
-        system_mapping=options.get("system_mapping")
+        system_mapping=options.get("system_mapping"),
+        ignore_patterns=options.get("ignore_patterns"),
+        workers=options.get("workers"),
+        executor=options.get("executor")
     )
 
     assert result == {
@@ -244,15 +257,21 @@ def test_fetch(mocked_discover, definitions, options):
         "implicit-packages": []
     }
 
+    assert isinstance(result["package"], wiz.definition.DefinitionMapping)
+
 
 @pytest.mark.parametrize("options", [
     {},
     {"max_depth": 4},
-    {"system_mapping": "__SYSTEM__"}
+    {"system_mapping": "__SYSTEM__"},
+    {"ignore_patterns": [".git"]},
+    {"workers": 4, "executor": "process"}
 ], ids=[
     "without-option",
     "with-max-depth",
-    "with-system"
+    "with-system",
+    "with-ignore-patterns",
+    "with-workers"
 ])
 def test_fetch_with_implicit_packages(mocked_discover, definitions, options):
     """Fetch all definition within *paths*."""
@@ -270,6 +289,9 @@ def test_fetch_with_implicit_packages(mocked_discover, definitions, options):
         ["/path/to/registry-1", "/path/to/registry-2"],
         max_depth=options.get("max_depth"),
         system_mapping=options.get("system_mapping"),
+        ignore_patterns=options.get("ignore_patterns"),
+        workers=options.get("workers"),
+        executor=options.get("executor")
     )
 
     assert result == {
@@ -545,6 +567,100 @@ def test_query_definition_with_variant_identifier():
     )
 
 
+@pytest.mark.parametrize("requirement, expected", [
+    ("foo", "2!0.1.0"),
+    ("foo < 1!0", "2.0.1"),
+    ("foo >= 1.1, < 2", "1.10.0"),
+    ("foo < 1.9.1", "1.9.0.post1"),
+    ("foo <= 1.9", "1.9.0"),
+    ("foo > 1.9, < 1.10", "1.9.1"),
+    ("foo == 1.*", "1.10.0"),
+    ("foo == 1.9.*", "1.9.1"),
+    ("foo ~= 1.2", "1.10.0"),
+    ("foo ~= 1.9.0", "1.9.1"),
+    ("foo == 1.9", "1.9.0"),
+    ("foo == 1.9.0.post1", "1.9.0.post1"),
+    ("foo != 2.*, < 1!0", "1.10.0"),
+    ("foo >= 2.0a1, < 1!0", "2.0.1"),
+    ("foo[V1]", "1.9.1"),
+    ("foo[V1] < 1.9.1", "0.1.0"),
+], ids=[
+    "latest",
+    "with-epoch",
+    "with-range",
+    "with-post-release",
+    "with-maximum",
+    "with-exclusive-range",
+    "with-prefix",
+    "with-subversion-prefix",
+    "with-compatible-release",
+    "with-compatible-subversion",
+    "with-exact-version",
+    "with-exact-post-release",
+    "with-exclusion",
+    "with-pre-release",
+    "with-variant",
+    "with-variant-and-range",
+])
+def test_query_definition_from_index(requirement, expected):
+    """Query best matching definition from sorted versions."""
+    package_mapping = {"foo": wiz.definition.VersionMapping()}
+
+    for version in [
+        "0.1.0", "1.0.0", "1.9.0", "1.9.0.post1", "1.9.1", "1.10.0",
+        "2.0.0rc1", "2.0.1", "2!0.1.0"
+    ]:
+        data = {"identifier": "foo", "version": version}
+        if version in ["0.1.0", "1.9.1"]:
+            data["variants"] = [{"identifier": "V1"}]
+
+        definition = wiz.definition.Definition(data)
+        package_mapping["foo"][str(definition.version)] = definition
+
+    definition = wiz.definition.query(
+        Requirement(requirement), package_mapping
+    )
+    assert str(definition.version) == expected
+
+
+def test_version_mapping():
+    """Record sorted versions and variants within mapping."""
+    mapping = wiz.definition.VersionMapping()
+    mapping["1.0.0"] = wiz.definition.Definition(
+        {"identifier": "foo", "version": "1.0.0"}
+    )
+    mapping["0.1.0"] = wiz.definition.Definition({
+        "identifier": "foo",
+        "version": "0.1.0",
+        "variants": [{"identifier": "V1"}]
+    })
+
+    assert mapping.index() == (
+        [(0, (0, 1)), (0, (1,))], ["0.1.0", "1.0.0"]
+    )
+    assert mapping.index() is mapping.index()
+    assert mapping.has_variant("0.1.0", "V1") is True
+    assert mapping.has_variant("1.0.0", "V1") is False
+
+    # Recorded data are discarded when mapping is modified.
+    mapping["1.0.0"] = wiz.definition.Definition({
+        "identifier": "foo",
+        "version": "1.0.0",
+        "variants": [{"identifier": "V1"}]
+    })
+    assert mapping.has_variant("1.0.0", "V1") is True
+
+    mapping.pop("0.1.0")
+    assert mapping.index() == ([(0, (1,))], ["1.0.0"])
+
+    # Recorded data are not pickled.
+    _mapping = pickle.loads(pickle.dumps(mapping))
+    assert isinstance(_mapping, wiz.definition.VersionMapping)
+    assert list(_mapping.keys()) == ["1.0.0"]
+    assert _mapping["1.0.0"].data() == mapping["1.0.0"].data()
+    assert _mapping._index is None
+
+
 def test_query_definition_name_error():
     """Fails to query the definition name."""
     package_mapping = {}
@@ -599,6 +715,84 @@ def test_query_definition_mixed_version_error():
     ) in str(error)
 
 
+def test_query_all_definitions():
+    """Return all matching definitions from requirement."""
+    package_mapping = {
+        "foo": {
+            "1.1.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "version": "1.1.0",
+            }),
+            "0.2.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "version": "0.2.0",
+            }),
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "version": "0.1.0",
+            }),
+        }
+    }
+
+    requirement = Requirement("foo")
+    assert wiz.definition.query_all(requirement, package_mapping) == [
+        package_mapping["foo"]["1.1.0"],
+        package_mapping["foo"]["0.2.0"],
+        package_mapping["foo"]["0.1.0"],
+    ]
+
+    requirement = Requirement("foo<1, !=0.2.0")
+    assert wiz.definition.query_all(requirement, package_mapping) == [
+        package_mapping["foo"]["0.1.0"],
+    ]
+
+
+def test_query_all_definitions_with_variant_identifier():
+    """Return all definitions containing the variant identifier required."""
+    package_mapping = {
+        "foo": {
+            "0.3.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "version": "0.3.0",
+                "variants": [{"identifier": "V1"}, {"identifier": "V2"}]
+            }),
+            "0.2.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "version": "0.2.0",
+                "variants": [{"identifier": "V2"}]
+            }),
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "version": "0.1.0",
+                "variants": [{"identifier": "V1"}]
+            }),
+        },
+    }
+
+    requirement = Requirement("foo[V1]")
+    assert wiz.definition.query_all(requirement, package_mapping) == [
+        package_mapping["foo"]["0.3.0"],
+        package_mapping["foo"]["0.1.0"],
+    ]
+
+
+def test_query_all_definitions_version_error():
+    """Fails to query definitions matching the requirement."""
+    package_mapping = {
+        "foo": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "version": "0.1.0",
+            }),
+        },
+    }
+
+    requirement = Requirement("foo>10")
+
+    with pytest.raises(wiz.exception.RequestNotFound):
+        wiz.definition.query_all(requirement, package_mapping)
+
+
 def test_export_data(mocked_filesystem_export):
     """Export definition data as a JSON file."""
     data = {
@@ -756,32 +950,32 @@ def test_discover(mocked_load, mocked_system_validate, registries, definitions):
 
     path = os.path.join(r1, "defA.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=True
     )
 
     path = os.path.join(r1, "level1", "level2", "defC.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=True
     )
 
     path = os.path.join(r1, "level1", "level2", "level3", "defF.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=True
     )
 
     path = os.path.join(r1, "level1", "level2", "level3", "defE.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=True
     )
 
     path = os.path.join(r2, "defH.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=True
     )
 
     path = os.path.join(r2, "defI.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=True
     )
 
     assert discovered == definitions[:6]
@@ -807,22 +1001,22 @@ def test_discover_with_max_depth(
 
     path = os.path.join(r1, "defA.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=True
     )
 
     path = os.path.join(r1, "level1", "level2", "defC.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=True
     )
 
     path = os.path.join(r2, "defH.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=True
     )
 
     path = os.path.join(r2, "defI.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=True
     )
 
     assert discovered == definitions[:4]
@@ -849,32 +1043,32 @@ def test_discover_with_system_valid(
 
     path = os.path.join(r1, "defA.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=True
     )
 
     path = os.path.join(r1, "level1", "level2", "defC.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=True
     )
 
     path = os.path.join(r1, "level1", "level2", "level3", "defF.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=True
     )
 
     path = os.path.join(r1, "level1", "level2", "level3", "defE.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=True
     )
 
     path = os.path.join(r2, "defH.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=True
     )
 
     path = os.path.join(r2, "defI.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=True
     )
 
     assert discovered == definitions[:6]
@@ -900,32 +1094,32 @@ def test_discover_with_system_invalid(
 
     path = os.path.join(r1, "defA.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=True
     )
 
     path = os.path.join(r1, "level1", "level2", "defC.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=True
     )
 
     path = os.path.join(r1, "level1", "level2", "level3", "defF.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=True
     )
 
     path = os.path.join(r1, "level1", "level2", "level3", "defE.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=True
     )
 
     path = os.path.join(r2, "defH.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=True
     )
 
     path = os.path.join(r2, "defI.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=True
     )
 
     assert discovered == []
@@ -1000,6 +1194,496 @@ def test_discover_error(mocked_load, registries, exception):
         list(wiz.definition.discover(registries))
 
 
+def test_discover_with_ignore_patterns(
+    mocked_load, mocked_system_validate, registries, definitions
+):
+    """Discover and yield definitions with ignore patterns."""
+    mocked_load.side_effect = definitions
+
+    discovered = list(
+        wiz.definition.discover(registries, ignore_patterns=["level*", "defH*"])
+    )
+    assert len(discovered) == 2
+    assert mocked_load.call_count == 2
+
+    r1 = registries[0]
+    r2 = registries[1]
+
+    mocked_load.assert_any_call(
+        os.path.join(r1, "defA.json"), registry_path=r1, lazy=True
+    )
+    mocked_load.assert_any_call(
+        os.path.join(r2, "defI.json"), registry_path=r2, lazy=True
+    )
+
+    assert discovered == definitions[:2]
+    mocked_system_validate.assert_not_called()
+
+
+@pytest.mark.parametrize("options", [
+    {"workers": 3},
+    {"workers": 3, "executor": "thread"},
+], ids=[
+    "with-workers",
+    "with-thread-executor",
+])
+def test_discover_with_workers(
+    mocked_load, mocked_system_validate, registries, options
+):
+    """Discover and yield definitions concurrently in deterministic order."""
+    mocked_load.side_effect = lambda path, registry_path, lazy: (
+        wiz.definition.Definition(
+            {"identifier": os.path.basename(path)[:-5]},
+            path=path, registry_path=registry_path
+        )
+    )
+
+    discovered = list(wiz.definition.discover(registries))
+    assert mocked_load.call_count == 6
+
+    # Remove index to ensure that definitions are loaded again.
+    for path in registries[:2]:
+        os.remove(os.path.join(path, wiz.registry.INDEX_PATH))
+
+    result = wiz.definition.discover(registries, **options)
+    assert isinstance(result, types.GeneratorType)
+    assert mocked_load.call_count == 6
+
+    assert [_definition.path for _definition in result] == [
+        _definition.path for _definition in discovered
+    ]
+    assert mocked_load.call_count == 12
+    mocked_system_validate.assert_not_called()
+
+
+def test_discover_with_executor(mocked_load, registries):
+    """Discover and yield definitions with custom executor."""
+    mocked_load.side_effect = lambda path, registry_path, lazy: (
+        wiz.definition.Definition(
+            {"identifier": os.path.basename(path)[:-5]},
+            path=path, registry_path=registry_path
+        )
+    )
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    discovered = list(wiz.definition.discover(registries, executor=executor))
+    assert [_definition.identifier for _definition in discovered] == [
+        "defA", "defC", "defE", "defF", "defH", "defI"
+    ]
+    assert mocked_load.call_count == 6
+
+    # Custom executor is not shutdown after discovery.
+    assert executor.submit(lambda: "TEST").result() == "TEST"
+    executor.shutdown()
+
+
+def test_discover_with_workers_error(mocked_load, registries):
+    """Fail to discover and yield definitions concurrently."""
+    mocked_load.side_effect = RuntimeError
+
+    with pytest.raises(RuntimeError):
+        list(wiz.definition.discover(registries, workers=3))
+
+
+def test_discover_with_index(
+    mocked_load, mocked_system_validate, registries, definitions
+):
+    """Discover definitions from index without loading unmodified files."""
+    mocked_load.side_effect = definitions
+
+    discovered = list(wiz.definition.discover(registries))
+    assert len(discovered) == 6
+    assert mocked_load.call_count == 6
+    mocked_load.reset_mock()
+
+    discovered = list(wiz.definition.discover(registries))
+    assert len(discovered) == 6
+    mocked_load.assert_not_called()
+
+    assert [
+        (_definition.identifier, _definition.version, _definition.command)
+        for _definition in discovered
+    ] == [
+        (_definition.identifier, _definition.version, _definition.command)
+        for _definition in definitions[:6]
+    ]
+    mocked_system_validate.assert_not_called()
+
+
+def test_discover_with_modified_index(
+    mocked_load, mocked_system_validate, registries, definitions
+):
+    """Discover definitions and reload files modified since indexed."""
+    mocked_load.side_effect = definitions
+
+    list(wiz.definition.discover(registries))
+    assert mocked_load.call_count == 6
+    mocked_load.reset_mock()
+
+    path = os.path.join(registries[1], "defI.json")
+    with open(path, "w") as stream:
+        stream.write("{}")
+
+    mocked_load.side_effect = [definitions[6]]
+
+    discovered = list(wiz.definition.discover(registries))
+    assert len(discovered) == 6
+    mocked_load.assert_called_once_with(
+        path, registry_path=registries[1], lazy=True
+    )
+    assert definitions[6] in discovered
+
+    index = wiz.registry.load_index(registries[1])
+    assert index["definitions"]["defI.json"]["header"] == {
+        "identifier": "bim",
+        "version": "0.2.1",
+        "command": {"bim-test": "Bim0.2 --test"}
+    }
+
+
+def test_discover_with_pack(
+    mocked_load, mocked_system_validate, registries, definitions
+):
+    """Discover definitions from registry pack without loading files."""
+    mocked_load.side_effect = definitions[4:6]
+    assert wiz.registry.pack(registries[1]) == 2
+    mocked_load.reset_mock()
+
+    mocked_load.side_effect = definitions[:4]
+
+    discovered = list(wiz.definition.discover(registries))
+    assert len(discovered) == 6
+    assert mocked_load.call_count == 4
+
+    assert [
+        (_definition.identifier, _definition.version, _definition.command)
+        for _definition in discovered
+    ] == [
+        (_definition.identifier, _definition.version, _definition.command)
+        for _definition in definitions[:6]
+    ]
+    assert [_definition.path for _definition in discovered[4:]] == [
+        os.path.join(registries[1], "defH.json"),
+        os.path.join(registries[1], "defI.json"),
+    ]
+    assert all(
+        _definition.registry_path == registries[1]
+        for _definition in discovered[4:]
+    )
+    mocked_system_validate.assert_not_called()
+
+
+def test_discover_without_index_directory(temporary_directory):
+    """Discover definitions without creating index directory."""
+    wiz.filesystem.export(
+        os.path.join(temporary_directory, "foo.json"),
+        json.dumps({"identifier": "foo"})
+    )
+
+    discovered = list(wiz.definition.discover([temporary_directory]))
+    assert [_definition.identifier for _definition in discovered] == ["foo"]
+    assert os.listdir(temporary_directory) == ["foo.json"]
+
+
+def test_discover_with_update_index(mocker, temporary_directory):
+    """Discover definitions and create index when requested."""
+    wiz.filesystem.export(
+        os.path.join(temporary_directory, "foo.json"),
+        json.dumps({"identifier": "foo"})
+    )
+
+    spy = mocker.spy(wiz.registry, "load_pack")
+
+    discovered = list(
+        wiz.definition.discover([temporary_directory], update_index=True)
+    )
+    assert [_definition.identifier for _definition in discovered] == ["foo"]
+    spy.assert_not_called()
+
+    index = wiz.registry.load_index(temporary_directory)
+    assert index["definitions"]["foo.json"]["header"] == {"identifier": "foo"}
+    assert wiz.definition._is_index_valid(temporary_directory, index) is True
+
+
+def test_definition_header():
+    """Return header from definition."""
+    definition = wiz.definition.Definition({
+        "identifier": "foo",
+        "version": "0.1.0",
+        "namespace": "test",
+        "description": "Test definition",
+        "command": {"app": "AppExe"},
+        "environ": {"KEY": "VALUE"},
+        "requirements": ["bar"],
+        "variants": [
+            {"identifier": "V1", "environ": {"KEY1": "VALUE1"}},
+            {"identifier": "V2", "requirements": ["baz"]},
+        ]
+    })
+
+    assert definition.header() == {
+        "identifier": "foo",
+        "version": "0.1.0",
+        "namespace": "test",
+        "description": "Test definition",
+        "command": {"app": "AppExe"},
+        "variants": [{"identifier": "V1"}, {"identifier": "V2"}]
+    }
+
+
+def test_definition_lazy():
+    """Create definition and validate complete data when required."""
+    data = {
+        "identifier": "foo",
+        "version": "0.1.0",
+        "environ": {"KEY": "VALUE"},
+        "requirements": "incorrect"
+    }
+
+    definition = wiz.definition.Definition(data, lazy=True)
+    assert definition.identifier == "foo"
+    assert definition.version == Version("0.1.0")
+
+    with pytest.raises(wiz.exception.IncorrectDefinition) as error:
+        definition.environ
+
+    assert "'requirements' has incorrect type." in str(error)
+
+    with pytest.raises(wiz.exception.IncorrectDefinition):
+        wiz.definition.Definition({"version": "0.1.0"}, lazy=True)
+
+
+def test_load_lazy(temporary_file):
+    """Load a definition from a path and only validate header."""
+    with open(temporary_file, "w") as stream:
+        stream.write(
+            "{\"identifier\": \"foo\", \"environ\": {\"KEY\": \"VALUE\"}}"
+        )
+
+    definition = wiz.definition.load(temporary_file, lazy=True)
+    assert definition.identifier == "foo"
+    assert definition.environ == {"KEY": "VALUE"}
+
+
+def test_definition_header_only(temporary_file):
+    """Create definition from header and load complete data when required."""
+    with open(temporary_file, "w") as stream:
+        stream.write(
+            "{\"identifier\": \"foo\", \"version\": \"0.1.0\", "
+            "\"environ\": {\"KEY\": \"VALUE\"}}"
+        )
+
+    definition = wiz.definition.Definition(
+        {"identifier": "foo", "version": "0.1.0"},
+        path=temporary_file, header_only=True
+    )
+    assert definition.identifier == "foo"
+    assert definition.version == Version("0.1.0")
+
+    os.remove(temporary_file)
+    with pytest.raises(IOError):
+        definition.environ
+
+    with open(temporary_file, "w") as stream:
+        stream.write(
+            "{\"identifier\": \"foo\", \"version\": \"0.1.0\", "
+            "\"environ\": {\"KEY\": \"VALUE\"}}"
+        )
+
+    assert definition.environ == {"KEY": "VALUE"}
+    assert definition.data() == {
+        "identifier": "foo",
+        "version": "0.1.0",
+        "environ": {"KEY": "VALUE"}
+    }
+
+
+@pytest.fixture()
+def lazy_registry(temporary_directory):
+    """Return registry path with definitions for lazy mapping."""
+    definitions = {
+        "foo-0.1.0.json": {
+            "identifier": "foo", "namespace": "test", "version": "0.1.0"
+        },
+        "foo-0.2.0.json": {
+            "identifier": "foo", "namespace": "test", "version": "0.2.0",
+            "requirements": ["bar"]
+        },
+        os.path.join("sub", "bar.json"): {
+            "identifier": "bar", "version": "1.0.0", "auto-use": True,
+            "command": {"bar": "BarExe"}
+        },
+        os.path.join("sub", "baz.json"): {
+            "identifier": "baz", "disabled": True
+        },
+    }
+
+    for name, data in definitions.items():
+        wiz.filesystem.export(
+            os.path.join(temporary_directory, name), json.dumps(data)
+        )
+
+    wiz.filesystem.ensure_directory(
+        os.path.join(
+            temporary_directory, os.path.dirname(wiz.registry.INDEX_PATH)
+        )
+    )
+
+    return temporary_directory
+
+
+def test_fetch_lazy(mocker, lazy_registry):
+    """Fetch lazy definition mapping from registry."""
+    expected = wiz.definition.fetch([lazy_registry])
+
+    mocked_load = mocker.patch.object(
+        wiz.definition, "_load_from_index",
+        wraps=wiz.definition._load_from_index
+    )
+
+    result = wiz.definition.fetch([lazy_registry], lazy=True)
+    mapping = result["package"]
+    assert isinstance(mapping, wiz.definition.LazyDefinitionMapping)
+
+    # Only implicit package definitions are loaded.
+    assert mocked_load.call_count == 1
+
+    assert sorted(mapping.keys()) == ["__namespace__", "bar", "test::foo"]
+    assert "test::foo" in mapping
+    assert "baz" not in mapping
+    assert mapping["__namespace__"] == {"foo": {"test"}}
+    assert result["command"] == expected["command"]
+    assert result["implicit-packages"] == expected["implicit-packages"]
+    assert mocked_load.call_count == 1
+
+    definition = wiz.definition.query(
+        Requirement("foo"), result["package"]
+    )
+    assert definition.version == Version("0.2.0")
+    assert definition.requirements == [Requirement("bar")]
+    assert mocked_load.call_count == 3
+
+
+def test_fetch_lazy_with_modified_definition(lazy_registry):
+    """Fetch lazy definition mapping with definition modified in place."""
+    wiz.definition.fetch([lazy_registry])
+
+    path = os.path.join(lazy_registry, "foo-0.2.0.json")
+    with open(path, "w") as stream:
+        stream.write(json.dumps({
+            "identifier": "foo", "namespace": "test", "version": "0.3.0",
+            "environ": {"KEY": "VALUE"}
+        }))
+
+    result = wiz.definition.fetch([lazy_registry], lazy=True)
+    assert sorted(result["package"]["test::foo"].keys()) == ["0.1.0", "0.3.0"]
+    assert result["package"]["test::foo"]["0.3.0"].environ == {"KEY": "VALUE"}
+
+
+def test_fetch_lazy_with_modified_header(lazy_registry):
+    """Fetch lazy definition mapping with header modified in place."""
+    wiz.definition.fetch([lazy_registry])
+
+    path = os.path.join(lazy_registry, "sub", "bar.json")
+    with open(path, "w") as stream:
+        stream.write(json.dumps({"identifier": "bar", "version": "1.0.0"}))
+
+    # Index is still used as the directory has not been modified.
+    result = wiz.definition.fetch([lazy_registry], lazy=True)
+    assert result["command"] == {"bar": "bar"}
+
+    # Index is updated once the directory is modified.
+    wiz.filesystem.export(
+        os.path.join(lazy_registry, "sub", "bim.json"),
+        json.dumps({"identifier": "bim"})
+    )
+
+    result = wiz.definition.fetch([lazy_registry], lazy=True)
+    assert result["command"] == {}
+    assert result["implicit-packages"] == []
+
+
+def test_fetch_lazy_with_outdated_index(mocker, lazy_registry):
+    """Fetch lazy definition mapping when index is older than registry."""
+    wiz.definition.fetch([lazy_registry])
+
+    os.utime(os.path.join(lazy_registry, wiz.registry.INDEX_PATH), (0, 0))
+
+    spy = mocker.spy(wiz.definition, "discover")
+
+    result = wiz.definition.fetch([lazy_registry], lazy=True)
+    assert sorted(result["package"].keys()) == [
+        "__namespace__", "bar", "test::foo"
+    ]
+    spy.assert_called_once_with(
+        [lazy_registry], system_mapping=None, max_depth=None,
+        ignore_patterns=None, workers=None, executor=None
+    )
+
+
+def test_fetch_lazy_with_new_definition(mocker, lazy_registry):
+    """Fetch lazy definition mapping from registry with new definition."""
+    wiz.definition.fetch([lazy_registry])
+
+    wiz.filesystem.export(
+        os.path.join(lazy_registry, "sub", "bim.json"),
+        json.dumps({"identifier": "bim"})
+    )
+
+    spy = mocker.spy(wiz.definition, "discover")
+
+    result = wiz.definition.fetch([lazy_registry], lazy=True)
+    assert sorted(result["package"].keys()) == [
+        "__namespace__", "bar", "bim", "test::foo"
+    ]
+    spy.assert_called_once_with(
+        [lazy_registry], system_mapping=None, max_depth=None,
+        ignore_patterns=None, workers=None, executor=None
+    )
+
+    # Index has been updated.
+    spy.reset_mock()
+    wiz.definition.fetch([lazy_registry], lazy=True)
+    spy.assert_not_called()
+
+
+def test_fetch_lazy_with_different_options(mocker, lazy_registry):
+    """Fetch lazy definition mapping with options different from index."""
+    wiz.definition.fetch([lazy_registry])
+
+    spy = mocker.spy(wiz.definition, "discover")
+
+    result = wiz.definition.fetch([lazy_registry], max_depth=0, lazy=True)
+    assert sorted(result["package"].keys()) == ["__namespace__", "test::foo"]
+    assert spy.call_count == 1
+
+
+def test_lazy_definition_mapping():
+    """Create lazy definition mapping."""
+    mapping = wiz.definition.LazyDefinitionMapping()
+    assert len(mapping) == 0
+    assert "__namespace__" not in mapping
+
+    with pytest.raises(KeyError):
+        mapping["foo"]
+
+    definition1 = wiz.definition.Definition(
+        {"identifier": "foo", "version": "0.1.0", "namespace": "test"}
+    )
+    definition2 = wiz.definition.Definition(
+        {"identifier": "foo", "version": "0.1.0"}
+    )
+
+    assert mapping.add("/path1", "/registry", definition1) == "test::foo"
+    assert mapping.add("/path2", "/registry", definition2) == "foo"
+
+    assert len(mapping) == 3
+    assert list(mapping) == ["__namespace__", "test::foo", "foo"]
+    assert mapping["__namespace__"] == {"foo": {"test"}}
+    assert mapping["test::foo"] == {"0.1.0": definition1}
+    assert mapping["foo"] == {"0.1.0": definition2}
+
+
 def test_load(mocked_definition, temporary_file):
     """Load a definition from a path."""
     with open(temporary_file, "w") as stream:
@@ -1012,7 +1696,8 @@ def test_load(mocked_definition, temporary_file):
         {"identifier": "test_definition"},
         path=temporary_file,
         registry_path=None,
-        copy_data=False
+        copy_data=False,
+        lazy=False
     )
 
 
@@ -1028,7 +1713,8 @@ def test_load_with_mapping(mocked_definition, temporary_file):
         {"identifier": "test_definition", "key": "value"},
         path=temporary_file,
         registry_path=None,
-        copy_data=False
+        copy_data=False,
+        lazy=False
     )
 
 
@@ -3,12 +3,36 @@
 import os
 import io
 import gzip
+import stat
 
 import pytest
 
 import wiz.filesystem
 
 
+@pytest.fixture()
+def structure(temporary_directory):
+    """Return directory containing a mocked registry structure."""
+    paths = [
+        ["defA.json"],
+        ["defB.txt"],
+        ["level1", "defC.json"],
+        ["level1", "level2", "defD.json"],
+        ["level1", "level2", "level3", "defE.json"],
+        [".git", "defF.json"],
+        ["payload", "bin", "defG.json"],
+    ]
+
+    for elements in paths:
+        path = os.path.join(temporary_directory, *elements)
+        wiz.filesystem.ensure_directory(os.path.dirname(path))
+
+        with open(path, "w") as stream:
+            stream.write("")
+
+    return temporary_directory
+
+
 @pytest.fixture()
 def mocked_ensure_directory(mocker):
     """Return mocked ensure_directory function."""
@@ -99,6 +123,124 @@ def test_export_with_compression(
     mocked_gzip_open["stream"].write.assert_called_once_with(content)
 
 
+
+@pytest.mark.parametrize("content, binary", [
+    ("THIS IS\n A TEST.\n", False),
+    (b"\x00\x01", True),
+], ids=[
+    "text",
+    "binary"
+])
+def test_export_atomically(temporary_directory, content, binary):
+    """Export a file atomically."""
+    path = os.path.join(temporary_directory, "folder", "file")
+
+    wiz.filesystem.export_atomically(path, content, binary=binary)
+    wiz.filesystem.export_atomically(path, content, binary=binary)
+
+    with open(path, "rb" if binary else "r") as stream:
+        assert stream.read() == content
+
+    # No temporary file should be left.
+    assert os.listdir(os.path.dirname(path)) == ["file"]
+
+
+def test_export_atomically_mode(temporary_directory):
+    """Export a file atomically with default or existing permissions."""
+    path = os.path.join(temporary_directory, "file")
+
+    umask = os.umask(0o022)
+
+    try:
+        wiz.filesystem.export_atomically(path, "TEST")
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+        os.chmod(path, 0o664)
+
+        wiz.filesystem.export_atomically(path, "TEST")
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o664
+
+    finally:
+        os.umask(umask)
+
+
+def test_export_atomically_error(mocker, temporary_directory):
+    """Fail to export a file atomically and remove temporary file."""
+    path = os.path.join(temporary_directory, "file")
+    mocker.patch.object(os, "rename", side_effect=OSError)
+
+    with pytest.raises(OSError):
+        wiz.filesystem.export_atomically(path, "TEST")
+
+    assert os.listdir(temporary_directory) == []
+
+def test_scan(structure):
+    """Scan all files from directory."""
+    statistics = {}
+
+    result = wiz.filesystem.scan(structure, statistics=statistics)
+    assert [
+        os.path.relpath(entry.path, structure) for entry in result
+    ] == [
+        "defA.json",
+        "defB.txt",
+        os.path.join(".git", "defF.json"),
+        os.path.join("level1", "defC.json"),
+        os.path.join("level1", "level2", "defD.json"),
+        os.path.join("level1", "level2", "level3", "defE.json"),
+        os.path.join("payload", "bin", "defG.json"),
+    ]
+
+    assert statistics == {
+        "directories": 7,
+        "files": 7,
+        "skipped_files": 0,
+        "skipped_directories": 0,
+    }
+
+
+def test_scan_with_options(structure):
+    """Scan files from directory with extension, depth and ignore patterns."""
+    statistics = {}
+
+    result = wiz.filesystem.scan(
+        structure, extension=".json", max_depth=1,
+        ignore_patterns=[".git", "payload"], statistics=statistics
+    )
+    assert [
+        os.path.relpath(entry.path, structure) for entry in result
+    ] == [
+        "defA.json",
+        os.path.join("level1", "defC.json"),
+    ]
+
+    assert statistics == {
+        "directories": 2,
+        "files": 2,
+        "skipped_files": 1,
+        "skipped_directories": 3,
+    }
+
+
+def test_scan_symlink(structure):
+    """Scan files from directory without following symbolic links."""
+    os.symlink(
+        os.path.join(structure, "level1"), os.path.join(structure, "link")
+    )
+
+    result = wiz.filesystem.scan(structure, ignore_patterns=["payload"])
+    assert [
+        os.path.relpath(entry.path, structure) for entry in result
+    ] == [
+        "defA.json",
+        "defB.txt",
+        os.path.join(".git", "defF.json"),
+        os.path.join("level1", "defC.json"),
+        os.path.join("level1", "level2", "defD.json"),
+        os.path.join("level1", "level2", "level3", "defE.json"),
+    ]
+
+
 def test_accessible(temporary_directory, temporary_file, mocked_os_access):
     """Indicate whether directory is accessible."""
     mocked_os_access.return_value = True
@@ -1,8 +1,13 @@
 # :coding: utf-8
 
+import collections
+import concurrent.futures
+import copy
+import gc
 import pytest
 import types
 import re
+import threading
 
 import six.moves
 
@@ -11,6 +16,7 @@ import wiz.graph
 import wiz.package
 import wiz.definition
 import wiz.exception
+import wiz.symbol
 
 
 @pytest.fixture()
@@ -38,8 +44,15 @@ def mocked_graph(mocker):
 
 @pytest.fixture()
 def mocked_resolver(mocker):
-    """Return mocked Resolver."""
+    """Return mocked Resolver extracting packages without cache."""
     resolver = mocker.patch.object(wiz.graph, "Resolver")
+    resolver.fetch_packages.side_effect = (
+        lambda requirement, namespace_counter=None: wiz.package.extract(
+            requirement, resolver.definition_mapping,
+            namespace_counter=namespace_counter
+        )
+    )
+    resolver.fetch_closure.return_value = None
     return resolver
 
 
@@ -67,6 +80,9 @@ def test_resolver():
     resolver = wiz.graph.Resolver(definition_mapping)
     assert resolver.definition_mapping == definition_mapping
     assert id(resolver.definition_mapping) == id(definition_mapping)
+    assert resolver.statistics == {
+        "learned_nogoods": 0, "pruned_combinations": 0
+    }
 
 
 @pytest.mark.parametrize("mapping, expected", [
@@ -467,13 +483,17 @@ def test_extract_conflicting_nodes(mocker, mocked_graph):
         "F": mocker.Mock(
             identifier="F",
             definition=mocker.Mock(qualified_identifier="defA")
+        ),
+        "G": mocker.Mock(
+            identifier="G",
+            definition=mocker.Mock(qualified_identifier="defC")
         )
     }
 
     mocked_graph.node = lambda _id: node_mapping[_id]
-    mocked_graph.conflicting_identifiers.return_value = sorted(
-        node_mapping.keys()
-    )
+    mocked_graph.definition_identifiers = lambda _id: {
+        "defA": ["D", "E", "F"], "defB": ["A", "B", "C"], "defC": ["G"]
+    }[_id]
 
     assert wiz.graph.extract_conflicting_nodes(
         mocked_graph, node_mapping["F"]
@@ -487,6 +507,31 @@ def test_extract_conflicting_nodes(mocker, mocked_graph):
         mocked_graph, node_mapping["C"]
     ) == [node_mapping["A"], node_mapping["B"]]
 
+    assert wiz.graph.extract_conflicting_nodes(
+        mocked_graph, node_mapping["G"]
+    ) == []
+
+
+def test_extract_ancestors(mocker, mocked_graph):
+    """Extract ancestors of node identifiers."""
+    node_mapping = {
+        "A": mocker.Mock(parent_identifiers={"root"}),
+        "B": mocker.Mock(parent_identifiers={"A", "E"}),
+        "C": mocker.Mock(parent_identifiers={"B"}),
+        "D": mocker.Mock(parent_identifiers={"root", "C"}),
+    }
+
+    mocked_graph.node = lambda _id: node_mapping.get(_id)
+    mocked_graph.exists = lambda _id: _id in node_mapping
+
+    assert wiz.graph.extract_ancestors(mocked_graph, ["C"]) == {
+        "root", "A", "B", "C"
+    }
+    assert wiz.graph.extract_ancestors(mocked_graph, ["A", "D"]) == {
+        "root", "A", "B", "C", "D"
+    }
+    assert wiz.graph.extract_ancestors(mocked_graph, ["root"]) == {"root"}
+
 
 def test_combined_requirements(mocker, mocked_graph):
     """Combine nodes requirements."""
@@ -517,6 +562,9 @@ def test_combined_requirements(mocker, mocked_graph):
 
     assert str(requirement) == "A >=1, ==1.2.3, <2"
 
+    # Ensure that incoming requirements are not mutated.
+    assert requirements[0] == Requirement("A >= 1")
+
     assert mocked_graph.link_requirement.call_count == 3
     mocked_graph.link_requirement.assert_any_call("A==3", "B")
     mocked_graph.link_requirement.assert_any_call("A==1.9", "C")
@@ -584,9 +632,15 @@ def test_combined_requirements_error(mocker, mocked_graph):
     "explicit-no-namespace",
 ])
 def test_sanitize_requirement(requirement, namespace, expected):
-    """Mutate the requirement according to package namespaces."""
-    wiz.graph.sanitize_requirement(requirement, namespace)
-    assert requirement == expected
+    """Return requirement according to package namespaces."""
+    _requirement = copy.copy(requirement)
+
+    result = wiz.graph.sanitize_requirement(requirement, namespace)
+    assert result == expected
+    assert isinstance(result, wiz.utility.FrozenRequirement)
+
+    # Ensure that incoming requirement is not mutated.
+    assert requirement == _requirement
 
 
 def test_extract_conflicting_requirements(mocker, mocked_graph):
@@ -1080,6 +1134,11 @@ def test_graph_find_matching_identifiers(
             )
         ),
     }
+    graph._identifiers_per_name = {
+        "A": ["A==0.1.0", "A==2.4.5", "A==3.0.0"],
+        "Name1::B": ["Name1::B"],
+        "B": ["Name1::B", "B==1"],
+    }
 
     result = graph.find(requirement)
     assert result == expected
@@ -1212,34 +1271,78 @@ def test_graph_requirement_weight():
     assert graph.link_requirement("C", "A") == requirements[1]
 
 
-@pytest.mark.parametrize("definition_mapping, node_mapping, expected", [
-    (
-        {"defA": ["nodeA"], "defB": ["nodeB"]},
-        {"nodeA": "_nodeA", "nodeB": "_nodeB"},
-        []
-    ),
-    (
-        {"defA": ["nodeA1", "nodeA2"], "defB": ["nodeB"]},
-        {"nodeA1": "_nodeA1", "nodeA2": "_nodeA2", "nodeB": "_nodeB"},
-        ["nodeA1", "nodeA2"]
-    ),
-    (
-        {"defA": ["nodeA1", "nodeA2"], "defB": ["nodeB"]},
-        {"nodeA1": "_nodeA1", "nodeB": "_nodeB"},
-        []
-    )
+@pytest.fixture()
+def packages_for_conflicts():
+    """Return packages from two definitions."""
+    return {
+        identifier: wiz.package.Package(
+            wiz.definition.Definition({
+                "identifier": identifier.split("==")[0],
+                "version": identifier.split("==")[1]
+            })
+        ) for identifier in ["A==1", "A==2", "B==1"]
+    }
+
+
+@pytest.mark.parametrize("identifiers, removed, expected", [
+    (["A==1", "B==1"], [], []),
+    (["A==1", "A==2", "B==1"], [], ["A==1", "A==2"]),
+    (["A==1", "A==2", "B==1"], ["A==2"], [])
 ], ids=[
     "without-conflicts",
     "with-two-conflicts",
     "with-conflicting-node-removed"
 ])
-def test_graph_conflicts(definition_mapping, node_mapping, expected):
+def test_graph_conflicts(
+    packages_for_conflicts, identifiers, removed, expected
+):
     """Extract conflicting nodes from graph."""
     graph = wiz.graph.Graph(None)
-    graph._node_mapping = node_mapping
-    graph._identifiers_per_definition = definition_mapping
 
-    assert graph.conflicting_identifiers() == expected
+    for identifier in identifiers:
+        graph._create_node_from_package(packages_for_conflicts[identifier])
+
+    for identifier in removed:
+        graph.remove_node(identifier)
+
+    assert sorted(graph.conflicting_identifiers()) == expected
+
+
+def test_graph_definition_identifiers(packages_for_conflicts):
+    """Return existing node identifiers for definition."""
+    graph = wiz.graph.Graph(None)
+
+    for package in packages_for_conflicts.values():
+        graph._create_node_from_package(package)
+
+    graph.remove_node("A==2")
+
+    assert graph.definition_identifiers("A") == ["A==1"]
+    assert graph.definition_identifiers("B") == ["B==1"]
+    assert graph.definition_identifiers("C") == []
+
+
+def test_graph_error_identifiers(
+    mocker, mocked_resolver, mocked_package_extract, packages_for_conflicts
+):
+    """Extract existing nodes identifiers with errors from graph."""
+    graph = wiz.graph.Graph(mocked_resolver)
+    graph._create_node_from_package(packages_for_conflicts["A==1"])
+
+    mocked_package_extract.side_effect = wiz.exception.RequestNotFound("")
+
+    for parent_identifier in [graph.ROOT, "A==1", "A==2"]:
+        graph._update_from_requirement(
+            Requirement("C"), parent_identifier, mocker.Mock()
+        )
+
+    assert sorted(graph.error_identifiers()) == ["A==1", "root"]
+
+    graph.remove_node("A==1")
+    assert graph.error_identifiers() == ["root"]
+
+    graph._create_node_from_package(packages_for_conflicts["A==2"])
+    assert sorted(graph.error_identifiers()) == ["A==2", "root"]
 
 
 def test_graph_update_from_requirements(
@@ -1544,9 +1647,11 @@ def test_graph_update_from_requirements_with_namespaces(
         [_mapping["Foo::B==2.1.1"]]
     ]
 
-    graph.update_from_requirements(
-        [Requirement("A"), Requirement("B>=2")], graph.ROOT
-    )
+    requirements = [Requirement("A"), Requirement("B>=2")]
+    graph.update_from_requirements(requirements, graph.ROOT)
+
+    # Ensure that requirements have not been mutated.
+    assert requirements == [Requirement("A"), Requirement("B>=2")]
 
     assert graph.data() == {
         "identifier": mocker.ANY,
@@ -2125,10 +2230,45 @@ def test_graph_create_node_from_package():
     graph._create_node_from_package(package)
 
     assert graph._identifiers_per_definition == {"A": {"A==0.1.0"}}
+    assert graph._identifiers_per_name == {"A": ["A==0.1.0"]}
     assert list(graph._node_mapping.keys()) == ["A==0.1.0"]
     assert isinstance(graph._node_mapping["A==0.1.0"], wiz.graph.Node)
 
 
+def test_graph_create_node_from_package_with_namespace():
+    """Create nodes in graph from packages with namespace."""
+    packages = [
+        wiz.package.Package(
+            wiz.definition.Definition({
+                "identifier": "A",
+                "version": version,
+                "namespace": "N"
+            })
+        ) for version in ["0.1.0", "0.2.0"]
+    ]
+
+    graph = wiz.graph.Graph(None)
+    graph._create_node_from_package(packages[0])
+    graph._create_node_from_package(packages[1])
+
+    assert graph._identifiers_per_name == {
+        "A": ["N::A==0.1.0", "N::A==0.2.0"],
+        "N::A": ["N::A==0.1.0", "N::A==0.2.0"],
+    }
+    assert graph.find(Requirement("A")) == ["N::A==0.1.0", "N::A==0.2.0"]
+    assert graph.find(Requirement("N::A > 0.1")) == ["N::A==0.2.0"]
+
+    # Node created again is moved at the end of index.
+    graph.remove_node("N::A==0.1.0")
+    assert graph.find(Requirement("A")) == ["N::A==0.2.0"]
+
+    graph._create_node_from_package(packages[0])
+    assert graph._identifiers_per_name == {
+        "A": ["N::A==0.2.0", "N::A==0.1.0"],
+        "N::A": ["N::A==0.2.0", "N::A==0.1.0"],
+    }
+
+
 @pytest.mark.parametrize("options", [
     {},
     {"weight": 5},
@@ -2173,22 +2313,806 @@ def test_graph_create_link_overwrite():
     assert graph.link_weight("child", "parent") == 1
 
 
-def test_graph_remove_node():
+def test_graph_remove_node(packages_for_conflicts):
     """Remove nodes from graph."""
     graph = wiz.graph.Graph(None)
-    graph._node_mapping = {"A1": "_A1", "A2": "_A2", "B": "B"}
-    graph._identifiers_per_definition = {"defA": ["A1", "A2"], "defB": ["B"]}
-    graph._variants_per_definition = {"_id": ["A1", "A2"]}
-    graph._link_mapping = {"A1": {"B": "LINK"}}
 
-    graph.remove_node("A1")
+    for package in packages_for_conflicts.values():
+        graph._create_node_from_package(package)
+
+    graph._link_mapping = {"A==1": {"B==1": "LINK"}}
 
-    assert graph._node_mapping == {"A2": "_A2", "B": "B"}
+    assert sorted(graph.conflicting_identifiers()) == ["A==1", "A==2"]
+
+    graph.remove_node("A==1")
+
+    assert sorted(graph._node_mapping.keys()) == ["A==2", "B==1"]
     assert graph._identifiers_per_definition == {
-        "defA": ["A1", "A2"], "defB": ["B"]
+        "A": {"A==2"}, "B": {"B==1"}
     }
-    assert graph._variants_per_definition == {"_id": ["A1", "A2"]}
-    assert graph._link_mapping == {"A1": {"B": "LINK"}}
+    assert graph.conflicting_identifiers() == []
+    assert graph._link_mapping == {"A==1": {"B==1": "LINK"}}
+
+
+def test_graph_add_parent(mocker):
+    """Add parent to node in graph."""
+    node = mocker.Mock()
+
+    graph = wiz.graph.Graph(None)
+    graph._node_mapping = {"A": node}
+
+    assert graph.add_parent("A", "parent") == node
+    node.add_parent.assert_called_once_with("parent")
+
+    with pytest.raises(KeyError):
+        graph.add_parent("B", "parent")
+
+
+def test_graph_copy():
+    """Copy graph sharing unchanged elements."""
+    definition = wiz.definition.Definition({
+        "identifier": "A",
+        "version": "0.1.0",
+        "variants": [{"identifier": "V1"}, {"identifier": "V2"}]
+    })
+
+    package1 = wiz.package.Package(definition, variant_index=0)
+    package2 = wiz.package.Package(definition, variant_index=1)
+
+    graph = wiz.graph.Graph(None)
+    graph._create_node_from_package(package1)
+    graph.add_parent(package1.identifier, graph.ROOT)
+    graph.create_link(package1.identifier, graph.ROOT, Requirement("A[V1]"))
+    graph._error_mapping = {"A[V1]==0.1.0": ["ERROR1"]}
+
+    data = graph.data()
+
+    _graph = copy.deepcopy(graph)
+    assert isinstance(_graph, wiz.graph.Graph)
+    assert _graph.identifier != graph.identifier
+    assert _graph.node(package1.identifier) is graph.node(package1.identifier)
+
+    # Modify the copy.
+    _graph.add_parent(package1.identifier, "B")
+    _graph.create_link(package1.identifier, "B", Requirement("A"))
+    _graph.create_link(
+        package1.identifier, graph.ROOT, Requirement("A"), weight=0
+    )
+    _graph._create_node_from_package(package2)
+    _graph._writable("_error_mapping", "A[V1]==0.1.0").append("ERROR2")
+    _graph.remove_node(package1.identifier)
+
+    assert _graph.nodes() == [_graph.node(package2.identifier)]
+    assert _graph.link_requirement(package1.identifier, "B") == (
+        Requirement("A")
+    )
+    assert _graph.link_weight(package1.identifier, graph.ROOT) == 0
+    assert _graph.variant_identifiers("A") == [
+        package1.identifier, package2.identifier
+    ]
+    assert _graph.errors("A[V1]==0.1.0") == ["ERROR1", "ERROR2"]
+
+    # Ensure that initial graph is unchanged.
+    _data = graph.data()
+    _data["identifier"] = data["identifier"]
+    assert _data == data
+
+    # Modify the initial graph.
+    graph.add_parent(package1.identifier, "C")
+    assert graph.node(package1.identifier).parent_identifiers == {
+        graph.ROOT, "C"
+    }
+
+    __graph = graph.copy()
+    __graph.add_parent(package1.identifier, "D")
+    assert graph.node(package1.identifier).parent_identifiers == {
+        graph.ROOT, "C"
+    }
+    assert __graph.node(package1.identifier).parent_identifiers == {
+        graph.ROOT, "C", "D"
+    }
+
+
+def test_graph_copy_with_resolver():
+    """Copy graph associated with another resolver."""
+    resolver1 = wiz.graph.Resolver({})
+    resolver2 = wiz.graph.Resolver({})
+
+    graph = wiz.graph.Graph(resolver1)
+    assert graph.copy()._resolver is resolver1
+    assert graph.copy(resolver=resolver2)._resolver is resolver2
+    assert graph._resolver is resolver1
+
+
+def test_graph_distance_mapping(mocker):
+    """Update distance mapping when graph is modified."""
+    spied_compute_distance_mapping = mocker.spy(
+        wiz.graph, "compute_distance_mapping"
+    )
+
+    packages = {
+        identifier: wiz.package.Package(
+            wiz.definition.Definition({"identifier": identifier})
+        ) for identifier in ["A", "B", "C", "D"]
+    }
+
+    graph = wiz.graph.Graph(None)
+
+    for identifier, package in packages.items():
+        graph._create_node_from_package(package)
+
+    graph.create_link("A", graph.ROOT, Requirement("A"), weight=1)
+    graph.create_link("B", graph.ROOT, Requirement("B"), weight=2)
+    graph.create_link("C", "A", Requirement("C"), weight=1)
+    graph.create_link("C", "B", Requirement("C"), weight=1)
+    graph.create_link("D", "C", Requirement("D"), weight=1)
+
+    assert graph.distance_mapping() == {
+        "root": {"distance": 0, "parent": "root"},
+        "A": {"distance": 1, "parent": "root"},
+        "B": {"distance": 2, "parent": "root"},
+        "C": {"distance": 2, "parent": "A"},
+        "D": {"distance": 3, "parent": "C"},
+    }
+    assert spied_compute_distance_mapping.call_count == 1
+
+    # Distances of nodes reached through removed node are updated.
+    graph.remove_node("A")
+    assert graph.distance_mapping() == {
+        "root": {"distance": 0, "parent": "root"},
+        "B": {"distance": 2, "parent": "root"},
+        "C": {"distance": 3, "parent": "B"},
+        "D": {"distance": 4, "parent": "C"},
+    }
+
+    # Distances are reduced when shorter links are created.
+    graph.create_link("D", graph.ROOT, Requirement("D"), weight=1)
+    assert graph.distance_mapping()["D"] == {"distance": 1, "parent": "root"}
+
+    # Previous links are used when node is added again.
+    graph._create_node_from_package(packages["A"])
+    assert graph.distance_mapping()["A"] == {"distance": 1, "parent": "root"}
+    assert graph.distance_mapping()["C"] == {"distance": 2, "parent": "A"}
+
+    # Node unreachable once parent is removed.
+    graph.remove_node("B")
+    graph.remove_node("A")
+    assert graph.distance_mapping()["C"] == {"distance": None, "parent": None}
+
+    assert spied_compute_distance_mapping.call_count == 1
+    mapping = wiz.graph.compute_distance_mapping(graph)
+    assert graph.distance_mapping() == mapping
+
+    # Copy of the graph share the same distance mapping.
+    _graph = graph.copy()
+    _graph.remove_node("D")
+    assert "D" in graph.distance_mapping()
+    assert "D" not in _graph.distance_mapping()
+
+
+def test_resolver_fetch_distance_mapping(mocker):
+    """Fetch distance mapping from graph with update indicator."""
+    graph = mocker.Mock(identifier="_ID", revision=1)
+    graph.distance_mapping.return_value = "__MAPPING__"
+
+    resolver = wiz.graph.Resolver({})
+    assert resolver._fetch_distance_mapping(graph) == ("__MAPPING__", True)
+    assert resolver._fetch_distance_mapping(graph) == ("__MAPPING__", False)
+
+    graph.revision = 2
+    assert resolver._fetch_distance_mapping(graph) == ("__MAPPING__", True)
+
+    graph.identifier = "_ID2"
+    assert resolver._fetch_distance_mapping(graph) == ("__MAPPING__", True)
+
+
+def test_resolver_nogoods(mocker):
+    """Skip combinations containing nogoods."""
+    graph = mocker.Mock(identifier="_ID")
+    graph.copy.return_value = "__GRAPH__"
+
+    node = mocker.Mock(package=mocker.Mock(conditions=[]))
+    node.parent_identifiers = {"root"}
+
+    _graph = mocker.Mock(ROOT="root")
+    _graph.node = lambda _id: node if _id == "A[V1]" else None
+    _graph.exists = lambda _id: _id == "A[V1]"
+
+    resolver = wiz.graph.Resolver({})
+    resolver._nogoods["_ID"] = wiz.graph._Nogoods(
+        ["A[V1]", "A[V2]", "B[V1]", "B[V2]"]
+    )
+    resolver._iterator = iter([
+        (graph, ("A[V2]", "B[V2]")),
+        (graph, ("A[V2]", "B[V1]")),
+        (graph, ("A[V1]", "B[V2]")),
+    ])
+
+    assert resolver._fetch_next_combination() == (
+        "__GRAPH__", ("A[V2]", "B[V2]")
+    )
+
+    # Node with error is kept in the combination and reachable from 'A[V1]'.
+    resolver._record_nogood_from_graph(_graph, ["A[V1]"])
+    assert list(resolver._nogoods["_ID"]) == [frozenset(["A[V1]"])]
+
+    assert resolver._fetch_next_combination() == (
+        "__GRAPH__", ("A[V1]", "B[V2]")
+    )
+    assert resolver.statistics == {
+        "learned_nogoods": 1, "pruned_combinations": 1
+    }
+
+
+def test_resolver_nogoods_with_conditions(mocker):
+    """Do not record nogoods when ancestors have conditions."""
+    node = mocker.Mock(package=mocker.Mock(conditions=["__CONDITION__"]))
+    node.parent_identifiers = {"root"}
+
+    graph = mocker.Mock(ROOT="root")
+    graph.node = lambda _id: node if _id == "A[V1]" else None
+    graph.exists = lambda _id: _id == "A[V1]"
+
+    nogoods = wiz.graph._Nogoods(["A[V1]", "A[V2]"])
+
+    resolver = wiz.graph.Resolver({})
+    resolver._combination = (nogoods, {"A[V1]"})
+    resolver._record_nogood_from_graph(graph, ["A[V1]"])
+
+    assert len(nogoods) == 0
+    assert resolver.statistics["learned_nogoods"] == 0
+
+
+def test_resolver_without_nogoods(mocker):
+    """Do not record nogoods when disabled."""
+    graph = mocker.Mock(identifier="_ID")
+    graph.variant_groups.return_value = [["A[V1]", "A[V2]"]]
+    graph.distance_mapping.return_value = {
+        "A[V1]": {"distance": 1}, "A[V2]": {"distance": 2}
+    }
+
+    mocker.patch.object(
+        wiz.graph, "generate_variant_combinations", return_value=[]
+    )
+
+    resolver = wiz.graph.Resolver({}, learn_nogoods=False)
+    assert resolver._extract_combinations(graph) is True
+    assert resolver._nogoods == {}
+
+    resolver = wiz.graph.Resolver({})
+    assert resolver._extract_combinations(graph) is True
+    assert resolver._nogoods["_ID"].identifiers == {"A[V1]", "A[V2]"}
+
+
+@pytest.fixture()
+def definitions_with_variants():
+    """Return definition mapping with variants only compatible with 'L==1'.
+
+    Root
+     |
+     |--(A): A==0.1.0
+     |   |
+     |   `--(L==1): L==1
+     |
+     |--(P0): P0[V3]==0.1.0 | P0[V2]==0.1.0 | P0[V1]==0.1.0
+     |   |
+     |   `--(L==3) | (L==2) | (L==1)
+     |
+     ...
+
+    """
+    mapping = {
+        "A": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.1.0",
+                "requirements": ["L==1"]
+            })
+        },
+        "L": {
+            str(index): wiz.definition.Definition({
+                "identifier": "L",
+                "version": str(index)
+            })
+            for index in range(1, 4)
+        }
+    }
+
+    for plugin in range(3):
+        identifier = "P{}".format(plugin)
+        mapping[identifier] = {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": identifier,
+                "version": "0.1.0",
+                "variants": [
+                    {
+                        "identifier": "V{}".format(index),
+                        "requirements": ["L=={}".format(index)]
+                    }
+                    for index in range(3, 0, -1)
+                ]
+            })
+        }
+
+    return mapping
+
+
+@pytest.mark.parametrize("executor", [
+    wiz.symbol.THREAD_EXECUTOR,
+    wiz.symbol.PROCESS_EXECUTOR,
+], ids=[
+    "thread",
+    "process",
+])
+def test_resolver_with_jobs(definitions_with_variants, executor):
+    """Compute combinations concurrently."""
+    requirements = [
+        Requirement("A"), Requirement("P0"), Requirement("P1"),
+        Requirement("P2")
+    ]
+
+    resolver = wiz.graph.Resolver(definitions_with_variants)
+    expected = resolver.compute_packages(requirements)
+
+    _resolver = wiz.graph.Resolver(
+        definitions_with_variants, jobs=3, executor=executor
+    )
+    packages = _resolver.compute_packages(requirements)
+
+    assert [package.identifier for package in packages] == [
+        package.identifier for package in expected
+    ]
+    assert _resolver.statistics == resolver.statistics
+    assert _resolver.statistics["learned_nogoods"] > 0
+
+
+def test_resolver_with_jobs_error(definitions_with_variants):
+    """Fail to compute combinations concurrently."""
+    requirements = [Requirement("A"), Requirement("P0"), Requirement("L==2")]
+
+    resolver = wiz.graph.Resolver(definitions_with_variants)
+
+    with pytest.raises(wiz.exception.GraphResolutionError) as error:
+        resolver.compute_packages(requirements)
+
+    _resolver = wiz.graph.Resolver(
+        definitions_with_variants, jobs=2,
+        executor=wiz.symbol.THREAD_EXECUTOR
+    )
+
+    with pytest.raises(wiz.exception.GraphResolutionError) as _error:
+        _resolver.compute_packages(requirements)
+
+    assert str(_error.value) == str(error.value)
+    assert _resolver.statistics == resolver.statistics
+    assert _resolver._nb_failures == resolver._nb_failures
+
+
+def test_resolver_with_jobs_shared_definitions(
+    mocker, definitions_with_variants
+):
+    """Send definition mapping once to workers of a shared executor."""
+    mocker.patch.object(wiz.graph, "WORKER_DEFINITION_MAPPINGS_SIZE", 1)
+    mocker.patch.object(
+        wiz.graph, "_WORKER_DEFINITION_MAPPINGS", collections.OrderedDict()
+    )
+
+    spied_dumps = mocker.spy(wiz.graph.cPickle, "dumps")
+
+    requirements = [
+        Requirement("A"), Requirement("P0"), Requirement("P1"),
+        Requirement("P2")
+    ]
+
+    mapping1 = wiz.definition.DefinitionMapping(definitions_with_variants)
+    mapping2 = wiz.definition.DefinitionMapping(definitions_with_variants)
+
+    token1 = wiz.graph._fetch_definition_token(mapping1)
+    token2 = wiz.graph._fetch_definition_token(mapping2)
+    assert token1 == wiz.graph._fetch_definition_token(mapping1)
+    assert token1 != token2
+
+    # Definition mappings which cannot be weakly referenced are not shared.
+    assert wiz.graph._fetch_definition_token(
+        definitions_with_variants
+    ) != wiz.graph._fetch_definition_token(definitions_with_variants)
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+    try:
+        for mapping in [mapping1, mapping1, mapping2, mapping1]:
+            resolver = wiz.graph.Resolver(mapping, jobs=2, executor=executor)
+            packages = resolver.compute_packages(requirements)
+            assert [package.identifier for package in packages] == [
+                "P2[V1]==0.1.0", "P1[V1]==0.1.0", "P0[V1]==0.1.0", "L==1",
+                "A==0.1.0"
+            ]
+
+    finally:
+        executor.shutdown()
+
+    # Least recently used definition mapping was discarded by workers.
+    assert spied_dumps.call_count == 3
+    assert list(wiz.graph._WORKER_DEFINITION_MAPPINGS.keys()) == [token1]
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"jobs": 2, "executor": wiz.symbol.THREAD_EXECUTOR},
+    {"jobs": 3, "executor": wiz.symbol.PROCESS_EXECUTOR},
+], ids=[
+    "sequential",
+    "thread",
+    "process",
+])
+def test_resolver_with_max_combinations(definitions_with_variants, options):
+    """Interrupt resolution when maximum number of combinations is reached."""
+    requirements = [
+        Requirement("A"), Requirement("P0"), Requirement("P1"),
+        Requirement("P2")
+    ]
+
+    resolver = wiz.graph.Resolver(
+        definitions_with_variants, max_combinations=7, **options
+    )
+    packages = resolver.compute_packages(requirements)
+    assert [package.identifier for package in packages] == [
+        "P2[V1]==0.1.0", "P1[V1]==0.1.0", "P0[V1]==0.1.0", "L==1", "A==0.1.0"
+    ]
+
+    resolver = wiz.graph.Resolver(
+        definitions_with_variants, max_combinations=2, **options
+    )
+
+    with pytest.raises(wiz.exception.ResolutionLimitExceeded) as error:
+        resolver.compute_packages(requirements)
+
+    assert (
+        "The resolution has exceeded the maximum of 2 combination(s) after 2 "
+        "failed combination(s) out of 27 estimated."
+    ) in str(error.value)
+    assert "Latest error:" in str(error.value)
+    assert "L ==1 \t[A==0.1.0]" in str(error.value)
+    assert len(error.value.conflicts) == 2
+    assert resolver._nb_failures == 2
+
+
+def test_resolver_with_timeout(definitions_with_variants):
+    """Interrupt resolution when timeout is exceeded."""
+    requirements = [Requirement("A"), Requirement("P0")]
+
+    resolver = wiz.graph.Resolver(definitions_with_variants, timeout=0)
+
+    with pytest.raises(wiz.exception.ResolutionLimitExceeded) as error:
+        resolver.compute_packages(requirements)
+
+    assert (
+        "The resolution has exceeded the timeout of 0 second(s) after 0 "
+        "failed combination(s) out of 3 estimated."
+    ) in str(error.value)
+    assert error.value.conflicts == []
+
+
+def test_resolver_cancelled(definitions_with_variants):
+    """Interrupt resolution when cancellation event is set."""
+    requirements = [Requirement("A"), Requirement("P0")]
+
+    event = threading.Event()
+
+    resolver = wiz.graph.Resolver(
+        definitions_with_variants, timeout=60, cancel_event=event
+    )
+    packages = resolver.compute_packages(requirements)
+    assert [package.identifier for package in packages] == [
+        "P0[V1]==0.1.0", "L==1", "A==0.1.0"
+    ]
+
+    event.set()
+
+    with pytest.raises(wiz.exception.ResolutionInterrupted) as error:
+        resolver.compute_packages(requirements)
+
+    assert not isinstance(error.value, wiz.exception.ResolutionLimitExceeded)
+    assert (
+        "The resolution has been cancelled after 0 failed combination(s) out "
+        "of 3 estimated."
+    ) in str(error.value)
+
+
+def test_resolver_compute_packages_several_times(definitions_with_variants):
+    """Compute packages several times with the same resolver."""
+    resolver = wiz.graph.Resolver(definitions_with_variants)
+
+    packages = resolver.compute_packages([Requirement("A"), Requirement("P0")])
+    assert [package.identifier for package in packages] == [
+        "P0[V1]==0.1.0", "L==1", "A==0.1.0"
+    ]
+
+    packages = resolver.compute_packages([
+        Requirement("A"), Requirement("P0"), Requirement("P1")
+    ])
+    assert [package.identifier for package in packages] == [
+        "P1[V1]==0.1.0", "P0[V1]==0.1.0", "L==1", "A==0.1.0"
+    ]
+    assert resolver.statistics == {
+        "learned_nogoods": 4, "pruned_combinations": 2
+    }
+
+    # Nogoods are discarded with the state of the previous resolution.
+    assert len(resolver._nogoods) > 0
+    resolver._reset_state()
+    assert resolver._nogoods == {}
+
+    # Statistics are only recorded for the latest resolution.
+    packages = resolver.compute_packages([Requirement("P0"), Requirement("P1")])
+    assert [package.identifier for package in packages] == [
+        "P1[V3]==0.1.0", "L==3", "P0[V3]==0.1.0"
+    ]
+    assert resolver.statistics == {
+        "learned_nogoods": 0, "pruned_combinations": 0
+    }
+
+
+def test_resolver_dump_and_load():
+    """Serialize graph referencing the resolver."""
+    resolver = wiz.graph.Resolver({})
+
+    graph = wiz.graph.Graph(resolver)
+    graph.update_from_requirements([Requirement("A")], graph.ROOT)
+
+    _graph = wiz.graph._load(wiz.graph._dump(graph, resolver), resolver)
+    assert isinstance(_graph, wiz.graph.Graph)
+    assert _graph.identifier == graph.identifier
+    assert _graph.data() == graph.data()
+    assert _graph._resolver is resolver
+
+
+def test_resolver_fetch_packages(mocked_package_extract):
+    """Fetch packages extracted from requirement."""
+    mocked_package_extract.return_value = ["__PACKAGE__"]
+
+    resolver = wiz.graph.Resolver({"__MAPPING__": {}})
+    assert resolver.fetch_packages(Requirement("A")) == ["__PACKAGE__"]
+    assert resolver.fetch_packages(Requirement("A")) == ["__PACKAGE__"]
+
+    mocked_package_extract.assert_called_once_with(
+        Requirement("A"), {"__MAPPING__": {}}, namespace_counter=None
+    )
+
+
+def test_package_cache(mocked_package_extract):
+    """Record packages extracted from requirements."""
+    mocked_package_extract.side_effect = [["__A__"], ["__B1__", "__B2__"]]
+
+    cache = wiz.graph._PackageCache({})
+    assert cache.hit_rate == 0.0
+
+    packages = cache.extract(Requirement("A"))
+    assert packages == ["__A__"]
+
+    # Returned list can be modified without changing the cache.
+    packages.append("__OTHER__")
+    assert cache.extract(Requirement("A")) == ["__A__"]
+
+    assert cache.extract(Requirement("B >= 1")) == ["__B1__", "__B2__"]
+    assert cache.extract(Requirement("B>=1")) == ["__B1__", "__B2__"]
+
+    assert mocked_package_extract.call_count == 2
+    assert cache.hits == 2
+    assert cache.requests == 4
+    assert cache.hit_rate == 0.5
+
+
+def test_package_cache_error(mocked_package_extract):
+    """Do not record requirements which cannot be extracted."""
+    mocked_package_extract.side_effect = wiz.exception.RequestNotFound("")
+
+    cache = wiz.graph._PackageCache({})
+
+    for _ in range(2):
+        with pytest.raises(wiz.exception.RequestNotFound):
+            cache.extract(Requirement("A"))
+
+    assert mocked_package_extract.call_count == 2
+    assert cache.hits == 0
+
+
+def test_package_cache_with_namespaces(mocker, mocked_package_extract):
+    """Record packages per occurrence of namespaces qualifying requirement."""
+    mocked_package_extract.return_value = ["__PACKAGE__"]
+
+    cache = wiz.graph._PackageCache({
+        "__namespace__": {"A": {"ns1", "ns2"}}
+    })
+
+    counter = collections.Counter()
+    cache.extract(Requirement("A"), namespace_counter=counter)
+    assert mocked_package_extract.call_count == 1
+
+    # Namespace occurrences which cannot qualify the requirement are ignored.
+    counter.update(["ns3"])
+    cache.extract(Requirement("A"), namespace_counter=counter)
+    assert mocked_package_extract.call_count == 1
+
+    # Qualified requirements do not depend on namespace occurrences.
+    counter.update(["ns1"])
+    cache.extract(Requirement("ns1::A"), namespace_counter=counter)
+    cache.extract(Requirement("ns1::A"))
+    assert mocked_package_extract.call_count == 2
+
+    cache.extract(Requirement("A"), namespace_counter=counter)
+    assert mocked_package_extract.call_count == 3
+
+    mocked_package_extract.assert_called_with(
+        Requirement("A"), mocker.ANY, namespace_counter=counter
+    )
+
+
+@pytest.fixture()
+def definitions_with_closures():
+    """Return definition mapping with closures which can be recorded.
+
+    Root
+     |
+     |--(A): A==0.1.0
+     |   |
+     |   |--(B): B==0.1.0
+     |   |   |
+     |   |   `--(C): C==0.1.0
+     |   |
+     |   `--(C): C==0.1.0
+     |
+     |--(D): D==0.1.0
+     |   |
+     |   `--(E): E[V2]==0.1.0 | E[V1]==0.1.0
+     |
+     `--(F): F==0.1.0
+         |
+         |--(A): A==0.1.0
+         |
+         `--(B<0.1.0): B==0.0.1
+
+    """
+    mapping = wiz.definition.DefinitionMapping({
+        "A": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.1.0",
+                "requirements": ["B", "C"]
+            })
+        },
+        "B": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "B",
+                "version": "0.1.0",
+                "requirements": ["C"]
+            }),
+            "0.0.1": wiz.definition.Definition({
+                "identifier": "B",
+                "version": "0.0.1",
+                "requirements": ["C"]
+            })
+        },
+        "C": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "C",
+                "version": "0.1.0"
+            })
+        },
+        "D": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "D",
+                "version": "0.1.0",
+                "requirements": ["E"]
+            })
+        },
+        "E": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "E",
+                "version": "0.1.0",
+                "variants": [{"identifier": "V2"}, {"identifier": "V1"}]
+            })
+        },
+        "F": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "F",
+                "version": "0.1.0",
+                "requirements": ["A", "B<0.1.0"]
+            })
+        },
+    })
+
+    return mapping
+
+
+def test_resolver_fetch_closure(definitions_with_closures):
+    """Fetch closures shared by resolvers using the same definitions."""
+    resolver = wiz.graph.Resolver(definitions_with_closures)
+    package = resolver.fetch_packages(Requirement("A"))[0]
+
+    closure = resolver.fetch_closure(package)
+    assert {
+        identifier: [
+            (_package.identifier, str(requirement), weight)
+            for _package, requirement, weight in dependencies
+        ]
+        for identifier, dependencies in closure.items()
+    } == {
+        "A==0.1.0": [("B==0.1.0", "B", 1), ("C==0.1.0", "C", 2)],
+        "B==0.1.0": [("C==0.1.0", "C", 1)],
+        "C==0.1.0": [],
+    }
+
+    _resolver = wiz.graph.Resolver(definitions_with_closures)
+    assert _resolver.fetch_closure(package) is closure
+
+    _resolver = wiz.graph.Resolver(
+        definitions_with_closures, closure_cache=False
+    )
+    assert _resolver.fetch_closure(package) is None
+
+    _resolver = wiz.graph.Resolver(copy.copy(definitions_with_closures))
+    assert _resolver.fetch_closure(package) is not closure
+
+    # Closures are not shared when mapping cannot be weakly referenced.
+    mapping = dict(definitions_with_closures)
+    _resolver = wiz.graph.Resolver(mapping)
+    assert _resolver.fetch_closure(package) is not closure
+    assert wiz.graph.Resolver(mapping).fetch_closure(package) is not (
+        _resolver.fetch_closure(package)
+    )
+
+
+def test_resolver_closure_cache_discarded(definitions_with_closures):
+    """Discard closure cache with definition mapping."""
+    mapping = copy.copy(definitions_with_closures)
+    key = id(mapping)
+
+    resolver = wiz.graph.Resolver(mapping)
+    assert key in wiz.graph._CLOSURE_CACHES
+
+    del resolver, mapping
+    gc.collect()
+
+    assert key not in wiz.graph._CLOSURE_CACHES
+
+
+@pytest.mark.parametrize("request_", ["D", "F"], ids=[
+    "with-variants",
+    "with-conflict",
+])
+def test_resolver_fetch_closure_incompatible(
+    definitions_with_closures, request_
+):
+    """Do not record closures which could depend on the graph."""
+    resolver = wiz.graph.Resolver(definitions_with_closures)
+    package = resolver.fetch_packages(Requirement(request_))[0]
+    assert resolver.fetch_closure(package) is None
+
+
+def test_graph_update_from_closures(definitions_with_closures):
+    """Update graph from closures as from each requirement."""
+    requirements = [
+        Requirement("A"), Requirement("D"), Requirement("F")
+    ]
+
+    resolver = wiz.graph.Resolver(
+        definitions_with_closures, closure_cache=False
+    )
+    graph = wiz.graph.Graph(resolver)
+    graph.update_from_requirements(requirements, graph.ROOT)
+
+    _resolver = wiz.graph.Resolver(definitions_with_closures)
+    _graph = wiz.graph.Graph(_resolver)
+    _graph.update_from_requirements(requirements, _graph.ROOT)
+
+    data, _data = graph.data(), _graph.data()
+    del data["identifier"], _data["identifier"]
+
+    assert _data == data
+    assert _graph.distance_mapping() == graph.distance_mapping()
+    assert _resolver._closure_cache.hits == 0
+    assert _resolver._closure_cache.requests == 6
 
 
 def test_node():
@@ -2213,6 +3137,12 @@ def test_node():
 
     assert node.parent_identifiers == {"parent1", "parent2"}
 
+    _node = copy.copy(node)
+    _node.add_parent("parent3")
+    assert _node.package == package
+    assert _node.parent_identifiers == {"parent1", "parent2", "parent3"}
+    assert node.parent_identifiers == {"parent1", "parent2"}
+
 
 def test_distance_queue():
     """Create and use distance queue."""
@@ -2270,3 +3200,68 @@ def test_distance_queue():
     assert queue.pop_smallest() == "E"
     assert queue.pop_smallest() == "A"
     assert queue.empty() is True
+
+
+def test_conflict_queue():
+    """Create and use conflict queue."""
+    queue = wiz.graph._ConflictQueue(["A", "B", "C"])
+    assert queue.empty() is False
+    assert queue.sorted is False
+    assert len(queue) == 3
+    assert "A" in queue
+    assert sorted(queue) == ["A", "B", "C"]
+
+    distance_mapping = {
+        "A": {"distance": 1},
+        "B": {"distance": 3},
+        "C": {"distance": None},
+        "D": {"distance": 3},
+        "E": {"distance": 2},
+    }
+
+    # Unreachable identifiers are removed when sorting.
+    queue.sort(distance_mapping)
+    assert queue.sorted is True
+    assert sorted(queue) == ["A", "B"]
+
+    # Furthest identifier is popped first.
+    assert queue.pop() == "B"
+    assert "B" not in queue
+
+    queue.update(["D", "E"])
+    assert queue.sorted is False
+
+    queue.sort(distance_mapping)
+    assert queue.pop() == "D"
+    assert queue.pop() == "E"
+    assert queue.pop() == "A"
+    assert queue.empty() is True
+
+    with pytest.raises(IndexError):
+        queue.pop()
+
+
+def test_nogoods():
+    """Record minimal nogoods and match combinations."""
+    nogoods = wiz.graph._Nogoods(["A[V1]", "A[V2]", "B[V1]", "B[V2]"])
+    assert nogoods.identifiers == {"A[V1]", "A[V2]", "B[V1]", "B[V2]"}
+    assert len(nogoods) == 0
+    assert nogoods.match(["A[V2]", "B[V2]"]) is False
+
+    assert nogoods.add({"A[V1]", "B[V1]"}) is True
+    assert nogoods.match(["A[V2]", "B[V2]"]) is True
+    assert nogoods.match(["A[V1]", "B[V2]"]) is False
+
+    # Nogoods containing a recorded nogood are ignored.
+    assert nogoods.add({"A[V1]", "B[V1]"}) is False
+    assert len(nogoods) == 1
+
+    # Nogoods containing the new nogood are discarded.
+    assert nogoods.add({"B[V1]"}) is True
+    assert list(nogoods) == [frozenset(["B[V1]"])]
+    assert nogoods.match(["A[V1]", "B[V2]"]) is True
+    assert nogoods.match(["A[V2]", "B[V1]"]) is False
+
+    # Empty nogood matches all combinations.
+    assert nogoods.add(set()) is True
+    assert nogoods.match(["A[V2]", "B[V1]"]) is True
@@ -1,12 +1,16 @@
 # :coding: utf-8
 
+import json
 import os
 import os.path
+import stat
+import time
 import types
 
 import pytest
 
 import wiz.config
+import wiz.definition
 import wiz.exception
 import wiz.filesystem
 import wiz.registry
@@ -500,3 +504,296 @@ def test_install_to_path_no_content(
     logger.info.assert_not_called()
 
     assert "InstallNoChanges: Nothing to install." in str(error)
+
+
+def test_export_index(temporary_directory):
+    """Export and load registry index."""
+    index = {
+        "options": {"max_depth": None, "ignore_patterns": []},
+        "directories": {".": 1000},
+        "definitions": {
+            "foo.json": {
+                "signature": [1000, 10],
+                "header": {"identifier": "foo"}
+            }
+        }
+    }
+
+    assert wiz.registry.export_index(temporary_directory, index) is True
+    assert os.path.isfile(
+        os.path.join(temporary_directory, wiz.registry.INDEX_PATH)
+    )
+    assert wiz.registry.load_index(temporary_directory) == index
+
+
+def test_load_index_missing(temporary_directory):
+    """Return empty index when index file does not exist."""
+    assert wiz.registry.load_index(temporary_directory) == {
+        "options": {}, "directories": {}, "definitions": {}
+    }
+
+
+@pytest.mark.parametrize("content", [
+    "{\"version\": 0, \"definitions\": {\"foo.json\": {}}}",
+    "INCORRECT",
+], ids=[
+    "incompatible-version",
+    "incorrect-json",
+])
+def test_load_index_incorrect(temporary_directory, content):
+    """Return empty index when index file is incorrect."""
+    path = os.path.join(temporary_directory, wiz.registry.INDEX_PATH)
+    wiz.filesystem.ensure_directory(os.path.dirname(path))
+
+    with open(path, "w") as stream:
+        stream.write(content)
+
+    assert wiz.registry.load_index(temporary_directory) == {
+        "options": {}, "directories": {}, "definitions": {}
+    }
+
+
+def test_export_index_error(mocker, temporary_directory):
+    """Fail to export registry index."""
+    mocker.patch.object(wiz.registry.os, "rename", side_effect=OSError)
+
+    assert wiz.registry.export_index(temporary_directory, {}) is False
+    assert os.listdir(
+        os.path.join(temporary_directory, os.path.dirname(
+            wiz.registry.INDEX_PATH
+        ))
+    ) == []
+
+
+@pytest.fixture()
+def packed_registry(temporary_directory):
+    """Return registry path with a few definitions."""
+    path = os.path.join(temporary_directory, "registry")
+
+    for relative_path, data in [
+        ("foo/foo-0.1.0.json", {"identifier": "foo", "version": "0.1.0"}),
+        ("foo/foo-0.2.0.json", {"identifier": "foo", "version": "0.2.0"}),
+        ("bar/bar.json", {"identifier": "bar"}),
+        (".git/baz.json", {"identifier": "baz"}),
+        ("incorrect.json", {"version": "0.1.0"}),
+    ]:
+        _path = os.path.join(path, relative_path)
+        wiz.filesystem.ensure_directory(os.path.dirname(_path))
+
+        with open(_path, "w") as stream:
+            stream.write(json.dumps(data))
+
+    return path
+
+
+def test_pack(packed_registry):
+    """Pack registry and load definition data from pack."""
+    assert wiz.registry.pack(packed_registry, ignore_patterns=[".git"]) == 3
+    assert os.path.isfile(
+        os.path.join(packed_registry, wiz.registry.PACK_PATH)
+    )
+
+    result = wiz.registry.load_pack(packed_registry, ignore_patterns=[".git"])
+    assert list(result.items()) == [
+        (
+            os.path.join("bar", "bar.json"),
+            {"identifier": "bar"}
+        ),
+        (
+            os.path.join("foo", "foo-0.1.0.json"),
+            {"identifier": "foo", "version": "0.1.0"}
+        ),
+        (
+            os.path.join("foo", "foo-0.2.0.json"),
+            {"identifier": "foo", "version": "0.2.0"}
+        ),
+    ]
+
+    # Index is exported with the same options.
+    index = wiz.registry.load_index(packed_registry)
+    assert index["options"] == {"max_depth": None, "ignore_patterns": [".git"]}
+    assert sorted(index["definitions"].keys()) == sorted(result.keys())
+    assert index["definitions"][os.path.join("bar", "bar.json")]["header"] == {
+        "identifier": "bar"
+    }
+
+    # Pack is ignored when options are different.
+    assert wiz.registry.load_pack(packed_registry) is None
+    assert wiz.registry.load_pack(
+        packed_registry, max_depth=1, ignore_patterns=[".git"]
+    ) is None
+
+
+def test_pack_error(temporary_directory):
+    """Fail to pack invalid registry."""
+    with pytest.raises(wiz.exception.WizError) as error:
+        wiz.registry.pack(os.path.join(temporary_directory, "missing"))
+
+    assert "is not a valid registry directory." in str(error)
+
+
+def test_load_pack_missing(packed_registry):
+    """Return None when registry does not have a pack."""
+    assert wiz.registry.load_pack(packed_registry) is None
+
+
+def test_load_pack_outdated(packed_registry):
+    """Ignore pack when registry has been modified."""
+    wiz.registry.pack(packed_registry)
+
+    # Ensure that modification time differs on low resolution filesystems.
+    time.sleep(0.01)
+    with open(os.path.join(packed_registry, "foo", "new.json"), "w") as stream:
+        stream.write(json.dumps({"identifier": "new"}))
+
+    assert wiz.registry.load_pack(packed_registry) is None
+
+
+def test_load_pack_outdated_file(packed_registry):
+    """Ignore pack when definition file has been modified in place if
+    requested."""
+    wiz.registry.pack(packed_registry, ignore_patterns=[".git"])
+
+    path = os.path.join(packed_registry, "foo", "foo-0.1.0.json")
+    directory_stat = os.stat(os.path.dirname(path))
+
+    time.sleep(0.01)
+    with open(path, "w") as stream:
+        stream.write(json.dumps({"identifier": "foo", "version": "0.1.1"}))
+
+    # Directory is not modified when a file is edited in place.
+    assert os.stat(os.path.dirname(path)).st_mtime == directory_stat.st_mtime
+
+    # Definition files are only checked when requested.
+    assert wiz.registry.load_pack(
+        packed_registry, ignore_patterns=[".git"]
+    ) is not None
+
+    assert wiz.registry.load_pack(
+        packed_registry, ignore_patterns=[".git"], check_files=True
+    ) is None
+
+
+def test_load_pack_older_than_directory(packed_registry):
+    """Ignore pack when a directory is more recent than the pack."""
+    wiz.registry.pack(packed_registry, ignore_patterns=[".git"])
+
+    path = os.path.join(packed_registry, wiz.registry.PACK_PATH)
+    os.utime(path, (0, 0))
+
+    assert wiz.registry.load_pack(
+        packed_registry, ignore_patterns=[".git"]
+    ) is None
+
+
+def test_pack_mode(packed_registry):
+    """Pack registry with default permissions of new files."""
+    umask = os.umask(0o022)
+
+    try:
+        wiz.registry.pack(packed_registry)
+
+    finally:
+        os.umask(umask)
+
+    path = os.path.join(packed_registry, wiz.registry.PACK_PATH)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+
+def test_load_pack_incorrect(packed_registry):
+    """Ignore incorrect pack."""
+    path = os.path.join(packed_registry, wiz.registry.PACK_PATH)
+    wiz.filesystem.ensure_directory(os.path.dirname(path))
+
+    with open(path, "wb") as stream:
+        stream.write(b"INCORRECT")
+
+    assert wiz.registry.load_pack(packed_registry) is None
+
+
+def test_append_to_pack(packed_registry):
+    """Append definitions to pack."""
+    wiz.registry.pack(packed_registry, ignore_patterns=[".git"])
+
+    time.sleep(0.01)
+    removed_path = os.path.join(packed_registry, "foo", "foo-0.1.0.json")
+    os.remove(removed_path)
+
+    path = os.path.join(packed_registry, "foo", "foo-0.3.0.json")
+    with open(path, "w") as stream:
+        stream.write(json.dumps({"identifier": "foo", "version": "0.3.0"}))
+
+    assert wiz.registry.load_pack(
+        packed_registry, ignore_patterns=[".git"]
+    ) is None
+
+    assert wiz.registry.append_to_pack(
+        packed_registry, paths=[path], removed_paths=[removed_path]
+    ) is True
+
+    result = wiz.registry.load_pack(packed_registry, ignore_patterns=[".git"])
+    assert list(result.keys()) == [
+        os.path.join("bar", "bar.json"),
+        os.path.join("foo", "foo-0.2.0.json"),
+        os.path.join("foo", "foo-0.3.0.json"),
+    ]
+
+
+def test_append_to_pack_missing(packed_registry):
+    """Do not append definitions when registry does not have a pack."""
+    path = os.path.join(packed_registry, "bar", "bar.json")
+    assert wiz.registry.append_to_pack(packed_registry, paths=[path]) is False
+    assert not os.path.exists(
+        os.path.join(packed_registry, wiz.registry.PACK_PATH)
+    )
+
+
+def test_append_to_pack_error(packed_registry):
+    """Remove pack when definitions cannot be appended."""
+    wiz.registry.pack(packed_registry)
+
+    path = os.path.join(packed_registry, "incorrect.json")
+    assert wiz.registry.append_to_pack(packed_registry, paths=[path]) is False
+    assert not os.path.exists(
+        os.path.join(packed_registry, wiz.registry.PACK_PATH)
+    )
+
+
+@pytest.mark.parametrize("rebuild_pack", [False, True], ids=[
+    "append",
+    "rebuild",
+])
+def test_install_to_path_with_pack(mocker, packed_registry, rebuild_pack):
+    """Install definitions to registry with pack."""
+    mocker.patch.object(os.path, "expanduser", side_effect=lambda path: path)
+    wiz.registry.pack(packed_registry, ignore_patterns=[".git"])
+
+    definitions = [
+        wiz.definition.Definition({"identifier": "foo", "version": "0.3.0"}),
+        wiz.definition.Definition(
+            {"identifier": "bar", "description": "test"}
+        ),
+    ]
+
+    time.sleep(0.01)
+    wiz.registry.install_to_path(
+        definitions, packed_registry, overwrite=True, rebuild_pack=rebuild_pack
+    )
+
+    result = wiz.registry.load_pack(packed_registry, ignore_patterns=[".git"])
+    assert sorted(result.keys()) == [
+        os.path.join("bar", "bar.json"),
+        "foo-0.3.0.json",
+        os.path.join("foo", "foo-0.1.0.json"),
+        os.path.join("foo", "foo-0.2.0.json"),
+    ]
+    assert result[os.path.join("bar", "bar.json")] == {
+        "identifier": "bar", "description": "test"
+    }
+
+    # Index is updated with installed definitions.
+    index = wiz.registry.load_index(packed_registry)
+    assert sorted(index["definitions"].keys()) == sorted(result.keys())
+    assert index["definitions"]["foo-0.3.0.json"]["header"] == {
+        "identifier": "foo", "version": "0.3.0"
+    }
@@ -0,0 +1,423 @@
+# :coding: utf-8
+
+import threading
+
+import pytest
+
+from wiz.utility import Requirement
+import wiz.definition
+import wiz.exception
+import wiz.package
+import wiz.sat
+
+
+def test_solver():
+    """Solve clauses."""
+    solver = wiz.sat.Solver()
+    a, b = solver.new_variable(), solver.new_variable()
+    solver.add_clause([a, b])
+    solver.add_clause([-a])
+
+    assert solver.solve() == {a: False, b: True}
+    assert solver.variables == 2
+    assert len(solver.clauses) == 1
+    assert solver.value(a) is False
+    assert solver.value(-a) is True
+
+
+def test_solver_with_decision():
+    """Solve clauses with custom decision function."""
+    solver = wiz.sat.Solver()
+    a, b, c = [solver.new_variable() for _ in range(3)]
+    solver.add_clause([-a, b])
+    solver.add_clause([-b, c])
+
+    def _decide(_solver):
+        """Attempt to assign 'a' first."""
+        if _solver.value(a) is None:
+            return a
+
+    assert solver.solve(decide=_decide) == {a: True, b: True, c: True}
+    assert solver.statistics == {"decisions": 1, "conflicts": 0}
+
+
+def test_solver_tautology():
+    """Ignore clause containing opposite literals."""
+    solver = wiz.sat.Solver()
+    a = solver.new_variable()
+    solver.add_clause([a, -a])
+
+    assert solver.clauses == []
+    assert solver.solve() == {a: False}
+
+
+def test_solver_unsatisfiable():
+    """Fail to solve contradicting clauses."""
+    solver = wiz.sat.Solver()
+    a = solver.new_variable()
+    solver.add_clause([a])
+    solver.add_clause([-a])
+
+    assert solver.solve() is None
+
+
+def test_solver_empty_clause():
+    """Fail to solve clauses containing an empty clause."""
+    solver = wiz.sat.Solver()
+    solver.new_variable()
+    solver.add_clause([])
+
+    assert solver.solve() is None
+
+
+def test_solver_learn_clauses():
+    """Learn clauses from conflicts to backjump."""
+    solver = wiz.sat.Solver()
+    a, b, c, d = [solver.new_variable() for _ in range(4)]
+
+    # Assigning 'a' to False leads to a conflict whichever the value of 'b'.
+    solver.add_clause([a, c, d])
+    solver.add_clause([a, c, -d])
+    solver.add_clause([a, -c, d])
+    solver.add_clause([a, -c, -d])
+
+    values = solver.solve()
+    assert values[a] is True
+    assert solver.statistics["conflicts"] > 0
+    assert len(solver.clauses) > 4
+
+
+def test_solver_pigeonhole():
+    """Fail to place three pigeons in two holes."""
+    solver = wiz.sat.Solver()
+    variables = [
+        [solver.new_variable() for _ in range(2)] for _ in range(3)
+    ]
+
+    for pigeon in variables:
+        solver.add_clause(pigeon)
+
+    for hole in range(2):
+        for index, pigeon in enumerate(variables):
+            for other in variables[index + 1:]:
+                solver.add_clause([-pigeon[hole], -other[hole]])
+
+    assert solver.solve() is None
+    assert solver.statistics["conflicts"] > 0
+
+
+def test_solver_interrupted():
+    """Interrupt solver before a decision."""
+    solver = wiz.sat.Solver()
+    a, b = solver.new_variable(), solver.new_variable()
+    solver.add_clause([a, b])
+
+    def _interrupt(_solver):
+        """Interrupt solver when 'a' is assigned."""
+        if _solver.value(a) is not None:
+            raise wiz.exception.ResolutionInterrupted()
+
+    with pytest.raises(wiz.exception.ResolutionInterrupted):
+        solver.solve(interrupt=_interrupt)
+
+    assert solver.statistics == {"decisions": 1, "conflicts": 0}
+
+
+def test_resolver():
+    """Compute packages from requirements."""
+    definition_mapping = {
+        "A": {
+            "0.2.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.2.0",
+                "requirements": ["B"]
+            }),
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.1.0"
+            })
+        },
+        "B": {
+            "1.0.0": wiz.definition.Definition({
+                "identifier": "B",
+                "version": "1.0.0"
+            }),
+        }
+    }
+
+    resolver = wiz.sat.Resolver(definition_mapping)
+    assert resolver.definition_mapping == definition_mapping
+    assert resolver.statistics == {}
+
+    packages = resolver.compute_packages([Requirement("A")])
+    assert [package.identifier for package in packages] == [
+        "B==1.0.0", "A==0.2.0"
+    ]
+
+    statistics = resolver.statistics
+    assert sorted(statistics.keys()) == [
+        "clauses", "conflicts", "decisions", "variables"
+    ]
+    assert statistics["conflicts"] == 0
+
+
+def test_resolver_with_conflict():
+    """Compute packages which fulfill the highest number of requirements."""
+    definition_mapping = {
+        "A": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.1.0",
+                "requirements": ["C<1"]
+            }),
+        },
+        "B": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "B",
+                "version": "0.1.0",
+                "requirements": ["C"]
+            }),
+        },
+        "C": {
+            "1.0.0": wiz.definition.Definition({
+                "identifier": "C",
+                "version": "1.0.0"
+            }),
+            "0.5.0": wiz.definition.Definition({
+                "identifier": "C",
+                "version": "0.5.0"
+            }),
+        }
+    }
+
+    resolver = wiz.sat.Resolver(definition_mapping)
+    packages = resolver.compute_packages([Requirement("A"), Requirement("B")])
+    assert [package.identifier for package in packages] == [
+        "B==0.1.0", "C==0.5.0", "A==0.1.0"
+    ]
+
+
+def test_resolver_with_conditions():
+    """Compute packages with another version than the conditioned one."""
+    definition_mapping = {
+        "A": {
+            "2.2.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "2.2.0",
+                "conditions": ["C"]
+            }),
+            "0.0.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.0.0"
+            }),
+        },
+        "C": {
+            "3.1.0": wiz.definition.Definition({
+                "identifier": "C",
+                "version": "3.1.0",
+                "requirements": ["A<1"]
+            }),
+        }
+    }
+
+    resolver = wiz.sat.Resolver(definition_mapping)
+
+    packages = resolver.compute_packages([Requirement("A"), Requirement("C")])
+    assert [package.identifier for package in packages] == [
+        "C==3.1.0", "A==0.0.0"
+    ]
+
+    # Requirement is ignored when conditions are not fulfilled.
+    packages = resolver.compute_packages([Requirement("A")])
+    assert packages == []
+
+
+def test_resolver_with_variants():
+    """Compute packages with variant compatible with other requirements."""
+    definition_mapping = {
+        "A": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.1.0",
+                "variants": [
+                    {"identifier": "V2", "requirements": ["C==2"]},
+                    {"identifier": "V1", "requirements": ["C==1"]},
+                ]
+            }),
+        },
+        "B": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "B",
+                "version": "0.1.0",
+                "requirements": ["C<2"]
+            }),
+        },
+        "C": {
+            "2": wiz.definition.Definition({
+                "identifier": "C",
+                "version": "2"
+            }),
+            "1": wiz.definition.Definition({
+                "identifier": "C",
+                "version": "1"
+            }),
+        }
+    }
+
+    resolver = wiz.sat.Resolver(definition_mapping)
+    packages = resolver.compute_packages([Requirement("A"), Requirement("B")])
+    assert [package.identifier for package in packages] == [
+        "B==0.1.0", "C==1", "A[V1]==0.1.0"
+    ]
+
+
+def test_resolver_error():
+    """Fail to compute packages from incompatible requirements."""
+    definition_mapping = {
+        "A": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.1.0",
+                "requirements": ["C>1"]
+            }),
+        },
+        "B": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "B",
+                "version": "0.1.0",
+                "requirements": ["C<1"]
+            }),
+        },
+        "C": {
+            "2.0.0": wiz.definition.Definition({
+                "identifier": "C",
+                "version": "2.0.0"
+            }),
+            "0.5.0": wiz.definition.Definition({
+                "identifier": "C",
+                "version": "0.5.0"
+            }),
+        }
+    }
+
+    resolver = wiz.sat.Resolver(definition_mapping)
+
+    with pytest.raises(wiz.exception.GraphResolutionError) as error:
+        resolver.compute_packages([Requirement("A"), Requirement("B")])
+
+    assert (
+        "no combination of package versions and variants fulfills all "
+        "requirements"
+    ) in str(error.value)
+
+
+def test_resolver_request_error():
+    """Fail to compute packages from unknown request."""
+    resolver = wiz.sat.Resolver({})
+
+    with pytest.raises(wiz.exception.GraphResolutionError) as error:
+        resolver.compute_packages([Requirement("A")])
+
+    assert "root: The requirement 'A' could not be resolved." in str(
+        error.value
+    )
+
+
+def test_resolver_cancelled():
+    """Fail to compute packages when resolution is cancelled."""
+    definition_mapping = {
+        "A": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.1.0"
+            }),
+        },
+    }
+
+    event = threading.Event()
+    event.set()
+
+    resolver = wiz.sat.Resolver(definition_mapping, cancel_event=event)
+
+    with pytest.raises(wiz.exception.ResolutionInterrupted) as error:
+        resolver.compute_packages([Requirement("A")])
+
+    assert "The resolution has been cancelled after 0 conflict(s)." in str(
+        error.value
+    )
+    assert resolver.statistics["decisions"] == 0
+
+
+def test_resolver_timeout(mocker):
+    """Fail to compute packages when timeout is exceeded."""
+    definition_mapping = {
+        "A": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.1.0"
+            }),
+        },
+    }
+
+    mocked_time = mocker.patch.object(wiz.sat, "time")
+    mocked_time.time.side_effect = [0, 10]
+
+    resolver = wiz.sat.Resolver(definition_mapping, timeout=5)
+
+    with pytest.raises(wiz.exception.ResolutionLimitExceeded) as error:
+        resolver.compute_packages([Requirement("A")])
+
+    assert (
+        "The resolution has exceeded the timeout of 5 second(s) after 0 "
+        "conflict(s)."
+    ) in str(error.value)
+
+
+def test_selection_mapping():
+    """Restrict definitions to selected packages."""
+    definition_mapping = {
+        "A": {
+            "0.2.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.2.0",
+                "variants": [{"identifier": "V1"}, {"identifier": "V2"}]
+            }),
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.1.0"
+            })
+        },
+        "B": {
+            "1.0.0": wiz.definition.Definition({
+                "identifier": "B",
+                "version": "1.0.0"
+            }),
+        }
+    }
+
+    package = wiz.package.Package(
+        definition_mapping["A"]["0.2.0"],
+        1
+    )
+
+    mapping = wiz.sat.SelectionMapping(definition_mapping, [package])
+    assert len(mapping) == 2
+    assert sorted(mapping) == ["A", "B"]
+    assert "A" in mapping
+    assert "C" not in mapping
+    assert mapping["B"] == definition_mapping["B"]
+
+    assert list(mapping["A"].keys()) == ["0.2.0"]
+    definition = mapping["A"]["0.2.0"]
+    assert [variant.identifier for variant in definition.variants] == ["V2"]
+
+    # Versions ignored as their conditions are not fulfilled are kept.
+    mapping = wiz.sat.SelectionMapping(
+        definition_mapping, [package], ignored_packages=[
+            wiz.package.Package(definition_mapping["A"]["0.1.0"]),
+            wiz.package.Package(definition_mapping["B"]["1.0.0"]),
+        ]
+    )
+    assert sorted(mapping["A"].keys()) == ["0.1.0", "0.2.0"]
+    assert mapping["A"]["0.1.0"] == definition_mapping["A"]["0.1.0"]
+    assert mapping["B"] == definition_mapping["B"]
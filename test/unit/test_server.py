@@ -0,0 +1,435 @@
+# :coding: utf-8
+
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+import wiz.cache
+import wiz.environ
+import wiz.exception
+import wiz.package
+import wiz.registry
+import wiz.server
+import wiz.utility
+
+
+@pytest.fixture()
+def registry(temporary_directory):
+    """Return registry path with a few definitions."""
+    path = os.path.join(temporary_directory, "registry")
+
+    for identifier, data in [
+        ("foo", {
+            "version": "0.1.0",
+            "command": {"fooExe": "FooExe"},
+            "environ": {"FOO": "foo"},
+            "requirements": ["bar >= 1"]
+        }),
+        ("bar", {"version": "1.0.0", "environ": {"BAR": "bar"}}),
+        ("baz", {
+            "variants": [
+                {"identifier": "V1", "environ": {"BAZ": "V1"}},
+                {"identifier": "V2", "environ": {"BAZ": "V2"}},
+            ]
+        }),
+    ]:
+        data["identifier"] = identifier
+        _export(os.path.join(path, identifier, "definition.json"), data)
+
+    os.makedirs(os.path.join(path, os.path.dirname(wiz.registry.INDEX_PATH)))
+
+    return path
+
+
+@pytest.fixture()
+def server(registry, temporary_directory):
+    """Return running server instance."""
+    _server = wiz.server.Server(
+        [registry], socket_path=os.path.join(temporary_directory, "socket"),
+        system_mapping={}, refresh_interval=0
+    )
+
+    thread = threading.Thread(target=_server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    # Wait for server to accept connections.
+    for _ in range(500):
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(_server.socket_path)
+            break
+        except socket.error:
+            time.sleep(0.01)
+        finally:
+            connection.close()
+
+    yield _server
+
+    _server.shutdown()
+    thread.join()
+
+
+def _export(path, data):
+    """Export definition *data* to *path*."""
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+
+    with open(path, "w") as stream:
+        stream.write(json.dumps(data))
+
+
+def test_get_socket_path(mocker):
+    """Return default socket path."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+    assert wiz.server.get_socket_path() == os.path.join(
+        "__HOME__", ".wiz", "server.sock"
+    )
+
+
+def test_server_handle(mocker, registry):
+    """Handle request without socket."""
+    mocker.patch.object(
+        wiz.environ, "initiate", return_value={"SERVER_KEY": "VALUE"}
+    )
+
+    _server = wiz.server.Server([registry], system_mapping={})
+
+    response = _server.handle({
+        "action": "resolve_context",
+        "arguments": {
+            "requests": ["foo", "baz[V2]"],
+            "registries": [registry],
+            "registry_key": wiz.cache.compute_key(
+                [registry], system_mapping={}
+            ),
+            "environ_mapping": {"KEY": "VALUE"}
+        }
+    })
+
+    assert response["status"] == "success"
+    assert response["result"]["environ"]["FOO"] == "foo"
+    assert response["result"]["environ"]["BAR"] == "bar"
+    assert response["result"]["environ"]["BAZ"] == "V2"
+    assert response["result"]["environ"]["KEY"] == "VALUE"
+    assert "SERVER_KEY" not in response["result"]["environ"]
+    assert response["result"]["command"] == {"fooExe": "FooExe"}
+    assert response["result"]["registries"] == [registry]
+    assert [
+        (item["definition"]["identifier"], item["variant"])
+        for item in response["result"]["packages"]
+    ] == [("baz", "V2"), ("bar", None), ("foo", None)]
+
+
+@pytest.mark.parametrize("request_data, error_type", [
+    (None, "ServerError"),
+    ({"action": "unknown"}, "ServerError"),
+    ({
+        "action": "resolve_context",
+        "arguments": {
+            "requests": ["foo"], "registries": ["/other"],
+            "registry_key": "__KEY__"
+        }
+    }, "ServerUnavailable"),
+    ({
+        "action": "resolve_context",
+        "arguments": {
+            "requests": ["foo"], "registries": "__REGISTRY__",
+            "registry_key": "__OTHER_KEY__"
+        }
+    }, "ServerUnavailable"),
+    ({
+        "action": "resolve_context",
+        "arguments": {
+            "requests": ["incorrect"], "registries": "__REGISTRY__",
+            "registry_key": "__KEY__"
+        }
+    }, "GraphResolutionError"),
+    ({
+        "action": "fetch_package_request_from_command",
+        "arguments": {"command_request": "unknownExe"}
+    }, "ServerError"),
+], ids=[
+    "not-a-mapping",
+    "unknown-action",
+    "other-registries",
+    "other-registry-options",
+    "resolution-error",
+    "missing-argument",
+])
+def test_server_handle_error(registry, request_data, error_type):
+    """Handle incorrect request without socket."""
+    if request_data is not None:
+        arguments = request_data.get("arguments", {})
+        if arguments.get("registries") == "__REGISTRY__":
+            arguments["registries"] = [registry]
+
+        if arguments.get("registry_key") == "__KEY__":
+            arguments["registry_key"] = wiz.cache.compute_key(
+                [registry], system_mapping={}
+            )
+
+    _server = wiz.server.Server([registry], system_mapping={})
+
+    response = _server.handle(request_data)
+    assert response["status"] == "error"
+    assert response["error"]["type"] == error_type
+
+
+def test_server_refresh(registry):
+    """Refresh definition mapping when registry is modified."""
+    _server = wiz.server.Server(
+        [registry], system_mapping={}, refresh_interval=0
+    )
+
+    mapping = _server.definition_mapping
+    assert sorted(mapping["package"].keys()) == ["bar", "baz", "foo"]
+
+    assert _server.refresh() is False
+    assert _server.definition_mapping is mapping
+
+    # Ensure that modification time differs on low resolution filesystems.
+    time.sleep(0.01)
+    _export(
+        os.path.join(registry, "qux", "definition.json"),
+        {"identifier": "qux"}
+    )
+
+    assert _server.refresh() is True
+    assert sorted(_server.definition_mapping["package"].keys()) == [
+        "bar", "baz", "foo", "qux"
+    ]
+
+
+def test_server_refresh_modified_definition(registry):
+    """Refresh definition mapping when definition is modified in place."""
+    _server = wiz.server.Server(
+        [registry], system_mapping={}, refresh_interval=0
+    )
+
+    mapping = _server.definition_mapping
+    assert sorted(mapping["package"]["bar"].keys()) == ["1.0.0"]
+
+    # Ensure that modification time differs on low resolution filesystems.
+    time.sleep(0.01)
+    _export(
+        os.path.join(registry, "bar", "definition.json"),
+        {"identifier": "bar", "version": "2.0.0"}
+    )
+
+    assert _server.refresh() is True
+    assert sorted(_server.definition_mapping["package"]["bar"].keys()) == [
+        "2.0.0"
+    ]
+    assert _server.refresh() is False
+
+
+def test_server_refresh_interval(registry):
+    """Do not check registries before refresh interval is passed."""
+    _server = wiz.server.Server(
+        [registry], system_mapping={}, refresh_interval=3600
+    )
+    assert _server.refresh() is True
+
+    _export(
+        os.path.join(registry, "qux", "definition.json"),
+        {"identifier": "qux"}
+    )
+
+    assert _server.refresh() is False
+    assert _server.refresh(force=True) is True
+    assert "qux" in _server.definition_mapping["package"]
+
+
+def test_resolve_context(server, registry):
+    """Resolve context from server."""
+    context = wiz.server.resolve_context(
+        ["foo", "baz[V1]"], [registry], system_mapping={},
+        socket_path=server.socket_path
+    )
+
+    assert context["environ"]["BAZ"] == "V1"
+    assert context["command"] == {"fooExe": "FooExe"}
+    assert all(
+        isinstance(_package, wiz.package.Package)
+        for _package in context["packages"]
+    )
+    assert [
+        _package.identifier for _package in context["packages"]
+    ] == ["baz[V1]", "bar==1.0.0", "foo==0.1.0"]
+    assert context["packages"][1].definition.registry_path == registry
+    assert context["packages"][1].definition.path == os.path.join(
+        registry, "bar", "definition.json"
+    )
+    assert wiz.utility.decode(context["environ"]["WIZ_CONTEXT"]) == [
+        ["baz[V1]", "bar==1.0.0", "foo==0.1.0"], [registry]
+    ]
+
+
+def test_fetch_package_request_from_command(server, registry):
+    """Fetch package request from command with server."""
+    assert wiz.server.fetch_package_request_from_command(
+        "fooExe", [registry], system_mapping={},
+        socket_path=server.socket_path
+    ) == "foo"
+
+
+def test_resolve_context_error(server, registry):
+    """Fail to resolve context from server."""
+    with pytest.raises(wiz.exception.GraphResolutionError) as error:
+        wiz.server.resolve_context(
+            ["incorrect"], [registry], system_mapping={},
+            socket_path=server.socket_path
+        )
+
+    assert "The requirement 'incorrect' could not be resolved." in str(
+        error.value
+    )
+
+    with pytest.raises(wiz.exception.RequestNotFound) as error:
+        wiz.server.fetch_package_request_from_command(
+            "incorrect", [registry], system_mapping={},
+            socket_path=server.socket_path
+        )
+
+    assert str(error.value) == "No command named 'incorrect' can be found."
+
+
+def test_resolve_context_concurrently(server, registry):
+    """Resolve contexts from several clients concurrently."""
+    results = []
+
+    def _resolve(request):
+        """Resolve context from *request*."""
+        context = wiz.server.resolve_context(
+            [request], [registry], system_mapping={},
+            socket_path=server.socket_path
+        )
+        results.append(context["environ"]["BAZ"])
+
+    threads = [
+        threading.Thread(target=_resolve, args=("baz[{}]".format(v),))
+        for v in ["V1", "V2"] * 10
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == ["V1"] * 10 + ["V2"] * 10
+
+
+def test_resolve_context_with_jobs(mocker, server, registry):
+    """Resolve contexts from server with the same executor."""
+    spy = mocker.spy(wiz, "resolve_context")
+
+    for request in ["baz[V1]", "baz[V2]"]:
+        context = wiz.server.resolve_context(
+            [request], [registry], system_mapping={}, jobs=2,
+            socket_path=server.socket_path
+        )
+        assert context["environ"]["BAZ"] == request[4:6]
+
+    executors = [call[1]["executor"] for call in spy.call_args_list]
+    assert executors[0] is not None
+    assert executors[0] is executors[1]
+
+    wiz.server.resolve_context(
+        ["foo"], [registry], system_mapping={},
+        socket_path=server.socket_path
+    )
+    assert spy.call_args_list[-1][1]["executor"] is None
+
+
+def test_resolve_context_environ(mocker, server, registry):
+    """Resolve context from server with environment initiated by client."""
+    mocked_initiate = mocker.patch.object(
+        wiz.environ, "initiate", return_value={"CLIENT_KEY": "VALUE"}
+    )
+
+    context = wiz.server.resolve_context(
+        ["bar"], [registry], system_mapping={},
+        environ_mapping={"KEY": "VALUE"}, socket_path=server.socket_path
+    )
+
+    mocked_initiate.assert_called_once_with({"KEY": "VALUE"})
+    assert context["environ"]["CLIENT_KEY"] == "VALUE"
+    assert "KEY" not in context["environ"]
+
+
+@pytest.mark.parametrize("options", [
+    {"system_mapping": {"platform": "windows"}},
+    {"system_mapping": {}, "max_depth": 2},
+    {"system_mapping": {}, "ignore_patterns": [".git"]},
+], ids=[
+    "other-system",
+    "other-depth",
+    "other-ignore-patterns",
+])
+def test_resolve_context_other_options(server, registry, options):
+    """Fail to resolve context when server uses other registry options."""
+    with pytest.raises(wiz.exception.ServerUnavailable):
+        wiz.server.resolve_context(
+            ["foo"], [registry], socket_path=server.socket_path, **options
+        )
+
+    with pytest.raises(wiz.exception.ServerUnavailable):
+        wiz.server.fetch_package_request_from_command(
+            "fooExe", [registry], socket_path=server.socket_path, **options
+        )
+
+
+def test_resolve_context_unavailable(registry, temporary_directory):
+    """Fail to resolve context when server is not running."""
+    with pytest.raises(wiz.exception.ServerUnavailable):
+        wiz.server.resolve_context(
+            ["foo"], [registry],
+            socket_path=os.path.join(temporary_directory, "socket")
+        )
+
+
+def test_serve_forever_already_running(server, registry):
+    """Fail to start server when socket is used by another server."""
+    _server = wiz.server.Server(
+        [registry], socket_path=server.socket_path, system_mapping={}
+    )
+
+    with pytest.raises(wiz.exception.ServerError):
+        _server.serve_forever()
+
+
+def test_serve_forever_stale_socket(registry, temporary_directory):
+    """Start server when socket has been left by a previous server."""
+    path = os.path.join(temporary_directory, "socket")
+
+    stale_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale_socket.bind(path)
+    stale_socket.close()
+
+    _server = wiz.server.Server([registry], socket_path=path, system_mapping={})
+
+    thread = threading.Thread(target=_server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    context = None
+    for _ in range(500):
+        try:
+            context = wiz.server.resolve_context(
+                ["bar"], [registry], system_mapping={}, socket_path=path
+            )
+            break
+        except wiz.exception.ServerUnavailable:
+            time.sleep(0.01)
+
+    _server.shutdown()
+    thread.join()
+
+    assert context["environ"]["BAR"] == "bar"
+    assert not os.path.exists(path)
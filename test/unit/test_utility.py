@@ -2,13 +2,18 @@
 
 import copy
 import base64
+import concurrent.futures
 import hashlib
+import pickle
 
+from packaging.requirements import InvalidRequirement
+from packaging.specifiers import SpecifierSet
 import pytest
 
 import wiz.definition
+import wiz.exception
 import wiz.utility
-from wiz.utility import Requirement
+from wiz.utility import Requirement, Version
 
 
 @pytest.fixture()
@@ -17,6 +22,51 @@ def mocked_extract_version_ranges(mocker):
     return mocker.patch.object(wiz.utility, "extract_version_ranges")
 
 
+@pytest.mark.parametrize("workers, executor", [
+    (None, None),
+    (1, None),
+    (None, "process"),
+], ids=[
+    "no-workers",
+    "one-worker",
+    "process-without-workers",
+])
+def test_create_executor_sequential(workers, executor):
+    """Return no executor when tasks should be executed sequentially."""
+    assert wiz.utility.create_executor(workers, executor) is None
+
+
+@pytest.mark.parametrize("executor, expected", [
+    (None, concurrent.futures.ThreadPoolExecutor),
+    ("thread", concurrent.futures.ThreadPoolExecutor),
+    ("process", concurrent.futures.ProcessPoolExecutor),
+], ids=[
+    "default",
+    "thread",
+    "process",
+])
+def test_create_executor(executor, expected):
+    """Create executor with workers."""
+    result = wiz.utility.create_executor(4, executor)
+    assert isinstance(result, expected)
+    result.shutdown()
+
+
+def test_create_executor_from_instance():
+    """Return executor instance."""
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    assert wiz.utility.create_executor(None, executor) is executor
+    executor.shutdown()
+
+
+def test_create_executor_error():
+    """Fail to create executor with incorrect type."""
+    with pytest.raises(ValueError) as error:
+        wiz.utility.create_executor(4, "incorrect")
+
+    assert "Executor type is incorrect: 'incorrect'" in str(error.value)
+
+
 @pytest.mark.parametrize("element", [
     "This is a string",
     42,
@@ -41,6 +91,323 @@ def test_encode_and_decode(element):
     assert element == wiz.utility.decode(encoded)
 
 
+@pytest.mark.parametrize("content", [
+    "foo",
+    "  foo  ",
+    "foo-bar_baz.2",
+    "foo::bar",
+    "::bar",
+    "foo[V1]",
+    "foo [ V1 , V2 ]",
+    "foo[]",
+    "foo >= 1",
+    "foo>=1,<2",
+    "foo::bar[V1] >= 1, < 2, != 1.5.*",
+    "foo (>=1, <2)",
+    "foo ~= 2.2.0",
+    "foo === 8",
+    "foo == 1.0.0.post1+local",
+    "foo >= 1 ; python_version > '2.7'",
+    "foo @ https://example.com/foo",
+], ids=[
+    "name",
+    "with-whitespaces",
+    "with-punctuation",
+    "with-namespace",
+    "with-empty-namespace",
+    "with-variant",
+    "with-several-variants",
+    "with-empty-variant",
+    "with-specifier",
+    "with-specifiers-without-whitespaces",
+    "complete",
+    "with-parentheses",
+    "with-compatible-release",
+    "with-arbitrary-equality",
+    "with-local-version",
+    "with-marker",
+    "with-url",
+])
+def test_get_requirement(content):
+    """Return requirement equivalent to the pyparsing grammar."""
+    requirement = wiz.utility.get_requirement(content)
+    expected = Requirement(content)
+
+    assert requirement.name == expected.name
+    assert requirement.extras == expected.extras
+    assert requirement.specifier == expected.specifier
+    assert requirement.url == expected.url
+    assert str(requirement.marker) == str(expected.marker)
+    assert str(requirement) == str(expected)
+    assert requirement == expected
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "foo-",
+    "foo::",
+    "foo::bar::baz",
+    "foo bar",
+    "foo[V1",
+    "foo[V1,]",
+    "foo >= 1,",
+    "foo >= 1 <2",
+    "foo ()",
+    "foo (>=1",
+    "foo !!!",
+], ids=[
+    "empty",
+    "with-trailing-punctuation",
+    "with-trailing-separator",
+    "with-several-namespaces",
+    "with-whitespace",
+    "with-unclosed-variant",
+    "with-trailing-comma-in-variant",
+    "with-trailing-comma",
+    "without-comma",
+    "with-empty-parentheses",
+    "with-unclosed-parentheses",
+    "with-incorrect-specifier",
+])
+def test_get_requirement_error(content):
+    """Fail to return requirement from incorrect content."""
+    with pytest.raises(InvalidRequirement):
+        Requirement(content)
+
+    with pytest.raises(wiz.exception.InvalidRequirement) as error:
+        wiz.utility.get_requirement(content)
+
+    assert (
+        "The requirement '{}' is incorrect".format(content) in str(error.value)
+    )
+
+
+def test_get_requirement_interned():
+    """Return same requirement instance for identical strings."""
+    wiz.utility.clear_intern_cache()
+
+    requirement = wiz.utility.get_requirement("foo >= 1, < 2")
+    assert wiz.utility.get_requirement("foo >= 1, < 2") is requirement
+    assert wiz.utility.get_requirement("foo >=1, <2") is not requirement
+
+    with pytest.raises(wiz.exception.InvalidRequirement):
+        wiz.utility.get_requirement("foo !!!")
+
+    assert wiz.utility.get_intern_statistics()["requirement"] == {
+        "hits": 1, "misses": 3, "size": 2
+    }
+
+    wiz.utility.clear_intern_cache()
+    assert wiz.utility.get_intern_statistics()["requirement"] == {
+        "hits": 0, "misses": 0, "size": 0
+    }
+
+
+def test_frozen_requirement():
+    """Create immutable requirement with precomputed hash."""
+    requirement = wiz.utility.get_requirement("foo[V1] >= 1, < 2")
+    assert isinstance(requirement, wiz.utility.FrozenRequirement)
+    assert str(requirement) == "foo[V1] >=1, <2"
+    assert requirement == Requirement("foo[V1] >= 1, < 2")
+    assert requirement != Requirement("foo[V1] >= 1")
+    assert hash(requirement) == hash(Requirement("foo[V1] >= 1, < 2"))
+    assert requirement.extras == {"V1"}
+
+    with pytest.raises(AttributeError):
+        requirement.name = "bar"
+
+    with pytest.raises(AttributeError):
+        requirement.specifier = SpecifierSet(">=2")
+
+    with pytest.raises(AttributeError):
+        del requirement.marker
+
+    for _requirement in [
+        copy.copy(requirement),
+        copy.deepcopy(requirement),
+        pickle.loads(pickle.dumps(requirement))
+    ]:
+        assert isinstance(_requirement, wiz.utility.FrozenRequirement)
+        assert _requirement == requirement
+        assert hash(_requirement) == hash(requirement)
+
+
+def test_frozen_requirement_with_marker():
+    """Create immutable requirement parsed with pyparsing grammar."""
+    requirement = wiz.utility.get_requirement(
+        "foo >= 1; python_version > '2.7'"
+    )
+    assert isinstance(requirement, wiz.utility.FrozenRequirement)
+    assert str(requirement.marker) == "python_version > \"2.7\""
+    assert pickle.loads(pickle.dumps(requirement)).marker is not None
+
+
+def test_frozen_requirement_with_name():
+    """Return requirement with another name."""
+    requirement = wiz.utility.get_requirement("foo[V1] >= 1")
+    assert requirement.with_name("foo") is requirement
+
+    _requirement = requirement.with_name("test::foo")
+    assert isinstance(_requirement, wiz.utility.FrozenRequirement)
+    assert _requirement == Requirement("test::foo[V1] >= 1")
+    assert requirement == Requirement("foo[V1] >= 1")
+
+
+def test_frozen_requirement_intersect():
+    """Return requirement constrained by another requirement."""
+    requirement = wiz.utility.get_requirement("foo[V1] >= 1")
+
+    _requirement = requirement.intersect(Requirement("foo < 2"))
+    assert isinstance(_requirement, wiz.utility.FrozenRequirement)
+    assert _requirement == Requirement("foo[V1] >= 1, < 2")
+    assert requirement == Requirement("foo[V1] >= 1")
+
+
+def test_freeze_requirement():
+    """Return immutable copy of requirement."""
+    requirement = Requirement("foo[V1] >= 1")
+
+    _requirement = wiz.utility.freeze_requirement(requirement)
+    assert isinstance(_requirement, wiz.utility.FrozenRequirement)
+    assert _requirement == requirement
+    assert wiz.utility.freeze_requirement(_requirement) is _requirement
+
+
+def test_get_version_interned():
+    """Return same version instance for identical strings."""
+    wiz.utility.clear_intern_cache()
+
+    version = wiz.utility.get_version("0.1.0")
+    assert wiz.utility.get_version("0.1.0") is version
+
+    with pytest.raises(wiz.exception.InvalidVersion):
+        wiz.utility.get_version("incorrect")
+
+    assert wiz.utility.get_intern_statistics()["version"] == {
+        "hits": 1, "misses": 2, "size": 1
+    }
+
+
+def test_intern_cache_least_recently_used(mocker):
+    """Discard least recently used objects."""
+    mocker.patch.object(wiz.utility, "INTERN_CACHE_SIZE", 2)
+    cache = wiz.utility.InternCache(Version)
+
+    version1 = cache.get("1")
+    version2 = cache.get("2")
+
+    # Mark first version as recently used.
+    cache.get("1")
+
+    cache.get("3")
+    assert cache.get("1") is version1
+    assert cache.get("2") is not version2
+    assert cache.statistics() == {"hits": 2, "misses": 4, "size": 2}
+
+
+def test_get_version_key():
+    """Return key sorting versions."""
+    versions = [
+        wiz.utility.get_version(version)
+        for version in ["1.0.0", "0.1.0", "1.0.0rc1", "1!0.1", "1.0.0.post1"]
+    ]
+    assert sorted(versions, key=wiz.utility.get_version_key) == sorted(versions)
+    assert wiz.utility.get_version_key(None) < wiz.utility.get_version_key(
+        wiz.utility.get_version("0")
+    )
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    ">=1, <2",
+    ">1.0",
+    "<=1.0",
+    "<1.0.1",
+    "==1.0",
+    "==1.0+local",
+    "==1.*",
+    "!=1.*",
+    "!=1.0, !=2.0.0",
+    "~=1.0",
+    "~=0.9.1",
+    ">=1.0.0rc1",
+    "<1!0",
+    "===1.0",
+], ids=[
+    "empty",
+    "range",
+    "exclusive-minimum",
+    "inclusive-maximum",
+    "exclusive-maximum",
+    "exact",
+    "exact-local",
+    "prefix",
+    "excluded-prefix",
+    "excluded",
+    "compatible-release",
+    "compatible-subversion",
+    "pre-release",
+    "epoch",
+    "arbitrary-equality",
+])
+def test_compiled_specifier_contains(content):
+    """Indicate whether version is compatible with compiled specifier."""
+    specifier = SpecifierSet(content)
+    compiled = wiz.utility.CompiledSpecifier(specifier)
+
+    for version in [
+        "0.1", "0.9.1", "0.9.5", "1.0.0", "1.0", "1.0+local", "1.0.0rc1",
+        "1.0.dev1", "1.0.post1", "1.0.1", "1.5", "2", "2.0.0.post2", "1!0.1"
+    ]:
+        version = Version(version)
+        assert compiled.contains(version) is specifier.contains(version)
+
+        # Result is recorded.
+        assert compiled.contains(version) is specifier.contains(version)
+
+
+def test_compiled_specifier():
+    """Compile specifier into bounds and excluded versions."""
+    compiled = wiz.utility.CompiledSpecifier(
+        SpecifierSet(">=2, <3.0, !=2.5, !=2.6.*")
+    )
+    assert compiled.minimum == (0, (2,))
+    assert compiled.maximum == (0, (3,))
+    assert compiled.excluded == frozenset([Version("2.5")])
+
+    compiled = wiz.utility.CompiledSpecifier(SpecifierSet("~=2.2"))
+    assert compiled.minimum == (0, (2, 2))
+    assert compiled.maximum == (0, (2, float("inf")))
+
+    compiled = wiz.utility.CompiledSpecifier(SpecifierSet("!=2.1"))
+    assert compiled.minimum is None
+    assert compiled.maximum is None
+
+
+def test_compiled_specifier_ranges(mocker):
+    """Extract version ranges only once from compiled specifier."""
+    requirement = Requirement("foo >=2, <3")
+    compiled = wiz.utility.CompiledSpecifier(requirement.specifier)
+
+    spy = mocker.spy(wiz.utility, "extract_version_ranges")
+    assert compiled.ranges(requirement) == [((2,), (2, 9999))]
+    assert compiled.ranges(requirement) == [((2,), (2, 9999))]
+    spy.assert_called_once_with(requirement)
+
+
+def test_compile_specifier():
+    """Return compiled specifier shared between identical specifiers."""
+    wiz.utility.clear_intern_cache()
+
+    compiled = wiz.utility.compile_specifier(SpecifierSet(">=2, <3"))
+    assert wiz.utility.compile_specifier(SpecifierSet("<3,>=2")) is compiled
+    assert wiz.utility.compile_specifier(SpecifierSet(">=2")) is not compiled
+
+    assert wiz.utility.get_intern_statistics()["specifier"] == {
+        "hits": 1, "misses": 2, "size": 2
+    }
+
+
 @pytest.mark.parametrize("ranges1, ranges2, expected", [
     (
         [(None, None)],
@@ -197,6 +197,45 @@ def test_validate_definition_failed(value, message):
     assert message in str(error)
 
 
+def test_validate_definition_header():
+    """Validate definition header without validating other keywords."""
+    wiz.validator.validate_definition_header({
+        "identifier": "foo",
+        "version": "0.1.0",
+        "command": {"app": "AppExe"},
+        "environ": 0,
+        "requirements": 0,
+        "unknown": True,
+        "variants": [{"identifier": "V1", "environ": 0}]
+    })
+
+
+@pytest.mark.parametrize("value, message", [
+    ("incorrect", "Data has incorrect type."),
+    ({}, "'identifier' is required."),
+    ({"identifier": "foo", "version": 0}, "'version' has incorrect type."),
+    ({"identifier": "foo", "command": 0}, "'command' has incorrect type."),
+    ({"identifier": "foo", "variants": 0}, "'variants' has incorrect type."),
+    (
+        {"identifier": "foo", "variants": [{}]},
+        "'variants/0/identifier' is required."
+    ),
+], ids=[
+    "incorrect-type",
+    "identifier-missing",
+    "version-incorrect",
+    "command-incorrect",
+    "variants-incorrect",
+    "variant-identifier-missing",
+])
+def test_validate_definition_header_failed(value, message):
+    """Raise error when header data is incorrect."""
+    with pytest.raises(wiz.exception.IncorrectDefinition) as error:
+        wiz.validator.validate_definition_header(value)
+
+    assert message in str(error)
+
+
 def test_validate_identifier_keyword():
     """Validate 'identifier' keyword within data."""
     wiz.validator.validate_identifier_keyword({"identifier": "foo"})
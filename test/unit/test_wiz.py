@@ -1,16 +1,21 @@
 # :coding: utf-8
 
 import os
+import threading
 
 import pytest
 from packaging.requirements import Requirement
 
 import wiz
+import wiz.cache
 import wiz.definition
 import wiz.environ
 import wiz.exception
 import wiz.graph
+import wiz.history
 import wiz.package
+import wiz.sat
+import wiz.symbol
 import wiz.system
 import wiz.utility
 from wiz._version import __version__
@@ -100,6 +105,12 @@ def mocked_graph_resolver(mocker):
     return mocker.patch.object(wiz.graph, "Resolver")
 
 
+@pytest.fixture()
+def mocked_sat_resolver(mocker):
+    """Return mocked 'wiz.sat.Resolver' class constructor."""
+    return mocker.patch.object(wiz.sat, "Resolver")
+
+
 @pytest.fixture()
 def mocked_utility_encode(mocker):
     """Return mocked 'wiz.utility.encode' function."""
@@ -115,11 +126,17 @@ def mocked_utility_decode(mocker):
 @pytest.mark.parametrize("options", [
     {},
     {"max_depth": 2},
-    {"system_mapping": "__CUSTOM_SYSTEM_MAPPING__"}
+    {"system_mapping": "__CUSTOM_SYSTEM_MAPPING__"},
+    {"ignore_patterns": [".git"]},
+    {"workers": 4, "executor": "process"},
+    {"lazy": True}
 ], ids=[
     "paths-only",
     "with-max-depth",
     "with-system-mapping",
+    "with-ignore-patterns",
+    "with-workers",
+    "lazy",
 ])
 def test_fetch_definition_mapping(
     mocked_definition_fetch, mocked_system_query, options
@@ -140,7 +157,11 @@ def test_fetch_definition_mapping(
     mocked_definition_fetch.assert_called_once_with(
         paths,
         max_depth=options.get("max_depth"),
-        system_mapping=options.get("system_mapping", default_system_mapping)
+        system_mapping=options.get("system_mapping", default_system_mapping),
+        ignore_patterns=options.get("ignore_patterns"),
+        workers=options.get("workers"),
+        executor=options.get("executor"),
+        lazy=options.get("lazy", False)
     )
 
     if options.get("system_mapping"):
@@ -149,6 +170,127 @@ def test_fetch_definition_mapping(
         mocked_system_query.assert_called_once()
 
 
+
+def test_fetch_definition_mapping_from_cache(
+    mocker, mocked_definition_fetch, mocked_system_query
+):
+    """Fetch mapping from snapshot cache."""
+    mocked_load = mocker.patch.object(wiz.cache, "load_snapshot")
+    mocked_export = mocker.patch.object(wiz.cache, "export_snapshot")
+    mocked_record = mocker.patch.object(wiz.history, "record_action")
+
+    paths = ["/path/to/registry1", "/path/to/registry2"]
+    mocked_load.return_value = {"command": {}, "package": {}}
+
+    result = wiz.fetch_definition_mapping(paths, cache=True)
+    assert result == {"command": {}, "package": {}, "registries": paths}
+
+    mocked_load.assert_called_once_with(
+        paths, system_mapping=mocked_system_query.return_value,
+        max_depth=None, ignore_patterns=None
+    )
+    mocked_definition_fetch.assert_not_called()
+    mocked_export.assert_not_called()
+    mocked_record.assert_called_once_with(
+        "FETCH_DEFINITIONS", registries=paths, max_depth=None,
+        definition_mapping=result
+    )
+
+
+def test_fetch_definition_mapping_update_cache(
+    mocker, mocked_definition_fetch, mocked_system_query
+):
+    """Fetch mapping and export snapshot when cache is outdated."""
+    mocked_load = mocker.patch.object(wiz.cache, "load_snapshot")
+    mocked_export = mocker.patch.object(wiz.cache, "export_snapshot")
+
+    paths = ["/path/to/registry1", "/path/to/registry2"]
+    definition_mapping = {"command": {}, "package": {}}
+    mocked_load.return_value = None
+    mocked_definition_fetch.return_value = definition_mapping
+
+    result = wiz.fetch_definition_mapping(paths, max_depth=2, cache=True)
+    assert result == definition_mapping
+
+    options = dict(
+        system_mapping=mocked_system_query.return_value, max_depth=2,
+        ignore_patterns=None
+    )
+    mocked_load.assert_called_once_with(paths, **options)
+    mocked_definition_fetch.assert_called_once_with(
+        paths, workers=None, executor=None, lazy=False, **options
+    )
+    mocked_export.assert_called_once_with(definition_mapping, paths, **options)
+
+
+def test_fetch_definition_mapping_lazy_ignore_cache(
+    mocker, mocked_definition_fetch, mocked_system_query
+):
+    """Fetch lazy mapping without snapshot cache."""
+    mocked_load = mocker.patch.object(wiz.cache, "load_snapshot")
+    mocked_export = mocker.patch.object(wiz.cache, "export_snapshot")
+    mocked_definition_fetch.return_value = {"command": {}, "package": {}}
+
+    wiz.fetch_definition_mapping(["/path"], lazy=True, cache=True)
+
+    mocked_load.assert_not_called()
+    mocked_export.assert_not_called()
+    mocked_definition_fetch.assert_called_once()
+
+def test_fetch_definition_mapping_from_memory(
+    mocker, mocked_definition_fetch, mocked_system_query
+):
+    """Fetch mapping kept in memory."""
+    mocked_load = mocker.patch.object(wiz.cache, "load_from_memory")
+    mocked_save = mocker.patch.object(wiz.cache, "save_to_memory")
+
+    paths = ["/path/to/registry1", "/path/to/registry2"]
+    mocked_load.return_value = "__MAPPING__"
+
+    result = wiz.fetch_definition_mapping(paths, memory_cache=True)
+    assert result == "__MAPPING__"
+
+    mocked_load.assert_called_once_with(
+        paths, system_mapping=mocked_system_query.return_value,
+        max_depth=None, ignore_patterns=None, lazy=False
+    )
+    mocked_definition_fetch.assert_not_called()
+    mocked_save.assert_not_called()
+
+
+def test_fetch_definition_mapping_save_to_memory(
+    mocker, mocked_definition_fetch, mocked_system_query
+):
+    """Fetch mapping and keep it in memory."""
+    mocked_load = mocker.patch.object(wiz.cache, "load_from_memory")
+    mocked_save = mocker.patch.object(wiz.cache, "save_to_memory")
+
+    paths = ["/path/to/registry1", "/path/to/registry2"]
+    definition_mapping = {"command": {}, "package": {}}
+    mocked_load.return_value = None
+    mocked_definition_fetch.return_value = definition_mapping
+
+    result = wiz.fetch_definition_mapping(
+        paths, max_depth=3, lazy=True, memory_cache=True
+    )
+    assert result == {"command": {}, "package": {}, "registries": paths}
+
+    options = dict(
+        system_mapping=mocked_system_query.return_value, max_depth=3,
+        ignore_patterns=None
+    )
+    mocked_load.assert_called_once_with(paths, lazy=True, **options)
+    mocked_save.assert_called_once_with(result, paths, lazy=True, **options)
+
+
+def test_invalidate_cache(mocker):
+    """Discard definition mappings kept in memory."""
+    mocked_clear = mocker.patch.object(wiz.cache, "clear_memory")
+
+    wiz.invalidate_cache()
+    mocked_clear.assert_called_once()
+
+
 def test_fetch_definition(mocked_definition_query):
     """Fetch definition."""
     request = "test >= 10"
@@ -208,6 +350,9 @@ def test_fetch_package_request_from_command():
         "app[variant] >1, <2", definition_mapping
     ) == "test[variant] >1, <2"
 
+    # Ensure that shared requirement instance has not been mutated.
+    assert str(wiz.utility.get_requirement("test")) == "test"
+
 
 def test_fetch_package_request_from_command_error():
     """Fail to fetch package request corresponding to command."""
@@ -270,7 +415,8 @@ def test_resolve_context(
     mocked_fetch_definition_mapping.assert_not_called()
 
     mocked_graph_resolver.assert_called_once_with(
-        "__PACKAGE_DEFINITIONS__"
+        "__PACKAGE_DEFINITIONS__", jobs=None, executor=None,
+        max_combinations=None, timeout=None, cancel_event=None
     )
     mocked_resolver.compute_packages.assert_called_once_with([
         Requirement(request) for request in requests
@@ -285,6 +431,34 @@ def test_resolve_context(
     )
 
 
+def test_resolve_context_without_initiating_environ(
+    mocked_graph_resolver, mocked_environ_initiate,
+    mocked_package_extract_context, mocked_utility_encode, mocker
+):
+    """Get resolved context mapping with environment already initiated."""
+    packages = [mocker.Mock(identifier="test1")]
+
+    mocked_resolver = mocker.Mock(**{"compute_packages.return_value": packages})
+    mocked_graph_resolver.return_value = mocked_resolver
+    mocked_package_extract_context.return_value = {"environ": {}}
+    mocked_utility_encode.return_value = "__ENCODED_CONTEXT__"
+
+    definition_mapping = {
+        "package": "__PACKAGE_DEFINITIONS__",
+        "registries": ["/path/to/registry"]
+    }
+
+    wiz.resolve_context(
+        ["test1"], definition_mapping, environ_mapping={"KEY": "VALUE"},
+        initiate_environ=False
+    )
+
+    mocked_environ_initiate.assert_not_called()
+    mocked_package_extract_context.assert_called_once_with(
+        packages, environ_mapping={"KEY": "VALUE"}
+    )
+
+
 @pytest.mark.parametrize("options", [
     {},
     {"environ_mapping": "__ENVIRON__"},
@@ -332,11 +506,14 @@ def test_resolve_context_with_default_definition_mapping(
         "registries": paths
     }
 
-    mocked_registry_defaults.asset_called_once()
-    mocked_fetch_definition_mapping.asset_called_once_with(paths)
+    mocked_registry_defaults.assert_called_once()
+    mocked_fetch_definition_mapping.assert_called_once_with(
+        paths, memory_cache=True
+    )
 
     mocked_graph_resolver.assert_called_once_with(
-        "__PACKAGE_DEFINITIONS__"
+        "__PACKAGE_DEFINITIONS__", jobs=None, executor=None,
+        max_combinations=None, timeout=None, cancel_event=None
     )
     mocked_resolver.compute_packages.assert_called_once_with([
         Requirement(request) for request in requests
@@ -404,7 +581,8 @@ def test_resolve_context_with_implicit_packages(
     mocked_fetch_definition_mapping.asset_called_once_with(paths)
 
     mocked_graph_resolver.assert_called_once_with(
-        "__PACKAGE_DEFINITIONS__"
+        "__PACKAGE_DEFINITIONS__", jobs=None, executor=None,
+        max_combinations=None, timeout=None, cancel_event=None
     )
     mocked_resolver.compute_packages.assert_called_once_with([
         Requirement(request) for request in implicit + requests
@@ -473,7 +651,8 @@ def test_resolve_context_with_implicit_packages_ignored(
     mocked_fetch_definition_mapping.asset_called_once_with(paths)
 
     mocked_graph_resolver.assert_called_once_with(
-        "__PACKAGE_DEFINITIONS__"
+        "__PACKAGE_DEFINITIONS__", jobs=None, executor=None,
+        max_combinations=None, timeout=None, cancel_event=None
     )
     mocked_resolver.compute_packages.assert_called_once_with([
         Requirement(request) for request in requests
@@ -488,6 +667,324 @@ def test_resolve_context_with_implicit_packages_ignored(
     )
 
 
+def test_resolve_context_with_sat_strategy(
+    mocked_fetch_definition_mapping, mocked_graph_resolver,
+    mocked_sat_resolver, mocked_environ_initiate,
+    mocked_package_extract_context, mocked_utility_encode, mocker
+):
+    """Get resolved context mapping with SAT resolver."""
+    requests = ["test1 >=10, < 11", "test2"]
+    paths = ["/path/to/registry1", "/path/to/registry2"]
+
+    context = {"environ": {"KEY": "VALUE"}, "command": {"app": "APP"}}
+    packages = [
+        mocker.Mock(identifier="test1"),
+        mocker.Mock(identifier="test2"),
+    ]
+
+    mocked_resolver = mocker.Mock(**{"compute_packages.return_value": packages})
+    mocked_sat_resolver.return_value = mocked_resolver
+    mocked_environ_initiate.return_value = "__INITIAL_ENVIRON__"
+    mocked_package_extract_context.return_value = context
+    mocked_utility_encode.return_value = "__ENCODED_CONTEXT__"
+
+    definition_mapping = {
+        "package": "__PACKAGE_DEFINITIONS__",
+        "registries": paths,
+    }
+
+    event = threading.Event()
+
+    result = wiz.resolve_context(
+        requests, definition_mapping, strategy="sat", timeout=5.0,
+        cancel_event=event
+    )
+
+    assert result["packages"] == packages
+
+    mocked_fetch_definition_mapping.assert_not_called()
+    mocked_graph_resolver.assert_not_called()
+    mocked_sat_resolver.assert_called_once_with(
+        "__PACKAGE_DEFINITIONS__", timeout=5.0, cancel_event=event
+    )
+    mocked_resolver.compute_packages.assert_called_once_with([
+        Requirement(request) for request in requests
+    ])
+
+
+def test_resolve_context_with_jobs(
+    mocked_fetch_definition_mapping, mocked_graph_resolver,
+    mocked_environ_initiate, mocked_package_extract_context,
+    mocked_utility_encode, mocker
+):
+    """Get resolved context mapping with concurrent combinations."""
+    requests = ["test1 >=10, < 11", "test2"]
+    paths = ["/path/to/registry1", "/path/to/registry2"]
+
+    context = {"environ": {"KEY": "VALUE"}, "command": {"app": "APP"}}
+    packages = [
+        mocker.Mock(identifier="test1"),
+        mocker.Mock(identifier="test2"),
+    ]
+
+    mocked_resolver = mocker.Mock(**{"compute_packages.return_value": packages})
+    mocked_graph_resolver.return_value = mocked_resolver
+    mocked_environ_initiate.return_value = "__INITIAL_ENVIRON__"
+    mocked_package_extract_context.return_value = context
+    mocked_utility_encode.return_value = "__ENCODED_CONTEXT__"
+
+    definition_mapping = {
+        "package": "__PACKAGE_DEFINITIONS__",
+        "registries": paths,
+    }
+
+    result = wiz.resolve_context(
+        requests, definition_mapping, jobs=4, executor="__EXECUTOR__"
+    )
+
+    assert result["packages"] == packages
+
+    mocked_fetch_definition_mapping.assert_not_called()
+    mocked_graph_resolver.assert_called_once_with(
+        "__PACKAGE_DEFINITIONS__", jobs=4, executor="__EXECUTOR__",
+        max_combinations=None, timeout=None, cancel_event=None
+    )
+    mocked_resolver.compute_packages.assert_called_once_with([
+        Requirement(request) for request in requests
+    ])
+
+
+def test_resolve_context_with_limits(
+    mocked_fetch_definition_mapping, mocked_graph_resolver,
+    mocked_environ_initiate, mocked_package_extract_context,
+    mocked_utility_encode, mocker
+):
+    """Get resolved context mapping with resolution limits."""
+    requests = ["test1 >=10, < 11", "test2"]
+    paths = ["/path/to/registry1", "/path/to/registry2"]
+
+    context = {"environ": {"KEY": "VALUE"}, "command": {"app": "APP"}}
+    packages = [
+        mocker.Mock(identifier="test1"),
+        mocker.Mock(identifier="test2"),
+    ]
+
+    mocked_resolver = mocker.Mock(**{"compute_packages.return_value": packages})
+    mocked_graph_resolver.return_value = mocked_resolver
+    mocked_environ_initiate.return_value = "__INITIAL_ENVIRON__"
+    mocked_package_extract_context.return_value = context
+    mocked_utility_encode.return_value = "__ENCODED_CONTEXT__"
+
+    definition_mapping = {
+        "package": "__PACKAGE_DEFINITIONS__",
+        "registries": paths,
+    }
+
+    event = threading.Event()
+
+    result = wiz.resolve_context(
+        requests, definition_mapping, max_combinations=10, timeout=5.0,
+        cancel_event=event
+    )
+
+    assert result["packages"] == packages
+
+    mocked_fetch_definition_mapping.assert_not_called()
+    mocked_graph_resolver.assert_called_once_with(
+        "__PACKAGE_DEFINITIONS__", jobs=None, executor=None,
+        max_combinations=10, timeout=5.0, cancel_event=event
+    )
+    mocked_resolver.compute_packages.assert_called_once_with([
+        Requirement(request) for request in requests
+    ])
+
+
+def test_resolve_context_with_incorrect_strategy(
+    mocked_graph_resolver, mocked_sat_resolver
+):
+    """Fail to get resolved context mapping with incorrect strategy."""
+    definition_mapping = {
+        "package": "__PACKAGE_DEFINITIONS__",
+        "registries": [],
+    }
+
+    with pytest.raises(ValueError) as error:
+        wiz.resolve_context(["test1"], definition_mapping, strategy="incorrect")
+
+    assert "'incorrect' is not a valid resolver strategy." in str(error.value)
+
+    mocked_graph_resolver.assert_not_called()
+    mocked_sat_resolver.assert_not_called()
+
+
+@pytest.mark.parametrize("options, name", [
+    ({"jobs": 4}, "jobs"),
+    ({"executor": "__EXECUTOR__"}, "executor"),
+    ({"max_combinations": 10}, "max_combinations"),
+], ids=[
+    "with-jobs",
+    "with-executor",
+    "with-max-combinations",
+])
+def test_resolve_context_with_sat_strategy_unsupported_options(
+    mocked_graph_resolver, mocked_sat_resolver, options, name
+):
+    """Fail to get resolved context mapping with unsupported SAT options."""
+    definition_mapping = {
+        "package": "__PACKAGE_DEFINITIONS__",
+        "registries": [],
+    }
+
+    with pytest.raises(ValueError) as error:
+        wiz.resolve_context(
+            ["test1"], definition_mapping, strategy="sat", **options
+        )
+
+    assert (
+        "'{}' is not supported by the 'sat' resolver strategy.".format(name)
+    ) in str(error.value)
+
+    mocked_graph_resolver.assert_not_called()
+    mocked_sat_resolver.assert_not_called()
+
+
+def test_resolve_contexts(
+    mocked_fetch_definition_mapping, mocked_graph_resolver,
+    mocked_environ_initiate, mocked_package_extract_context,
+    mocked_utility_encode, mocker
+):
+    """Get resolved context mappings from several lists of requests."""
+    requests_list = [["test1 >=10, < 11"], ["test2"], ["test3"]]
+    paths = ["/path/to/registry1", "/path/to/registry2"]
+
+    packages = [
+        mocker.Mock(identifier="test1"),
+        mocker.Mock(identifier="test3"),
+    ]
+    exception = wiz.exception.GraphResolutionError("Oops")
+
+    mocked_resolver = mocker.Mock(**{
+        "compute_packages.side_effect": [
+            [packages[0]], exception, [packages[1]]
+        ]
+    })
+    mocked_graph_resolver.return_value = mocked_resolver
+    mocked_environ_initiate.return_value = "__INITIAL_ENVIRON__"
+    mocked_package_extract_context.side_effect = lambda *_, **__: {
+        "environ": {"KEY": "VALUE"}, "command": {}
+    }
+    mocked_utility_encode.return_value = "__ENCODED_CONTEXT__"
+
+    definition_mapping = {
+        "package": "__PACKAGE_DEFINITIONS__",
+        "registries": paths,
+    }
+
+    results = list(wiz.resolve_contexts(
+        requests_list, definition_mapping, timeout=5.0
+    ))
+
+    assert [result[0] for result in results] == requests_list
+    assert results[0][1]["packages"] == [packages[0]]
+    assert results[1][1] == exception
+    assert results[2][1]["packages"] == [packages[1]]
+
+    mocked_fetch_definition_mapping.assert_not_called()
+    mocked_graph_resolver.assert_called_once_with(
+        "__PACKAGE_DEFINITIONS__", max_combinations=None, timeout=5.0
+    )
+    assert mocked_resolver.compute_packages.call_count == 3
+    mocked_resolver.compute_packages.assert_called_with([
+        Requirement("test3")
+    ])
+
+
+@pytest.mark.parametrize("executor", [
+    wiz.symbol.THREAD_EXECUTOR,
+    wiz.symbol.PROCESS_EXECUTOR,
+], ids=[
+    "thread",
+    "process",
+])
+def test_resolve_contexts_concurrently(executor):
+    """Get resolved context mappings from requests concurrently."""
+    definition_mapping = {
+        "package": {
+            "A": {
+                "0.1.0": wiz.definition.Definition({
+                    "identifier": "A",
+                    "version": "0.1.0",
+                    "requirements": ["B"]
+                })
+            },
+            "B": {
+                "0.1.0": wiz.definition.Definition({
+                    "identifier": "B",
+                    "version": "0.1.0",
+                    "environ": {"KEY": "VALUE"}
+                })
+            }
+        },
+        "registries": ["/path/to/registry"]
+    }
+
+    requests_list = [["A"], ["B"], ["C"], ["A", "B"]] * 3
+
+    results = list(wiz.resolve_contexts(
+        requests_list, definition_mapping, workers=2, executor=executor
+    ))
+
+    assert [result[0] for result in results] == requests_list
+
+    for requests, context in results:
+        if requests == ["C"]:
+            assert isinstance(context, wiz.exception.GraphResolutionError)
+            assert "The requirement 'C' could not be resolved." in str(context)
+            continue
+
+        expected = wiz.resolve_context(requests, definition_mapping)
+        assert context["environ"] == expected["environ"]
+        assert [package.identifier for package in context["packages"]] == [
+            package.identifier for package in expected["packages"]
+        ]
+
+
+def test_resolve_contexts_with_incorrect_strategy(
+    mocked_graph_resolver, mocked_sat_resolver
+):
+    """Fail to get resolved context mappings with incorrect strategy."""
+    definition_mapping = {
+        "package": "__PACKAGE_DEFINITIONS__",
+        "registries": [],
+    }
+
+    with pytest.raises(ValueError) as error:
+        wiz.resolve_contexts(
+            [["test1"]], definition_mapping, strategy="incorrect"
+        )
+
+    assert "'incorrect' is not a valid resolver strategy." in str(error.value)
+
+    mocked_graph_resolver.assert_not_called()
+    mocked_sat_resolver.assert_not_called()
+
+
+def test_resolve_contexts_with_incorrect_requests(
+    mocked_fetch_definition_mapping, mocked_graph_resolver
+):
+    """Fail to get resolved context mappings with incorrect requests."""
+    with pytest.raises(ValueError) as error:
+        wiz.resolve_contexts([["test1"], "test2"])
+
+    assert (
+        "Requests must be given as a list for each context "
+        "[received: 'test2']."
+    ) in str(error.value)
+
+    mocked_fetch_definition_mapping.assert_not_called()
+    mocked_graph_resolver.assert_not_called()
+
+
 def test_resolve_command():
     """Resolve a command from command mapping."""
     elements = ["app", "--option", "value", "/path/to/script"]
@@ -533,7 +1030,9 @@ def test_discover_context(
     }
 
     mocked_utility_decode.assert_called_once_with("__CONTEXT__")
-    mocked_fetch_definition_mapping.assert_called_once_with(paths)
+    mocked_fetch_definition_mapping.assert_called_once_with(
+        paths, memory_cache=True
+    )
 
     assert mocked_fetch_package.call_count == 2
     mocked_fetch_package.assert_any_call(